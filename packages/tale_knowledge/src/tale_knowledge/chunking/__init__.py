@@ -1,5 +1,17 @@
 """Markdown-aware content chunking."""
 
-from .splitter import ContentChunk, chunk_content
+from .diff import ChunkDiff, plan_chunk_diff
+from .offload import chunk_content_async, configure_chunk_pool, shutdown_chunk_pool
+from .splitter import ChunkSizing, ContentChunk, chunk_content, get_splitter
 
-__all__ = ["ContentChunk", "chunk_content"]
+__all__ = [
+    "ChunkDiff",
+    "ChunkSizing",
+    "ContentChunk",
+    "chunk_content",
+    "chunk_content_async",
+    "configure_chunk_pool",
+    "get_splitter",
+    "plan_chunk_diff",
+    "shutdown_chunk_pool",
+]
@@ -0,0 +1,69 @@
+"""Plan incremental re-indexing by matching stored chunks to new ones.
+
+Re-chunking an edited document mostly yields chunks that are already
+stored. :func:`plan_chunk_diff` pairs new chunks with stored rows by
+content hash so consumers embed and write only what actually changed.
+Hashing is left to the caller — it decides what text the stored
+embedding was computed from.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkDiff:
+    """Minimal change set turning stored chunks into a new chunk list.
+
+    ``updates`` pairs a stored row id with the new position it moves to
+    (its embedding is kept); ``inserts`` are new positions that still need
+    an embedding; ``deletes`` are stored row ids no new chunk matched.
+    """
+
+    deletes: list[int]
+    updates: list[tuple[int, int]]
+    inserts: list[int]
+
+    @property
+    def reused(self) -> int:
+        return len(self.updates)
+
+    @classmethod
+    def insert_all(cls, count: int) -> ChunkDiff:
+        """Diff for a document with no stored chunks."""
+        return cls(deletes=[], updates=[], inserts=list(range(count)))
+
+
+def plan_chunk_diff(stored: Iterable[tuple[int, int, str | None]], hashes: Sequence[str]) -> ChunkDiff:
+    """Match new chunk hashes to stored ``(row_id, position, hash)`` rows.
+
+    A row at the same position is preferred; otherwise the earliest unused
+    row with the same hash is reused. Rows with a ``None`` hash (legacy
+    rows, or rows missing an embedding) are never reused.
+    """
+    rows = sorted(stored, key=lambda row: row[1])
+    by_hash: dict[str, list[tuple[int, int]]] = {}
+    for row_id, position, digest in rows:
+        if digest is not None:
+            by_hash.setdefault(digest, []).append((row_id, position))
+
+    matched: dict[int, int] = {}
+    for position, digest in enumerate(hashes):
+        candidates = by_hash.get(digest, [])
+        same_position = next((row for row in candidates if row[1] == position), None)
+        if same_position is not None:
+            candidates.remove(same_position)
+            matched[position] = same_position[0]
+    for position, digest in enumerate(hashes):
+        candidates = by_hash.get(digest)
+        if position not in matched and candidates:
+            matched[position] = candidates.pop(0)[0]
+
+    kept = set(matched.values())
+    return ChunkDiff(
+        deletes=[row_id for row_id, _, _ in rows if row_id not in kept],
+        updates=[(row_id, position) for position, row_id in sorted(matched.items())],
+        inserts=[position for position in range(len(hashes)) if position not in matched],
+    )
@@ -0,0 +1,100 @@
+"""Async chunking entry point that keeps large inputs off the event loop.
+
+:func:`chunk_content` is CPU-bound; on a multi-megabyte extracted PDF it
+holds the GIL for hundreds of milliseconds, stalling every other request
+served by the same worker. :func:`chunk_content_async` runs small inputs
+inline (a process hop costs more than splitting them) and sends inputs of
+at least ``offload_threshold`` characters to a shared process pool, which
+returns the same :class:`ContentChunk` list.
+
+The pool is created on first use with the ``spawn`` start method — forking
+a process that already runs an event loop and helper threads is unsafe —
+and is bounded twice: ``max_workers`` processes, and at most that many
+documents in flight so large inputs queue in the caller instead of being
+pickled into the pool's unbounded work queue. Each worker keeps its own
+splitter cache. Consumers call :func:`shutdown_chunk_pool` on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from loguru import logger
+
+from .splitter import CHUNK_OVERLAP, CHUNK_SIZE, MIN_CHUNK_LENGTH, ChunkSizing, ContentChunk, chunk_content
+
+OFFLOAD_THRESHOLD = 262_144
+CHUNK_POOL_WORKERS = min(2, os.cpu_count() or 1)
+
+_executor: ProcessPoolExecutor | None = None
+_slots: asyncio.Semaphore | None = None
+_max_workers = CHUNK_POOL_WORKERS
+
+
+def configure_chunk_pool(max_workers: int) -> None:
+    """Set the pool size; takes effect the next time the pool is created."""
+    global _max_workers
+    if max_workers < 1:
+        raise ValueError("Chunk pool needs at least one worker")
+    _max_workers = max_workers
+
+
+def _get_executor() -> tuple[ProcessPoolExecutor, asyncio.Semaphore]:
+    global _executor, _slots
+    if _executor is None or _slots is None:
+        _executor = ProcessPoolExecutor(max_workers=_max_workers, mp_context=multiprocessing.get_context("spawn"))
+        _slots = asyncio.Semaphore(_max_workers)
+    return _executor, _slots
+
+
+def shutdown_chunk_pool() -> None:
+    """Stop the worker processes (no-op if the pool was never used)."""
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _slots = None
+
+
+async def chunk_content_async(
+    content: str | None,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    min_chunk_length: int = MIN_CHUNK_LENGTH,
+    *,
+    sizing: ChunkSizing = "chars",
+    tokenizer_model: str | None = None,
+    offload_threshold: int = OFFLOAD_THRESHOLD,
+) -> list[ContentChunk]:
+    """:func:`chunk_content` that offloads large inputs to a process pool.
+
+    Inputs shorter than ``offload_threshold`` characters are chunked
+    inline; ``offload_threshold <= 0`` always chunks inline.
+    """
+    call = partial(
+        chunk_content,
+        content,
+        chunk_size,
+        chunk_overlap,
+        min_chunk_length,
+        sizing=sizing,
+        tokenizer_model=tokenizer_model,
+    )
+    if offload_threshold <= 0 or not content or len(content) < offload_threshold:
+        return call()
+
+    executor, slots = _get_executor()
+    async with slots:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool next time
+            # and finish this document on a thread rather than failing it.
+            logger.warning("Chunking process pool broke, chunking {} chars on a thread", len(content))
+            shutdown_chunk_pool()
+            return await asyncio.to_thread(call)
@@ -4,6 +4,18 @@ Uses semantic-text-splitter's MarkdownSplitter to split at structural
 boundaries (headers, code blocks, tables, paragraphs, sentences) while
 respecting a target chunk size.
 
+Chunk size and overlap are measured in characters by default. With
+``sizing="tokens"`` they are measured in tokens of the embedding model's
+tokenizer instead, so every chunk fits the model context predictably:
+OpenAI model names use the splitter's built-in tiktoken tables, a path to
+a local Hugging Face ``tokenizer.json`` is loaded with the ``tokenizers``
+package when it is installed, and anything else falls back to
+``cl100k_base``. Tokenizers are never downloaded from the Hub here, so
+offline installs do not stall on the first chunking call.
+Splitters are immutable once built and are cached per
+``(size, overlap, sizing, model)``, so the crawler's per-page and the RAG
+service's per-document calls do not rebuild one every time.
+
 Each returned chunk carries three derived text fields so downstream storage
 can both (a) faithfully reconstruct the original document and (b) keep the
 embedding text identical to the splitter's raw output:
@@ -31,13 +43,25 @@ leaving the stored ``chunk.content`` free of the prefix.
 
 from __future__ import annotations
 
+import functools
+import os
 from dataclasses import dataclass
+from typing import Literal
 
+from loguru import logger
 from semantic_text_splitter import MarkdownSplitter
 
 CHUNK_SIZE = 2048
 CHUNK_OVERLAP = 200
 MIN_CHUNK_LENGTH = 10
+SPLITTER_CACHE_SIZE = 32
+# Model whose tiktoken table (cl100k_base) is used when no tokenizer matches
+FALLBACK_TOKENIZER_MODEL = "text-embedding-3-small"
+# The splitter's tiktoken binding raises a plain Exception with this message
+# for model names it has no table for
+_UNKNOWN_TIKTOKEN_MODEL = "No tokenizer found for model"
+
+ChunkSizing = Literal["chars", "tokens"]
 
 
 @dataclass
@@ -87,15 +111,59 @@ def build_metadata_prefix(title: str | None, url: str | None) -> str:
     return "\n\n".join(parts) + "\n\n" if parts else ""
 
 
+def _token_splitter(model: str | None, chunk_size: int, overlap: int) -> MarkdownSplitter:
+    if model:
+        try:
+            return MarkdownSplitter.from_tiktoken_model(model, chunk_size, overlap)
+        except Exception as e:
+            if _UNKNOWN_TIKTOKEN_MODEL not in str(e):
+                raise
+        if os.path.isfile(model):
+            try:
+                from tokenizers import Tokenizer
+            except ImportError:
+                logger.warning("tokenizers is not installed, sizing chunks for {} with cl100k_base", model)
+            else:
+                return MarkdownSplitter.from_huggingface_tokenizer(Tokenizer.from_file(model), chunk_size, overlap)
+        else:
+            logger.warning("No tokenizer found for {}, sizing chunks with cl100k_base", model)
+    return MarkdownSplitter.from_tiktoken_model(FALLBACK_TOKENIZER_MODEL, chunk_size, overlap)
+
+
+@functools.lru_cache(maxsize=SPLITTER_CACHE_SIZE)
+def get_splitter(
+    chunk_size: int,
+    overlap: int,
+    sizing: ChunkSizing = "chars",
+    model: str | None = None,
+) -> MarkdownSplitter:
+    """Return the shared splitter for these settings, building it on first use.
+
+    ``model`` names the tokenizer and only matters for ``sizing="tokens"``.
+    """
+    if sizing == "tokens":
+        return _token_splitter(model, chunk_size, overlap)
+    if sizing != "chars":
+        raise ValueError(f"Unknown chunk sizing {sizing!r}; expected 'chars' or 'tokens'")
+    return MarkdownSplitter(chunk_size, overlap=overlap)
+
+
 def chunk_content(
     content: str | None,
     chunk_size: int = CHUNK_SIZE,
     chunk_overlap: int = CHUNK_OVERLAP,
     min_chunk_length: int = MIN_CHUNK_LENGTH,
+    *,
+    sizing: ChunkSizing = "chars",
+    tokenizer_model: str | None = None,
 ) -> list[ContentChunk]:
     """Split ``content`` into overlap-aware chunks.
 
     Returns an empty list for ``None`` / empty / whitespace-only input.
+    ``chunk_size`` and ``chunk_overlap`` are characters, or tokens of
+    ``tokenizer_model`` when ``sizing="tokens"``; offsets and the tiling
+    invariants are the same in both modes.
+
     ``min_chunk_length`` is currently unused for the tiling computation —
     filtering short chunks would break the tiling invariant
     ``"".join(core) == content``. The parameter is kept for backward
@@ -105,7 +173,7 @@ def chunk_content(
         return []
 
     effective_overlap = min(chunk_overlap, chunk_size // 2)
-    splitter = MarkdownSplitter(chunk_size, overlap=effective_overlap)
+    splitter = get_splitter(chunk_size, effective_overlap, sizing, tokenizer_model if sizing == "tokens" else None)
 
     # Pass the raw content — NOT ``content.strip()`` — so offsets returned
     # by ``chunk_indices`` are indices into the exact input. Offsets are
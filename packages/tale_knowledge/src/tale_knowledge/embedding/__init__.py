@@ -1,6 +1,18 @@
 """Embedding generation service."""
 
+from .batching import TokenCounter, plan_batches
+from .cache import (
+    EmbeddingCache,
+    InMemoryEmbeddingCache,
+    TieredEmbeddingCache,
+    compute_text_hash,
+)
+from .factory import create_embedding_service
+from .limiter import AdaptiveConcurrencyLimiter, get_shared_limiter
+from .local import LocalEmbeddingService, is_local_base_url
+from .query_cache import QueryEmbeddingCache
 from .service import (
+    EmbeddingArrayResult,
     EmbeddingQueryResult,
     EmbeddingResult,
     EmbeddingService,
@@ -8,8 +20,21 @@ from .service import (
 )
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "EmbeddingArrayResult",
+    "EmbeddingCache",
     "EmbeddingQueryResult",
     "EmbeddingResult",
     "EmbeddingService",
     "EmbeddingUsage",
+    "InMemoryEmbeddingCache",
+    "LocalEmbeddingService",
+    "QueryEmbeddingCache",
+    "TieredEmbeddingCache",
+    "TokenCounter",
+    "compute_text_hash",
+    "create_embedding_service",
+    "get_shared_limiter",
+    "is_local_base_url",
+    "plan_batches",
 ]
@@ -0,0 +1,100 @@
+"""Token-budget-aware request batching for embedding calls.
+
+Providers cap both the number of inputs and the total number of tokens per
+embedding request, and reject any single input above the model's context
+length. Packing by item count alone either overshoots the token cap (2048
+char chunks plus a crawler title/URL prefix) or sends many tiny requests.
+
+:class:`TokenCounter` uses tiktoken when it is installed and its encoding
+can be loaded, and otherwise falls back to a conservative character
+heuristic that over-estimates tokens for typical text.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from typing import Any
+
+from loguru import logger
+
+MAX_TOKENS_PER_REQUEST = 100_000
+MAX_TOKENS_PER_INPUT = 8191
+CHARS_PER_TOKEN = 3
+DEFAULT_ENCODING = "cl100k_base"
+
+
+@functools.lru_cache(maxsize=8)
+def _load_encoding(model: str | None) -> Any | None:
+    """Return a tiktoken encoding for ``model``, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception:
+        logger.opt(exception=True).warning("tiktoken encoding unavailable, estimating tokens from characters")
+        return None
+
+
+class TokenCounter:
+    """Count and truncate text in tokens of the embedding model."""
+
+    def __init__(self, model: str | None = None) -> None:
+        self._model = model
+
+    @property
+    def exact(self) -> bool:
+        """True when counts come from a real tokenizer, not the heuristic."""
+        return _load_encoding(self._model) is not None
+
+    def count(self, text: str) -> int:
+        encoding = _load_encoding(self._model)
+        if encoding is None:
+            return math.ceil(len(text) / CHARS_PER_TOKEN)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Return the longest prefix of ``text`` that fits in ``max_tokens``."""
+        encoding = _load_encoding(self._model)
+        if encoding is None:
+            return text[: max_tokens * CHARS_PER_TOKEN]
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+
+
+def plan_batches(
+    token_counts: list[int],
+    *,
+    max_items: int,
+    max_tokens: int,
+) -> list[tuple[int, int]]:
+    """Pack consecutive inputs into ``(start, end)`` slices.
+
+    Greedy and order-preserving: a slice is closed as soon as adding the
+    next input would exceed ``max_items`` or ``max_tokens``. An input that
+    alone exceeds ``max_tokens`` gets a slice of its own (callers truncate
+    inputs to the per-input limit first, which is far below the request
+    limit).
+    """
+    batches: list[tuple[int, int]] = []
+    start = 0
+    budget = 0
+    for i, count in enumerate(token_counts):
+        if i > start and (i - start >= max_items or budget + count > max_tokens):
+            batches.append((start, i))
+            start = i
+            budget = 0
+        budget += count
+    if start < len(token_counts):
+        batches.append((start, len(token_counts)))
+    return batches
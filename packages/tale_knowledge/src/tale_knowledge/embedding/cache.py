@@ -0,0 +1,155 @@
+"""Content-addressed embedding cache.
+
+Embeddings are deterministic for a given (model, dimensions, text), so a
+vector computed once can be reused for every later occurrence of the same
+text — re-uploaded document revisions and boilerplate-heavy pages mostly
+consist of unchanged chunks. Entries are keyed by ``sha256(text)`` within a
+``(model, dimensions)`` namespace; the hash is the same ``content_hash``
+both services already store per chunk.
+
+This module provides the cache interface, an in-process LRU tier and a
+tier combinator. Persistent tiers (e.g. Postgres) live in the consuming
+services, which own their database connections.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from array import array
+from collections import OrderedDict
+from typing import Protocol, runtime_checkable
+
+from loguru import logger
+
+MEMORY_CACHE_SIZE = 4096
+
+
+def compute_text_hash(text: str) -> str:
+    """Compute the SHA-256 hash of ``text`` used as the cache key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@runtime_checkable
+class EmbeddingCache(Protocol):
+    """Storage tier for embeddings keyed by ``(model, dimensions, text_hash)``."""
+
+    name: str
+
+    async def get_many(self, model: str, dimensions: int, text_hashes: list[str]) -> dict[str, list[float]]:
+        """Return cached vectors for the hashes that are present."""
+        ...
+
+    async def set_many(self, model: str, dimensions: int, entries: dict[str, list[float]]) -> None:
+        """Store vectors for the given hashes."""
+        ...
+
+
+class InMemoryEmbeddingCache:
+    """Bounded in-process LRU tier.
+
+    Vectors are stored as ``array('f')`` (4 bytes per dimension) instead of
+    lists of Python floats (~32 bytes per dimension), so a few thousand
+    1536-dim entries cost tens of MB rather than hundreds.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_size: int = MEMORY_CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[tuple[str, int, str], array] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_many(self, model: str, dimensions: int, text_hashes: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        for text_hash in text_hashes:
+            key = (model, dimensions, text_hash)
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                found[text_hash] = vector.tolist()
+        return found
+
+    async def set_many(self, model: str, dimensions: int, entries: dict[str, list[float]]) -> None:
+        if self._max_size <= 0:
+            return
+        for text_hash, vector in entries.items():
+            key = (model, dimensions, text_hash)
+            self._entries[key] = array("f", vector)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TieredEmbeddingCache:
+    """Read-through cache over ordered tiers (fastest first).
+
+    Lookups walk the tiers in order and only ask later tiers for keys the
+    earlier ones missed; hits from a slower tier are written back to the
+    faster tiers. Writes go to every tier. A failing tier is logged and
+    treated as a miss so the cache can never fail an embedding request.
+
+    Hit and miss counters are kept here (not on ``EmbeddingService``) so
+    they survive the service being rebuilt on provider config reloads.
+    """
+
+    name = "tiered"
+
+    def __init__(self, tiers: list[EmbeddingCache]) -> None:
+        self._tiers = list(tiers)
+        self._stats: dict[str, int] = {"hits": 0, "misses": 0}
+        for tier in self._tiers:
+            self._stats[f"{tier.name}_hits"] = 0
+
+    @property
+    def tiers(self) -> list[EmbeddingCache]:
+        return list(self._tiers)
+
+    async def get_many(self, model: str, dimensions: int, text_hashes: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        remaining = list(dict.fromkeys(text_hashes))
+
+        for depth, tier in enumerate(self._tiers):
+            if not remaining:
+                break
+            try:
+                tier_found = await tier.get_many(model, dimensions, remaining)
+            except Exception:
+                logger.opt(exception=True).warning("Embedding cache tier '{}' lookup failed", tier.name)
+                continue
+            if not tier_found:
+                continue
+
+            self._stats[f"{tier.name}_hits"] += len(tier_found)
+            found.update(tier_found)
+            remaining = [h for h in remaining if h not in tier_found]
+
+            for faster in self._tiers[:depth]:
+                try:
+                    await faster.set_many(model, dimensions, tier_found)
+                except Exception:
+                    logger.opt(exception=True).warning("Embedding cache tier '{}' backfill failed", faster.name)
+
+        self._stats["hits"] += len(found)
+        self._stats["misses"] += len(remaining)
+        return found
+
+    async def set_many(self, model: str, dimensions: int, entries: dict[str, list[float]]) -> None:
+        if not entries:
+            return
+        for tier in self._tiers:
+            try:
+                await tier.set_many(model, dimensions, entries)
+            except Exception:
+                logger.opt(exception=True).warning("Embedding cache tier '{}' write failed", tier.name)
+
+    def get_stats(self) -> dict[str, int]:
+        stats = dict(self._stats)
+        for tier in self._tiers:
+            if isinstance(tier, InMemoryEmbeddingCache):
+                stats[f"{tier.name}_size"] = len(tier)
+        return stats
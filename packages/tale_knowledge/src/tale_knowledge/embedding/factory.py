@@ -0,0 +1,25 @@
+"""Build the embedding service selected by the provider config."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .local import LocalEmbeddingService, is_local_base_url, parse_local_backend
+from .service import EmbeddingService
+
+
+def create_embedding_service(
+    api_key: str,
+    base_url: str | None,
+    model: str,
+    dimensions: int,
+    **kwargs: Any,
+) -> EmbeddingService:
+    """Return a local backend for ``local://`` base URLs, else the HTTP client.
+
+    Keyword arguments are passed to either constructor (cache, token limits,
+    encoding format), so callers do not need to know which one they get.
+    """
+    if is_local_base_url(base_url):
+        return LocalEmbeddingService(model, dimensions, backend=parse_local_backend(base_url), **kwargs)
+    return EmbeddingService(api_key=api_key, base_url=base_url, model=model, dimensions=dimensions, **kwargs)
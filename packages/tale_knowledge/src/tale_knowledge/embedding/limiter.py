@@ -0,0 +1,180 @@
+"""Adaptive (AIMD) concurrency limiting for embedding requests.
+
+A fixed per-instance semaphore neither protects the provider (every config
+reload and every service instance brings its own) nor uses spare capacity.
+:class:`AdaptiveConcurrencyLimiter` is shared process-wide per provider
+endpoint and model via :func:`get_shared_limiter`:
+
+* **Additive increase** — each request that completes with latency close
+  to the observed baseline grows the limit by ``1 / limit``, i.e. roughly
+  one extra slot per window of successful requests.
+* **Multiplicative decrease** — a rate limit or timeout multiplies the
+  limit by ``decrease_factor`` (at most once per cooldown, so a burst of
+  429s from one overloaded window counts as a single congestion signal).
+* **Retry-After** — when the provider says how long to back off, no new
+  request is admitted until that moment passes.
+
+Waiters are plain futures created on the running loop, so a shared limiter
+is never bound to a single event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import time
+from collections import deque
+from typing import Any
+
+INITIAL_LIMIT = 3
+MIN_LIMIT = 1
+MAX_LIMIT = 16
+DECREASE_FACTOR = 0.5
+LATENCY_TOLERANCE = 2.0
+DECREASE_COOLDOWN = 1.0
+_BASELINE_ALPHA = 0.1
+
+
+def parse_retry_after(headers: Any) -> float | None:
+    """Parse ``retry-after-ms`` / ``retry-after`` response headers into seconds."""
+    if headers is None:
+        return None
+    try:
+        retry_ms = headers.get("retry-after-ms")
+        if retry_ms is not None:
+            return max(float(retry_ms) / 1000.0, 0.0)
+        retry = headers.get("retry-after")
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if retry is None:
+        return None
+    try:
+        return max(float(retry), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit that adapts to provider latency and throttling."""
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = INITIAL_LIMIT,
+        min_limit: int = MIN_LIMIT,
+        max_limit: int = MAX_LIMIT,
+        decrease_factor: float = DECREASE_FACTOR,
+        latency_tolerance: float = LATENCY_TOLERANCE,
+    ) -> None:
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._decrease_factor = decrease_factor
+        self._latency_tolerance = latency_tolerance
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._baseline_latency: float | None = None
+        self._stats = {"requests": 0, "throttle_events": 0}
+
+    @property
+    def limit(self) -> int:
+        return max(self._min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot (and for any Retry-After pause to elapse)."""
+        while True:
+            pause = self._blocked_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+            if self._in_flight < self.limit and not self._waiters:
+                self._in_flight += 1
+                return
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._wake_next()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # The slot was already handed to us; pass it on.
+                    self.release()
+                raise
+            # A woken waiter owns the slot handed over by _wake_next(),
+            # unless a Retry-After pause started while it was queued.
+            if time.monotonic() >= self._blocked_until:
+                return
+            self.release()
+
+    def release(self) -> None:
+        self._in_flight = max(self._in_flight - 1, 0)
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def record_success(self, latency: float) -> None:
+        """Additive increase while latency stays near the baseline."""
+        self._stats["requests"] += 1
+        if self._baseline_latency is None:
+            self._baseline_latency = latency
+        else:
+            self._baseline_latency += _BASELINE_ALPHA * (latency - self._baseline_latency)
+        if latency <= self._baseline_latency * self._latency_tolerance:
+            self._limit = min(self._limit + 1.0 / self._limit, float(self._max_limit))
+            self._wake_next()
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """Multiplicative decrease on rate limiting or timeouts."""
+        self._stats["requests"] += 1
+        self._stats["throttle_events"] += 1
+        now = time.monotonic()
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+        if now - self._last_decrease >= DECREASE_COOLDOWN:
+            self._limit = max(self._limit * self._decrease_factor, float(self._min_limit))
+            self._last_decrease = now
+
+    def get_stats(self) -> dict[str, float]:
+        return {
+            **self._stats,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "baseline_latency_seconds": self._baseline_latency or 0.0,
+        }
+
+
+_shared_limiters: dict[tuple[str, str], AdaptiveConcurrencyLimiter] = {}
+
+
+def get_shared_limiter(base_url: str | None, model: str) -> AdaptiveConcurrencyLimiter:
+    """Return the process-wide limiter for a provider endpoint and model.
+
+    Provider rate limits apply per endpoint/model, not per client object,
+    so every ``EmbeddingService`` (including ones rebuilt on config reload)
+    targeting the same pair shares one limiter.
+    """
+    key = (base_url or "", model)
+    limiter = _shared_limiters.get(key)
+    if limiter is None:
+        limiter = AdaptiveConcurrencyLimiter()
+        _shared_limiters[key] = limiter
+    return limiter
@@ -0,0 +1,178 @@
+"""Local CPU embedding backend.
+
+Runs a sentence-transformers model in-process — PyTorch or ONNX Runtime —
+so a corpus can be embedded without any external call (air-gapped installs,
+bulk re-indexing). It is selected through the provider config by giving the
+embedding provider a ``local://`` base URL::
+
+    {
+      "baseUrl": "local://onnx",
+      "models": [{"id": "BAAI/bge-small-en-v1.5", "tags": ["embedding"], "dimensions": 384}]
+    }
+
+``local://`` (or ``local://torch``) uses PyTorch, ``local://onnx`` uses ONNX
+Runtime. The model id is anything ``SentenceTransformer`` accepts — a hub
+name, or a directory path when the host has no network access.
+
+Inference runs on one dedicated worker thread; the runtime already spreads
+each forward pass across all cores, so more threads would only contend.
+Concurrent callers are coalesced by dynamic batching: requests that arrive
+within ``batch_wait`` seconds are merged into one forward pass of up to
+``max_batch_size`` texts.
+
+``dimensions`` below the model's native size keep the leading components
+and re-normalise them (Matryoshka-style truncation); larger values are an
+error. Requires the optional ``sentence-transformers`` dependency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from .service import EmbeddingService, EmbeddingUsage
+
+LOCAL_SCHEME = "local://"
+LOCAL_MAX_BATCH_SIZE = 64
+LOCAL_BATCH_WAIT = 0.005
+_BACKENDS = ("torch", "onnx")
+
+
+def is_local_base_url(base_url: str | None) -> bool:
+    """True when a provider base URL selects the local backend."""
+    return bool(base_url) and base_url.startswith(LOCAL_SCHEME)
+
+
+def parse_local_backend(base_url: str) -> str:
+    """Return the runtime named by a ``local://<backend>`` base URL."""
+    backend = base_url[len(LOCAL_SCHEME) :].strip("/") or "torch"
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown local embedding backend {backend!r}; expected one of {', '.join(_BACKENDS)}")
+    return backend
+
+
+def _load_sentence_transformer(model: str, backend: str) -> Callable[[list[str]], np.ndarray]:
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as exc:
+        raise RuntimeError(
+            "The local embedding backend requires sentence-transformers (install tale-knowledge with the 'local' extra)"
+        ) from exc
+
+    st_model = SentenceTransformer(model, device="cpu", backend=backend)
+
+    def encode(texts: list[str]) -> np.ndarray:
+        return st_model.encode(
+            texts,
+            batch_size=len(texts),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
+    return encode
+
+
+class LocalEmbeddingService(EmbeddingService):
+    """``EmbeddingService`` backed by a local model instead of an HTTP API.
+
+    Caching, token-aware batch planning, streaming and the array API are
+    inherited unchanged; only the call that produces vectors differs. Token
+    usage is not reported — there is nothing to bill.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        dimensions: int,
+        *,
+        backend: str = "torch",
+        max_batch_size: int = LOCAL_MAX_BATCH_SIZE,
+        batch_wait: float = LOCAL_BATCH_WAIT,
+        encoder: Callable[[list[str]], np.ndarray] | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(api_key="", base_url=f"{LOCAL_SCHEME}{backend}", model=model, dimensions=dimensions, **kwargs)
+        self._backend = backend
+        self._max_batch_size = max_batch_size
+        self._batch_wait = batch_wait
+        self._encoder = encoder
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-embedding")
+        self._pending: list[tuple[list[str], asyncio.Future[np.ndarray]]] = []
+        self._pending_texts = 0
+        self._worker: asyncio.Task[None] | None = None
+
+    def _create_client(self, api_key: str, base_url: str | None) -> Any:
+        return None
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        """Run one forward pass (worker thread only)."""
+        if self._encoder is None:
+            self._encoder = _load_sentence_transformer(self._model, self._backend)
+        vectors = np.asarray(self._encoder(texts), dtype=np.float32)
+        native = vectors.shape[1]
+        if native < self._dimensions:
+            raise ValueError(f"Local model {self._model} produces {native}-dim vectors, {self._dimensions} requested")
+        if native > self._dimensions:
+            vectors = vectors[:, : self._dimensions]
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        return np.ascontiguousarray(vectors)
+
+    async def _embed_valid(self, texts: list[str], usage: EmbeddingUsage) -> list[Any]:
+        future: asyncio.Future[np.ndarray] = asyncio.get_running_loop().create_future()
+        self._pending.append((texts, future))
+        self._pending_texts += len(texts)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run_batches())
+        return list(await future)
+
+    async def _run_batches(self) -> None:
+        """Drain queued requests, merging them into forward passes."""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if self._pending_texts < self._max_batch_size:
+                # Give concurrent callers a moment to join this pass.
+                await asyncio.sleep(self._batch_wait)
+
+            taken: list[tuple[list[str], asyncio.Future[np.ndarray]]] = []
+            size = 0
+            while self._pending and (not taken or size + len(self._pending[0][0]) <= self._max_batch_size):
+                texts, future = self._pending.pop(0)
+                size += len(texts)
+                if not future.done():
+                    taken.append((texts, future))
+            self._pending_texts -= size
+            if not taken:
+                continue
+
+            merged = [text for texts, _ in taken for text in texts]
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode, merged)
+            except asyncio.CancelledError:
+                for _, future in taken:
+                    future.cancel()
+                raise
+            except Exception as exc:
+                for _, future in taken:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            start = 0
+            for texts, future in taken:
+                if not future.done():
+                    future.set_result(vectors[start : start + len(texts)])
+                start += len(texts)
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._pending_texts = 0
+        self._executor.shutdown(wait=False, cancel_futures=True)
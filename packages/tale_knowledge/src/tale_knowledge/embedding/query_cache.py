@@ -0,0 +1,79 @@
+"""In-process LRU + TTL cache for query embeddings.
+
+Search traffic repeats itself: agent tools re-issue identical searches and
+callers retry a search while files are still processing. This cache sits
+in front of :meth:`EmbeddingService.embed_query_with_usage` so a repeated
+query returns its vector without a provider round-trip (or a wait in the
+query coalescing window).
+
+Keys are ``(model, dimensions, normalized query)``. Normalization is
+Unicode NFC plus whitespace collapsing only — case and punctuation can
+change the embedding, so they are kept. The TTL bounds how long a vector
+survives a provider-side model update that keeps the same model name;
+consumers also :meth:`~QueryEmbeddingCache.clear` it when they swap the
+embedding configuration.
+"""
+
+from __future__ import annotations
+
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_TTL = 300.0
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache lookup (NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", query).split())
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of query vectors with a per-entry time-to-live."""
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[tuple[str, int, str], tuple[float, array]] = OrderedDict()
+        self._stats: dict[str, int] = {"hits": 0, "misses": 0, "expired": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model: str, dimensions: int, query: str) -> list[float] | None:
+        key = (model, dimensions, normalize_query(query))
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, vector = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return vector.tolist()
+            del self._entries[key]
+            self._stats["expired"] += 1
+        self._stats["misses"] += 1
+        return None
+
+    def set(self, model: str, dimensions: int, query: str, vector: list[float]) -> None:
+        if self._max_size <= 0:
+            return
+        key = (model, dimensions, normalize_query(query))
+        self._entries[key] = (time.monotonic() + self._ttl, array("f", vector))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after the embedding provider changed)."""
+        self._entries.clear()
+        self._stats["invalidations"] += 1
+
+    def get_stats(self) -> dict[str, float]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
@@ -1,13 +1,48 @@
 """OpenAI-compatible embedding generation service.
 
-Constructor-injected configuration — no global state or settings imports.
-Each service creates its own EmbeddingService instance with its own config.
+Constructor-injected configuration — no settings imports. Each service
+creates its own EmbeddingService instance with its own config; the only
+process-wide state is the adaptive concurrency limiter (see below).
+
+An optional :class:`~tale_knowledge.embedding.cache.EmbeddingCache` can be
+injected; cached vectors are served without a provider call and only the
+misses are sent to the API.
+
+Concurrency is governed by a process-wide adaptive limiter (see
+``limiter``) shared by every instance targeting the same endpoint and model.
+
+Requests are packed by estimated token count (see ``batching``) as well as
+by item count, and inputs above the model's per-input limit are truncated
+to a deterministic prefix instead of being rejected by the provider.
+
+With ``encoding_format="base64"`` the provider's raw float32 payload is
+decoded straight into numpy arrays instead of being expanded into Python
+floats; :meth:`EmbeddingService.embed_texts_array` then returns one
+contiguous ``(n, dimensions)`` float32 matrix. The list-returning API keeps
+working in either mode.
+
+:meth:`EmbeddingService.embed_stream` yields each batch as soon as it is
+embedded, so consumers can store vectors while later batches are still in
+flight instead of holding every vector of a large document at once.
+
+With a ``query_batch_window``, concurrent :meth:`EmbeddingService.embed_query`
+calls are coalesced: queries arriving within the window (or until
+``query_batch_size`` are queued) go out as one request, and the request's
+token usage is split between the callers by their estimated token counts.
+
+An optional :class:`~tale_knowledge.embedding.query_cache.QueryEmbeddingCache`
+answers repeated queries before any of that happens.
 """
 
 import asyncio
+import base64
 import random
+import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
+from typing import Any, Literal
 
+import numpy as np
 from loguru import logger
 from openai import (
     APIConnectionError,
@@ -17,10 +52,16 @@ from openai import (
     RateLimitError,
 )
 
+from .batching import MAX_TOKENS_PER_INPUT, MAX_TOKENS_PER_REQUEST, TokenCounter, plan_batches
+from .cache import EmbeddingCache, compute_text_hash
+from .limiter import AdaptiveConcurrencyLimiter, get_shared_limiter, parse_retry_after
+from .query_cache import QueryEmbeddingCache
+
 MAX_BATCH_SIZE = 256
-MAX_CONCURRENT_REQUESTS = 3
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0
+STREAM_MAX_PENDING = 4
+QUERY_BATCH_SIZE = 32
 
 
 @dataclass
@@ -51,6 +92,14 @@ class EmbeddingResult:
     usage: EmbeddingUsage = field(default_factory=EmbeddingUsage)
 
 
+@dataclass
+class EmbeddingArrayResult:
+    """Embeddings as one ``(n, dimensions)`` float32 matrix with token usage metadata."""
+
+    embeddings: np.ndarray
+    usage: EmbeddingUsage = field(default_factory=EmbeddingUsage)
+
+
 @dataclass
 class EmbeddingQueryResult:
     """Single embedding with token usage metadata."""
@@ -60,67 +109,148 @@ class EmbeddingQueryResult:
 
 
 class EmbeddingService:
-    def __init__(self, api_key: str, base_url: str | None, model: str, dimensions: int):
-        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None,
+        model: str,
+        dimensions: int,
+        *,
+        cache: EmbeddingCache | None = None,
+        max_tokens_per_request: int = MAX_TOKENS_PER_REQUEST,
+        max_tokens_per_input: int = MAX_TOKENS_PER_INPUT,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        encoding_format: Literal["float", "base64"] | None = None,
+        query_batch_window: float = 0.0,
+        query_batch_size: int = QUERY_BATCH_SIZE,
+        query_cache: QueryEmbeddingCache | None = None,
+    ):
+        self._client = self._create_client(api_key, base_url)
         self._model = model
         self._dimensions = dimensions
-        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._limiter = limiter or get_shared_limiter(base_url, model)
+        self._cache = cache
+        self._max_tokens_per_request = max_tokens_per_request
+        self._max_tokens_per_input = min(max_tokens_per_input, max_tokens_per_request)
+        self._tokens = TokenCounter(model)
+        self._encoding_format = encoding_format
+        self._query_batch_window = query_batch_window
+        self._query_batch_size = query_batch_size
+        self._query_waiters: list[tuple[str, asyncio.Future[EmbeddingQueryResult]]] = []
+        self._query_timer: asyncio.TimerHandle | None = None
+        self._query_batches: set[asyncio.Task[None]] = set()
+        self._query_cache = query_cache
+
+    def _create_client(self, api_key: str, base_url: str | None) -> Any:
+        return AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    @property
+    def model(self) -> str:
+        return self._model
 
     @property
     def dimensions(self) -> int:
         return self._dimensions
 
+    @property
+    def cache(self) -> EmbeddingCache | None:
+        return self._cache
+
+    @property
+    def query_cache(self) -> QueryEmbeddingCache | None:
+        return self._query_cache
+
+    @property
+    def limiter(self) -> AdaptiveConcurrencyLimiter:
+        return self._limiter
+
     def _zero_vector(self) -> list[float]:
         return [0.0] * self._dimensions
 
-    async def _embed_batch_with_usage(self, batch: list[str], usage: EmbeddingUsage) -> list[list[float]]:
+    @staticmethod
+    def _decode(embedding: Any) -> Any:
+        """Decode a base64 float32 payload; float lists pass through unchanged."""
+        if isinstance(embedding, str):
+            return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+        return embedding
+
+    def _to_matrix(self, vectors: list[Any]) -> np.ndarray:
+        matrix = np.zeros((len(vectors), self._dimensions), dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            matrix[i] = vector
+        return matrix
+
+    async def _create_with_retry(self, texts: list[str]) -> Any:
+        """Call the embeddings API under the shared adaptive limiter.
+
+        A slot is held only for the duration of one attempt, never across
+        backoff sleeps. Rate limits and timeouts are reported to the limiter
+        as congestion; ``Retry-After`` extends the backoff when present.
+        """
+        kwargs: dict[str, Any] = {"model": self._model, "input": texts, "dimensions": self._dimensions}
+        if self._encoding_format is not None:
+            kwargs["encoding_format"] = self._encoding_format
+
+        attempt = 0
+        while True:
+            retry_after: float | None = None
+            await self._limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = await self._client.embeddings.create(**kwargs)
+            except (RateLimitError, APITimeoutError) as exc:
+                retry_after = parse_retry_after(getattr(getattr(exc, "response", None), "headers", None))
+                self._limiter.record_throttle(retry_after)
+                if attempt == MAX_RETRIES - 1:
+                    raise
+            except (APIConnectionError, InternalServerError):
+                if attempt == MAX_RETRIES - 1:
+                    raise
+            else:
+                self._limiter.record_success(time.monotonic() - started)
+                return response
+            finally:
+                self._limiter.release()
+
+            delay = max(RETRY_BASE_DELAY * (2**attempt) + random.uniform(0, 0.5), retry_after or 0.0)
+            logger.warning(
+                "Embedding request failed (attempt {}/{}), retrying in {:.2f}s",
+                attempt + 1,
+                MAX_RETRIES,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _embed_valid(self, texts: list[str], usage: EmbeddingUsage) -> list[Any]:
+        """Embed non-blank texts; an empty result means the backend returned no data."""
+        response = await self._create_with_retry(texts)
+        if not response.data:
+            return []
+
+        if response.usage:
+            usage.add(
+                response.usage.prompt_tokens,
+                response.usage.total_tokens,
+            )
+        return [self._decode(item.embedding) for item in response.data]
+
+    async def _embed_batch_with_usage(self, batch: list[str], usage: EmbeddingUsage) -> list[Any]:
         valid = [(i, text) for i, text in enumerate(batch) if text.strip()]
         if not valid:
             return [self._zero_vector() for _ in batch]
 
         valid_indices, valid_texts = zip(*valid, strict=True)
 
-        async with self._semaphore:
-            for attempt in range(MAX_RETRIES):
-                try:
-                    response = await self._client.embeddings.create(
-                        model=self._model,
-                        input=list(valid_texts),
-                        dimensions=self._dimensions,
-                    )
-                    if not response.data:
-                        raise ValueError("No embedding data received")
-                    embeddings = [item.embedding for item in response.data]
-                    if response.usage:
-                        usage.add(
-                            response.usage.prompt_tokens,
-                            response.usage.total_tokens,
-                        )
-                    break
-                except (
-                    RateLimitError,
-                    APITimeoutError,
-                    APIConnectionError,
-                    InternalServerError,
-                ):
-                    if attempt == MAX_RETRIES - 1:
-                        raise
-                    delay = RETRY_BASE_DELAY * (2**attempt) + random.uniform(0, 0.5)
-                    logger.warning(
-                        "Embedding request failed (attempt {}/{}), retrying in {:.2f}s",
-                        attempt + 1,
-                        MAX_RETRIES,
-                        delay,
-                    )
-                    await asyncio.sleep(delay)
-                except ValueError:
-                    logger.warning(
-                        "Embedding returned empty data for batch of {} texts, filling with zero vectors",
-                        len(valid_texts),
-                    )
-                    return [self._zero_vector() for _ in batch]
-
-        results: list[list[float]] = [self._zero_vector() for _ in batch]
+        embeddings = await self._embed_valid(list(valid_texts), usage)
+        if not embeddings:
+            logger.warning(
+                "Embedding returned empty data for batch of {} texts, filling with zero vectors",
+                len(valid_texts),
+            )
+            return [self._zero_vector() for _ in batch]
+
+        results: list[Any] = [self._zero_vector() for _ in batch]
         for idx, emb in zip(valid_indices, embeddings, strict=True):
             results[idx] = emb
         return results
@@ -132,25 +262,211 @@ class EmbeddingService:
         result = await self.embed_texts_with_usage(texts)
         return result.embeddings
 
+    def _plan_requests(self, texts: list[str]) -> list[tuple[int, list[str]]]:
+        """Truncate oversized inputs and pack them into token-bounded batches.
+
+        Returns ``(offset, batch)`` pairs, where ``offset`` is the index of the
+        batch's first text in ``texts``.
+        """
+        prepared: list[str] = []
+        counts: list[int] = []
+        for text in texts:
+            count = self._tokens.count(text)
+            if count > self._max_tokens_per_input:
+                logger.warning(
+                    "Embedding input of ~{} tokens exceeds the {} token limit, truncating",
+                    count,
+                    self._max_tokens_per_input,
+                )
+                text = self._tokens.truncate(text, self._max_tokens_per_input)
+                count = self._max_tokens_per_input
+            prepared.append(text)
+            counts.append(count)
+
+        slices = plan_batches(counts, max_items=MAX_BATCH_SIZE, max_tokens=self._max_tokens_per_request)
+        return [(start, prepared[start:end]) for start, end in slices]
+
+    async def _embed_uncached(self, texts: list[str], usage: EmbeddingUsage) -> list[Any]:
+        batches = self._plan_requests(texts)
+        results = await asyncio.gather(*[self._embed_batch_with_usage(batch, usage) for _, batch in batches])
+        return [emb for batch_result in results for emb in batch_result]
+
+    async def _embed_cached(
+        self,
+        texts: list[str],
+        usage: EmbeddingUsage,
+        cache: EmbeddingCache,
+    ) -> list[Any]:
+        """Serve cache hits directly and embed each distinct missing text once."""
+        hashes = [compute_text_hash(text) if text.strip() else "" for text in texts]
+        cached = await cache.get_many(self._model, self._dimensions, [h for h in hashes if h])
+
+        misses: dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes, strict=True):
+            if text_hash and text_hash not in cached:
+                misses.setdefault(text_hash, text)
+
+        fresh: dict[str, list[float]] = {}
+        if misses:
+            vectors = await self._embed_uncached(list(misses.values()), usage)
+            fresh = dict(zip(misses.keys(), vectors, strict=True))
+            # Zero vectors only appear when the provider returned no data —
+            # never persist them, or the failure would be replayed forever.
+            await cache.set_many(
+                self._model,
+                self._dimensions,
+                {h: _as_list(v) for h, v in fresh.items() if np.any(v)},
+            )
+
+        zero = self._zero_vector()
+        return [cached.get(h) or fresh.get(h, zero) for h in hashes]
+
+    async def _embed_vectors(self, texts: list[str], usage: EmbeddingUsage) -> list[Any]:
+        if self._cache is None:
+            return await self._embed_uncached(texts, usage)
+        return await self._embed_cached(texts, usage, self._cache)
+
     async def embed_texts_with_usage(self, texts: list[str]) -> EmbeddingResult:
         if not texts:
             return EmbeddingResult()
         usage = EmbeddingUsage(model=self._model)
-        batches = [texts[i : i + MAX_BATCH_SIZE] for i in range(0, len(texts), MAX_BATCH_SIZE)]
-        results = await asyncio.gather(*[self._embed_batch_with_usage(batch, usage) for batch in batches])
-        embeddings = [emb for batch_result in results for emb in batch_result]
-        return EmbeddingResult(embeddings=embeddings, usage=usage)
+        vectors = await self._embed_vectors(texts, usage)
+        return EmbeddingResult(embeddings=[_as_list(v) for v in vectors], usage=usage)
+
+    async def embed_texts_array(self, texts: list[str]) -> np.ndarray:
+        result = await self.embed_texts_array_with_usage(texts)
+        return result.embeddings
+
+    async def embed_texts_array_with_usage(self, texts: list[str]) -> EmbeddingArrayResult:
+        """Like :meth:`embed_texts_with_usage`, but as one float32 matrix."""
+        usage = EmbeddingUsage(model=self._model)
+        vectors = await self._embed_vectors(texts, usage) if texts else []
+        return EmbeddingArrayResult(embeddings=self._to_matrix(vectors), usage=usage)
+
+    async def embed_stream(
+        self,
+        texts: list[str],
+        *,
+        usage: EmbeddingUsage | None = None,
+        max_pending: int = STREAM_MAX_PENDING,
+    ) -> AsyncIterator[tuple[int, np.ndarray]]:
+        """Yield ``(offset, vectors)`` for each batch as soon as it is embedded.
+
+        ``vectors`` is a float32 matrix for ``texts[offset:offset + len(vectors)]``.
+        Batches are yielded in completion order, not input order. At most
+        ``max_pending`` batches are in flight, so memory stays bounded by the
+        batch size however many texts are passed. Token usage is accumulated
+        into ``usage`` when given. Closing the generator early cancels the
+        batches still in flight.
+        """
+        usage = usage if usage is not None else EmbeddingUsage(model=self._model)
+
+        async def embed_batch(offset: int, batch: list[str]) -> tuple[int, np.ndarray]:
+            return offset, self._to_matrix(await self._embed_vectors(batch, usage))
+
+        batches = iter(self._plan_requests(texts))
+        pending: set[asyncio.Task[tuple[int, np.ndarray]]] = set()
+        try:
+            while True:
+                for offset, batch in batches:
+                    pending.add(asyncio.create_task(embed_batch(offset, batch)))
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
     async def embed_query(self, query: str) -> list[float]:
         result = await self.embed_query_with_usage(query)
         return result.embedding
 
     async def embed_query_with_usage(self, query: str) -> EmbeddingQueryResult:
-        result = await self.embed_texts_with_usage([query])
-        return EmbeddingQueryResult(
-            embedding=result.embeddings[0] if result.embeddings else self._zero_vector(),
-            usage=result.usage,
-        )
+        if self._query_cache is None:
+            return await self._embed_query(query)
+
+        cached = self._query_cache.get(self._model, self._dimensions, query)
+        if cached is not None:
+            return EmbeddingQueryResult(embedding=cached, usage=EmbeddingUsage(model=self._model))
+        result = await self._embed_query(query)
+        if any(result.embedding):
+            self._query_cache.set(self._model, self._dimensions, query, result.embedding)
+        return result
+
+    async def _embed_query(self, query: str) -> EmbeddingQueryResult:
+        if self._query_batch_window <= 0:
+            result = await self.embed_texts_with_usage([query])
+            return EmbeddingQueryResult(
+                embedding=result.embeddings[0] if result.embeddings else self._zero_vector(),
+                usage=result.usage,
+            )
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[EmbeddingQueryResult] = loop.create_future()
+        self._query_waiters.append((query, future))
+        if len(self._query_waiters) >= self._query_batch_size:
+            self._flush_queries()
+        elif self._query_timer is None:
+            self._query_timer = loop.call_later(self._query_batch_window, self._flush_queries)
+        return await future
+
+    def _flush_queries(self) -> None:
+        if self._query_timer is not None:
+            self._query_timer.cancel()
+            self._query_timer = None
+        waiters, self._query_waiters = self._query_waiters, []
+        if waiters:
+            task = asyncio.get_running_loop().create_task(self._embed_query_batch(waiters))
+            self._query_batches.add(task)
+            task.add_done_callback(self._query_batches.discard)
+
+    async def _embed_query_batch(self, waiters: list[tuple[str, asyncio.Future[EmbeddingQueryResult]]]) -> None:
+        """Embed coalesced queries in one request and resolve each caller."""
+        queries = [query for query, _ in waiters]
+        try:
+            result = await self.embed_texts_with_usage(queries)
+        except Exception as exc:
+            for _, future in waiters:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        usages = _split_usage(result.usage, [self._tokens.count(query) for query in queries])
+        for (_, future), embedding, usage in zip(waiters, result.embeddings, usages, strict=True):
+            if not future.done():
+                future.set_result(EmbeddingQueryResult(embedding=embedding, usage=usage))
 
     async def close(self):
         await self._client.close()
+
+
+def _as_list(vector: Any) -> list[float]:
+    return vector.tolist() if isinstance(vector, np.ndarray) else vector
+
+
+def _apportion(total: int, weights: list[int]) -> list[int]:
+    """Split ``total`` in proportion to ``weights`` (largest remainder, sums exactly)."""
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        weights = [1] * len(weights)
+        weight_sum = len(weights)
+    exact = [total * w / weight_sum for w in weights]
+    shares = [int(x) for x in exact]
+    by_remainder = sorted(range(len(weights)), key=lambda i: exact[i] - shares[i], reverse=True)
+    for i in by_remainder[: total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def _split_usage(usage: EmbeddingUsage, weights: list[int]) -> list[EmbeddingUsage]:
+    prompt = _apportion(usage.prompt_tokens, weights)
+    total = _apportion(usage.total_tokens, weights)
+    return [
+        EmbeddingUsage(prompt_tokens=p, total_tokens=t, model=usage.model) for p, t in zip(prompt, total, strict=True)
+    ]
@@ -1,5 +1,18 @@
 """File text extraction modules."""
 
-from .router import ProgressCallback, extract_text
+from .checkpoint import InMemoryPageCheckpointStore, PageCheckpointStore, PageResult
+from .metadata import DocumentMetadata
+from .router import ExtractionResult, ProgressCallback, extract_document, extract_text
+from .source import FileSource
 
-__all__ = ["ProgressCallback", "extract_text"]
+__all__ = [
+    "DocumentMetadata",
+    "ExtractionResult",
+    "FileSource",
+    "InMemoryPageCheckpointStore",
+    "PageCheckpointStore",
+    "PageResult",
+    "ProgressCallback",
+    "extract_document",
+    "extract_text",
+]
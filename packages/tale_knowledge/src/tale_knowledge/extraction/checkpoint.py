@@ -0,0 +1,59 @@
+"""Page-level checkpoints for resumable PDF extraction.
+
+Extracting a large PDF can take many minutes of OCR and image-description
+calls. When a checkpoint store is passed to the PDF extractor, each page's
+result is saved as soon as it is done, keyed by ``(content_hash, page_index,
+extractor_version)``; a retried extraction of the same file loads the saved
+pages and only processes the ones that are missing.
+
+``extractor_version`` changes whenever a page would be extracted
+differently (a new extractor release, or vision on/off), so stale pages
+are never reused. This module provides the store interface and an
+in-process store; persistent stores (e.g. Postgres) live in the consuming
+services, which own their database connections.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol, runtime_checkable
+
+
+@dataclass(frozen=True, slots=True)
+class PageResult:
+    """Extracted content of one PDF page."""
+
+    content: str
+    vision_used: bool
+    is_scanned: bool
+
+
+@runtime_checkable
+class PageCheckpointStore(Protocol):
+    """Storage for per-page extraction results."""
+
+    async def load_pages(self, content_hash: str, extractor_version: str) -> dict[int, PageResult]:
+        """Return the saved pages of a file, by zero-based page index."""
+        ...
+
+    async def save_page(self, content_hash: str, extractor_version: str, page_index: int, page: PageResult) -> None:
+        """Save one extracted page."""
+        ...
+
+
+class InMemoryPageCheckpointStore:
+    """Process-local store (retries within one process, and tests)."""
+
+    def __init__(self) -> None:
+        self._pages: dict[tuple[str, str], dict[int, PageResult]] = {}
+
+    async def load_pages(self, content_hash: str, extractor_version: str) -> dict[int, PageResult]:
+        return dict(self._pages.get((content_hash, extractor_version), {}))
+
+    async def save_page(self, content_hash: str, extractor_version: str, page_index: int, page: PageResult) -> None:
+        self._pages.setdefault((content_hash, extractor_version), {})[page_index] = page
+
+    def discard(self, content_hash: str) -> None:
+        """Drop every saved page of a file (once it is fully ingested)."""
+        for key in [key for key in self._pages if key[0] == content_hash]:
+            del self._pages[key]
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import asyncio
 import zipfile
-from io import BytesIO
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from docx import Document
@@ -16,6 +16,8 @@ from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from loguru import logger
 
 from ._helpers import describe_image_bytes, extract_table_text
+from .metadata import DocumentMetadata, core_properties_metadata
+from .source import FileSource, open_source
 
 _WP_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 
@@ -25,6 +27,17 @@ if TYPE_CHECKING:
 MAX_UNCOMPRESSED_SIZE = 500 * 1024 * 1024  # 500 MB
 
 
+@dataclass(frozen=True, slots=True)
+class DocxExtractionResult:
+    """Result of a DOCX text extraction."""
+
+    text: str
+    vision_used: bool
+    # Element position indices where explicit page breaks occur
+    page_break_positions: list[int]
+    metadata: DocumentMetadata
+
+
 def _has_page_break(element) -> bool:
     """Detect explicit page breaks in a paragraph XML element.
 
@@ -43,7 +56,7 @@ def _has_page_break(element) -> bool:
 
 
 async def extract_text_from_docx_bytes(
-    docx_bytes: bytes,
+    docx_bytes: FileSource,
     filename: str = "document.docx",
     *,
     vision_client: VisionClient | None = None,
@@ -53,7 +66,7 @@ async def extract_text_from_docx_bytes(
     """Extract text from DOCX bytes with optional Vision support.
 
     Args:
-        docx_bytes: Raw DOCX bytes.
+        docx_bytes: Raw DOCX bytes or a path to the file.
         filename: Filename for logging.
         vision_client: Optional VisionClient for image description.
         process_images: Whether to extract and describe embedded images.
@@ -64,17 +77,36 @@ async def extract_text_from_docx_bytes(
         page_break_positions is a list of element position indices where
         explicit page breaks occur. The text output is not modified.
     """
+    result = await extract_docx(
+        docx_bytes,
+        filename,
+        vision_client=vision_client,
+        process_images=process_images,
+        max_concurrent=max_concurrent,
+    )
+    return result.text, result.vision_used, result.page_break_positions
+
+
+async def extract_docx(
+    docx_bytes: FileSource,
+    filename: str = "document.docx",
+    *,
+    vision_client: VisionClient | None = None,
+    process_images: bool = True,
+    max_concurrent: int = 3,
+) -> DocxExtractionResult:
+    """Like :func:`extract_text_from_docx_bytes`, plus the core properties of the same parse."""
     logger.info(f"Processing DOCX: {filename}")
 
     try:
-        with zipfile.ZipFile(BytesIO(docx_bytes)) as zf:
+        with zipfile.ZipFile(open_source(docx_bytes)) as zf:
             total = sum(info.file_size for info in zf.infolist())
             if total > MAX_UNCOMPRESSED_SIZE:
                 raise ValueError(f"File exceeds maximum decompressed size ({total} bytes)")
     except zipfile.BadZipFile as err:
         raise ValueError("Invalid or corrupt file") from err
 
-    doc = Document(BytesIO(docx_bytes))
+    doc = Document(open_source(docx_bytes))
     elements: list[tuple[int, str]] = []
     vision_used = False
     position = 0
@@ -184,4 +216,9 @@ async def extract_text_from_docx_bytes(
 
     logger.info(f"DOCX processing complete: {len(elements)} elements, Vision API used: {vision_used}")
 
-    return content, vision_used, page_break_positions
+    return DocxExtractionResult(
+        text=content,
+        vision_used=vision_used,
+        page_break_positions=page_break_positions,
+        metadata=core_properties_metadata(doc.core_properties),
+    )
@@ -11,6 +11,8 @@ from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from .source import FileSource, read_source
+
 if TYPE_CHECKING:
     from tale_knowledge.vision.client import VisionClient
 
@@ -29,7 +31,7 @@ MIN_OCR_TEXT_LENGTH = 20
 
 
 async def extract_text_from_image_bytes(
-    image_bytes: bytes,
+    image_bytes: FileSource,
     filename: str = "image",
     *,
     vision_client: VisionClient | None = None,
@@ -40,7 +42,7 @@ async def extract_text_from_image_bytes(
     generates a description of the image for indexing.
 
     Args:
-        image_bytes: Raw image bytes.
+        image_bytes: Raw image bytes or a path to the file.
         filename: Filename for logging.
         vision_client: VisionClient instance. If None, returns empty.
 
@@ -55,6 +57,7 @@ async def extract_text_from_image_bytes(
         return "", False
 
     logger.info(f"Processing image: {filename}")
+    image_bytes = read_source(image_bytes)
 
     try:
         ocr_text = await vision_client.ocr_image(image_bytes)
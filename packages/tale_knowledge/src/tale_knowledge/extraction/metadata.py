@@ -0,0 +1,121 @@
+"""Document metadata read by the extractors from the file they already parsed.
+
+Each extractor fills a :class:`DocumentMetadata` from the document object it
+opened for the text (PDF info dictionary, OOXML core properties), so callers
+get dates, page count, title and author without opening the file again.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import re
+from dataclasses import dataclass
+from typing import Any
+
+_PDF_DATE_RE = re.compile(
+    r"^(?:D:)?"
+    r"(\d{4})"
+    r"(\d{2})?"
+    r"(\d{2})?"
+    r"(\d{2})?"
+    r"(\d{2})?"
+    r"(\d{2})?"
+    r"([Z+\-])?"
+    r"(\d{2})?'?"
+    r"(\d{2})?'?"
+)
+
+_MIN_YEAR = 1970
+_MAX_YEAR = 2100
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentMetadata:
+    """Properties a document declares about itself; None when it does not."""
+
+    created_at: dt.datetime | None = None
+    modified_at: dt.datetime | None = None
+    # Pages (PDF) or slides (PPTX); None for formats without a fixed layout
+    page_count: int | None = None
+    title: str | None = None
+    author: str | None = None
+
+
+def parse_pdf_date(date_str: str | None) -> dt.datetime | None:
+    """Parse PDF date format ``D:YYYYMMDDHHmmSSOHH'mm'`` to a datetime.
+
+    Returns ``None`` for missing, malformed, or out-of-range dates.
+    """
+    if not date_str or not isinstance(date_str, str):
+        return None
+
+    match = _PDF_DATE_RE.match(date_str.strip())
+    if not match:
+        return None
+
+    try:
+        year = int(match.group(1))
+        if year < _MIN_YEAR or year > _MAX_YEAR:
+            return None
+
+        month = int(match.group(2) or "01")
+        day = int(match.group(3) or "01")
+        hour = int(match.group(4) or "00")
+        minute = int(match.group(5) or "00")
+        second = int(match.group(6) or "00")
+
+        tz_sign = match.group(7)
+        tz_hours = int(match.group(8) or "0")
+        tz_minutes = int(match.group(9) or "0")
+
+        if tz_sign == "-":
+            tz_offset = dt.timezone(dt.timedelta(hours=-tz_hours, minutes=-tz_minutes))
+        elif tz_sign == "+":
+            tz_offset = dt.timezone(dt.timedelta(hours=tz_hours, minutes=tz_minutes))
+        else:
+            tz_offset = dt.UTC
+
+        return dt.datetime(year, month, day, hour, minute, second, tzinfo=tz_offset)
+    except (ValueError, OverflowError):
+        return None
+
+
+def ensure_aware(d: dt.datetime | None) -> dt.datetime | None:
+    """Ensure a datetime is timezone-aware (assume UTC if naive)."""
+    if d is None:
+        return None
+    if not isinstance(d, dt.datetime):
+        return None
+    if d.tzinfo is None:
+        return d.replace(tzinfo=dt.UTC)
+    return d
+
+
+def _text_or_none(value: Any) -> str | None:
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+def pdf_metadata(info: dict[str, Any] | None, page_count: int) -> DocumentMetadata:
+    """Metadata from a PyMuPDF ``Document.metadata`` dictionary."""
+    info = info or {}
+    return DocumentMetadata(
+        created_at=parse_pdf_date(info.get("creationDate")),
+        modified_at=parse_pdf_date(info.get("modDate")),
+        page_count=page_count,
+        title=_text_or_none(info.get("title")),
+        author=_text_or_none(info.get("author")),
+    )
+
+
+def core_properties_metadata(props: Any, page_count: int | None = None) -> DocumentMetadata:
+    """Metadata from OOXML core properties (python-docx, python-pptx, openpyxl)."""
+    return DocumentMetadata(
+        created_at=ensure_aware(getattr(props, "created", None)),
+        modified_at=ensure_aware(getattr(props, "modified", None)),
+        page_count=page_count,
+        title=_text_or_none(getattr(props, "title", None)),
+        # openpyxl calls the author "creator"
+        author=_text_or_none(getattr(props, "author", None) or getattr(props, "creator", None)),
+    )
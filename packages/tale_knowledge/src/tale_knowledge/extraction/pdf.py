@@ -10,13 +10,18 @@ Scanned page detection:
   covering > LARGE_IMAGE_RATIO of the page area.
 - The extraction result includes `scanned_pages_detected` and `ocr_applied`
   so callers can inform the user about OCR activity.
+
+Resumable extraction:
+- With a `PageCheckpointStore` and the file's content hash, every finished
+  page is saved and a retried extraction skips the pages already saved.
 """
 
 from __future__ import annotations
 
 import asyncio
+import os
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import partial
 from typing import TYPE_CHECKING
 
@@ -24,6 +29,9 @@ import fitz  # PyMuPDF
 from loguru import logger
 
 from ._helpers import MIN_IMAGE_SIZE
+from .checkpoint import PageCheckpointStore, PageResult
+from .metadata import DocumentMetadata, pdf_metadata
+from .source import FileSource
 
 if TYPE_CHECKING:
     from tale_knowledge.vision.client import VisionClient
@@ -34,6 +42,8 @@ LARGE_IMAGE_RATIO = 0.5
 SCANNED_PAGE_TEXT_THRESHOLD = 50
 MAX_PAGES = 2000
 DEFAULT_PAGE_CONCURRENCY = 8
+# Bump when page output changes, so saved checkpoints are not reused.
+PDF_EXTRACTOR_VERSION = "1"
 
 
 @dataclass(frozen=True, slots=True)
@@ -44,6 +54,7 @@ class PdfExtractionResult:
     vision_used: bool
     scanned_pages_detected: int
     ocr_applied: bool
+    metadata: DocumentMetadata = field(default_factory=DocumentMetadata)
 
 
 def _extract_page_text_sync(page_bytes: bytes) -> dict:
@@ -94,6 +105,13 @@ def _extract_page_text_sync(page_bytes: bytes) -> dict:
         doc.close()
 
 
+def open_pdf(source: FileSource) -> fitz.Document:
+    """Open a PDF from bytes, or from a path so MuPDF reads it from disk on demand."""
+    if isinstance(source, os.PathLike):
+        return fitz.open(os.fspath(source), filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
 def _serialize_page(doc: fitz.Document, page_num: int) -> bytes:
     """Serialize a single page to its own PDF bytes for thread-safe processing."""
     single = fitz.open()
@@ -110,14 +128,15 @@ async def _extract_page_with_layout(
     vision_semaphore: asyncio.Semaphore,
     vision_client: VisionClient | None,
     process_images: bool,
-) -> tuple[str, bool, bool]:
+) -> tuple[PageResult, bool]:
     """Extract page content preserving text and image positions.
 
     Images covering >50% of the page area are OCR'd (likely scanned pages),
     smaller images are described.
 
     Returns:
-        Tuple of (content, vision_used, is_scanned_page).
+        Tuple of (page, complete); ``complete`` is False when an image
+        could not be processed, so the page must not be checkpointed.
     """
     loop = asyncio.get_running_loop()
 
@@ -126,6 +145,7 @@ async def _extract_page_with_layout(
     images: list[tuple[float, bytes, float]] = text_data["images"]
     total_text_len: int = text_data["total_text_len"]
     vision_used = False
+    complete = True
 
     has_large_image = any(area_ratio > LARGE_IMAGE_RATIO for _, _, area_ratio in images)
     is_scanned_page = total_text_len < SCANNED_PAGE_TEXT_THRESHOLD and has_large_image
@@ -153,34 +173,41 @@ async def _extract_page_with_layout(
                             vision_used = True
             except Exception as e:
                 logger.warning(f"Failed to process image on page {page_num + 1}: {e}")
+                complete = False
 
     elements.sort(key=lambda x: x[0])
     content = "\n\n".join(elem[1] for elem in elements)
-    return content, vision_used, is_scanned_page
+    return PageResult(content, vision_used, is_scanned_page), complete
 
 
 async def extract_text_from_pdf_bytes(
-    pdf_bytes: bytes,
+    pdf_bytes: FileSource,
     filename: str = "document.pdf",
     *,
     vision_client: VisionClient | None = None,
     process_images: bool = True,
     max_pages: int = MAX_PAGES,
     on_progress: ProgressCallback | None = None,
+    checkpoints: PageCheckpointStore | None = None,
+    content_hash: str | None = None,
 ) -> PdfExtractionResult:
     """Extract text from PDF bytes.
 
     Args:
-        pdf_bytes: Raw PDF bytes.
+        pdf_bytes: Raw PDF bytes, or a path (MuPDF then reads pages from the file on demand).
         filename: Filename for logging.
         vision_client: Optional VisionClient for OCR/image description.
         process_images: Whether to extract and describe embedded images.
         max_pages: Maximum number of pages to process.
         on_progress: Optional callback ``(pages_done, total_pages)`` invoked
             after each page completes.  Safe to call from concurrent tasks.
+        checkpoints: Optional store for per-page results; used together with
+            ``content_hash`` to resume a previously interrupted extraction.
+        content_hash: SHA-256 of the file, the checkpoint key.
 
     Returns:
-        PdfExtractionResult with text, vision_used, scanned_pages_detected, and ocr_applied.
+        PdfExtractionResult with text, vision_used, scanned_pages_detected,
+        ocr_applied, and the document's metadata (read from the same open).
     """
     logger.info(f"Processing PDF: {filename}")
 
@@ -190,10 +217,19 @@ async def extract_text_from_pdf_bytes(
 
     loop = asyncio.get_running_loop()
 
-    doc = await loop.run_in_executor(None, partial(fitz.open, stream=pdf_bytes, filetype="pdf"))
+    # Pages extracted without vision differ from pages extracted with it
+    extractor_version = f"{PDF_EXTRACTOR_VERSION}:{'vision' if vision_client and process_images else 'text'}"
+    saved: dict[int, PageResult] = {}
+    if checkpoints is not None and content_hash is not None:
+        saved = await _load_checkpoints(checkpoints, content_hash, extractor_version)
+        if saved:
+            logger.info(f"Resuming PDF '{filename}': {len(saved)} page(s) already extracted")
+
+    doc = await loop.run_in_executor(None, partial(open_pdf, pdf_bytes))
     try:
         total_pages = len(doc)
         pages_to_process = min(total_pages, max_pages)
+        metadata = pdf_metadata(doc.metadata, total_pages)
 
         if total_pages > max_pages:
             logger.warning(
@@ -203,35 +239,37 @@ async def extract_text_from_pdf_bytes(
 
         page_data: list[tuple[int, bytes]] = []
         for i in range(pages_to_process):
+            if i in saved:
+                continue
             page_bytes = await loop.run_in_executor(None, partial(_serialize_page, doc, i))
             page_data.append((i, page_bytes))
     finally:
         doc.close()
 
-    pages_done = 0
+    resumed = [(page_num, page) for page_num, page in saved.items() if page_num < pages_to_process]
+    pages_done = len(resumed)
+    if pages_done and on_progress is not None:
+        on_progress(pages_done, pages_to_process)
 
-    async def process_page(page_num: int, page_bytes: bytes) -> tuple[int, str, bool, bool]:
+    async def process_page(page_num: int, page_bytes: bytes) -> tuple[int, PageResult]:
         nonlocal pages_done
         async with page_semaphore:
-            content, vis_used, is_scanned = await _extract_page_with_layout(
+            page, complete = await _extract_page_with_layout(
                 page_bytes,
                 page_num,
                 vision_semaphore,
                 vision_client,
                 process_images,
             )
+            if checkpoints is not None and content_hash is not None and complete:
+                await _save_checkpoint(checkpoints, content_hash, extractor_version, page_num, page)
             pages_done += 1
             if on_progress is not None:
                 on_progress(pages_done, pages_to_process)
-            return (
-                page_num,
-                f"--- Page {page_num + 1} ---\n{content}",
-                vis_used,
-                is_scanned,
-            )
+            return page_num, page
 
     tasks = [process_page(pn, pb) for pn, pb in page_data]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    results = [*resumed, *await asyncio.gather(*tasks, return_exceptions=True)]
 
     pages_content: list[tuple[int, str]] = []
     vision_used = False
@@ -242,13 +280,13 @@ async def extract_text_from_pdf_bytes(
         if isinstance(result, Exception):
             logger.warning(f"Page processing failed: {result}")
             continue
-        page_num, content, page_vision_used, page_is_scanned = result
-        pages_content.append((page_num, content))
-        if page_vision_used:
+        page_num, page = result
+        pages_content.append((page_num, f"--- Page {page_num + 1} ---\n{page.content}"))
+        if page.vision_used:
             vision_used = True
-        if page_is_scanned:
+        if page.is_scanned:
             scanned_pages_detected += 1
-            if page_vision_used:
+            if page.vision_used:
                 ocr_applied = True
 
     pages_content.sort(key=lambda x: x[0])
@@ -271,4 +309,24 @@ async def extract_text_from_pdf_bytes(
         vision_used=vision_used,
         scanned_pages_detected=scanned_pages_detected,
         ocr_applied=ocr_applied,
+        metadata=metadata,
     )
+
+
+async def _load_checkpoints(
+    checkpoints: PageCheckpointStore, content_hash: str, extractor_version: str
+) -> dict[int, PageResult]:
+    try:
+        return await checkpoints.load_pages(content_hash, extractor_version)
+    except Exception as e:
+        logger.warning(f"Could not load PDF page checkpoints, extracting every page: {e}")
+        return {}
+
+
+async def _save_checkpoint(
+    checkpoints: PageCheckpointStore, content_hash: str, extractor_version: str, page_num: int, page: PageResult
+) -> None:
+    try:
+        await checkpoints.save_page(content_hash, extractor_version, page_num, page)
+    except Exception as e:
+        logger.warning(f"Could not checkpoint page {page_num + 1}: {e}")
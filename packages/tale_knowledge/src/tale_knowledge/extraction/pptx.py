@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import asyncio
 import zipfile
-from io import BytesIO
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from loguru import logger
@@ -16,6 +16,8 @@ from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
 from ._helpers import describe_image_bytes, extract_table_text
+from .metadata import DocumentMetadata, core_properties_metadata
+from .source import FileSource, open_source
 
 if TYPE_CHECKING:
     from tale_knowledge.vision.client import VisionClient
@@ -23,6 +25,15 @@ if TYPE_CHECKING:
 MAX_UNCOMPRESSED_SIZE = 500 * 1024 * 1024  # 500 MB
 
 
+@dataclass(frozen=True, slots=True)
+class PptxExtractionResult:
+    """Result of a PPTX text extraction."""
+
+    text: str
+    vision_used: bool
+    metadata: DocumentMetadata
+
+
 def _iter_shapes(shapes):
     """Recursively yield all shapes, descending into groups."""
     for shape in shapes:
@@ -91,7 +102,7 @@ async def _process_slide(
 
 
 async def extract_text_from_pptx_bytes(
-    pptx_bytes: bytes,
+    pptx_bytes: FileSource,
     filename: str = "presentation.pptx",
     *,
     vision_client: VisionClient | None = None,
@@ -101,7 +112,7 @@ async def extract_text_from_pptx_bytes(
     """Extract text from PPTX bytes with optional Vision support.
 
     Args:
-        pptx_bytes: Raw PPTX bytes.
+        pptx_bytes: Raw PPTX bytes or a path to the file.
         filename: Filename for logging.
         vision_client: Optional VisionClient for image description.
         process_images: Whether to extract and describe embedded images.
@@ -110,17 +121,36 @@ async def extract_text_from_pptx_bytes(
     Returns:
         Tuple of (extracted_text, vision_was_used).
     """
+    result = await extract_pptx(
+        pptx_bytes,
+        filename,
+        vision_client=vision_client,
+        process_images=process_images,
+        max_concurrent=max_concurrent,
+    )
+    return result.text, result.vision_used
+
+
+async def extract_pptx(
+    pptx_bytes: FileSource,
+    filename: str = "presentation.pptx",
+    *,
+    vision_client: VisionClient | None = None,
+    process_images: bool = True,
+    max_concurrent: int = 3,
+) -> PptxExtractionResult:
+    """Like :func:`extract_text_from_pptx_bytes`, plus the core properties and slide count."""
     logger.info(f"Processing PPTX: {filename}")
 
     try:
-        with zipfile.ZipFile(BytesIO(pptx_bytes)) as zf:
+        with zipfile.ZipFile(open_source(pptx_bytes)) as zf:
             total = sum(info.file_size for info in zf.infolist())
             if total > MAX_UNCOMPRESSED_SIZE:
                 raise ValueError(f"File exceeds maximum decompressed size ({total} bytes)")
     except zipfile.BadZipFile as err:
         raise ValueError("Invalid or corrupt file") from err
 
-    prs = Presentation(BytesIO(pptx_bytes))
+    prs = Presentation(open_source(pptx_bytes))
     semaphore = asyncio.Semaphore(max_concurrent)
 
     tasks = [
@@ -145,4 +175,8 @@ async def extract_text_from_pptx_bytes(
 
     logger.info(f"PPTX processing complete: {len(slides_content)} slides, Vision API used: {vision_used}")
 
-    return combined_text, vision_used
+    return PptxExtractionResult(
+        text=combined_text,
+        vision_used=vision_used,
+        metadata=core_properties_metadata(prs.core_properties, page_count=len(prs.slides)),
+    )
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from .checkpoint import PageCheckpointStore
 from .image import SUPPORTED_IMAGE_EXTENSIONS
+from .metadata import DocumentMetadata
+from .source import FileSource
 from .text import SUPPORTED_TEXT_EXTENSIONS
 
 if TYPE_CHECKING:
@@ -37,26 +41,72 @@ def is_supported(filename: str) -> bool:
 ProgressCallback = Callable[[int, int], None]
 
 
+@dataclass(frozen=True, slots=True)
+class ExtractionResult:
+    """Text of a file and the metadata read from the same parse."""
+
+    text: str
+    vision_used: bool
+    metadata: DocumentMetadata = field(default_factory=DocumentMetadata)
+
+
 async def extract_text(
-    file_bytes: bytes,
+    file_bytes: FileSource,
     filename: str,
     *,
     vision_client: VisionClient | None = None,
     process_images: bool = True,
     on_progress: ProgressCallback | None = None,
+    checkpoints: PageCheckpointStore | None = None,
+    content_hash: str | None = None,
 ) -> tuple[str, bool]:
-    """Extract text from file bytes, routing to the correct extractor.
+    """Extract text from file bytes; :func:`extract_document` without the metadata.
+
+    Returns:
+        Tuple of (extracted_text, vision_was_used).
+    """
+    result = await extract_document(
+        file_bytes,
+        filename,
+        vision_client=vision_client,
+        process_images=process_images,
+        on_progress=on_progress,
+        checkpoints=checkpoints,
+        content_hash=content_hash,
+    )
+    return result.text, result.vision_used
+
+
+async def extract_document(
+    file_bytes: FileSource,
+    filename: str,
+    *,
+    vision_client: VisionClient | None = None,
+    process_images: bool = True,
+    on_progress: ProgressCallback | None = None,
+    checkpoints: PageCheckpointStore | None = None,
+    content_hash: str | None = None,
+) -> ExtractionResult:
+    """Extract text and document metadata from file bytes, routing to the correct extractor.
+
+    Every file is opened once: dates, page count, title and author come
+    from the same parse as the text (formats without such properties, like
+    plain text and images, get an empty :class:`DocumentMetadata`).
 
     Args:
-        file_bytes: Raw file bytes.
+        file_bytes: Raw file bytes, or the path of the file on disk.
         filename: Original filename (used to determine file type).
         vision_client: Optional VisionClient for OCR/image description.
         process_images: Whether to extract and describe embedded images.
         on_progress: Optional callback ``(done, total)`` for page-level progress
             (currently only used by PDF extraction).
+        checkpoints: Optional per-page checkpoint store, keyed by
+            ``content_hash``, so a retried PDF extraction resumes where the
+            previous attempt stopped.
+        content_hash: SHA-256 of the file (required for checkpointing).
 
     Returns:
-        Tuple of (extracted_text, vision_was_used).
+        ExtractionResult with the text, whether vision was used, and the metadata.
 
     Raises:
         ValueError: If the file type is not supported.
@@ -73,48 +123,54 @@ async def extract_text(
             vision_client=vision_client,
             process_images=process_images,
             on_progress=on_progress,
+            checkpoints=checkpoints,
+            content_hash=content_hash,
         )
-        return result.text, result.vision_used
+        return ExtractionResult(result.text, result.vision_used, result.metadata)
 
     if suffix in DOCX_EXTENSIONS:
-        from .docx import extract_text_from_docx_bytes
+        from .docx import extract_docx
 
-        text, vision_used, _page_breaks = await extract_text_from_docx_bytes(
+        docx = await extract_docx(
             file_bytes,
             filename,
             vision_client=vision_client,
             process_images=process_images,
         )
-        return text, vision_used
+        return ExtractionResult(docx.text, docx.vision_used, docx.metadata)
 
     if suffix in PPTX_EXTENSIONS:
-        from .pptx import extract_text_from_pptx_bytes
+        from .pptx import extract_pptx
 
-        return await extract_text_from_pptx_bytes(
+        pptx = await extract_pptx(
             file_bytes,
             filename,
             vision_client=vision_client,
             process_images=process_images,
         )
+        return ExtractionResult(pptx.text, pptx.vision_used, pptx.metadata)
 
     if suffix in XLSX_EXTENSIONS:
-        from .xlsx import extract_text_from_xlsx_bytes
+        from .xlsx import extract_xlsx
 
-        return await extract_text_from_xlsx_bytes(file_bytes, filename)
+        xlsx = await extract_xlsx(file_bytes, filename)
+        return ExtractionResult(xlsx.text, False, xlsx.metadata)
 
     if suffix in SUPPORTED_IMAGE_EXTENSIONS:
         from .image import extract_text_from_image_bytes
 
-        return await extract_text_from_image_bytes(
+        text, vision_used = await extract_text_from_image_bytes(
             file_bytes,
             filename,
             vision_client=vision_client,
         )
+        return ExtractionResult(text, vision_used)
 
     if suffix in SUPPORTED_TEXT_EXTENSIONS:
         from .text import extract_text_from_text_bytes
 
-        return await extract_text_from_text_bytes(file_bytes, filename)
+        text, vision_used = await extract_text_from_text_bytes(file_bytes, filename)
+        return ExtractionResult(text, vision_used)
 
     logger.warning(f"Unsupported file type: {suffix}")
     raise ValueError(f"Unsupported file type: {suffix}")
@@ -0,0 +1,29 @@
+"""File inputs for the extractors: in-memory bytes or a path on disk.
+
+Large uploads are spooled to disk by the consuming service; passing the
+path lets each parser read the file itself instead of the whole upload
+being held as one ``bytes`` object.
+"""
+
+from __future__ import annotations
+
+import os
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+
+FileSource = bytes | os.PathLike[str]
+
+
+def open_source(source: FileSource) -> BinaryIO | str:
+    """Argument for parsers that take a filename or a binary file object."""
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    return BytesIO(source)
+
+
+def read_source(source: FileSource) -> bytes:
+    """Whole content, for formats that are parsed in memory anyway (text, images)."""
+    if isinstance(source, os.PathLike):
+        return Path(source).read_bytes()
+    return source
@@ -5,6 +5,8 @@ Simple UTF-8 text reading — no Vision API needed.
 
 from loguru import logger
 
+from .source import FileSource, read_source
+
 SUPPORTED_TEXT_EXTENSIONS = {
     # Text / markup
     ".txt",
@@ -81,19 +83,20 @@ SUPPORTED_TEXT_EXTENSIONS = {
 
 
 async def extract_text_from_text_bytes(
-    text_bytes: bytes,
+    text_bytes: FileSource,
     filename: str = "document.txt",
 ) -> tuple[str, bool]:
     """Extract text from plain text bytes.
 
     Args:
-        text_bytes: Raw file bytes.
+        text_bytes: Raw file bytes or a path to the file.
         filename: Filename for logging.
 
     Returns:
         Tuple of (extracted_text, vision_was_used). Vision is never used.
     """
     logger.info(f"Processing text file: {filename}")
+    text_bytes = read_source(text_bytes)
     try:
         text = text_bytes.decode("utf-8")
     except UnicodeDecodeError:
@@ -4,31 +4,51 @@ Converts spreadsheet rows into plain text for indexing.
 """
 
 import zipfile
-from io import BytesIO
+from dataclasses import dataclass
 
 from loguru import logger
 from openpyxl import load_workbook
 
+from .metadata import DocumentMetadata, core_properties_metadata
+from .source import FileSource, open_source
+
 MAX_UNCOMPRESSED_SIZE = 500 * 1024 * 1024  # 500 MB
 
 
+@dataclass(frozen=True, slots=True)
+class XlsxExtractionResult:
+    """Result of an XLSX text extraction."""
+
+    text: str
+    metadata: DocumentMetadata
+
+
 async def extract_text_from_xlsx_bytes(
-    xlsx_bytes: bytes,
+    xlsx_bytes: FileSource,
     filename: str = "spreadsheet.xlsx",
 ) -> tuple[str, bool]:
     """Extract text from XLSX bytes.
 
     Args:
-        xlsx_bytes: Raw XLSX bytes.
+        xlsx_bytes: Raw XLSX bytes or a path to the file.
         filename: Filename for logging.
 
     Returns:
         Tuple of (extracted_text, vision_was_used). Vision is never used for XLSX.
     """
+    result = await extract_xlsx(xlsx_bytes, filename)
+    return result.text, False
+
+
+async def extract_xlsx(
+    xlsx_bytes: FileSource,
+    filename: str = "spreadsheet.xlsx",
+) -> XlsxExtractionResult:
+    """Like :func:`extract_text_from_xlsx_bytes`, plus the workbook's core properties."""
     logger.info(f"Processing XLSX: {filename}")
 
     try:
-        zf = zipfile.ZipFile(BytesIO(xlsx_bytes))
+        zf = zipfile.ZipFile(open_source(xlsx_bytes))
         total = sum(info.file_size for info in zf.infolist())
         if total > MAX_UNCOMPRESSED_SIZE:
             raise ValueError(f"File exceeds maximum decompressed size ({total} bytes)")
@@ -36,8 +56,9 @@ async def extract_text_from_xlsx_bytes(
     except zipfile.BadZipFile as err:
         raise ValueError("Invalid or corrupt file") from err
 
-    wb = load_workbook(BytesIO(xlsx_bytes), read_only=True, data_only=True)
+    wb = load_workbook(open_source(xlsx_bytes), read_only=True, data_only=True)
     try:
+        metadata = core_properties_metadata(wb.properties)
         sheets_text: list[str] = []
 
         for sheet_name in wb.sheetnames:
@@ -61,4 +82,4 @@ async def extract_text_from_xlsx_bytes(
     combined_text = "\n\n".join(sheets_text)
     logger.info(f"XLSX processing complete: {len(sheets_text)} sheets, {len(combined_text)} chars")
 
-    return combined_text, False
+    return XlsxExtractionResult(text=combined_text, metadata=metadata)
@@ -1,5 +1,6 @@
 """Search retrieval utilities."""
 
+from .prefix_index import PrefixIndex, VectorIndexMode, candidate_limit, prefix_index_for
 from .rrf import merge_rrf
 
-__all__ = ["merge_rrf"]
+__all__ = ["PrefixIndex", "VectorIndexMode", "candidate_limit", "merge_rrf", "prefix_index_for"]
@@ -0,0 +1,101 @@
+"""Truncated, quantized vector prefixes for the ANN candidate stage.
+
+Matryoshka-trained embedding models (OpenAI ``text-embedding-3-*``, Nomic,
+BGE-M3, ...) front-load information into the leading dimensions, so a
+re-normalized prefix of each vector is a good proxy for the whole vector.
+Indexing only that prefix — as ``halfvec`` or sign-quantized into ``bit`` —
+shrinks the HNSW graph several-fold and makes each distance cheaper. The
+full-precision column stays in the heap and rescores the candidates, so the
+scores callers see are still exact cosine similarities.
+
+The index is a pgvector expression index; no extra column or backfill::
+
+    CREATE INDEX ... USING hnsw
+        ((l2_normalize(subvector(embedding, 1, 512))::halfvec(512)) halfvec_ip_ops)
+
+Prefixes are re-normalized so the cheaper inner-product operator ranks them
+exactly like cosine distance. pgvector has no int8 vector type; ``halfvec``
+(16-bit) and ``bit`` (1-bit, Hamming distance) are the compressed types HNSW
+can index.
+
+This module only builds SQL fragments — consumers own their connections.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+VectorIndexMode = Literal["full", "halfvec", "bit"]
+
+RESCORE_FACTOR = 4
+# pgvector caps hnsw.ef_search at 1000
+MAX_EF_SEARCH = 1000
+
+_OPS = {
+    "halfvec": ("halfvec_ip_ops", "<#>"),
+    "bit": ("bit_hamming_ops", "<~>"),
+}
+
+
+@dataclass(frozen=True)
+class PrefixIndex:
+    """HNSW index over the first ``dimensions`` components of a vector column."""
+
+    mode: Literal["halfvec", "bit"]
+    dimensions: int
+
+    def __post_init__(self) -> None:
+        if self.mode not in _OPS:
+            raise ValueError(f"Unknown prefix index mode {self.mode!r}; expected one of {', '.join(_OPS)}")
+        if self.dimensions < 1:
+            raise ValueError("Prefix index dimensions must be positive")
+
+    @property
+    def opclass(self) -> str:
+        return _OPS[self.mode][0]
+
+    @property
+    def operator(self) -> str:
+        return _OPS[self.mode][1]
+
+    def expression(self, operand: str) -> str:
+        """Prefix expression for a column or a ``$n::vector`` parameter.
+
+        The column side must be spelled exactly like the index definition
+        for the planner to use the index.
+        """
+        prefix = f"subvector({operand}, 1, {self.dimensions})"
+        if self.mode == "bit":
+            return f"binary_quantize({prefix})::bit({self.dimensions})"
+        return f"l2_normalize({prefix})::halfvec({self.dimensions})"
+
+    def distance(self, column: str, query: str) -> str:
+        """``ORDER BY`` key for the candidate stage."""
+        return f"({self.expression(column)}) {self.operator} ({self.expression(query)})"
+
+    def index_name(self, base: str) -> str:
+        """Index name that changes with the mode and width, e.g. ``<base>_halfvec512_hnsw``."""
+        return f"{base}_{self.mode}{self.dimensions}_hnsw"
+
+    def index_method(self, column: str = "embedding", *, m: int = 16, ef_construction: int = 64) -> str:
+        """``USING ...`` clause for ``CREATE INDEX``."""
+        return (
+            f"USING hnsw (({self.expression(column)}) {self.opclass}) "
+            f"WITH (m = {m}, ef_construction = {ef_construction})"
+        )
+
+
+def prefix_index_for(mode: VectorIndexMode, dimensions: int, embedding_dimensions: int) -> PrefixIndex | None:
+    """Resolve settings to a :class:`PrefixIndex`, or None for full-precision search.
+
+    The prefix is clamped to the embedding width.
+    """
+    if mode == "full":
+        return None
+    return PrefixIndex(mode, min(dimensions, embedding_dimensions))
+
+
+def candidate_limit(limit: int, factor: int = RESCORE_FACTOR) -> int:
+    """Number of prefix candidates to rescore for a final ``limit``."""
+    return min(max(limit * factor, limit), MAX_EF_SEARCH)
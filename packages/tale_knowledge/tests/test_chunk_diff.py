@@ -0,0 +1,35 @@
+"""Tests for content-hash chunk diff planning."""
+
+from tale_knowledge.chunking import ChunkDiff, plan_chunk_diff
+
+
+class TestPlanChunkDiff:
+    def test_unchanged_chunks_reused_in_place(self):
+        diff = plan_chunk_diff([(1, 0, "a"), (2, 1, "b"), (3, 2, "c")], ["a", "B", "c"])
+
+        assert diff.deletes == [2]
+        assert diff.updates == [(1, 0), (3, 2)]
+        assert diff.inserts == [1]
+        assert diff.reused == 2
+
+    def test_inserted_chunk_shifts_positions(self):
+        diff = plan_chunk_diff([(1, 0, "a"), (2, 1, "b")], ["new", "a", "b"])
+
+        assert diff.deletes == []
+        assert diff.updates == [(1, 1), (2, 2)]
+        assert diff.inserts == [0]
+
+    def test_duplicate_content_prefers_same_position(self):
+        diff = plan_chunk_diff([(1, 0, "x"), (2, 1, "x"), (3, 2, "x")], ["x", "x"])
+
+        assert diff.updates == [(1, 0), (2, 1)]
+        assert diff.deletes == [3]
+
+    def test_rows_without_hash_not_reused(self):
+        diff = plan_chunk_diff([(1, 0, None)], ["a"])
+
+        assert diff.deletes == [1]
+        assert diff.inserts == [0]
+
+    def test_insert_all(self):
+        assert ChunkDiff.insert_all(3) == ChunkDiff(deletes=[], updates=[], inserts=[0, 1, 2])
@@ -0,0 +1,64 @@
+"""Tests for the process-pool chunking entry point."""
+
+from unittest.mock import patch
+
+import pytest
+
+from tale_knowledge.chunking import (
+    chunk_content,
+    chunk_content_async,
+    configure_chunk_pool,
+    offload,
+    shutdown_chunk_pool,
+)
+
+TEXT = ("# Heading\n\n" + "The quick brown fox jumps over the lazy dog. " * 60 + "\n\n") * 20
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    shutdown_chunk_pool()
+    yield
+    shutdown_chunk_pool()
+    configure_chunk_pool(offload.CHUNK_POOL_WORKERS)
+
+
+class TestChunkContentAsync:
+    @pytest.mark.asyncio
+    async def test_small_input_stays_inline(self):
+        with patch.object(offload, "_get_executor") as get_executor:
+            chunks = await chunk_content_async("short text", offload_threshold=1000)
+
+        get_executor.assert_not_called()
+        assert chunks == chunk_content("short text")
+
+    @pytest.mark.asyncio
+    async def test_large_input_matches_inline_result(self):
+        configure_chunk_pool(1)
+
+        chunks = await chunk_content_async(TEXT, chunk_size=500, chunk_overlap=50, offload_threshold=1000)
+
+        assert offload._executor is not None
+        assert chunks == chunk_content(TEXT, chunk_size=500, chunk_overlap=50)
+        assert "".join(c.core_content for c in chunks) == TEXT
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_falls_back_to_thread(self):
+        from concurrent.futures.process import BrokenProcessPool
+
+        class BrokenExecutor:
+            def submit(self, *_args, **_kwargs):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, **_kwargs):
+                pass
+
+        with patch.object(offload, "ProcessPoolExecutor", return_value=BrokenExecutor()):
+            chunks = await chunk_content_async(TEXT, chunk_size=500, chunk_overlap=50, offload_threshold=1000)
+
+        assert chunks == chunk_content(TEXT, chunk_size=500, chunk_overlap=50)
+        assert offload._executor is None
+
+    def test_rejects_empty_pool(self):
+        with pytest.raises(ValueError, match="at least one worker"):
+            configure_chunk_pool(0)
@@ -26,6 +26,13 @@ class TestExtractTextFromDocxBytes:
         assert "Hello World" in text
         assert vision_used is False
 
+    @pytest.mark.asyncio
+    async def test_extracts_from_path(self, tmp_path):
+        path = tmp_path / "doc.docx"
+        path.write_bytes(_make_simple_docx("From disk"))
+        text, _, _ = await extract_text_from_docx_bytes(path)
+        assert "From disk" in text
+
     @pytest.mark.asyncio
     async def test_multiple_paragraphs(self):
         from io import BytesIO
@@ -1,10 +1,14 @@
 """Tests for embedding service."""
 
+import asyncio
+import base64
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 from openai import APIConnectionError
 
+from tale_knowledge.embedding.limiter import AdaptiveConcurrencyLimiter
 from tale_knowledge.embedding.service import (
     MAX_BATCH_SIZE,
     EmbeddingService,
@@ -130,3 +134,234 @@ class TestEmbeddingService:
         svc._client.close = AsyncMock()
         await svc.close()
         svc._client.close.assert_awaited_once()
+
+
+def _b64(values: list[float]) -> str:
+    return base64.b64encode(np.asarray(values, dtype=np.float32).tobytes()).decode()
+
+
+class TestBase64Transport:
+    def _service(self) -> EmbeddingService:
+        svc = EmbeddingService(
+            api_key="test-key",
+            base_url="http://localhost:8080",
+            model="text-embedding-3-small",
+            dimensions=2,
+            encoding_format="base64",
+        )
+        svc._client = MagicMock()
+        svc._client.embeddings = MagicMock()
+        return svc
+
+    @pytest.mark.asyncio
+    async def test_array_api_returns_float32_matrix(self):
+        svc = self._service()
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(embedding=_b64([0.5, 0.25])), MagicMock(embedding=_b64([1.0, 2.0]))]
+        svc._client.embeddings.create = AsyncMock(return_value=mock_response)
+
+        result = await svc.embed_texts_array_with_usage(["a", "", "b"])
+
+        assert svc._client.embeddings.create.call_args.kwargs["encoding_format"] == "base64"
+        assert result.embeddings.dtype == np.float32
+        assert result.embeddings.flags.c_contiguous
+        np.testing.assert_array_equal(result.embeddings, [[0.5, 0.25], [0.0, 0.0], [1.0, 2.0]])
+
+    @pytest.mark.asyncio
+    async def test_list_api_still_returns_lists(self):
+        svc = self._service()
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(embedding=_b64([0.5, 0.25]))]
+        svc._client.embeddings.create = AsyncMock(return_value=mock_response)
+
+        assert await svc.embed_texts(["a"]) == [[0.5, 0.25]]
+        assert await svc.embed_query("a") == [0.5, 0.25]
+
+    @pytest.mark.asyncio
+    async def test_float_lists_are_accepted(self):
+        # Providers that ignore encoding_format still answer with floats.
+        svc = self._service()
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(embedding=[0.5, 0.25])]
+        svc._client.embeddings.create = AsyncMock(return_value=mock_response)
+
+        np.testing.assert_array_equal(await svc.embed_texts_array(["a"]), [[0.5, 0.25]])
+
+    @pytest.mark.asyncio
+    async def test_cached_rows_fill_matrix(self):
+        from tale_knowledge.embedding import InMemoryEmbeddingCache
+
+        svc = self._service()
+        svc._cache = InMemoryEmbeddingCache()
+        mock_response = MagicMock()
+        mock_response.data = [MagicMock(embedding=_b64([0.5, 0.25]))]
+        svc._client.embeddings.create = AsyncMock(return_value=mock_response)
+
+        first = await svc.embed_texts_array(["a"])
+        second = await svc.embed_texts_array(["a", "a"])
+
+        svc._client.embeddings.create.assert_awaited_once()
+        np.testing.assert_array_equal(second, np.vstack([first, first]))
+
+    @pytest.mark.asyncio
+    async def test_empty_input_returns_empty_matrix(self):
+        assert (await self._service().embed_texts_array([])).shape == (0, 2)
+
+
+class TestEmbedStream:
+    def _service(self) -> EmbeddingService:
+        svc = EmbeddingService(
+            api_key="test-key",
+            base_url="http://localhost:8080",
+            model="text-embedding-3-small",
+            dimensions=1,
+            limiter=AdaptiveConcurrencyLimiter(initial_limit=16),
+        )
+        svc._client = MagicMock()
+        svc._client.embeddings = MagicMock()
+        return svc
+
+    @pytest.mark.asyncio
+    async def test_yields_every_batch_with_offsets(self):
+        svc = self._service()
+
+        async def mock_create(**kwargs):
+            mock_response = MagicMock()
+            mock_response.data = [MagicMock(embedding=[float(t.split("-")[1])]) for t in kwargs["input"]]
+            return mock_response
+
+        svc._client.embeddings.create = mock_create
+        texts = [f"text-{i}" for i in range(7)]
+
+        received = np.full(7, -1.0, dtype=np.float32)
+        with patch("tale_knowledge.embedding.service.MAX_BATCH_SIZE", 2):
+            async for offset, vectors in svc.embed_stream(texts):
+                assert vectors.dtype == np.float32
+                received[offset : offset + len(vectors)] = vectors[:, 0]
+
+        np.testing.assert_array_equal(received, np.arange(7))
+
+    @pytest.mark.asyncio
+    async def test_bounds_batches_in_flight(self):
+        svc = self._service()
+        in_flight = 0
+        peak = 0
+
+        async def mock_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            mock_response = MagicMock()
+            mock_response.data = [MagicMock(embedding=[1.0]) for _ in kwargs["input"]]
+            return mock_response
+
+        svc._client.embeddings.create = mock_create
+        with patch("tale_knowledge.embedding.service.MAX_BATCH_SIZE", 1):
+            batches = [offset async for offset, _ in svc.embed_stream(["t"] * 10, max_pending=3)]
+
+        assert sorted(batches) == list(range(10))
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_pending_batches(self):
+        svc = self._service()
+        started = 0
+
+        async def mock_create(**kwargs):
+            nonlocal started
+            started += 1
+            if started > 1:
+                await asyncio.sleep(10)
+            mock_response = MagicMock()
+            mock_response.data = [MagicMock(embedding=[1.0]) for _ in kwargs["input"]]
+            return mock_response
+
+        svc._client.embeddings.create = mock_create
+        with patch("tale_knowledge.embedding.service.MAX_BATCH_SIZE", 1):
+            stream = svc.embed_stream(["a", "b", "c"])
+            await anext(stream)
+            await stream.aclose()
+
+        assert svc.limiter.in_flight == 0
+
+
+class TestQueryCoalescing:
+    def _service(self, **kwargs) -> EmbeddingService:
+        svc = EmbeddingService(
+            api_key="test-key",
+            base_url="http://localhost:8080",
+            model="text-embedding-3-small",
+            dimensions=1,
+            limiter=AdaptiveConcurrencyLimiter(initial_limit=16),
+            **kwargs,
+        )
+        svc._client = MagicMock()
+        svc._client.embeddings = MagicMock()
+        return svc
+
+    @staticmethod
+    def _echo_create(calls: list[list[str]]):
+        async def create(**kwargs):
+            calls.append(kwargs["input"])
+            response = MagicMock()
+            response.data = [MagicMock(embedding=[float(len(text))]) for text in kwargs["input"]]
+            response.usage = MagicMock(prompt_tokens=9, total_tokens=9)
+            return response
+
+        return create
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_request(self):
+        calls: list[list[str]] = []
+        svc = self._service(query_batch_window=0.01)
+        svc._client.embeddings.create = self._echo_create(calls)
+
+        results = await asyncio.gather(*(svc.embed_query_with_usage(q) for q in ["a", "bbb", "cc"]))
+
+        assert calls == [["a", "bbb", "cc"]]
+        assert [r.embedding for r in results] == [[1.0], [3.0], [2.0]]
+        assert sum(r.usage.prompt_tokens for r in results) == 9
+        assert sum(r.usage.total_tokens for r in results) == 9
+        assert all(r.usage.model == "text-embedding-3-small" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        calls: list[list[str]] = []
+        svc = self._service(query_batch_window=60.0, query_batch_size=2)
+        svc._client.embeddings.create = self._echo_create(calls)
+
+        results = await asyncio.wait_for(asyncio.gather(svc.embed_query("a"), svc.embed_query("b")), timeout=5)
+
+        assert results == [[1.0], [1.0]]
+        assert calls == [["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        calls: list[list[str]] = []
+        svc = self._service()
+        svc._client.embeddings.create = self._echo_create(calls)
+
+        await asyncio.gather(svc.embed_query("a"), svc.embed_query("b"))
+
+        assert sorted(calls) == [["a"], ["b"]]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        svc = self._service(query_batch_window=0.01)
+        svc._client.embeddings.create = AsyncMock(side_effect=ValueError("bad input"))
+
+        results = await asyncio.gather(svc.embed_query("a"), svc.embed_query("b"), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+class TestApportion:
+    def test_splits_proportionally_and_sums_exactly(self):
+        from tale_knowledge.embedding.service import _apportion
+
+        assert _apportion(10, [1, 1, 1]) == [4, 3, 3]
+        assert _apportion(9, [1, 2]) == [3, 6]
+        assert _apportion(5, [0, 0]) == [3, 2]
+        assert _apportion(0, [4, 2]) == [0, 0]
@@ -0,0 +1,104 @@
+"""Tests for token-budget-aware embedding batching."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tale_knowledge.embedding import EmbeddingService, TokenCounter, plan_batches
+from tale_knowledge.embedding.batching import CHARS_PER_TOKEN
+
+
+@pytest.fixture
+def heuristic_tokens():
+    """Force the character heuristic so tests don't depend on tiktoken data."""
+    with patch("tale_knowledge.embedding.batching._load_encoding", return_value=None):
+        yield
+
+
+def _make_service(**kwargs) -> EmbeddingService:
+    svc = EmbeddingService(
+        api_key="test-key",
+        base_url="http://localhost:8080",
+        model="text-embedding-3-small",
+        dimensions=1,
+        **kwargs,
+    )
+
+    async def mock_create(**kw):
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[float(len(text))]) for text in kw["input"]]
+        return response
+
+    svc._client = MagicMock()
+    svc._client.embeddings = MagicMock()
+    svc._client.embeddings.create = AsyncMock(side_effect=mock_create)
+    return svc
+
+
+class TestPlanBatches:
+    def test_empty(self):
+        assert plan_batches([], max_items=10, max_tokens=100) == []
+
+    def test_packs_by_token_budget(self):
+        assert plan_batches([40, 40, 40, 10], max_items=10, max_tokens=100) == [(0, 2), (2, 4)]
+
+    def test_packs_by_item_count(self):
+        assert plan_batches([1, 1, 1, 1, 1], max_items=2, max_tokens=100) == [(0, 2), (2, 4), (4, 5)]
+
+    def test_oversized_input_gets_own_batch(self):
+        assert plan_batches([10, 500, 10], max_items=10, max_tokens=100) == [(0, 1), (1, 2), (2, 3)]
+
+    def test_slices_tile_input(self):
+        counts = [7, 30, 2, 90, 1, 1, 64, 33]
+        batches = plan_batches(counts, max_items=3, max_tokens=100)
+        assert [i for start, end in batches for i in range(start, end)] == list(range(len(counts)))
+        assert all(end - start <= 3 for start, end in batches)
+
+
+class TestTokenCounter:
+    def test_heuristic_count(self, heuristic_tokens):
+        assert TokenCounter().count("a" * (CHARS_PER_TOKEN * 4 + 1)) == 5
+
+    def test_heuristic_truncate(self, heuristic_tokens):
+        text = "x" * 100
+        assert TokenCounter().truncate(text, 5) == text[: 5 * CHARS_PER_TOKEN]
+
+    def test_exact_truncate_fits(self):
+        counter = TokenCounter("text-embedding-3-small")
+        if not counter.exact:
+            pytest.skip("tiktoken encoding not available")
+        text = "The quick brown fox jumps over the lazy dog. " * 50
+        truncated = counter.truncate(text, 20)
+        assert text.startswith(truncated)
+        assert counter.count(truncated) <= 20
+
+
+class TestEmbeddingServiceBatching:
+    @pytest.mark.asyncio
+    async def test_requests_respect_token_ceiling(self, heuristic_tokens):
+        svc = _make_service(max_tokens_per_request=100, max_tokens_per_input=100)
+        texts = ["a" * (CHARS_PER_TOKEN * 40)] * 5
+
+        result = await svc.embed_texts(texts)
+
+        assert len(result) == 5
+        sizes = [len(c.kwargs["input"]) for c in svc._client.embeddings.create.call_args_list]
+        assert sizes == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_oversized_input_truncated(self, heuristic_tokens):
+        svc = _make_service(max_tokens_per_request=1000, max_tokens_per_input=10)
+
+        result = await svc.embed_texts(["b" * 500, "short"])
+
+        sent = svc._client.embeddings.create.call_args.kwargs["input"]
+        assert sent == ["b" * (10 * CHARS_PER_TOKEN), "short"]
+        assert result == [[float(10 * CHARS_PER_TOKEN)], [5.0]]
+
+    @pytest.mark.asyncio
+    async def test_small_inputs_share_one_request(self, heuristic_tokens):
+        svc = _make_service()
+
+        await svc.embed_texts([f"text {i}" for i in range(100)])
+
+        svc._client.embeddings.create.assert_awaited_once()
@@ -0,0 +1,140 @@
+"""Tests for the content-addressed embedding cache."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tale_knowledge.embedding import (
+    EmbeddingService,
+    InMemoryEmbeddingCache,
+    TieredEmbeddingCache,
+    compute_text_hash,
+)
+
+MODEL = "text-embedding-3-small"
+
+
+def _make_service(cache) -> EmbeddingService:
+    svc = EmbeddingService(
+        api_key="test-key",
+        base_url="http://localhost:8080",
+        model=MODEL,
+        dimensions=2,
+        cache=cache,
+    )
+
+    async def mock_create(**kwargs):
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[float(len(text)), 1.0]) for text in kwargs["input"]]
+        response.usage = MagicMock(prompt_tokens=len(kwargs["input"]), total_tokens=len(kwargs["input"]))
+        return response
+
+    svc._client = MagicMock()
+    svc._client.embeddings = MagicMock()
+    svc._client.embeddings.create = AsyncMock(side_effect=mock_create)
+    return svc
+
+
+class _FailingTier:
+    name = "broken"
+
+    async def get_many(self, model, dimensions, text_hashes):
+        raise RuntimeError("db down")
+
+    async def set_many(self, model, dimensions, entries):
+        raise RuntimeError("db down")
+
+
+class TestInMemoryEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_roundtrip(self):
+        cache = InMemoryEmbeddingCache()
+        await cache.set_many(MODEL, 2, {"h1": [0.5, 0.25]})
+        assert await cache.get_many(MODEL, 2, ["h1", "h2"]) == {"h1": [0.5, 0.25]}
+
+    @pytest.mark.asyncio
+    async def test_namespaced_by_model_and_dimensions(self):
+        cache = InMemoryEmbeddingCache()
+        await cache.set_many(MODEL, 2, {"h1": [0.5, 0.25]})
+        assert await cache.get_many(MODEL, 3, ["h1"]) == {}
+        assert await cache.get_many("other-model", 2, ["h1"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        cache = InMemoryEmbeddingCache(max_size=2)
+        await cache.set_many(MODEL, 2, {"a": [1.0, 0.0], "b": [2.0, 0.0]})
+        await cache.get_many(MODEL, 2, ["a"])
+        await cache.set_many(MODEL, 2, {"c": [3.0, 0.0]})
+        assert set(await cache.get_many(MODEL, 2, ["a", "b", "c"])) == {"a", "c"}
+
+
+class TestTieredEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_backfills_faster_tier(self):
+        memory = InMemoryEmbeddingCache()
+        persistent = InMemoryEmbeddingCache()
+        persistent.name = "postgres"
+        await persistent.set_many(MODEL, 2, {"h1": [1.0, 0.0]})
+
+        cache = TieredEmbeddingCache([memory, persistent])
+        assert await cache.get_many(MODEL, 2, ["h1", "h2"]) == {"h1": [1.0, 0.0]}
+        assert await memory.get_many(MODEL, 2, ["h1"]) == {"h1": [1.0, 0.0]}
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["postgres_hits"] == 1
+        assert stats["memory_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_tier_is_a_miss(self):
+        cache = TieredEmbeddingCache([_FailingTier(), InMemoryEmbeddingCache()])
+        await cache.set_many(MODEL, 2, {"h1": [1.0, 0.0]})
+        assert await cache.get_many(MODEL, 2, ["h1"]) == {"h1": [1.0, 0.0]}
+
+
+class TestEmbeddingServiceWithCache:
+    @pytest.mark.asyncio
+    async def test_only_misses_are_sent(self):
+        cache = TieredEmbeddingCache([InMemoryEmbeddingCache()])
+        await cache.set_many(MODEL, 2, {compute_text_hash("cached"): [9.0, 9.0]})
+        svc = _make_service(cache)
+
+        result = await svc.embed_texts_with_usage(["cached", "fresh", "fresh"])
+
+        assert result.embeddings == [[9.0, 9.0], [5.0, 1.0], [5.0, 1.0]]
+        svc._client.embeddings.create.assert_awaited_once()
+        assert svc._client.embeddings.create.call_args.kwargs["input"] == ["fresh"]
+        assert result.usage.prompt_tokens == 1
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self):
+        svc = _make_service(TieredEmbeddingCache([InMemoryEmbeddingCache()]))
+
+        first = await svc.embed_texts(["alpha", "beta"])
+        second = await svc.embed_texts(["beta", "alpha"])
+
+        assert second == [first[1], first[0]]
+        assert svc._client.embeddings.create.await_count == 1
+        assert svc.cache.get_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_blank_texts_bypass_cache(self):
+        svc = _make_service(TieredEmbeddingCache([InMemoryEmbeddingCache()]))
+
+        result = await svc.embed_texts(["  ", ""])
+
+        assert result == [[0.0, 0.0], [0.0, 0.0]]
+        svc._client.embeddings.create.assert_not_called()
+        assert svc.cache.get_stats()["misses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_zero_vectors_are_not_cached(self):
+        memory = InMemoryEmbeddingCache()
+        svc = _make_service(TieredEmbeddingCache([memory]))
+        empty_response = MagicMock()
+        empty_response.data = []
+        svc._client.embeddings.create = AsyncMock(return_value=empty_response)
+
+        assert await svc.embed_texts(["text"]) == [[0.0, 0.0]]
+        assert len(memory) == 0
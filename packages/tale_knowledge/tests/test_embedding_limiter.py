@@ -0,0 +1,135 @@
+"""Tests for the adaptive (AIMD) embedding concurrency limiter."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from tale_knowledge.embedding import AdaptiveConcurrencyLimiter, EmbeddingService, get_shared_limiter
+from tale_knowledge.embedding.limiter import parse_retry_after
+
+
+def _rate_limit_error(headers: dict[str, str]) -> RateLimitError:
+    request = httpx.Request("POST", "http://localhost/embeddings")
+    response = httpx.Response(429, headers=headers, request=request)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after({"retry-after": "2"}) == 2.0
+
+    def test_milliseconds_preferred(self):
+        assert parse_retry_after({"retry-after-ms": "250", "retry-after": "2"}) == 0.25
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after({}) is None
+        assert parse_retry_after({"retry-after": "soon"}) is None
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def test_additive_increase_on_stable_latency(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+        for _ in range(10):
+            limiter.record_success(0.1)
+        assert limiter.limit == 4
+
+    def test_no_increase_when_latency_spikes(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, latency_tolerance=1.5)
+        limiter.record_success(0.1)
+        limit_before = limiter._limit
+        limiter.record_success(5.0)
+        assert limiter._limit == limit_before
+
+    def test_multiplicative_decrease_once_per_cooldown(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+        limiter.record_throttle()
+        limiter.record_throttle()
+        assert limiter.limit == 4
+        assert limiter.get_stats()["throttle_events"] == 2
+
+    def test_never_below_min_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.record_throttle()
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_caps_in_flight_requests(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        peak = 0
+
+        async def worker():
+            nonlocal peak
+            await limiter.acquire()
+            try:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+            finally:
+                limiter.release()
+
+        await asyncio.gather(*[worker() for _ in range(6)])
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_admission(self):
+        limiter = AdaptiveConcurrencyLimiter()
+        limiter.record_throttle(retry_after=0.05)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await limiter.acquire()
+        limiter.release()
+        assert loop.time() - started >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+
+class TestSharedLimiter:
+    def test_shared_per_endpoint_and_model(self):
+        assert get_shared_limiter("http://a", "m") is get_shared_limiter("http://a", "m")
+        assert get_shared_limiter("http://a", "m") is not get_shared_limiter("http://b", "m")
+
+    def test_rebuilt_services_share_limiter(self):
+        first = EmbeddingService(api_key="k1", base_url="http://shared", model="m", dimensions=2)
+        second = EmbeddingService(api_key="k2", base_url="http://shared", model="m", dimensions=2)
+        assert first.limiter is second.limiter
+
+
+class TestEmbeddingServiceThrottling:
+    @pytest.mark.asyncio
+    async def test_rate_limit_honours_retry_after(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        svc = EmbeddingService(api_key="k", base_url="http://x", model="m", dimensions=1, limiter=limiter)
+        ok = MagicMock()
+        ok.data = [MagicMock(embedding=[1.0])]
+        svc._client = MagicMock()
+        svc._client.embeddings = MagicMock()
+        svc._client.embeddings.create = AsyncMock(side_effect=[_rate_limit_error({"retry-after-ms": "30"}), ok])
+
+        with (
+            patch("tale_knowledge.embedding.service.RETRY_BASE_DELAY", 0.001),
+            patch("tale_knowledge.embedding.service.random.uniform", return_value=0),
+            patch("tale_knowledge.embedding.service.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+        ):
+            assert await svc.embed_texts(["hello"]) == [[1.0]]
+
+        # The backoff is stretched to the provider's Retry-After.
+        assert max(c.args[0] for c in mock_sleep.await_args_list) == pytest.approx(0.03, abs=0.005)
+        stats = limiter.get_stats()
+        assert stats["throttle_events"] == 1
+        assert stats["limit"] == 2
+        assert stats["in_flight"] == 0
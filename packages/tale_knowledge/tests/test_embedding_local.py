@@ -0,0 +1,115 @@
+"""Tests for the local CPU embedding backend."""
+
+import asyncio
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from tale_knowledge.embedding import (
+    EmbeddingService,
+    LocalEmbeddingService,
+    create_embedding_service,
+    is_local_base_url,
+)
+from tale_knowledge.embedding.local import parse_local_backend
+
+
+class FakeEncoder:
+    """Deterministic 4-dim encoder that records each forward pass."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.array([[float(len(t)), 1.0, 0.0, 0.0] for t in texts], dtype=np.float32)
+
+
+def _service(encoder: FakeEncoder, dimensions: int = 4, **kwargs) -> LocalEmbeddingService:
+    return LocalEmbeddingService("local-model", dimensions, encoder=encoder, **kwargs)
+
+
+class TestBaseUrl:
+    def test_is_local_base_url(self):
+        assert is_local_base_url("local://")
+        assert is_local_base_url("local://onnx")
+        assert not is_local_base_url("https://api.openai.com/v1")
+        assert not is_local_base_url(None)
+
+    def test_parse_backend(self):
+        assert parse_local_backend("local://") == "torch"
+        assert parse_local_backend("local://onnx/") == "onnx"
+        with pytest.raises(ValueError, match="Unknown local embedding backend"):
+            parse_local_backend("local://tensorflow")
+
+    def test_factory_selects_backend(self):
+        local = create_embedding_service("", "local://onnx", "m", 4)
+        remote = create_embedding_service("key", "http://localhost:8080", "m", 4)
+
+        assert isinstance(local, LocalEmbeddingService)
+        assert local._backend == "onnx"
+        assert type(remote) is EmbeddingService
+
+
+class TestLocalEmbeddingService:
+    @pytest.mark.asyncio
+    async def test_embeds_and_fills_blank_texts(self):
+        encoder = FakeEncoder()
+        svc = _service(encoder)
+
+        result = await svc.embed_texts(["ab", "  ", "abc"])
+
+        assert result == [[2.0, 1.0, 0.0, 0.0], [0.0] * 4, [3.0, 1.0, 0.0, 0.0]]
+        assert encoder.calls == [["ab", "abc"]]
+        await svc.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_a_forward_pass(self):
+        encoder = FakeEncoder()
+        svc = _service(encoder)
+
+        results = await asyncio.gather(svc.embed_query("a"), svc.embed_query("bb"), svc.embed_query("ccc"))
+
+        assert [r[0] for r in results] == [1.0, 2.0, 3.0]
+        assert encoder.calls == [["a", "bb", "ccc"]]
+        await svc.close()
+
+    @pytest.mark.asyncio
+    async def test_forward_pass_capped_at_max_batch_size(self):
+        encoder = FakeEncoder()
+        svc = _service(encoder, max_batch_size=2)
+
+        await asyncio.gather(*(svc.embed_query(t) for t in ["a", "b", "c", "d", "e"]))
+
+        assert [len(call) for call in encoder.calls] == [2, 2, 1]
+        await svc.close()
+
+    @pytest.mark.asyncio
+    async def test_selectable_dimensions_truncate_and_renormalise(self):
+        svc = _service(FakeEncoder(), dimensions=2)
+
+        matrix = await svc.embed_texts_array(["abc"])
+
+        assert matrix.shape == (1, 2)
+        np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), [1.0], rtol=1e-6)
+        np.testing.assert_allclose(matrix[0], np.array([3.0, 1.0]) / np.sqrt(10), rtol=1e-6)
+        await svc.close()
+
+    @pytest.mark.asyncio
+    async def test_too_many_dimensions_fails_every_waiter(self):
+        svc = _service(FakeEncoder(), dimensions=8)
+
+        results = await asyncio.gather(svc.embed_query("a"), svc.embed_query("b"), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        await svc.close()
+
+    @pytest.mark.asyncio
+    async def test_missing_dependency_is_reported(self):
+        svc = LocalEmbeddingService("local-model", 4)
+
+        with patch.dict(sys.modules, {"sentence_transformers": None}), pytest.raises(RuntimeError, match="local"):
+            await svc.embed_query("a")
+        await svc.close()
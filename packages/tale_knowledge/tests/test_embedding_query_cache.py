@@ -0,0 +1,106 @@
+"""Tests for the query embedding LRU."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tale_knowledge.embedding import EmbeddingService, QueryEmbeddingCache
+from tale_knowledge.embedding.limiter import AdaptiveConcurrencyLimiter
+from tale_knowledge.embedding.query_cache import normalize_query
+
+
+class TestNormalizeQuery:
+    def test_collapses_whitespace_but_keeps_case(self):
+        assert normalize_query("  What is\tTale?\n") == "What is Tale?"
+
+    def test_unicode_nfc(self):
+        assert normalize_query("cafe\u0301") == normalize_query("caf\u00e9")
+
+
+class TestQueryEmbeddingCache:
+    def test_hit_after_set_with_normalized_key(self):
+        cache = QueryEmbeddingCache()
+        cache.set("m", 2, "hello  world", [0.5, 0.25])
+
+        assert cache.get("m", 2, " hello world ") == [0.5, 0.25]
+        assert cache.get("m", 3, "hello world") is None
+        assert cache.get("other", 2, "hello world") is None
+
+    def test_lru_eviction(self):
+        cache = QueryEmbeddingCache(max_size=2)
+        cache.set("m", 1, "a", [1.0])
+        cache.set("m", 1, "b", [2.0])
+        cache.get("m", 1, "a")
+        cache.set("m", 1, "c", [3.0])
+
+        assert cache.get("m", 1, "b") is None
+        assert cache.get("m", 1, "a") == [1.0]
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self):
+        cache = QueryEmbeddingCache(ttl=10)
+        with patch("tale_knowledge.embedding.query_cache.time.monotonic", return_value=100.0):
+            cache.set("m", 1, "a", [1.0])
+        with patch("tale_knowledge.embedding.query_cache.time.monotonic", return_value=111.0):
+            assert cache.get("m", 1, "a") is None
+
+        assert cache.get_stats()["expired"] == 1
+        assert len(cache) == 0
+
+    def test_stats_and_clear(self):
+        cache = QueryEmbeddingCache()
+        cache.set("m", 1, "a", [1.0])
+        cache.get("m", 1, "a")
+        cache.get("m", 1, "b")
+        cache.clear()
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["invalidations"] == 1
+        assert stats["size"] == 0
+
+    def test_zero_size_disables(self):
+        cache = QueryEmbeddingCache(max_size=0)
+        cache.set("m", 1, "a", [1.0])
+        assert cache.get("m", 1, "a") is None
+
+
+class TestServiceQueryCache:
+    def _service(self, cache: QueryEmbeddingCache) -> EmbeddingService:
+        svc = EmbeddingService(
+            api_key="test-key",
+            base_url="http://localhost:8080",
+            model="m",
+            dimensions=2,
+            limiter=AdaptiveConcurrencyLimiter(),
+            query_cache=cache,
+        )
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.5, 0.25])]
+        response.usage = MagicMock(prompt_tokens=3, total_tokens=3)
+        svc._client = MagicMock()
+        svc._client.embeddings = MagicMock()
+        svc._client.embeddings.create = AsyncMock(return_value=response)
+        return svc
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_skips_provider(self):
+        svc = self._service(QueryEmbeddingCache())
+
+        first = await svc.embed_query_with_usage("hello")
+        second = await svc.embed_query_with_usage("hello ")
+
+        svc._client.embeddings.create.assert_awaited_once()
+        assert second.embedding == first.embedding == [0.5, 0.25]
+        assert first.usage.total_tokens == 3
+        assert second.usage.total_tokens == 0
+
+    @pytest.mark.asyncio
+    async def test_blank_query_not_cached(self):
+        cache = QueryEmbeddingCache()
+        svc = self._service(cache)
+
+        assert await svc.embed_query("  ") == [0.0, 0.0]
+        assert len(cache) == 0
@@ -0,0 +1,178 @@
+"""Tests for document metadata read by the extractors."""
+
+from __future__ import annotations
+
+import datetime as dt
+from io import BytesIO
+
+import fitz
+import pytest
+
+from tale_knowledge.extraction import DocumentMetadata, extract_document
+from tale_knowledge.extraction.metadata import ensure_aware, parse_pdf_date
+
+
+class TestParsePdfDate:
+    """PDF date format ``D:YYYYMMDDHHmmSSOHH'mm'`` parsing."""
+
+    def test_full_date_with_timezone(self):
+        result = parse_pdf_date("D:20230615143052+02'00'")
+        assert result is not None
+        assert result.year == 2023
+        assert result.month == 6
+        assert result.day == 15
+        assert result.hour == 14
+        assert result.minute == 30
+        assert result.second == 52
+        assert result.tzinfo is not None
+
+    def test_date_without_prefix(self):
+        result = parse_pdf_date("20230101120000Z")
+        assert result is not None
+        assert result.year == 2023
+        assert result.tzinfo == dt.UTC
+
+    def test_date_only_year(self):
+        result = parse_pdf_date("D:2023")
+        assert result is not None
+        assert result.year == 2023
+        assert result.month == 1
+        assert result.day == 1
+
+    def test_negative_timezone(self):
+        result = parse_pdf_date("D:20230615143052-05'00'")
+        assert result is not None
+        expected_offset = dt.timezone(dt.timedelta(hours=-5))
+        assert result.utcoffset() == expected_offset.utcoffset(None)
+
+    def test_none_input(self):
+        assert parse_pdf_date(None) is None
+
+    def test_empty_string(self):
+        assert parse_pdf_date("") is None
+
+    def test_non_string_input(self):
+        assert parse_pdf_date(12345) is None  # type: ignore[arg-type]
+
+    def test_malformed_string(self):
+        assert parse_pdf_date("not-a-date") is None
+
+    def test_year_below_min(self):
+        assert parse_pdf_date("D:1900") is None
+
+    def test_year_above_max(self):
+        assert parse_pdf_date("D:2200") is None
+
+    def test_whitespace_stripped(self):
+        result = parse_pdf_date("  D:20230101  ")
+        assert result is not None
+        assert result.year == 2023
+
+
+class TestEnsureAware:
+    """Timezone-aware datetime conversion."""
+
+    def test_none_returns_none(self):
+        assert ensure_aware(None) is None
+
+    def test_naive_gets_utc(self):
+        naive = dt.datetime(2023, 1, 1, 12, 0, 0)
+        result = ensure_aware(naive)
+        assert result is not None
+        assert result.tzinfo == dt.UTC
+
+    def test_aware_preserved(self):
+        tz = dt.timezone(dt.timedelta(hours=5))
+        aware = dt.datetime(2023, 1, 1, 12, 0, 0, tzinfo=tz)
+        result = ensure_aware(aware)
+        assert result is not None
+        assert result.tzinfo == tz
+
+    def test_non_datetime_returns_none(self):
+        assert ensure_aware("not a datetime") is None  # type: ignore[arg-type]
+
+
+class TestExtractDocumentMetadata:
+    """Metadata comes from the same parse as the text."""
+
+    @pytest.mark.asyncio
+    async def test_pdf(self):
+        doc = fitz.open()
+        for text in ("One", "Two"):
+            doc.new_page().insert_text((72, 72), text)
+        doc.set_metadata(
+            {
+                "title": "Annual Report",
+                "author": "Finance",
+                "creationDate": "D:20230615143052Z",
+                "modDate": "D:20240101000000Z",
+            }
+        )
+        pdf_bytes = doc.tobytes()
+        doc.close()
+
+        result = await extract_document(pdf_bytes, "report.pdf")
+
+        assert "Two" in result.text
+        assert result.metadata.page_count == 2
+        assert result.metadata.title == "Annual Report"
+        assert result.metadata.author == "Finance"
+        assert result.metadata.created_at == dt.datetime(2023, 6, 15, 14, 30, 52, tzinfo=dt.UTC)
+        assert result.metadata.modified_at == dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
+
+    @pytest.mark.asyncio
+    async def test_docx(self):
+        from docx import Document
+
+        doc = Document()
+        doc.add_paragraph("Body")
+        doc.core_properties.title = "Contract"
+        doc.core_properties.author = "Legal"
+        doc.core_properties.created = dt.datetime(2023, 6, 15, 14, 30, 52)
+        buf = BytesIO()
+        doc.save(buf)
+
+        result = await extract_document(buf.getvalue(), "contract.docx")
+
+        assert "Body" in result.text
+        assert result.metadata.title == "Contract"
+        assert result.metadata.author == "Legal"
+        assert result.metadata.created_at == dt.datetime(2023, 6, 15, 14, 30, 52, tzinfo=dt.UTC)
+        assert result.metadata.page_count is None
+
+    @pytest.mark.asyncio
+    async def test_pptx_counts_slides(self):
+        from pptx import Presentation
+
+        prs = Presentation()
+        for _ in range(3):
+            prs.slides.add_slide(prs.slide_layouts[5])
+        prs.core_properties.title = "Roadmap"
+        buf = BytesIO()
+        prs.save(buf)
+
+        result = await extract_document(buf.getvalue(), "roadmap.pptx")
+
+        assert result.metadata.page_count == 3
+        assert result.metadata.title == "Roadmap"
+
+    @pytest.mark.asyncio
+    async def test_xlsx(self):
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        wb.active.append(["a", "b"])
+        wb.properties.creator = "Ops"
+        buf = BytesIO()
+        wb.save(buf)
+
+        result = await extract_document(buf.getvalue(), "sheet.xlsx")
+
+        assert "a | b" in result.text
+        assert result.metadata.author == "Ops"
+
+    @pytest.mark.asyncio
+    async def test_text_has_empty_metadata(self):
+        result = await extract_document(b"plain", "notes.txt")
+        assert result.text == "plain"
+        assert result.metadata == DocumentMetadata()
@@ -62,6 +62,16 @@ class TestExtractText:
         assert "# Title" in text
         assert vision_used is False
 
+    @pytest.mark.asyncio
+    async def test_text_file_from_path(self, tmp_path):
+        from tale_knowledge.extraction.router import extract_text
+
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"Spooled to disk")
+        text, vision_used = await extract_text(path, "notes.txt")
+        assert text == "Spooled to disk"
+        assert vision_used is False
+
     @pytest.mark.asyncio
     async def test_unsupported_raises(self):
         from tale_knowledge.extraction.router import extract_text
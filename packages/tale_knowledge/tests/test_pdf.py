@@ -5,8 +5,11 @@ from unittest.mock import AsyncMock
 import fitz
 import pytest
 
+from tale_knowledge.extraction import InMemoryPageCheckpointStore, PageResult
+from tale_knowledge.extraction import pdf as pdf_module
 from tale_knowledge.extraction.pdf import (
     LARGE_IMAGE_RATIO,
+    PDF_EXTRACTOR_VERSION,
     PdfExtractionResult,
     _extract_page_text_sync,
     extract_text_from_pdf_bytes,
@@ -120,6 +123,13 @@ class TestExtractTextFromPdfBytes:
         assert result.scanned_pages_detected == 0
         assert result.ocr_applied is False
 
+    @pytest.mark.asyncio
+    async def test_extracts_from_path(self, tmp_path):
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(_make_simple_pdf("From disk"))
+        result = await extract_text_from_pdf_bytes(path)
+        assert "From disk" in result.text
+
     @pytest.mark.asyncio
     async def test_multi_page_pdf(self):
         doc = fitz.open()
@@ -213,3 +223,85 @@ class TestExtractTextFromPdfBytes:
         assert result.scanned_pages_detected == 1
         assert result.ocr_applied is False
         assert result.vision_used is False
+
+
+def _make_pages_pdf(count: int) -> bytes:
+    doc = fitz.open()
+    for i in range(count):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1} content")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+class TestPageCheckpoints:
+    @pytest.mark.asyncio
+    async def test_pages_saved_and_resumed(self, monkeypatch):
+        store = InMemoryPageCheckpointStore()
+        pdf_bytes = _make_pages_pdf(3)
+        first = await extract_text_from_pdf_bytes(pdf_bytes, checkpoints=store, content_hash="h1")
+
+        saved = await store.load_pages("h1", f"{PDF_EXTRACTOR_VERSION}:text")
+        assert sorted(saved) == [0, 1, 2]
+
+        # Simulate a failed attempt that got only page 2 done
+        store.discard("h1")
+        await store.save_page("h1", f"{PDF_EXTRACTOR_VERSION}:text", 1, saved[1])
+        serialized: list[int] = []
+        real_serialize = pdf_module._serialize_page
+
+        def tracking_serialize(doc, page_num):
+            serialized.append(page_num)
+            return real_serialize(doc, page_num)
+
+        monkeypatch.setattr(pdf_module, "_serialize_page", tracking_serialize)
+        progress: list[tuple[int, int]] = []
+        resumed = await extract_text_from_pdf_bytes(
+            pdf_bytes, checkpoints=store, content_hash="h1", on_progress=lambda d, t: progress.append((d, t))
+        )
+
+        assert resumed.text == first.text
+        assert sorted(serialized) == [0, 2]
+        assert progress[0] == (1, 3) and progress[-1] == (3, 3)
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_keyed_by_vision_mode(self):
+        store = InMemoryPageCheckpointStore()
+        await store.save_page("h1", f"{PDF_EXTRACTOR_VERSION}:text", 0, PageResult("stale", False, False))
+
+        mock_client = AsyncMock()
+        mock_client.max_concurrent_pages = 3
+        result = await extract_text_from_pdf_bytes(
+            _make_simple_pdf("Fresh"), vision_client=mock_client, checkpoints=store, content_hash="h1"
+        )
+
+        assert "Fresh" in result.text and "stale" not in result.text
+
+    @pytest.mark.asyncio
+    async def test_page_with_failed_image_not_saved(self):
+        store = InMemoryPageCheckpointStore()
+        mock_client = AsyncMock()
+        mock_client.max_concurrent_pages = 3
+        mock_client.describe_image = AsyncMock(side_effect=TimeoutError("vision timeout"))
+
+        await extract_text_from_pdf_bytes(
+            _make_pdf_with_image("Caption text", image_size=200),
+            vision_client=mock_client,
+            checkpoints=store,
+            content_hash="h1",
+        )
+
+        assert await store.load_pages("h1", f"{PDF_EXTRACTOR_VERSION}:vision") == {}
+
+    @pytest.mark.asyncio
+    async def test_store_errors_do_not_fail_extraction(self):
+        store = AsyncMock()
+        store.load_pages = AsyncMock(side_effect=ConnectionError("db down"))
+        store.save_page = AsyncMock(side_effect=ConnectionError("db down"))
+
+        result = await extract_text_from_pdf_bytes(
+            _make_simple_pdf("Still works"), checkpoints=store, content_hash="h1"
+        )
+
+        assert "Still works" in result.text
+        store.save_page.assert_awaited_once()
@@ -0,0 +1,51 @@
+"""Tests for truncated/quantized prefix index SQL."""
+
+import pytest
+
+from tale_knowledge.retrieval import PrefixIndex, candidate_limit, prefix_index_for
+
+
+class TestPrefixIndex:
+    def test_halfvec_expression_is_renormalized_prefix(self):
+        index = PrefixIndex("halfvec", 512)
+
+        assert index.expression("embedding") == "l2_normalize(subvector(embedding, 1, 512))::halfvec(512)"
+        assert index.distance("c.embedding", "$1::vector") == (
+            "(l2_normalize(subvector(c.embedding, 1, 512))::halfvec(512)) <#> "
+            "(l2_normalize(subvector($1::vector, 1, 512))::halfvec(512))"
+        )
+
+    def test_bit_expression_uses_hamming(self):
+        index = PrefixIndex("bit", 256)
+
+        assert index.expression("embedding") == "binary_quantize(subvector(embedding, 1, 256))::bit(256)"
+        assert index.operator == "<~>"
+        assert "bit_hamming_ops" in index.index_method()
+
+    def test_index_method_and_name(self):
+        index = PrefixIndex("halfvec", 512)
+
+        assert index.index_method() == (
+            "USING hnsw ((l2_normalize(subvector(embedding, 1, 512))::halfvec(512)) halfvec_ip_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+        assert index.index_name("idx_chunks_embedding") == "idx_chunks_embedding_halfvec512_hnsw"
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError, match="Unknown prefix index mode"):
+            PrefixIndex("int8", 512)
+
+
+class TestPrefixIndexFor:
+    def test_full_mode_disables(self):
+        assert prefix_index_for("full", 512, 1536) is None
+
+    def test_clamped_to_embedding_width(self):
+        assert prefix_index_for("halfvec", 512, 384) == PrefixIndex("halfvec", 384)
+
+
+class TestCandidateLimit:
+    def test_scales_and_caps(self):
+        assert candidate_limit(15) == 60
+        assert candidate_limit(15, 1) == 15
+        assert candidate_limit(600) == 1000
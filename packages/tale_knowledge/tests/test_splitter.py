@@ -1,5 +1,9 @@
 """Tests for markdown-aware content chunking."""
 
+from unittest.mock import patch
+
+import pytest
+
 from tale_knowledge.chunking.splitter import (
     CHUNK_OVERLAP,
     CHUNK_SIZE,
@@ -7,7 +11,9 @@ from tale_knowledge.chunking.splitter import (
     ContentChunk,
     build_metadata_prefix,
     chunk_content,
+    get_splitter,
 )
+from tale_knowledge.embedding import TokenCounter
 
 
 class TestChunkContent:
@@ -67,6 +73,77 @@ class TestChunkContent:
         assert len(chunks) > 1
 
 
+class TestSplitterCache:
+    def test_splitter_reused_across_calls(self):
+        get_splitter.cache_clear()
+        chunk_content("word " * 1000, chunk_size=300, chunk_overlap=30)
+        chunk_content("other " * 1000, chunk_size=300, chunk_overlap=30)
+        chunk_content("word " * 1000, chunk_size=400, chunk_overlap=30)
+
+        info = get_splitter.cache_info()
+        assert info.misses == 2
+        assert info.hits == 1
+
+    def test_keyed_by_sizing_mode(self):
+        assert get_splitter(300, 30) is get_splitter(300, 30)
+        assert get_splitter(300, 30) is not get_splitter(300, 30, "tokens", "text-embedding-3-small")
+
+    def test_unknown_sizing_rejected(self):
+        with pytest.raises(ValueError, match="Unknown chunk sizing"):
+            get_splitter(300, 30, "words")
+
+
+class TestTokenSizing:
+    def test_chunks_fit_token_budget(self):
+        counter = TokenCounter("text-embedding-3-small")
+        if not counter.exact:
+            pytest.skip("tiktoken encoding unavailable")
+        text = ("The quick brown fox jumps over the lazy dog. " * 40 + "\n\n") * 5
+        chunks = chunk_content(
+            text, chunk_size=100, chunk_overlap=10, sizing="tokens", tokenizer_model="text-embedding-3-small"
+        )
+
+        assert len(chunks) > 1
+        assert all(counter.count(c.content) <= 100 for c in chunks)
+        assert "".join(c.core_content for c in chunks) == text
+
+    def test_unknown_model_falls_back_to_cl100k_without_download(self):
+        tokenizers = pytest.importorskip("tokenizers")
+        get_splitter.cache_clear()
+        with patch.object(tokenizers.Tokenizer, "from_pretrained") as from_pretrained:
+            splitter = get_splitter(123, 12, "tokens", "acme/unknown-embedder")
+
+        from_pretrained.assert_not_called()
+        assert splitter is not None
+        assert chunk_content(
+            "hello " * 500, chunk_size=123, chunk_overlap=12, sizing="tokens", tokenizer_model="acme/unknown-embedder"
+        )
+
+    def test_local_tokenizer_file(self, tmp_path):
+        tokenizers = pytest.importorskip("tokenizers")
+        from tokenizers.models import WordLevel
+        from tokenizers.pre_tokenizers import Whitespace
+
+        tokenizer = tokenizers.Tokenizer(WordLevel({"hello": 0, "[UNK]": 1}, unk_token="[UNK]"))
+        tokenizer.pre_tokenizer = Whitespace()
+        path = tmp_path / "tokenizer.json"
+        tokenizer.save(str(path))
+
+        chunks = chunk_content(
+            "hello " * 500, chunk_size=50, chunk_overlap=5, sizing="tokens", tokenizer_model=str(path)
+        )
+
+        assert len(chunks) > 1
+        assert all(len(c.content.split()) <= 50 for c in chunks)
+
+    def test_char_mode_ignores_tokenizer_model(self):
+        get_splitter.cache_clear()
+        chunk_content("word " * 500, chunk_size=300, chunk_overlap=30, tokenizer_model="a")
+        chunk_content("word " * 500, chunk_size=300, chunk_overlap=30, tokenizer_model="b")
+
+        assert get_splitter.cache_info().misses == 1
+
+
 class TestBuildMetadataPrefix:
     def test_title_and_url(self):
         prefix = build_metadata_prefix("My Page", "https://example.com/page")
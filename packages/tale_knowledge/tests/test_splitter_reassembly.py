@@ -84,6 +84,8 @@ SINGLE_CHAR = "x"
 
 EXACTLY_CHUNK_SIZE = "x" * 2048  # default chunk_size
 
+TOKENS = {"sizing": "tokens", "tokenizer_model": "text-embedding-3-small"}
+
 
 CORPUS = {
     "connector_ts_regression": (CONNECTOR_TS_REGRESSION, {}),
@@ -95,6 +97,10 @@ CORPUS = {
     "trailing_newline": (TRAILING_NEWLINE, {}),
     "single_char": (SINGLE_CHAR, {}),
     "exactly_chunk_size": (EXACTLY_CHUNK_SIZE, {}),
+    # Token sizing: same invariants, sizes counted by the embedding tokenizer
+    "connector_ts_tokens": (CONNECTOR_TS_REGRESSION, {**TOKENS, "chunk_size": 64, "chunk_overlap": 8}),
+    "cjk_and_emoji_tokens": (CJK_AND_EMOJI, {**TOKENS, "chunk_size": 48, "chunk_overlap": 6}),
+    "prose_tokens": (PROSE, {**TOKENS, "chunk_size": 80, "chunk_overlap": 10}),
 }
 
 
@@ -1,5 +1,18 @@
 """Database utilities."""
 
+from .bulk_load import IndexBuildProgress, build_progress, rebuild_indexes, suspend_indexes, suspended_indexes
+from .copy import copy_insert
 from .retry import acquire_with_retry, transact_with_retry
+from .vector import register_vector_codecs
 
-__all__ = ["acquire_with_retry", "transact_with_retry"]
+__all__ = [
+    "IndexBuildProgress",
+    "acquire_with_retry",
+    "build_progress",
+    "copy_insert",
+    "rebuild_indexes",
+    "register_vector_codecs",
+    "suspend_indexes",
+    "suspended_indexes",
+    "transact_with_retry",
+]
@@ -0,0 +1,163 @@
+"""Bulk-load mode: suspend a table's search indexes during a large import.
+
+Every row inserted into a table with an HNSW (or BM25) index pays for an
+incremental index update, which dominates the cost of a first-time import
+of hundreds of thousands of rows. In bulk-load mode the indexes are
+dropped, rows are loaded without them, and each index is then built once
+from the finished table — with a large ``maintenance_work_mem`` and
+parallel maintenance workers.
+
+The definition of every suspended index is kept in the schema's
+``bulk_load_indexes`` table (see the services' migrations), so the mode
+survives restarts and is visible to every replica: callers that create
+indexes on their own (startup convergence, self-healing) must skip them
+while :func:`suspended_indexes` is not empty. Each index is rebuilt in its
+own transaction together with the removal of its row, so an interrupted
+rebuild is simply resumed by the next call.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import asyncpg
+from loguru import logger
+
+from .retry import acquire_with_retry
+
+STATE_TABLE = "bulk_load_indexes"
+
+
+@dataclass(frozen=True, slots=True)
+class IndexBuildProgress:
+    """One running ``CREATE INDEX`` as reported by ``pg_stat_progress_create_index``."""
+
+    phase: str
+    blocks_done: int
+    blocks_total: int
+    tuples_done: int
+    tuples_total: int
+
+    @property
+    def percent(self) -> float | None:
+        """Completion of the current phase, or None when Postgres reports no totals."""
+        if self.tuples_total:
+            return 100.0 * self.tuples_done / self.tuples_total
+        if self.blocks_total:
+            return 100.0 * self.blocks_done / self.blocks_total
+        return None
+
+
+async def suspended_indexes(conn: asyncpg.Connection, schema: str) -> list[str]:
+    """Qualified names of the indexes currently suspended for a bulk load."""
+    rows = await conn.fetch(f"SELECT index_name FROM {schema}.{STATE_TABLE} ORDER BY suspended_at, index_name")
+    return [row["index_name"] for row in rows]
+
+
+async def suspend_indexes(conn: asyncpg.Connection, schema: str, indexes: Sequence[str]) -> list[str]:
+    """Record the definitions of ``indexes`` and drop them; returns the ones dropped.
+
+    Indexes that do not exist are skipped, so calling this again while a
+    bulk load is already running is harmless.
+    """
+    dropped: list[str] = []
+    async with conn.transaction():
+        for index in indexes:
+            definition = await conn.fetchval("SELECT pg_get_indexdef(to_regclass($1))", index)
+            if definition is None:
+                continue
+            await conn.execute(
+                f"""INSERT INTO {schema}.{STATE_TABLE} (index_name, definition)
+                    VALUES ($1, $2)
+                    ON CONFLICT (index_name) DO NOTHING""",
+                index,
+                definition,
+            )
+            await conn.execute(f"DROP INDEX {index}")
+            dropped.append(index)
+    return dropped
+
+
+async def build_progress(conn: asyncpg.Connection, table: str, *, pid: int | None = None) -> list[IndexBuildProgress]:
+    """Progress of the index builds running on ``table`` (only backend ``pid``'s if given)."""
+    rows = await conn.fetch(
+        """SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+           FROM pg_stat_progress_create_index
+           WHERE relid = to_regclass($1) AND ($2::int IS NULL OR pid = $2)""",
+        table,
+        pid,
+    )
+    return [
+        IndexBuildProgress(
+            phase=row["phase"],
+            blocks_done=row["blocks_done"],
+            blocks_total=row["blocks_total"],
+            tuples_done=row["tuples_done"],
+            tuples_total=row["tuples_total"],
+        )
+        for row in rows
+    ]
+
+
+async def rebuild_indexes(
+    pool: asyncpg.Pool,
+    schema: str,
+    table: str,
+    *,
+    maintenance_work_mem: str,
+    parallel_workers: int,
+    timeout: float,
+    progress_interval: float = 30.0,
+) -> list[str]:
+    """Build every suspended index once, ending bulk-load mode; returns the indexes built.
+
+    Runs until no suspended index is left. Indexes another replica is
+    already building are skipped (their rows are locked). Progress of each
+    build is logged every ``progress_interval`` seconds.
+    """
+    built: list[str] = []
+    while True:
+        async with acquire_with_retry(pool) as conn, conn.transaction():
+            row = await conn.fetchrow(
+                f"""SELECT index_name, definition FROM {schema}.{STATE_TABLE}
+                    ORDER BY suspended_at, index_name
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED"""
+            )
+            if row is None:
+                return built
+            index = row["index_name"]
+            if await conn.fetchval("SELECT to_regclass($1)", index) is None:
+                await conn.execute("SELECT set_config('maintenance_work_mem', $1, true)", maintenance_work_mem)
+                await conn.execute(
+                    "SELECT set_config('max_parallel_maintenance_workers', $1, true)", str(parallel_workers)
+                )
+                await conn.execute("SELECT set_config('statement_timeout', '0', true)")
+                logger.info("Bulk load: building index {}", index)
+                reporter = asyncio.create_task(
+                    _report_progress(pool, table, index, conn.get_server_pid(), progress_interval)
+                )
+                try:
+                    await conn.execute(row["definition"], timeout=timeout)
+                finally:
+                    reporter.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await reporter
+                logger.info("Bulk load: built index {}", index)
+            await conn.execute(f"DELETE FROM {schema}.{STATE_TABLE} WHERE index_name = $1", index)
+            built.append(index)
+
+
+async def _report_progress(pool: asyncpg.Pool, table: str, index: str, pid: int, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with acquire_with_retry(pool) as conn:
+                progress = await build_progress(conn, table, pid=pid)
+        except Exception as e:
+            logger.debug("Could not read index build progress: {}", e)
+            continue
+        for p in progress:
+            percent = f"{p.percent:.1f}%" if p.percent is not None else "n/a"
+            logger.info("Bulk load: building {} — {} ({})", index, p.phase, percent)
@@ -0,0 +1,86 @@
+"""Binary asyncpg codecs for pgvector's ``vector`` and ``halfvec`` types.
+
+Without a codec, asyncpg exchanges these types as text: every embedding is
+formatted into a ``[0.1,0.2,...]`` literal in Python and parsed again by
+Postgres (and the reverse on reads). The binary wire format is a
+``(dim int16, unused int16)`` header followed by big-endian float4
+(``vector``) or float16 (``halfvec``) components.
+
+Encoders take any float sequence; numpy arrays are converted in one
+``astype`` call. Text literals are still accepted so existing
+``$1::vector`` callers keep working. Decoders return ``list[float]``.
+
+Register on every pool connection with ``init=register_vector_codecs``.
+"""
+
+import struct
+from collections.abc import Sequence
+from typing import Any
+
+import asyncpg
+
+_HEADER = struct.Struct(">HH")
+
+
+def _components(value: Any) -> Sequence[float]:
+    if isinstance(value, str):
+        body = value.strip().strip("[]")
+        return [float(x) for x in body.split(",")] if body else []
+    return value
+
+
+def _encode(value: Any, dtype: str, fmt: str) -> bytes:
+    if hasattr(value, "astype"):  # numpy array: one C-level conversion
+        flat = value.reshape(-1)
+        return _HEADER.pack(len(flat), 0) + flat.astype(dtype, copy=False).tobytes()
+    components = _components(value)
+    dim = len(components)
+    return _HEADER.pack(dim, 0) + struct.pack(f">{dim}{fmt}", *components)
+
+
+def _decode(data: bytes, fmt: str) -> list[float]:
+    dim, _unused = _HEADER.unpack_from(data)
+    return list(struct.unpack_from(f">{dim}{fmt}", data, _HEADER.size))
+
+
+def encode_vector(value: Any) -> bytes:
+    return _encode(value, ">f4", "f")
+
+
+def decode_vector(data: bytes) -> list[float]:
+    return _decode(data, "f")
+
+
+def encode_halfvec(value: Any) -> bytes:
+    return _encode(value, ">f2", "e")
+
+
+def decode_halfvec(data: bytes) -> list[float]:
+    return _decode(data, "e")
+
+
+_CODECS = {
+    "vector": (encode_vector, decode_vector),
+    "halfvec": (encode_halfvec, decode_halfvec),
+}
+
+
+async def register_vector_codecs(conn: asyncpg.Connection) -> None:
+    """Register binary ``vector``/``halfvec`` codecs (skips types that are not installed)."""
+    rows = await conn.fetch(
+        """
+        SELECT t.typname, n.nspname
+        FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname = ANY($1::text[])
+        """,
+        list(_CODECS),
+    )
+    for row in rows:
+        encoder, decoder = _CODECS[row["typname"]]
+        await conn.set_type_codec(
+            row["typname"],
+            schema=row["nspname"],
+            encoder=encoder,
+            decoder=decoder,
+            format="binary",
+        )
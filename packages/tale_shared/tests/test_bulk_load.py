@@ -0,0 +1,84 @@
+"""Tests for bulk-load index suspension and rebuild."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncpg
+import pytest
+
+from tale_shared.db.bulk_load import IndexBuildProgress, rebuild_indexes, suspend_indexes
+
+
+def _conn() -> AsyncMock:
+    conn = AsyncMock()
+    conn.transaction = MagicMock(return_value=AsyncMock())
+    conn.get_server_pid = MagicMock(return_value=4242)
+    return conn
+
+
+def _pool(conn: AsyncMock) -> MagicMock:
+    pool = MagicMock(spec=asyncpg.Pool)
+    pool.acquire = AsyncMock(return_value=conn)
+    pool.release = AsyncMock()
+    return pool
+
+
+class TestSuspendIndexes:
+    @pytest.mark.asyncio
+    async def test_records_definition_then_drops_existing_indexes(self):
+        conn = _conn()
+        conn.fetchval = AsyncMock(side_effect=["CREATE INDEX idx_a ON s.chunks USING hnsw (embedding)", None])
+
+        dropped = await suspend_indexes(conn, "s", ["s.idx_a", "s.idx_missing"])
+
+        assert dropped == ["s.idx_a"]
+        insert, drop = [c.args for c in conn.execute.await_args_list]
+        assert "INSERT INTO s.bulk_load_indexes" in insert[0]
+        assert insert[1:] == ("s.idx_a", "CREATE INDEX idx_a ON s.chunks USING hnsw (embedding)")
+        assert drop == ("DROP INDEX s.idx_a",)
+
+
+class TestRebuildIndexes:
+    @pytest.mark.asyncio
+    async def test_builds_each_suspended_index_with_tuned_settings(self):
+        conn = _conn()
+        conn.fetchrow = AsyncMock(
+            side_effect=[{"index_name": "s.idx_a", "definition": "CREATE INDEX idx_a ON s.chunks (x)"}, None]
+        )
+        conn.fetchval = AsyncMock(return_value=None)  # index does not exist yet
+
+        built = await rebuild_indexes(
+            _pool(conn), "s", "s.chunks", maintenance_work_mem="4GB", parallel_workers=6, timeout=3600
+        )
+
+        assert built == ["s.idx_a"]
+        calls = [c.args for c in conn.execute.await_args_list]
+        assert ("SELECT set_config('maintenance_work_mem', $1, true)", "4GB") in calls
+        assert ("SELECT set_config('max_parallel_maintenance_workers', $1, true)", "6") in calls
+        assert ("CREATE INDEX idx_a ON s.chunks (x)",) in calls
+        assert calls[-1] == ("DELETE FROM s.bulk_load_indexes WHERE index_name = $1", "s.idx_a")
+        build = next(c for c in conn.execute.await_args_list if c.args == ("CREATE INDEX idx_a ON s.chunks (x)",))
+        assert build.kwargs == {"timeout": 3600}
+
+    @pytest.mark.asyncio
+    async def test_existing_index_only_clears_state(self):
+        conn = _conn()
+        conn.fetchrow = AsyncMock(
+            side_effect=[{"index_name": "s.idx_a", "definition": "CREATE INDEX idx_a ON s.chunks (x)"}, None]
+        )
+        conn.fetchval = AsyncMock(return_value="s.idx_a")
+
+        built = await rebuild_indexes(
+            _pool(conn), "s", "s.chunks", maintenance_work_mem="4GB", parallel_workers=6, timeout=3600
+        )
+
+        assert built == ["s.idx_a"]
+        assert [c.args[0] for c in conn.execute.await_args_list] == [
+            "DELETE FROM s.bulk_load_indexes WHERE index_name = $1"
+        ]
+
+
+class TestIndexBuildProgress:
+    def test_percent_prefers_tuples_then_blocks(self):
+        assert IndexBuildProgress("loading tuples in tree", 0, 0, 25, 100).percent == 25.0
+        assert IndexBuildProgress("building index: scanning table", 5, 10, 0, 0).percent == 50.0
+        assert IndexBuildProgress("initializing", 0, 0, 0, 0).percent is None
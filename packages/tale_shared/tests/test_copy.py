@@ -0,0 +1,37 @@
+"""Tests for the COPY-based bulk insert helper."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tale_shared.db.copy import copy_insert
+
+
+class TestCopyInsert:
+    @pytest.mark.asyncio
+    async def test_copies_into_staging_then_inserts(self):
+        conn = AsyncMock()
+        records = [(1, "a", [0.1, 0.2]), (2, "b", [0.3, 0.4])]
+
+        await copy_insert(
+            conn,
+            "private_knowledge.chunks",
+            ["chunk_index", "chunk_content", "embedding"],
+            records,
+            column_types={"embedding": "real[]"},
+        )
+
+        create, insert, truncate = [c.args[0] for c in conn.execute.await_args_list]
+        assert create == (
+            "CREATE TEMP TABLE IF NOT EXISTS _copy_chunks ON COMMIT DROP AS "
+            "SELECT chunk_index, chunk_content, NULL::real[] AS embedding "
+            "FROM private_knowledge.chunks WITH NO DATA"
+        )
+        conn.copy_records_to_table.assert_awaited_once_with(
+            "_copy_chunks", records=records, columns=["chunk_index", "chunk_content", "embedding"]
+        )
+        assert insert == (
+            "INSERT INTO private_knowledge.chunks (chunk_index, chunk_content, embedding) "
+            "SELECT chunk_index, chunk_content, embedding FROM _copy_chunks"
+        )
+        assert truncate == "TRUNCATE _copy_chunks"
@@ -0,0 +1,51 @@
+"""Tests for the binary pgvector codecs."""
+
+import struct
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tale_shared.db.vector import (
+    decode_halfvec,
+    decode_vector,
+    encode_halfvec,
+    encode_vector,
+    register_vector_codecs,
+)
+
+
+class TestVectorCodec:
+    def test_wire_format(self):
+        assert encode_vector([1.0, -2.5]) == struct.pack(">HHff", 2, 0, 1.0, -2.5)
+
+    def test_round_trip(self):
+        assert decode_vector(encode_vector([0.25, 0.5, -1.0])) == [0.25, 0.5, -1.0]
+
+    def test_halfvec_round_trip(self):
+        data = encode_halfvec([0.5, -2.0])
+        assert len(data) == 4 + 2 * 2
+        assert decode_halfvec(data) == [0.5, -2.0]
+
+    def test_text_literal_accepted(self):
+        assert encode_vector("[0.5,1.5]") == encode_vector([0.5, 1.5])
+        assert encode_vector("[]") == struct.pack(">HH", 0, 0)
+
+    def test_numpy_matches_list(self):
+        np = pytest.importorskip("numpy")
+
+        values = [0.1, 0.2, 0.3]
+        assert encode_vector(np.array(values, dtype=np.float32)) == encode_vector(values)
+        assert encode_halfvec(np.array(values)) == encode_halfvec(values)
+
+
+class TestRegisterVectorCodecs:
+    @pytest.mark.asyncio
+    async def test_registers_installed_types_in_their_schema(self):
+        conn = AsyncMock()
+        conn.fetch = AsyncMock(return_value=[{"typname": "vector", "nspname": "public"}])
+
+        await register_vector_codecs(conn)
+
+        conn.set_type_codec.assert_awaited_once_with(
+            "vector", schema="public", encoder=encode_vector, decoder=decode_vector, format="binary"
+        )
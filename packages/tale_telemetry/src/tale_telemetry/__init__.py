@@ -4,12 +4,15 @@ Exposes a GET /metrics endpoint in Prometheus text format with:
 - HTTP request count and duration (using FastAPI route templates)
 - Process CPU, memory, threads, open FDs (auto-collected)
 - Python GC stats (auto-collected)
+- Component stats (cache hit counters, limiter state, ...) registered via
+  ``register_stats_collector`` and read lazily at scrape time
 
 Usage:
     from tale_telemetry import init_telemetry, shutdown_telemetry
 
     app = FastAPI(...)
     init_telemetry(app)
+    register_stats_collector("rag_embedding_cache", "Embedding cache", cache.get_stats)
 
     # In lifespan shutdown:
     shutdown_telemetry()
@@ -17,6 +20,7 @@ Usage:
 
 import logging
 import time
+from collections.abc import Callable, Iterator, Mapping
 from typing import Any
 
 from fastapi import FastAPI, Response
@@ -28,6 +32,8 @@ from prometheus_client import (
     Histogram,
     generate_latest,
 )
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,7 @@ _initialized = False
 _request_count: Counter | None = None
 _request_duration: Histogram | None = None
 _active_registry: CollectorRegistry | None = None
+_stats_collectors: dict[str, tuple[CollectorRegistry, "_StatsCollector"]] = {}
 
 # Custom buckets optimised for HTTP request latencies (10 ms - 10 s).
 _HTTP_DURATION_BUCKETS = (
@@ -116,6 +123,63 @@ class _MetricsMiddleware:
             _record_metrics(scope, status_code, time.perf_counter() - start)
 
 
+class _StatsCollector(Collector):
+    """Expose a ``get_stats()`` mapping as one gauge per key.
+
+    The callback runs at scrape time, so components only keep plain
+    counters and never import ``prometheus_client`` themselves.
+    """
+
+    def __init__(self, name: str, documentation: str, get_stats: Callable[[], Mapping[str, float]]) -> None:
+        self._name = name
+        self._documentation = documentation
+        self._get_stats = get_stats
+
+    def describe(self) -> list:
+        # Empty description: skip the registry's eager collect() on register,
+        # the stats source may not be initialised yet.
+        return []
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        try:
+            stats = self._get_stats()
+        except Exception:
+            logger.debug("Failed to read stats for %s", self._name, exc_info=True)
+            return
+        for key, value in sorted(stats.items()):
+            if not isinstance(value, int | float):
+                continue
+            yield GaugeMetricFamily(
+                f"{self._name}_{key}",
+                f"{self._documentation} ({key})",
+                value=float(value),
+            )
+
+
+def register_stats_collector(
+    name: str,
+    documentation: str,
+    get_stats: Callable[[], Mapping[str, float]],
+    *,
+    _registry: CollectorRegistry | None = None,
+) -> None:
+    """Export the numeric values of ``get_stats()`` as ``{name}_{key}`` gauges.
+
+    Registering the same ``name`` again replaces the previous collector,
+    so callers can re-register after rebuilding the component. Never raises.
+    """
+    registry = _registry or _active_registry or REGISTRY
+    try:
+        previous = _stats_collectors.pop(name, None)
+        if previous is not None:
+            previous[0].unregister(previous[1])
+        collector = _StatsCollector(name, documentation, get_stats)
+        registry.register(collector)
+        _stats_collectors[name] = (registry, collector)
+    except Exception:
+        logger.exception("Failed to register stats collector %s", name)
+
+
 def init_telemetry(app: FastAPI, *, _registry: CollectorRegistry | None = None) -> None:
     """Initialise Prometheus metrics and mount ``/metrics``.
 
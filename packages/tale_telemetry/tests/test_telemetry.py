@@ -249,3 +249,44 @@ class TestIdempotency:
         app = _create_app()
         _init(app)
         shutdown_telemetry()
+
+
+# ---------------------------------------------------------------------------
+# Component stats collectors
+# ---------------------------------------------------------------------------
+
+
+class TestStatsCollector:
+    def test_stats_exported_as_gauges(self):
+        app = _create_app()
+        registry = _init(app)
+        stats = {"hits": 3, "misses": 1, "label": "ignored"}
+        mod.register_stats_collector("component_cache", "Component cache", lambda: stats, _registry=registry)
+
+        client = TestClient(app)
+        stats["hits"] = 5
+        body = client.get("/metrics").text
+        assert "component_cache_hits 5.0" in body
+        assert "component_cache_misses 1.0" in body
+        assert "component_cache_label" not in body
+
+    def test_reregistering_replaces_collector(self):
+        registry = CollectorRegistry()
+        mod.register_stats_collector("component", "Component", lambda: {"value": 1}, _registry=registry)
+        mod.register_stats_collector("component", "Component", lambda: {"value": 2}, _registry=registry)
+
+        assert registry.get_sample_value("component_value") == 2.0
+
+    def test_failing_stats_callback_does_not_break_scrape(self):
+        app = _create_app()
+        registry = _init(app)
+
+        def broken() -> dict:
+            raise RuntimeError("not ready")
+
+        mod.register_stats_collector("broken_component", "Broken", broken, _registry=registry)
+
+        client = TestClient(app)
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert "broken_component" not in response.text
@@ -2,6 +2,8 @@
 Configuration for the Tale Crawler service.
 """
 
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import SettingsConfigDict
 from tale_shared.config import BaseServiceSettings
@@ -30,6 +32,41 @@ class Settings(BaseServiceSettings):
     crawl_count_before_restart: int = Field(25, ge=1)
     db_pool_max_size: int = Field(10, ge=2)
 
+    # Chunking: chunk_size / chunk_overlap are characters, or embedding-model
+    # tokens with chunk_sizing="tokens"
+    chunk_size: int = Field(2048, ge=1)
+    chunk_overlap: int = Field(200, ge=0)
+    chunk_sizing: Literal["chars", "tokens"] = "chars"
+    # Pages at least this long are chunked in a worker process (0 = always inline)
+    chunk_offload_threshold_chars: int = Field(262_144, ge=0)
+    chunk_pool_workers: int = Field(2, ge=1)
+
+    # Embedding requests: per-request token ceiling used to pack batches
+    embedding_max_tokens_per_request: int = Field(100_000, ge=1)
+    # Concurrent query embeddings are coalesced for up to this long / this many queries
+    embedding_query_batch_window_ms: int = Field(5, ge=0)
+    embedding_query_batch_size: int = Field(32, ge=1)
+
+    # Embedding cache (content-addressed, memory + Postgres tiers)
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_size: int = Field(4096, ge=0)
+
+    # Query embedding LRU (0 disables)
+    query_embedding_cache_size: int = Field(1024, ge=0)
+    query_embedding_cache_ttl_seconds: int = Field(300, ge=1)
+
+    # Vector index: "full" indexes the whole vector; "halfvec"/"bit" index a
+    # truncated prefix (Matryoshka models) and rescore candidates at full precision
+    vector_index_mode: Literal["full", "halfvec", "bit"] = "full"
+    vector_index_dimensions: int = Field(512, ge=1)
+    vector_rescore_factor: int = Field(4, ge=1)
+
+    # Bulk-load mode (POST /api/v1/index/bulk-load/start|finish): search
+    # indexes are dropped for a large import and rebuilt once with these
+    bulk_load_maintenance_work_mem: str = "2GB"
+    bulk_load_parallel_workers: int = Field(4, ge=0)
+    bulk_load_rebuild_timeout_seconds: int = Field(86_400, ge=1)
+
 
 # Global settings instance
 settings = Settings()
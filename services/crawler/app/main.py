@@ -20,7 +20,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from tale_shared.logging import suppress_health_check_logs
-from tale_telemetry import init_telemetry, shutdown_telemetry
+from tale_telemetry import init_telemetry, register_stats_collector, shutdown_telemetry
 
 from app import __version__
 from app.config import settings
@@ -37,7 +37,14 @@ from app.routers import (
     web_router,
     websites_router,
 )
+from app.services.chunking_service import configure_chunk_pool, shutdown_chunk_pool
 from app.services.crawler_service import get_crawler_service
+from app.services.embedding_service import (
+    configure_embedding_cache,
+    get_embedding_cache_stats,
+    get_embedding_limiter_stats,
+    get_query_embedding_cache_stats,
+)
 from app.services.image_service import get_image_service
 from app.services.pdf_service import get_pdf_service
 
@@ -57,6 +64,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         f"db_pool={settings.db_pool_max_size}"
     )
 
+    # Worker processes for chunking very large pages (started on first use)
+    configure_chunk_pool(settings.chunk_pool_workers)
+
     # Initialize crawler service
     try:
         crawler = get_crawler_service(
@@ -86,6 +96,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
             from app.services.index_health import check_and_repair_chunks_index
 
             await check_and_repair_chunks_index(pool)
+            configure_embedding_cache(pool)
 
             pg_store_manager = PgWebsiteStoreManager(pool)
             indexing_service = IndexingService(pool)
@@ -156,6 +167,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         logger.info("Scheduler stopped")
 
     if db_initialized:
+        from app.services.bulk_load import bulk_loader
+
+        await bulk_loader.stop()
+
         # Wait for any in-flight background deletions to finish
         from app.routers.websites import get_delete_tasks
 
@@ -169,6 +184,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 
     # Always close pool if it was created (handles partial init failures)
     await close_pool()
+    shutdown_chunk_pool()
 
     try:
         crawler = get_crawler_service()
@@ -202,6 +218,21 @@ app.add_middleware(
 )
 
 init_telemetry(app)
+register_stats_collector(
+    "crawler_embedding_cache",
+    "Embedding cache lookups served without a provider call",
+    get_embedding_cache_stats,
+)
+register_stats_collector(
+    "crawler_embedding_limiter",
+    "Adaptive embedding request concurrency",
+    get_embedding_limiter_stats,
+)
+register_stats_collector(
+    "crawler_query_embedding_cache",
+    "Query embedding LRU lookups",
+    get_query_embedding_cache_stats,
+)
 
 
 # Register routers
@@ -527,3 +527,24 @@ class IndexWebsiteResponse(BaseModel):
     pages_skipped: int
     pages_failed: int
     total_chunks: int
+
+
+class IndexBuildStatus(BaseModel):
+    """Progress of one running index build (from pg_stat_progress_create_index)."""
+
+    phase: str
+    blocks_done: int
+    blocks_total: int
+    tuples_done: int
+    tuples_total: int
+    percent: float | None = None
+
+
+class BulkLoadStatusResponse(BaseModel):
+    """State of bulk-load mode."""
+
+    active: bool
+    suspended_indexes: list[str]
+    rebuilding: bool
+    builds: list[IndexBuildStatus]
+    approximate_chunks: int
@@ -5,7 +5,14 @@ Index Router — Content indexing management endpoints.
 from fastapi import APIRouter, HTTPException
 from loguru import logger
 
-from app.models import IndexPageRequest, IndexPageResponse, IndexWebsiteResponse
+from app.models import (
+    BulkLoadStatusResponse,
+    IndexBuildStatus,
+    IndexPageRequest,
+    IndexPageResponse,
+    IndexWebsiteResponse,
+)
+from app.services.bulk_load import bulk_loader
 from app.services.indexing_service import IndexingService
 
 router = APIRouter(prefix="/api/v1/index", tags=["Indexing"])
@@ -72,3 +79,56 @@ async def index_website(domain: str):
     except Exception:
         logger.exception(f"Website indexing failed for {domain}")
         raise HTTPException(status_code=500, detail="Website indexing failed") from None
+
+
+async def _bulk_load_status() -> BulkLoadStatusResponse:
+    state = await bulk_loader.status()
+    builds = [
+        IndexBuildStatus(
+            phase=b.phase,
+            blocks_done=b.blocks_done,
+            blocks_total=b.blocks_total,
+            tuples_done=b.tuples_done,
+            tuples_total=b.tuples_total,
+            percent=b.percent,
+        )
+        for b in state["builds"]
+    ]
+    return BulkLoadStatusResponse(**{**state, "builds": builds})
+
+
+@router.get("/bulk-load", response_model=BulkLoadStatusResponse)
+async def get_bulk_load_status():
+    """Report whether bulk-load mode is active and how far the index rebuild is."""
+    try:
+        return await _bulk_load_status()
+    except Exception:
+        logger.exception("Failed to read bulk load status")
+        raise HTTPException(status_code=500, detail="Failed to read bulk load status") from None
+
+
+@router.post("/bulk-load/start", response_model=BulkLoadStatusResponse)
+async def start_bulk_load():
+    """Suspend the chunk search indexes so a large first crawl skips per-row index updates.
+
+    Search stays available but is slow until the load is finished.
+    """
+    if bulk_loader.rebuilding:
+        raise HTTPException(status_code=409, detail="Index rebuild in progress")
+    try:
+        await bulk_loader.start()
+        return await _bulk_load_status()
+    except Exception:
+        logger.exception("Failed to start bulk load")
+        raise HTTPException(status_code=500, detail="Failed to start bulk load") from None
+
+
+@router.post("/bulk-load/finish", response_model=BulkLoadStatusResponse, status_code=202)
+async def finish_bulk_load():
+    """Rebuild the suspended indexes in the background; poll ``GET /bulk-load`` for progress."""
+    try:
+        await bulk_loader.finish()
+        return await _bulk_load_status()
+    except Exception:
+        logger.exception("Failed to finish bulk load")
+        raise HTTPException(status_code=500, detail="Failed to finish bulk load") from None
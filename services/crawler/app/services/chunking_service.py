@@ -4,7 +4,16 @@ Markdown-aware content chunking for search indexing.
 Re-exports from the shared tale_knowledge package.
 """
 
-from tale_knowledge.chunking import ContentChunk, chunk_content  # noqa: F401
+from tale_knowledge.chunking import (  # noqa: F401
+    ChunkDiff,
+    ChunkSizing,
+    ContentChunk,
+    chunk_content,
+    chunk_content_async,
+    configure_chunk_pool,
+    plan_chunk_diff,
+    shutdown_chunk_pool,
+)
 from tale_knowledge.chunking.splitter import (  # noqa: F401
     CHUNK_OVERLAP,
     CHUNK_SIZE,
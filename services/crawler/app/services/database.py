@@ -11,11 +11,13 @@ import os
 
 import asyncpg
 from loguru import logger
-from tale_shared.db import acquire_with_retry
+from tale_knowledge.retrieval import PrefixIndex, prefix_index_for
+from tale_shared.db import acquire_with_retry, register_vector_codecs, suspended_indexes
 
 from app.config import settings
 
 SCHEMA = "public_web"
+_HNSW_INDEX_BASE = "idx_pw_chunks_embedding"
 
 _pool: asyncpg.Pool | None = None
 _pool_lock = asyncio.Lock()
@@ -33,8 +35,10 @@ def _get_database_url() -> str:
 
 
 async def _init_connection(conn: asyncpg.Connection):
-    """Register JSONB codec so asyncpg returns dicts instead of raw strings."""
+    """Register JSONB codec so asyncpg returns dicts instead of raw strings,
+    and binary pgvector codecs so embeddings skip text formatting/parsing."""
     await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+    await register_vector_codecs(conn)
 
 
 async def init_pool(*, max_size: int = 10) -> asyncpg.Pool:
@@ -88,22 +92,77 @@ async def init_pool(*, max_size: int = 10) -> asyncpg.Pool:
                 f"{SCHEMA}.chunks",
             )
             if col_type != expected_type:
-                await conn.execute(f"DROP INDEX IF EXISTS {SCHEMA}.idx_pw_chunks_embedding_hnsw")
+                full_index = f"{SCHEMA}.{_HNSW_INDEX_BASE}_hnsw"
+                for index in dict.fromkeys([full_index, *await list_vector_indexes(conn)]):
+                    await conn.execute(f"DROP INDEX IF EXISTS {index}")
                 await conn.execute(
                     f"ALTER TABLE {SCHEMA}.chunks ALTER COLUMN embedding TYPE vector({int(configured_dims)})"
                 )
                 logger.info(f"Pinned embedding column to vector({configured_dims}) (was {col_type})")
 
-        # Create HNSW index if it doesn't exist yet.
+        # Create the HNSW index for the configured mode if it doesn't exist yet.
         try:
             async with acquire_with_retry(_pool) as conn:
-                await conn.execute(f"SELECT {SCHEMA}.create_chunks_hnsw_index()")
+                await ensure_vector_index(conn)
         except Exception as e:
             logger.warning(f"HNSW index creation deferred: {e}")
 
         return _pool
 
 
+def vector_prefix_index() -> PrefixIndex | None:
+    """Prefix index selected by ``vector_index_mode``, or None for full vectors."""
+    if settings.vector_index_mode == "full":
+        return None
+    return prefix_index_for(
+        settings.vector_index_mode, settings.vector_index_dimensions, settings.get_embedding_dimensions()
+    )
+
+
+def vector_index_name() -> str:
+    """Qualified name of the HNSW index the current settings search through."""
+    prefix = vector_prefix_index()
+    name = prefix.index_name(_HNSW_INDEX_BASE) if prefix else f"{_HNSW_INDEX_BASE}_hnsw"
+    return f"{SCHEMA}.{name}"
+
+
+async def list_vector_indexes(conn: asyncpg.Connection) -> list[str]:
+    """Qualified names of the HNSW indexes currently on chunks.embedding."""
+    rows = await conn.fetch(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = $1 AND tablename = 'chunks' AND indexname LIKE $2",
+        SCHEMA,
+        f"{_HNSW_INDEX_BASE}%hnsw",
+    )
+    return [f"{SCHEMA}.{row['indexname']}" for row in rows]
+
+
+async def ensure_vector_index(conn: asyncpg.Connection) -> None:
+    """Converge chunks to exactly one HNSW index for the configured mode.
+
+    Full mode uses the migration-defined ``create_chunks_hnsw_index()``;
+    prefix modes build an expression index over the truncated prefix and
+    drop the full-width graph (and any other stale width).
+
+    Does nothing while a bulk load has the indexes suspended.
+    """
+    if await suspended_indexes(conn, SCHEMA):
+        logger.info("Bulk load in progress, vector index build deferred to its finish")
+        return
+
+    wanted = vector_index_name()
+    for index in await list_vector_indexes(conn):
+        if index != wanted:
+            logger.info(f"Dropping stale vector index {index}")
+            await conn.execute(f"DROP INDEX IF EXISTS {index}")
+
+    prefix = vector_prefix_index()
+    if prefix is None:
+        await conn.execute(f"SELECT {SCHEMA}.create_chunks_hnsw_index()")
+    else:
+        name = wanted.split(".", 1)[1]
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {SCHEMA}.chunks {prefix.index_method()}")
+
+
 def get_pool() -> asyncpg.Pool:
     if _pool is None:
         raise RuntimeError("Database pool not initialized. Call init_pool() first.")
@@ -0,0 +1,58 @@
+"""
+Postgres-backed tier for the content-addressed embedding cache.
+
+Persists embeddings in ``public_web.embedding_cache`` keyed by
+(model, dimensions, sha256(text)) so recrawled pages only pay for the
+chunks whose embed text actually changed. Vectors are stored as ``REAL[]``:
+the table is only read by primary key and needs no vector index.
+"""
+
+import asyncpg
+from tale_knowledge.embedding import InMemoryEmbeddingCache, TieredEmbeddingCache
+
+from app.config import settings
+from app.services.database import SCHEMA, acquire_with_retry
+
+
+class PostgresEmbeddingCache:
+    name = "postgres"
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+
+    async def get_many(self, model: str, dimensions: int, text_hashes: list[str]) -> dict[str, list[float]]:
+        if not text_hashes:
+            return {}
+        async with acquire_with_retry(self._pool) as conn:
+            rows = await conn.fetch(
+                f"""SELECT text_hash, embedding
+                    FROM {SCHEMA}.embedding_cache
+                    WHERE model = $1 AND dimensions = $2 AND text_hash = ANY($3)""",
+                model,
+                dimensions,
+                text_hashes,
+            )
+        return {row["text_hash"]: list(row["embedding"]) for row in rows}
+
+    async def set_many(self, model: str, dimensions: int, entries: dict[str, list[float]]) -> None:
+        if not entries:
+            return
+        async with acquire_with_retry(self._pool) as conn:
+            await conn.executemany(
+                f"""INSERT INTO {SCHEMA}.embedding_cache (model, dimensions, text_hash, embedding)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (model, dimensions, text_hash) DO NOTHING""",
+                [(model, dimensions, text_hash, vector) for text_hash, vector in entries.items()],
+            )
+
+
+def build_embedding_cache(pool: asyncpg.Pool) -> TieredEmbeddingCache | None:
+    """Build the memory + Postgres cache from settings, or None when disabled."""
+    if not settings.embedding_cache_enabled:
+        return None
+    return TieredEmbeddingCache(
+        [
+            InMemoryEmbeddingCache(settings.embedding_cache_memory_size),
+            PostgresEmbeddingCache(pool),
+        ]
+    )
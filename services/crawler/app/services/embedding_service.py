@@ -4,19 +4,36 @@ OpenAI-compatible embedding generation service.
 Crawler-specific factory with TTL-based config refresh.
 When provider config files change (e.g. API key rotation), the client
 is automatically rebuilt on the next access after the TTL expires.
+The embedding cache is configured once the DB pool exists and is shared
+across rebuilds; the query embedding LRU is also shared, and cleared
+whenever the client is rebuilt for a new provider config.
 """
 
 import asyncio
 import contextlib
 import time
 
+import asyncpg
 from loguru import logger
-from tale_knowledge.embedding import EmbeddingService
+from tale_knowledge.embedding import (
+    EmbeddingService,
+    QueryEmbeddingCache,
+    TieredEmbeddingCache,
+    create_embedding_service,
+    is_local_base_url,
+)
 
 from app.config import settings
+from app.services.embedding_cache import build_embedding_cache
 
 _embedding_service: EmbeddingService | None = None
 _embedding_config: tuple | None = None
+_embedding_cache: TieredEmbeddingCache | None = None
+_query_embedding_cache: QueryEmbeddingCache | None = (
+    QueryEmbeddingCache(settings.query_embedding_cache_size, settings.query_embedding_cache_ttl_seconds)
+    if settings.query_embedding_cache_size > 0
+    else None
+)
 _last_config_check: float = 0
 _CONFIG_CHECK_INTERVAL = 15  # seconds
 
@@ -30,6 +47,37 @@ async def _close_old(service: EmbeddingService) -> None:
         logger.opt(exception=True).warning("Failed to close old embedding service")
 
 
+def configure_embedding_cache(pool: asyncpg.Pool) -> None:
+    """Enable the memory + Postgres embedding cache for subsequent clients."""
+    global _embedding_cache, _embedding_config, _last_config_check
+
+    _embedding_cache = build_embedding_cache(pool)
+    # Force the next get_embedding_service() call to rebuild with the cache.
+    _embedding_config = None
+    _last_config_check = 0
+
+
+def get_embedding_cache_stats() -> dict[str, int]:
+    """Embedding cache hit/miss counters (empty when the cache is disabled)."""
+    if _embedding_cache is None:
+        return {}
+    return _embedding_cache.get_stats()
+
+
+def get_embedding_limiter_stats() -> dict[str, float]:
+    """Adaptive embedding concurrency: current limit, in-flight, throttle events."""
+    if _embedding_service is None:
+        return {}
+    return _embedding_service.limiter.get_stats()
+
+
+def get_query_embedding_cache_stats() -> dict[str, float]:
+    """Query embedding LRU hits, misses and hit rate (empty when disabled)."""
+    if _query_embedding_cache is None:
+        return {}
+    return _query_embedding_cache.get_stats()
+
+
 def get_embedding_service() -> EmbeddingService:
     global _embedding_service, _embedding_config, _last_config_check
 
@@ -51,8 +99,8 @@ def get_embedding_service() -> EmbeddingService:
 
     base_url, api_key, model, dims = config
 
-    # Never downgrade to empty key
-    if not api_key and _embedding_service is not None:
+    # Never downgrade to empty key (local backends need none)
+    if not api_key and not is_local_base_url(base_url) and _embedding_service is not None:
         logger.warning("Skipping embedding reload: new config has empty API key")
         return _embedding_service
 
@@ -66,16 +114,24 @@ def get_embedding_service() -> EmbeddingService:
         return _embedding_service
 
     old = _embedding_service
-    _embedding_service = EmbeddingService(
+    _embedding_service = create_embedding_service(
         api_key=api_key,
         base_url=base_url,
         model=model,
         dimensions=dims,
+        cache=_embedding_cache,
+        max_tokens_per_request=settings.embedding_max_tokens_per_request,
+        query_batch_window=settings.embedding_query_batch_window_ms / 1000,
+        query_batch_size=settings.embedding_query_batch_size,
+        query_cache=_query_embedding_cache,
     )
     _embedding_config = config
 
     if old is not None:
         logger.info("Embedding service rebuilt: model={}", model)
+        # Vectors from the previous provider must not answer new queries.
+        if _query_embedding_cache is not None:
+            _query_embedding_cache.clear()
         with contextlib.suppress(RuntimeError):
             asyncio.get_running_loop().create_task(_close_old(old))
     else:
@@ -4,21 +4,25 @@ import asyncpg
 from loguru import logger
 from tale_shared.db import acquire_with_retry
 
+from app.services.database import vector_index_name
+
 SCHEMA = "public_web"
 _BM25_INDEX = f"{SCHEMA}.idx_pw_chunks_bm25"
-_HNSW_INDEX = f"{SCHEMA}.idx_pw_chunks_embedding_hnsw"
 
 
 async def reindex_chunks(pool: asyncpg.Pool) -> None:
     """Rebuild BM25 and HNSW indexes on public_web.chunks.
 
+    The HNSW index is the one ``vector_index_mode`` selects (full-width or
+    truncated prefix).
+
     REINDEX cannot run inside a transaction, so each index is rebuilt
     separately on a bare connection.  Uses plain REINDEX (not CONCURRENTLY)
     since this runs after bulk deletes or during error recovery where
     correctness matters more than availability.
     """
     async with acquire_with_retry(pool) as conn:
-        for index in (_BM25_INDEX, _HNSW_INDEX):
+        for index in (_BM25_INDEX, vector_index_name()):
             try:
                 await conn.execute(f"REINDEX INDEX {index}", timeout=300)
                 logger.info("Rebuilt index: {}", index)
@@ -4,17 +4,31 @@ Content indexing pipeline: chunk → embed → store in PostgreSQL.
 Includes incremental cross-page paragraph deduplication: paragraph
 fingerprints are tracked per page, and lines appearing on more than
 a threshold number of pages are filtered as boilerplate before chunking.
+
+Re-indexing a changed page is chunk-aware: new chunks are matched to the
+stored ones by ``chunk_hash`` and only added or changed chunks are embedded
+and written. Unchanged rows keep their embedding (they are renumbered when a
+chunk before them was added or removed and take the new page hash), so a
+page edit that touches one paragraph costs one embedding.
 """
 
 import asyncio
 import hashlib
 import logging
+from collections.abc import Awaitable, Callable
 
 import asyncpg
-from tale_shared.db import transact_with_retry
-
-from app.services.chunking_service import build_metadata_prefix, chunk_content
-from app.services.database import acquire_with_retry
+from tale_shared.db import copy_insert, transact_with_retry
+
+from app.config import settings
+from app.services.chunking_service import (
+    ChunkDiff,
+    ContentChunk,
+    build_metadata_prefix,
+    chunk_content_async,
+    plan_chunk_diff,
+)
+from app.services.database import acquire_with_retry, ensure_vector_index
 from app.services.embedding_service import get_embedding_service
 from app.services.index_health import reindex_chunks
 from app.utils.paragraph_dedup import (
@@ -28,6 +42,26 @@ logger = logging.getLogger(__name__)
 
 INDEXING_CONCURRENCY = 5
 _EXECUTEMANY_BATCH_SIZE = 25
+# Pages with at least this many new chunks are written with binary COPY
+_COPY_MIN_ROWS = 100
+
+_CHUNK_COLUMNS = (
+    "domain",
+    "url",
+    "title",
+    "content_hash",
+    "chunk_index",
+    "chunk_content",
+    "embedding",
+    "core_content",
+    "prefix_overlap",
+    "suffix_overlap",
+    "chunk_hash",
+)
+_CHUNK_INSERT = """\
+INSERT INTO chunks (domain, url, title, content_hash, chunk_index, chunk_content, embedding,
+                    core_content, prefix_overlap, suffix_overlap, chunk_hash)
+VALUES ($1, $2, $3, $4, $5, $6, $7::vector, $8, $9, $10, $11)"""
 
 _UPSERT_WEBSITE_URL = """\
 INSERT INTO website_urls (domain, url, title, content_hash, status, discovered_at, last_crawled_at, metadata)
@@ -38,11 +72,81 @@ ON CONFLICT (domain, url) DO UPDATE SET
   metadata = jsonb_set(COALESCE(website_urls.metadata, '{}'), '{filtering_hash}', to_jsonb($5::text)),
   last_crawled_at = NOW()"""
 
+_STORED_CHUNKS = """SELECT id, chunk_index, CASE WHEN embedding IS NOT NULL THEN chunk_hash END AS chunk_hash
+FROM chunks WHERE url = $1"""
+# Rounds of (embed what the diff needs, apply it) before giving up on a
+# page whose stored chunks keep changing under us
+_STORE_ROUNDS = 3
+
+
+class _StaleChunkDiff(Exception):
+    """The stored chunks changed since the diff was planned; these positions need embedding."""
+
+    def __init__(self, positions: list[int]) -> None:
+        super().__init__(f"{len(positions)} chunks need embedding")
+        self.positions = positions
+
 
 def _sha256(content: str) -> str:
     return hashlib.sha256(content.encode()).hexdigest()
 
 
+async def _insert_chunk_rows(conn: asyncpg.Connection, chunk_rows: list[tuple]) -> None:
+    """Insert chunk rows (embedding as a float list in position 6).
+
+    Large pages go through binary COPY (the pool's ``vector`` codec encodes
+    the embedding); small ones use batched executemany.
+    """
+    if len(chunk_rows) >= _COPY_MIN_ROWS:
+        await copy_insert(
+            conn,
+            "chunks",
+            _CHUNK_COLUMNS,
+            chunk_rows,
+        )
+        return
+    for i in range(0, len(chunk_rows), _EXECUTEMANY_BATCH_SIZE):
+        await conn.executemany(_CHUNK_INSERT, chunk_rows[i : i + _EXECUTEMANY_BATCH_SIZE])
+
+
+async def _renumber_reused_chunks(
+    conn: asyncpg.Connection,
+    url: str,
+    content_hash: str,
+    diff: ChunkDiff,
+    chunks: list[ContentChunk],
+) -> None:
+    """Move reused rows to their new positions and refresh their spans and page hash.
+
+    ``(url, chunk_index)`` is unique and checked row by row, so moved rows
+    are first parked at negative positions and then flipped to their final
+    ones. Rows whose position, spans and page hash are unchanged are not
+    touched.
+    """
+    if not diff.updates:
+        return
+    await conn.execute(
+        """UPDATE chunks c
+           SET chunk_index = -1 - v.chunk_index,
+               content_hash = $6,
+               core_content = v.core_content,
+               prefix_overlap = v.prefix_overlap,
+               suffix_overlap = v.suffix_overlap
+           FROM unnest($1::bigint[], $2::int[], $3::text[], $4::text[], $5::text[])
+               AS v(id, chunk_index, core_content, prefix_overlap, suffix_overlap)
+           WHERE c.id = v.id
+             AND (c.chunk_index, c.content_hash, c.core_content, c.prefix_overlap, c.suffix_overlap)
+                 IS DISTINCT FROM (v.chunk_index, $6, v.core_content, v.prefix_overlap, v.suffix_overlap)""",
+        [row_id for row_id, _ in diff.updates],
+        [chunks[position].index for _, position in diff.updates],
+        [chunks[position].core_content for _, position in diff.updates],
+        [chunks[position].prefix_overlap for _, position in diff.updates],
+        [chunks[position].suffix_overlap for _, position in diff.updates],
+        content_hash,
+    )
+    await conn.execute("UPDATE chunks SET chunk_index = -1 - chunk_index WHERE url = $1 AND chunk_index < 0", url)
+
+
 class IndexingService:
     def __init__(self, pool: asyncpg.Pool):
         self._pool = pool
@@ -113,7 +217,14 @@ class IndexingService:
         # reintroduced below at embed- and storage-time only, so BM25 on
         # `chunk_content` keeps matching title/URL keywords until Phase 4
         # moves that responsibility onto dedicated indexed columns.
-        chunks = chunk_content(filtered)
+        chunks = await chunk_content_async(
+            filtered,
+            settings.chunk_size,
+            settings.chunk_overlap,
+            sizing=settings.chunk_sizing,
+            tokenizer_model=get_embedding_service().model if settings.chunk_sizing == "tokens" else None,
+            offload_threshold=settings.chunk_offload_threshold_chars,
+        )
         if not chunks:
             async with acquire_with_retry(self._pool) as conn:
                 await conn.execute(_UPSERT_WEBSITE_URL, domain, url, title, content_hash, filtered_hash)
@@ -129,45 +240,108 @@ class IndexingService:
         # chunk_content itself can be dropped in Phase 5.
         metadata_prefix = build_metadata_prefix(title, url)
         embed_texts = [metadata_prefix + c.content for c in chunks]
-        try:
-            embeddings = await get_embedding_service().embed_texts(embed_texts)
-        except Exception:
-            logger.exception(f"Embedding failed for {url}")
-            return {"url": url, "status": "error", "chunks_indexed": 0, "error": "embedding_failed"}
+        chunk_hashes = [_sha256(text) for text in embed_texts]
+
+        # Match against the stored chunks so unchanged ones keep their
+        # embedding. Hashing the prefixed text means a title change re-embeds
+        # the page, as it changes every embedding input. This plan only picks
+        # what to embed; the store re-plans against the rows it locks.
+        if existing is None:
+            diff = ChunkDiff.insert_all(len(chunks))
+        else:
+            async with acquire_with_retry(self._pool) as conn:
+                stored = await conn.fetch(_STORED_CHUNKS, url)
+            diff = plan_chunk_diff([(r["id"], r["chunk_index"], r["chunk_hash"]) for r in stored], chunk_hashes)
+
+        embeddings: dict[int, list[float]] = {}
 
         # Store in DB (transactional + retried). `chunk_content` keeps the
         # same shape as pre-refactor (prefix + raw chunk text) so the BM25
         # index doesn't regress; the three new columns hold the clean
         # forward-owning decomposition produced by tale_knowledge.
-        chunk_rows = [
-            (
-                domain,
+        async def _store_chunks(conn: asyncpg.Connection) -> ChunkDiff:
+            # The website_urls row lock serializes indexers of the same page
+            await conn.execute(_UPSERT_WEBSITE_URL, domain, url, title, content_hash, filtered_hash)
+            stored = await conn.fetch(f"{_STORED_CHUNKS} FOR UPDATE", url)
+            locked = plan_chunk_diff([(r["id"], r["chunk_index"], r["chunk_hash"]) for r in stored], chunk_hashes)
+            missing = [position for position in locked.inserts if position not in embeddings]
+            if missing:
+                raise _StaleChunkDiff(missing)
+            await conn.execute(
+                "DELETE FROM chunks WHERE url = $1 AND id <> ALL($2::bigint[])",
                 url,
-                title,
-                content_hash,
-                chunk.index,
-                embed_texts[i],  # chunk_content = prefix + chunk.content
-                str(embeddings[i]),
-                chunk.core_content,
-                chunk.prefix_overlap,
-                chunk.suffix_overlap,
+                [row_id for row_id, _ in locked.updates],
             )
-            for i, chunk in enumerate(chunks)
-        ]
+            await _renumber_reused_chunks(conn, url, content_hash, locked, chunks)
+            chunk_rows = [
+                (
+                    domain,
+                    url,
+                    title,
+                    content_hash,
+                    chunks[position].index,
+                    embed_texts[position],  # chunk_content = prefix + chunk.content
+                    embeddings[position],
+                    chunks[position].core_content,
+                    chunks[position].prefix_overlap,
+                    chunks[position].suffix_overlap,
+                    chunk_hashes[position],
+                )
+                for position in locked.inserts
+            ]
+            await _insert_chunk_rows(conn, chunk_rows)
+            return locked
+
+        to_embed = diff.inserts
+        for _ in range(_STORE_ROUNDS):
+            if to_embed:
+                try:
+                    vectors = await get_embedding_service().embed_texts([embed_texts[i] for i in to_embed])
+                except Exception:
+                    logger.exception(f"Embedding failed for {url}")
+                    return {"url": url, "status": "error", "chunks_indexed": 0, "error": "embedding_failed"}
+                embeddings.update(zip(to_embed, vectors, strict=True))
+            try:
+                diff = await self._store_page_chunks(_store_chunks)
+                break
+            except _StaleChunkDiff as exc:
+                to_embed = exc.positions
+        else:
+            logger.warning("Stored chunks of %s kept changing while it was indexed", url)
+            return {"url": url, "status": "error", "chunks_indexed": 0, "error": "chunks_changed"}
 
-        _chunk_insert = """\
-INSERT INTO chunks (domain, url, title, content_hash, chunk_index, chunk_content, embedding,
-                    core_content, prefix_overlap, suffix_overlap)
-VALUES ($1, $2, $3, $4, $5, $6, $7::vector, $8, $9, $10)"""
+        # Ensure HNSW index exists once embeddings are stored
+        if not self._hnsw_ensured:
+            try:
+                async with acquire_with_retry(self._pool) as conn:
+                    await ensure_vector_index(conn)
+                self._hnsw_ensured = True
+            except Exception as e:
+                logger.warning("HNSW index creation deferred: %s", e)
 
-        async def _store_chunks(conn: asyncpg.Connection) -> None:
-            await conn.execute(_UPSERT_WEBSITE_URL, domain, url, title, content_hash, filtered_hash)
-            await conn.execute("DELETE FROM chunks WHERE url = $1", url)
-            for i in range(0, len(chunk_rows), _EXECUTEMANY_BATCH_SIZE):
-                await conn.executemany(_chunk_insert, chunk_rows[i : i + _EXECUTEMANY_BATCH_SIZE])
+        if page_counts:
+            boilerplate_count = sum(1 for c in page_counts.values() if c > BOILERPLATE_PAGE_THRESHOLD)
+            logger.info(
+                "Indexed %d chunks for %s (%d reused, filtered %d boilerplate lines)",
+                len(chunks),
+                url,
+                diff.reused,
+                boilerplate_count,
+            )
+        else:
+            logger.info("Indexed %d chunks for %s (%d reused)", len(chunks), url, diff.reused)
+
+        return {
+            "url": url,
+            "status": "indexed",
+            "chunks_indexed": len(chunks),
+            "chunks_embedded": len(diff.inserts),
+            "chunks_reused": diff.reused,
+        }
 
+    async def _store_page_chunks(self, store: Callable[[asyncpg.Connection], Awaitable[ChunkDiff]]) -> ChunkDiff:
         try:
-            await transact_with_retry(self._pool, _store_chunks)
+            return await transact_with_retry(self._pool, store)
         except (
             asyncpg.PostgresConnectionError,
             asyncpg.InterfaceError,
@@ -179,24 +353,7 @@ VALUES ($1, $2, $3, $4, $5, $6, $7::vector, $8, $9, $10)"""
                 exc,
             )
             await reindex_chunks(self._pool)
-            await transact_with_retry(self._pool, _store_chunks)
-
-        # Ensure HNSW index exists once embeddings are stored
-        if not self._hnsw_ensured:
-            try:
-                async with acquire_with_retry(self._pool) as conn:
-                    await conn.execute("SELECT create_chunks_hnsw_index()")
-                self._hnsw_ensured = True
-            except Exception as e:
-                logger.warning("HNSW index creation deferred: %s", e)
-
-        if page_counts:
-            boilerplate_count = sum(1 for c in page_counts.values() if c > BOILERPLATE_PAGE_THRESHOLD)
-            logger.info("Indexed %d chunks for %s (filtered %d boilerplate lines)", len(chunks), url, boilerplate_count)
-        else:
-            logger.info("Indexed %d chunks for %s", len(chunks), url)
-
-        return {"url": url, "status": "indexed", "chunks_indexed": len(chunks)}
+            return await transact_with_retry(self._pool, store)
 
     async def index_website(self, domain: str) -> dict:
         indexed = 0
@@ -1,20 +1,32 @@
 """
 Hybrid search service: BM25 full-text (pg_search) + pgvector similarity with RRF fusion.
+
+When the BM25 index is missing (dropped for a bulk load, see
+``app.services.bulk_load``) or broken, searches fall back to vector-only
+results instead of failing.
 """
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass
 
 import asyncpg
+from tale_knowledge.retrieval import PrefixIndex, candidate_limit
 
-from app.services.database import acquire_with_retry
+from app.config import settings
+from app.services.database import acquire_with_retry, vector_prefix_index
 from app.services.embedding_service import get_embedding_service
 
 logger = logging.getLogger(__name__)
 
 RRF_K = 60
+# Substrings of pg_search errors raised when the BM25 index is missing or broken
+_BM25_ERROR_MARKERS = ("bm25", "paradedb", "@@@")
+
+
+def _is_bm25_error(exc: asyncpg.PostgresError) -> bool:
+    message = str(exc).lower()
+    return any(marker in message for marker in _BM25_ERROR_MARKERS)
 
 
 @dataclass
@@ -46,7 +58,13 @@ class SearchService:
         fts_task = asyncio.create_task(self._fts_search(query, domain, limit * 3))
 
         query_embedding = await embedding_task
-        fts_results = await fts_task
+        try:
+            fts_results = await fts_task
+        except asyncpg.PostgresError as e:
+            if not _is_bm25_error(e):
+                raise
+            logger.warning("BM25 search unavailable, falling back to vector-only: %s", e)
+            fts_results = []
         vector_results = await self._vector_search(query_embedding, domain, limit * 3)
 
         # Pre-filter vector results by cosine similarity (matches RAG pipeline).
@@ -97,7 +115,10 @@ class SearchService:
             return [dict(r) for r in rows]
 
     async def _vector_search(self, embedding: list[float], domain: str | None, limit: int) -> list[dict]:
-        vec_str = json.dumps(embedding)
+        prefix = vector_prefix_index()
+        if prefix is not None:
+            return await self._prefix_vector_search(embedding, domain, limit, prefix)
+
         async with acquire_with_retry(self._pool) as conn:
             if domain:
                 rows = await conn.fetch(
@@ -107,7 +128,7 @@ class SearchService:
                        WHERE domain = $2 AND embedding IS NOT NULL
                        ORDER BY embedding <=> $1::vector
                        LIMIT $3""",
-                    vec_str,
+                    embedding,
                     domain,
                     limit,
                 )
@@ -119,11 +140,37 @@ class SearchService:
                        WHERE embedding IS NOT NULL
                        ORDER BY embedding <=> $1::vector
                        LIMIT $2""",
-                    vec_str,
+                    embedding,
                     limit,
                 )
             return [dict(r) for r in rows]
 
+    async def _prefix_vector_search(
+        self, embedding: list[float], domain: str | None, limit: int, prefix: PrefixIndex
+    ) -> list[dict]:
+        """HNSW over the truncated prefix picks candidates; full vectors rescore them."""
+        candidates = candidate_limit(limit, settings.vector_rescore_factor)
+        domain_clause = "AND domain = $4" if domain else ""
+        sql = f"""SELECT c.id, c.url, c.title, c.chunk_content, c.core_content, c.chunk_index,
+                         1 - (c.embedding <=> $1::vector) AS score
+                  FROM (
+                      SELECT id
+                      FROM chunks
+                      WHERE embedding IS NOT NULL {domain_clause}
+                      ORDER BY {prefix.distance("embedding", "$1::vector")}
+                      LIMIT $2
+                  ) candidates
+                  JOIN chunks c ON c.id = candidates.id
+                  ORDER BY c.embedding <=> $1::vector
+                  LIMIT $3"""
+        params = [embedding, candidates, limit, *([domain] if domain else [])]
+
+        async with acquire_with_retry(self._pool) as conn, conn.transaction():
+            # The HNSW scan returns at most ef_search rows.
+            await conn.execute(f"SET LOCAL hnsw.ef_search = {max(candidates, 40)}")
+            rows = await conn.fetch(sql, *params)
+            return [dict(r) for r in rows]
+
     @staticmethod
     def _merge_rrf(ranked_lists: list[list[dict]], limit: int) -> list[SearchResult]:
         scores: dict[int, float] = {}
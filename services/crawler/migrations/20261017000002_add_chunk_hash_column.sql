@@ -0,0 +1,12 @@
+-- migrate:up
+-- Per-chunk hash of chunk_content (the exact text the embedding was computed
+-- from). Re-indexing a changed page matches new chunks against it and only
+-- embeds and writes the ones that differ. Existing rows start NULL and are
+-- replaced the next time their page changes.
+
+ALTER TABLE public_web.chunks
+    ADD COLUMN IF NOT EXISTS chunk_hash TEXT;
+
+-- migrate:down
+ALTER TABLE public_web.chunks
+    DROP COLUMN IF EXISTS chunk_hash;
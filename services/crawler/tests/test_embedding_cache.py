@@ -0,0 +1,76 @@
+"""Tests for the Postgres-backed embedding cache tier and its wiring."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import embedding_service
+from app.services.embedding_cache import PostgresEmbeddingCache
+
+
+def _async_ctx(mock_conn):
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=mock_conn)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return ctx
+
+
+def _patch_acquire(mock_conn):
+    return patch(
+        "app.services.embedding_cache.acquire_with_retry",
+        return_value=_async_ctx(mock_conn),
+    )
+
+
+class TestPostgresEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_get_many_returns_found_rows(self):
+        mock_conn = AsyncMock()
+        mock_conn.fetch = AsyncMock(return_value=[{"text_hash": "h1", "embedding": [0.5, 0.25]}])
+
+        with _patch_acquire(mock_conn):
+            found = await PostgresEmbeddingCache(MagicMock()).get_many("model", 2, ["h1", "h2"])
+
+        assert found == {"h1": [0.5, 0.25]}
+        assert mock_conn.fetch.call_args.args[1:] == ("model", 2, ["h1", "h2"])
+
+    @pytest.mark.asyncio
+    async def test_set_many_inserts_ignoring_conflicts(self):
+        mock_conn = AsyncMock()
+        with _patch_acquire(mock_conn):
+            await PostgresEmbeddingCache(MagicMock()).set_many("model", 2, {"h1": [0.5, 0.25]})
+
+        sql, rows = mock_conn.executemany.call_args.args
+        assert "ON CONFLICT (model, dimensions, text_hash) DO NOTHING" in sql
+        assert rows == [("model", 2, "h1", [0.5, 0.25])]
+
+    @pytest.mark.asyncio
+    async def test_set_many_empty_skips_db(self):
+        mock_conn = AsyncMock()
+        with _patch_acquire(mock_conn):
+            await PostgresEmbeddingCache(MagicMock()).set_many("model", 2, {})
+        mock_conn.executemany.assert_not_called()
+
+
+class TestConfigureEmbeddingCache:
+    @pytest.fixture(autouse=True)
+    def _reset_module_state(self, monkeypatch):
+        monkeypatch.setattr(embedding_service, "_embedding_service", None)
+        monkeypatch.setattr(embedding_service, "_embedding_config", None)
+        monkeypatch.setattr(embedding_service, "_embedding_cache", None)
+        monkeypatch.setattr(embedding_service, "_last_config_check", 0)
+
+    def test_stats_empty_without_cache(self):
+        assert embedding_service.get_embedding_cache_stats() == {}
+
+    def test_service_built_with_configured_cache(self):
+        embedding_service.configure_embedding_cache(MagicMock())
+
+        with patch("app.services.embedding_service.settings") as mock_settings:
+            mock_settings.get_embedding_config.return_value = ("http://localhost", "sk-test", "test-model", 8)
+            mock_settings.embedding_max_tokens_per_request = 100_000
+            service = embedding_service.get_embedding_service()
+
+        assert service.cache is embedding_service._embedding_cache
+        assert [tier.name for tier in service.cache.tiers] == ["memory", "postgres"]
+        assert embedding_service.get_embedding_cache_stats()["hits"] == 0
@@ -6,9 +6,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import asyncpg
 import pytest
 
+from app.services.database import vector_index_name
 from app.services.index_health import (
     _BM25_INDEX,
-    _HNSW_INDEX,
     check_and_repair_chunks_index,
     reindex_chunks,
 )
@@ -46,7 +46,7 @@ class TestReindexChunks:
         reindex_calls = [c for c in calls if "REINDEX" in str(c)]
         assert len(reindex_calls) == 2
         assert any(_BM25_INDEX in str(c) for c in reindex_calls)
-        assert any(_HNSW_INDEX in str(c) for c in reindex_calls)
+        assert any(vector_index_name() in str(c) for c in reindex_calls)
 
     @pytest.mark.asyncio
     async def test_skips_missing_index(self, pool, conn):
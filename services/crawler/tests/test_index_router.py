@@ -1,10 +1,12 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, PropertyMock, patch
 
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
+from tale_shared.db import IndexBuildProgress
 
 from app.routers.index import router, set_indexing_service
+from app.services.bulk_load import bulk_loader
 
 pytestmark = pytest.mark.asyncio
 
@@ -134,3 +136,63 @@ class TestIndexWebsite:
 
         assert response.status_code == 500
         assert response.json()["detail"] == "Website indexing failed"
+
+
+def _status(**overrides):
+    state = {
+        "active": True,
+        "suspended_indexes": ["public_web.idx_pw_chunks_bm25"],
+        "rebuilding": False,
+        "builds": [],
+        "approximate_chunks": 1000,
+    }
+    return {**state, **overrides}
+
+
+class TestBulkLoad:
+    async def test_status_reports_build_progress(self):
+        progress = IndexBuildProgress("building index", 0, 0, 250, 1000)
+        with patch.object(bulk_loader, "status", AsyncMock(return_value=_status(rebuilding=True, builds=[progress]))):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/api/v1/index/bulk-load")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rebuilding"] is True
+        assert data["builds"][0]["phase"] == "building index"
+        assert data["builds"][0]["percent"] == 25.0
+
+    async def test_start_suspends_indexes(self):
+        with (
+            patch.object(bulk_loader, "start", AsyncMock()) as start,
+            patch.object(bulk_loader, "status", AsyncMock(return_value=_status())),
+        ):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.post("/api/v1/index/bulk-load/start")
+
+        assert response.status_code == 200
+        assert response.json()["active"] is True
+        start.assert_awaited_once()
+
+    async def test_start_conflicts_with_running_rebuild(self):
+        with (
+            patch.object(type(bulk_loader), "rebuilding", new_callable=PropertyMock, return_value=True),
+            patch.object(bulk_loader, "start", AsyncMock()) as start,
+        ):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.post("/api/v1/index/bulk-load/start")
+
+        assert response.status_code == 409
+        start.assert_not_awaited()
+
+    async def test_finish_is_accepted(self):
+        with (
+            patch.object(bulk_loader, "finish", AsyncMock(return_value=True)) as finish,
+            patch.object(bulk_loader, "status", AsyncMock(return_value=_status(rebuilding=True))),
+        ):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.post("/api/v1/index/bulk-load/finish")
+
+        assert response.status_code == 202
+        assert response.json()["rebuilding"] is True
+        finish.assert_awaited_once()
@@ -30,7 +30,9 @@ def mock_conn():
     conn.fetchrow = AsyncMock(return_value=None)
     conn.execute = AsyncMock(return_value="DELETE 0")
     conn.executemany = AsyncMock()
-    conn.transaction = MagicMock(return_value=AsyncMock(__aenter__=AsyncMock(), __aexit__=AsyncMock()))
+    conn.transaction = MagicMock(
+        return_value=AsyncMock(__aenter__=AsyncMock(), __aexit__=AsyncMock(return_value=False))
+    )
     return conn
 
 
@@ -98,7 +100,7 @@ class TestIndexPage:
         )
         mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.indexing_service.chunk_content") as mock_chunk:
+        with patch("app.services.indexing_service.chunk_content_async") as mock_chunk:
             mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
             result = await indexing_service.index_page("example.com", "https://example.com/page", "Title", content)
 
@@ -109,13 +111,13 @@ class TestIndexPage:
         mock_conn.fetchrow = AsyncMock(return_value=None)
         mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.indexing_service.chunk_content") as mock_chunk:
+        with patch("app.services.indexing_service.chunk_content_async") as mock_chunk:
             mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
             result = await indexing_service.index_page("example.com", "https://example.com/page", "Title", "content")
 
         assert result["status"] == "indexed"
 
-    @patch("app.services.indexing_service.chunk_content", return_value=[])
+    @patch("app.services.indexing_service.chunk_content_async", return_value=[])
     async def test_returns_empty_when_no_chunks(self, mock_chunk, indexing_service, mock_conn):
         mock_conn.fetchval = AsyncMock(return_value=1)
         mock_conn.fetchrow = AsyncMock(return_value=None)
@@ -125,7 +127,7 @@ class TestIndexPage:
         assert result["status"] == "empty"
         assert result["chunks_indexed"] == 0
 
-    @patch("app.services.indexing_service.chunk_content")
+    @patch("app.services.indexing_service.chunk_content_async")
     async def test_returns_error_when_embedding_fails(self, mock_chunk, indexing_service, mock_conn, mock_embedding):
         mock_chunk.return_value = [ContentChunk(content="chunk text", index=0)]
         mock_embedding.embed_texts = AsyncMock(side_effect=RuntimeError("API down"))
@@ -138,7 +140,7 @@ class TestIndexPage:
         assert result["error"] == "embedding_failed"
         assert result["chunks_indexed"] == 0
 
-    @patch("app.services.indexing_service.chunk_content")
+    @patch("app.services.indexing_service.chunk_content_async")
     async def test_indexes_successfully(self, mock_chunk, indexing_service, mock_conn, mock_embedding):
         chunks = [ContentChunk(content="chunk one", index=0), ContentChunk(content="chunk two", index=1)]
         mock_chunk.return_value = chunks
@@ -152,7 +154,7 @@ class TestIndexPage:
         assert result["chunks_indexed"] == 2
         assert result["url"] == "https://example.com/page"
 
-    @patch("app.services.indexing_service.chunk_content")
+    @patch("app.services.indexing_service.chunk_content_async")
     async def test_deletes_old_chunks_before_inserting(self, mock_chunk, indexing_service, mock_conn, mock_embedding):
         chunks = [ContentChunk(content="chunk", index=0)]
         mock_chunk.return_value = chunks
@@ -167,6 +169,102 @@ class TestIndexPage:
         assert "https://example.com/page" in delete_chunk_call
 
 
+class TestBulkChunkInsert:
+    @patch("app.services.indexing_service.copy_insert", new_callable=AsyncMock)
+    @patch("app.services.indexing_service.chunk_content_async")
+    async def test_large_page_uses_copy(self, mock_chunk, mock_copy, indexing_service, mock_conn, mock_embedding):
+        mock_chunk.return_value = [ContentChunk(content=f"chunk {i}", index=i) for i in range(120)]
+        mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]] * 120)
+
+        result = await indexing_service.index_page("example.com", "https://example.com/page", "Title", "content")
+
+        assert result["chunks_indexed"] == 120
+        assert not any("INSERT INTO chunks" in c.args[0] for c in mock_conn.executemany.await_args_list)
+        _conn, table, columns, rows = mock_copy.await_args.args
+        assert table == "chunks"
+        assert len(rows) == 120
+        assert rows[0][columns.index("embedding")] == [0.1, 0.2]
+        assert mock_copy.await_args.kwargs == {}
+
+    @patch("app.services.indexing_service.copy_insert", new_callable=AsyncMock)
+    @patch("app.services.indexing_service.chunk_content_async")
+    async def test_small_page_uses_executemany(
+        self, mock_chunk, mock_copy, indexing_service, mock_conn, mock_embedding
+    ):
+        mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
+        mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
+
+        await indexing_service.index_page("example.com", "https://example.com/page", "Title", "content")
+
+        mock_copy.assert_not_awaited()
+        chunk_insert = next(c for c in mock_conn.executemany.await_args_list if "INSERT INTO chunks" in c.args[0])
+        assert chunk_insert.args[1][0][6] == [0.1, 0.2]
+
+
+class TestIncrementalReindex:
+    """Changed pages embed and write only new or changed chunks."""
+
+    @staticmethod
+    def _stored(row_id: int, index: int, content: str) -> dict:
+        from app.services.chunking_service import build_metadata_prefix
+
+        prefix = build_metadata_prefix("Title", "https://example.com/page")
+        return {"id": row_id, "chunk_index": index, "chunk_hash": _sha256(prefix + content)}
+
+    @patch("app.services.indexing_service.chunk_content_async")
+    async def test_only_changed_chunk_embedded(self, mock_chunk, indexing_service, mock_conn, mock_embedding):
+        mock_chunk.return_value = [ContentChunk(content="chunk one", index=0), ContentChunk(content="edited", index=1)]
+        mock_conn.fetchrow = AsyncMock(return_value={"content_hash": "old", "filtering_hash": "old"})
+        mock_conn.fetch = AsyncMock(return_value=[self._stored(7, 0, "chunk one"), self._stored(8, 1, "chunk two")])
+        mock_embedding.embed_texts = AsyncMock(return_value=[[0.3, 0.4]])
+
+        result = await indexing_service.index_page("example.com", "https://example.com/page", "Title", "content")
+
+        assert result["chunks_indexed"] == 2
+        assert result["chunks_embedded"] == 1
+        assert result["chunks_reused"] == 1
+        assert mock_embedding.embed_texts.await_args.args[0][0].endswith("edited")
+        delete_call = next(c for c in mock_conn.execute.await_args_list if "DELETE FROM chunks" in c.args[0])
+        assert delete_call.args[2] == [7]
+        chunk_insert = next(c for c in mock_conn.executemany.await_args_list if "INSERT INTO chunks" in c.args[0])
+        assert [row[4] for row in chunk_insert.args[1]] == [1]
+
+    @patch("app.services.indexing_service.chunk_content_async")
+    async def test_reordered_chunks_not_embedded(self, mock_chunk, indexing_service, mock_conn, mock_embedding):
+        mock_chunk.return_value = [ContentChunk(content="b", index=0), ContentChunk(content="a", index=1)]
+        mock_conn.fetchrow = AsyncMock(return_value={"content_hash": "old", "filtering_hash": "old"})
+        mock_conn.fetch = AsyncMock(return_value=[self._stored(7, 0, "a"), self._stored(8, 1, "b")])
+
+        result = await indexing_service.index_page("example.com", "https://example.com/page", "Title", "content")
+
+        assert result["chunks_embedded"] == 0
+        mock_embedding.embed_texts.assert_not_called()
+        park, flip = [c.args for c in mock_conn.execute.await_args_list if c.args[0].startswith("UPDATE chunks")]
+        assert park[1:3] == ([8, 7], [0, 1])
+        # Reused rows take the new page hash in the same statement
+        assert "content_hash = $6" in park[0]
+        assert park[6] == _sha256("content")
+        assert "chunk_index < 0" in flip[0]
+
+    @patch("app.services.indexing_service.chunk_content_async")
+    async def test_diff_replanned_against_locked_rows(self, mock_chunk, indexing_service, mock_conn, mock_embedding):
+        mock_chunk.return_value = [ContentChunk(content="chunk one", index=0), ContentChunk(content="edited", index=1)]
+        mock_conn.fetchrow = AsyncMock(return_value={"content_hash": "old", "filtering_hash": "old"})
+        # The reusable row is gone by the time the store locks the page's chunks
+        mock_conn.fetch = AsyncMock(side_effect=[[self._stored(7, 0, "chunk one")], [], [], []])
+        mock_embedding.embed_texts = AsyncMock(side_effect=[[[0.3, 0.4]], [[0.1, 0.2]]])
+
+        result = await indexing_service.index_page("example.com", "https://example.com/page", "Title", "content")
+
+        assert result["chunks_embedded"] == 2
+        assert result["chunks_reused"] == 0
+        assert mock_embedding.embed_texts.await_args.args[0][0].endswith("chunk one")
+        locked_reads = [c.args[0] for c in mock_conn.fetch.await_args_list[1:3]]
+        assert all(sql.endswith("FOR UPDATE") for sql in locked_reads)
+        chunk_insert = next(c for c in mock_conn.executemany.await_args_list if "INSERT INTO chunks" in c.args[0])
+        assert [(row[4], row[6]) for row in chunk_insert.args[1]] == [(0, [0.1, 0.2]), (1, [0.3, 0.4])]
+
+
 class TestParagraphHashTracking:
     async def test_records_paragraph_hashes(self, mock_conn, indexing_service, mock_embedding):
         content = "Paragraph one\n\nParagraph two"
@@ -174,7 +272,7 @@ class TestParagraphHashTracking:
         mock_conn.fetchrow = AsyncMock(return_value=None)
         mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.indexing_service.chunk_content") as mock_chunk:
+        with patch("app.services.indexing_service.chunk_content_async") as mock_chunk:
             mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
             await indexing_service.index_page("example.com", "https://example.com/page", "Title", content)
 
@@ -190,7 +288,7 @@ class TestParagraphHashTracking:
         mock_conn.fetchrow = AsyncMock(return_value=None)
         mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.indexing_service.chunk_content") as mock_chunk:
+        with patch("app.services.indexing_service.chunk_content_async") as mock_chunk:
             mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
             await indexing_service.index_page("example.com", "https://example.com/page", "Title", "content")
 
@@ -206,7 +304,7 @@ class TestParagraphHashTracking:
         mock_conn.fetchrow = AsyncMock(return_value=None)
         mock_embedding.embed_texts = AsyncMock(side_effect=RuntimeError("API down"))
 
-        with patch("app.services.indexing_service.chunk_content") as mock_chunk:
+        with patch("app.services.indexing_service.chunk_content_async") as mock_chunk:
             mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
             result = await indexing_service.index_page(
                 "example.com", "https://example.com/page", "Title", "content long enough to hash"
@@ -225,7 +323,7 @@ class TestBoilerplateFiltering:
         mock_conn.fetchrow = AsyncMock(return_value=None)
         mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.indexing_service.chunk_content") as mock_chunk:
+        with patch("app.services.indexing_service.chunk_content_async") as mock_chunk:
             mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
             await indexing_service.index_page("example.com", "https://example.com/page", "Title", content)
 
@@ -240,15 +338,18 @@ class TestBoilerplateFiltering:
 
         mock_conn.fetchval = AsyncMock(return_value=30)
         mock_conn.fetch = AsyncMock(
-            return_value=[
-                {"paragraph_hash": boilerplate_h, "url_count": 25},
-                {"paragraph_hash": unique_h, "url_count": 1},
+            side_effect=[
+                [
+                    {"paragraph_hash": boilerplate_h, "url_count": 25},
+                    {"paragraph_hash": unique_h, "url_count": 1},
+                ],
+                [],  # stored chunks
             ]
         )
         mock_conn.fetchrow = AsyncMock(return_value=None)
         mock_embedding.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
 
-        with patch("app.services.indexing_service.chunk_content") as mock_chunk:
+        with patch("app.services.indexing_service.chunk_content_async") as mock_chunk:
             mock_chunk.return_value = [ContentChunk(content="chunk", index=0)]
             await indexing_service.index_page("example.com", "https://example.com/page", "Title", content)
 
@@ -256,7 +357,7 @@ class TestBoilerplateFiltering:
         assert "Boilerplate text" not in passed_content
         assert "Unique content" in passed_content
 
-    @patch("app.services.indexing_service.chunk_content", return_value=[])
+    @patch("app.services.indexing_service.chunk_content_async", return_value=[])
     async def test_empty_after_filtering_stores_filtering_hash(self, mock_chunk, mock_conn, indexing_service):
         content = "Only boilerplate"
         boilerplate_h = paragraph_hash("Only boilerplate")
@@ -1,6 +1,11 @@
-"""Tests for SearchService RRF merge logic."""
+"""Tests for SearchService RRF merge logic and vector search SQL."""
 
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import asyncpg
 import pytest
+from tale_knowledge.retrieval import PrefixIndex
 
 from app.services.search_service import RRF_K, SearchResult, SearchService
 
@@ -182,3 +187,83 @@ class TestMergeRrfFieldMapping:
         item_v2 = _item(1, title="New Title")
         results = SearchService._merge_rrf([[item_v1], [item_v2]], limit=10)
         assert results[0].title == "New Title"
+
+
+class TestPrefixVectorSearch:
+    @staticmethod
+    def _service(rows):
+        conn = AsyncMock()
+        conn.fetch = AsyncMock(return_value=rows)
+        conn.transaction = MagicMock(return_value=AsyncMock())
+
+        @asynccontextmanager
+        async def _acq(_pool, **_kw):
+            yield conn
+
+        return SearchService(MagicMock()), conn, _acq
+
+    @pytest.mark.asyncio
+    async def test_full_mode_keeps_single_stage_query(self):
+        service, conn, acq = self._service([_item(1)])
+        with (
+            patch("app.services.search_service.acquire_with_retry", acq),
+            patch("app.services.search_service.vector_prefix_index", return_value=None),
+        ):
+            rows = await service._vector_search([0.1, 0.2], None, 30)
+
+        sql, *params = conn.fetch.call_args.args
+        assert "subvector" not in sql
+        assert params == [[0.1, 0.2], 30]
+        assert rows == [_item(1)]
+
+    @pytest.mark.asyncio
+    async def test_bit_mode_rescores_prefix_candidates(self):
+        service, conn, acq = self._service([_item(1)])
+        with (
+            patch("app.services.search_service.acquire_with_retry", acq),
+            patch("app.services.search_service.vector_prefix_index", return_value=PrefixIndex("bit", 256)),
+            patch("app.services.search_service.settings") as mock_settings,
+        ):
+            mock_settings.vector_rescore_factor = 4
+            await service._vector_search([0.1, 0.2], "example.com", 30)
+
+        conn.execute.assert_awaited_once_with("SET LOCAL hnsw.ef_search = 120")
+        sql, *params = conn.fetch.call_args.args
+        assert "ORDER BY (binary_quantize(subvector(embedding, 1, 256))::bit(256)) <~>" in sql
+        assert "AND domain = $4" in sql
+        assert "ORDER BY c.embedding <=> $1::vector" in sql
+        assert params == [[0.1, 0.2], 120, 30, "example.com"]
+
+
+@pytest.mark.asyncio
+class TestBm25Fallback:
+    """Searches keep working while a bulk load has the BM25 index dropped."""
+
+    @staticmethod
+    def _service(fts_error: Exception) -> SearchService:
+        service = SearchService(MagicMock())
+        service._fts_search = AsyncMock(side_effect=fts_error)
+        service._vector_search = AsyncMock(return_value=[{**_item(1), "score": 0.9}])
+        return service
+
+    async def test_search_during_suspended_load_uses_vector_results(self):
+        service = self._service(
+            asyncpg.exceptions.InternalServerError("no bm25 index found for relation public_web.chunks")
+        )
+        embedding = MagicMock(embed_query=AsyncMock(return_value=[0.1, 0.2]))
+
+        with patch("app.services.search_service.get_embedding_service", return_value=embedding):
+            results = await service.search("query", limit=5)
+
+        assert [r.chunk_content for r in results] == ["content"]
+        assert results[0].score == pytest.approx(1.0)
+
+    async def test_other_database_errors_propagate(self):
+        service = self._service(asyncpg.exceptions.UndefinedColumnError("column does not exist"))
+        embedding = MagicMock(embed_query=AsyncMock(return_value=[0.1, 0.2]))
+
+        with (
+            patch("app.services.search_service.get_embedding_service", return_value=embedding),
+            pytest.raises(asyncpg.exceptions.UndefinedColumnError),
+        ):
+            await service.search("query")
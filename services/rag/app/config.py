@@ -4,6 +4,8 @@ Configuration is loaded from environment variables with the RAG_ prefix.
 LLM settings are read from provider configuration files.
 """
 
+from typing import Literal
+
 from pydantic_settings import SettingsConfigDict
 from tale_shared.config import BaseServiceSettings
 
@@ -40,11 +42,58 @@ class Settings(BaseServiceSettings):
     # Chunking & Search
     chunk_size: int = 2048
     chunk_overlap: int = 200
+    # Unit of chunk_size / chunk_overlap: characters, or embedding-model tokens
+    chunk_sizing: Literal["chars", "tokens"] = "chars"
+    # Extracted text at least this long is chunked in a worker process (0 = always inline)
+    chunk_offload_threshold_chars: int = 262_144
+    chunk_pool_workers: int = 2
     top_k: int = 5
     similarity_threshold: float = 0.4
     max_document_size_mb: int = 100
+    # Uploads larger than this are spooled to a temp file in upload_spool_dir
+    # (default: the system temp dir) instead of being buffered in memory
+    upload_spool_threshold_mb: int = 8
+    upload_spool_dir: str | None = None
     ingestion_timeout_seconds: int = 10800
 
+    # Durable ingestion queue (ingestion_jobs table). Worker loops per
+    # replica: ingestion_workers take any lane (interactive first);
+    # ingestion_interactive_workers only take interactive uploads. 0 + 0
+    # makes an API-only replica that just enqueues.
+    ingestion_workers: int = 2
+    ingestion_interactive_workers: int = 1
+    ingestion_max_attempts: int = 3
+    # Claimed jobs reappear this long after their worker stops heartbeating
+    ingestion_visibility_timeout_seconds: int = 300
+    ingestion_retry_backoff_seconds: float = 30.0
+    ingestion_poll_interval_seconds: float = 2.0
+    # Bulk-lane workers claim up to this many jobs of at most this size at
+    # once and embed their chunks in shared requests (larger files run alone)
+    ingestion_batch_size: int = 16
+    ingestion_batch_max_file_bytes: int = 1024 * 1024
+    # Most files accepted by one /documents/upload/batch request
+    max_batch_upload_files: int = 500
+    # Extracted PDF pages are saved so a retried job resumes at the first
+    # missing page; unfinished checkpoints are pruned after the retention
+    pdf_page_checkpoints_enabled: bool = True
+    pdf_page_checkpoint_retention_hours: int = 72
+    # GET /documents/events (SSE): pushed status changes, with a comment
+    # line this often so proxies keep idle streams open
+    progress_events_enabled: bool = True
+    progress_events_heartbeat_seconds: float = 15.0
+    # Extractions running at once reserve their file size and PDF page
+    # count against these budgets; more work waits. Synchronous uploads
+    # and comparisons get 429 (with Retry-After) once this many extractions
+    # are already waiting.
+    admission_max_mb: int = 256
+    admission_max_pages: int = 2000
+    admission_max_queued: int = 32
+    admission_retry_after_seconds: int = 30
+    # Uploads are scanned for secrets in this many worker processes;
+    # verdicts are cached by content hash for repeated uploads
+    secret_scan_workers: int = 2
+    secret_scan_cache_size: int = 4096
+
     # Vision (additional settings beyond base)
     vision_extraction_prompt: str | None = None
     vision_preprocessing_timeout: int = 0
@@ -54,6 +103,34 @@ class Settings(BaseServiceSettings):
     recency_decay_base: float = 0.85
     recency_max_age_days: int = 730
 
+    # Embedding requests: per-request token ceiling used to pack batches
+    embedding_max_tokens_per_request: int = 100_000
+    # Documents with at least this many chunks are embedded and stored batch by batch
+    embedding_stream_min_chunks: int = 256
+    # Concurrent query embeddings are coalesced for up to this long / this many queries
+    embedding_query_batch_window_ms: int = 5
+    embedding_query_batch_size: int = 32
+
+    # Embedding cache (content-addressed, memory + Postgres tiers)
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_size: int = 4096
+
+    # Query embedding LRU (0 disables)
+    query_embedding_cache_size: int = 1024
+    query_embedding_cache_ttl_seconds: int = 300
+
+    # Vector index: "full" indexes the whole vector; "halfvec"/"bit" index a
+    # truncated prefix (Matryoshka models) and rescore candidates at full precision
+    vector_index_mode: Literal["full", "halfvec", "bit"] = "full"
+    vector_index_dimensions: int = 512
+    vector_rescore_factor: int = 4
+
+    # Bulk-load mode (POST /api/v1/bulk-load/start|finish): search indexes are
+    # dropped for a large import and rebuilt once with these
+    bulk_load_maintenance_work_mem: str = "2GB"
+    bulk_load_parallel_workers: int = 4
+    bulk_load_rebuild_timeout_seconds: int = 86_400
+
     # Semantic cache (RAG search results)
     semantic_cache_enabled: bool = False
     semantic_cache_similarity_threshold: float = 0.95
@@ -9,12 +9,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from loguru import logger
 from tale_shared.logging import suppress_health_check_logs
-from tale_telemetry import init_telemetry, shutdown_telemetry
+from tale_telemetry import init_telemetry, register_stats_collector, shutdown_telemetry
 
 from . import __version__
 from .auth import verify_auth_token, warn_if_auth_disabled
 from .config import settings
 from .models import ErrorResponse
+from .routers.bulk_load import router as bulk_load_router
+from .routers.documents import record_ingestion_failure, run_ingestion_batch, run_ingestion_job
 from .routers.documents import router as documents_router
 from .routers.health import (
     protected_router as health_protected_router,
@@ -23,6 +25,12 @@ from .routers.health import (
     public_router as health_public_router,
 )
 from .routers.search import router as search_router
+from .secret_scanner import configure_secret_scanning, shutdown_secret_scan_pool
+from .services.admission import admission
+from .services.bulk_load import bulk_loader
+from .services.database import get_pool
+from .services.ingestion_queue import ingestion_queue
+from .services.progress_events import progress_events
 from .services.rag_service import rag_service
 from .utils import cleanup_memory
 
@@ -58,6 +66,22 @@ async def lifespan(app: FastAPI):
     except Exception:
         logger.exception("Failed to initialize RAG service")
 
+    # Upload secret scanning runs in worker processes (started on first use)
+    configure_secret_scanning(settings.secret_scan_workers, settings.secret_scan_cache_size)
+
+    # Workers for the durable ingestion queue (jobs left by a previous run resume here)
+    try:
+        ingestion_queue.start(await get_pool(), run_ingestion_job, record_ingestion_failure, run_ingestion_batch)
+    except Exception:
+        logger.exception("Failed to start ingestion workers")
+
+    # Pushed progress for GET /documents/events
+    if settings.progress_events_enabled:
+        try:
+            progress_events.start()
+        except Exception:
+            logger.exception("Failed to start progress event listener")
+
     # Start periodic GC cleanup task
     gc_task = asyncio.create_task(periodic_gc_cleanup())
 
@@ -79,7 +103,11 @@ async def lifespan(app: FastAPI):
     with contextlib.suppress(asyncio.CancelledError):
         await gc_task
 
+    await ingestion_queue.stop()
+    await progress_events.stop()
+    await bulk_loader.stop()
     await rag_service.shutdown()
+    shutdown_secret_scan_pool()
     shutdown_telemetry()
     logger.info("Shutting down Tale RAG service...")
 
@@ -124,6 +152,7 @@ async def http_exception_handler(_request, exc):
             error=exc.__class__.__name__,
             message=exc.detail,
         ).model_dump(),
+        headers=exc.headers,
     )
 
 
@@ -151,7 +180,33 @@ app.include_router(health_public_router)
 app.include_router(health_protected_router, dependencies=[Depends(verify_auth_token)])
 app.include_router(documents_router, dependencies=[Depends(verify_auth_token)])
 app.include_router(search_router, dependencies=[Depends(verify_auth_token)])
+app.include_router(bulk_load_router, dependencies=[Depends(verify_auth_token)])
 init_telemetry(app)
+register_stats_collector(
+    "rag_embedding_cache",
+    "Embedding cache lookups served without a provider call",
+    rag_service.get_embedding_cache_stats,
+)
+register_stats_collector(
+    "rag_embedding_limiter",
+    "Adaptive embedding request concurrency",
+    rag_service.get_embedding_limiter_stats,
+)
+register_stats_collector(
+    "rag_query_embedding_cache",
+    "Query embedding LRU lookups",
+    rag_service.get_query_embedding_cache_stats,
+)
+register_stats_collector(
+    "rag_ingestion_queue",
+    "Durable ingestion queue workers and job outcomes",
+    ingestion_queue.get_stats,
+)
+register_stats_collector(
+    "rag_extraction_admission",
+    "Extraction byte and page budget reservations",
+    admission.get_stats,
+)
 
 # Round-2 review MEDIUM (E.4.6): the `@app.get("/")` route that lived
 # here was unreachable — `health_public_router` registers `/` first via
@@ -28,6 +28,7 @@ class ConfigResponse(BaseModel):
     openai_embedding_model: str
     chunk_size: int
     chunk_overlap: int
+    chunk_sizing: str
     top_k: int
     similarity_threshold: float
 
@@ -64,6 +65,48 @@ class DocumentAddResponse(BaseModel):
     )
 
 
+class BatchUploadItem(BaseModel):
+    """Outcome of one file in a batch upload."""
+
+    filename: str | None = Field(..., description="Uploaded filename")
+    file_id: str | None = Field(default=None, description="Document ID (null when rejected before one was assigned)")
+    status: Literal["queued", "rejected"] = Field(..., description="Whether the file was queued for ingestion")
+    error: str | None = Field(default=None, description="Rejection reason")
+
+
+class BatchUploadResponse(BaseModel):
+    """Response after a batch upload.
+
+    Per-file ingestion progress is then available from /documents/statuses.
+    """
+
+    success: bool = Field(..., description="Whether at least one file was queued")
+    queued: int = Field(..., description="Number of files queued for ingestion")
+    rejected: int = Field(..., description="Number of files rejected")
+    results: list[BatchUploadItem] = Field(..., description="Per-file outcome, in upload order")
+
+
+class IndexBuildStatus(BaseModel):
+    """Progress of one running index build (from pg_stat_progress_create_index)."""
+
+    phase: str = Field(..., description="Current build phase")
+    blocks_done: int = Field(..., description="Blocks processed in this phase")
+    blocks_total: int = Field(..., description="Blocks to process in this phase")
+    tuples_done: int = Field(..., description="Tuples processed in this phase")
+    tuples_total: int = Field(..., description="Tuples to process in this phase")
+    percent: float | None = Field(None, description="Completion of this phase, when known")
+
+
+class BulkLoadStatusResponse(BaseModel):
+    """State of bulk-load mode."""
+
+    active: bool = Field(..., description="Whether search indexes are suspended for a bulk load")
+    suspended_indexes: list[str] = Field(..., description="Indexes still to be rebuilt")
+    rebuilding: bool = Field(..., description="Whether this replica is rebuilding the indexes")
+    builds: list[IndexBuildStatus] = Field(..., description="Index builds running on the chunks table")
+    approximate_chunks: int = Field(..., description="Planner estimate of the rows in the chunks table")
+
+
 class ChunkRange(BaseModel):
     """Range of chunks returned in a content response."""
 
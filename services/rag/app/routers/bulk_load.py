@@ -0,0 +1,77 @@
+"""Bulk-load mode endpoints for first-time imports of large corpora.
+
+1. ``POST /bulk-load/start`` drops the HNSW and BM25 chunk indexes.
+2. Upload the corpus (``/documents/upload/batch`` with ``lane=bulk``).
+3. ``POST /bulk-load/finish`` builds each index once in the background.
+4. Poll ``GET /bulk-load`` until ``active`` is false.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+from loguru import logger
+
+from ..models import BulkLoadStatusResponse, IndexBuildStatus
+from ..services.bulk_load import bulk_loader
+
+router = APIRouter(prefix="/api/v1/bulk-load", tags=["Bulk load"])
+
+
+async def _status() -> BulkLoadStatusResponse:
+    state = await bulk_loader.status()
+    builds = [
+        IndexBuildStatus(
+            phase=b.phase,
+            blocks_done=b.blocks_done,
+            blocks_total=b.blocks_total,
+            tuples_done=b.tuples_done,
+            tuples_total=b.tuples_total,
+            percent=b.percent,
+        )
+        for b in state["builds"]
+    ]
+    return BulkLoadStatusResponse(**{**state, "builds": builds})
+
+
+@router.get("", response_model=BulkLoadStatusResponse)
+async def get_bulk_load_status():
+    """Report whether bulk-load mode is active and how far the index rebuild is."""
+    try:
+        return await _status()
+    except Exception as e:
+        logger.error("Failed to read bulk load status: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to read bulk load status.",
+        ) from e
+
+
+@router.post("/start", response_model=BulkLoadStatusResponse)
+async def start_bulk_load():
+    """Suspend the chunk search indexes so a large import skips per-row index updates.
+
+    Search stays available but is slow and vector-only until the load is finished.
+    """
+    if bulk_loader.rebuilding:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Index rebuild in progress")
+    try:
+        await bulk_loader.start()
+        return await _status()
+    except Exception as e:
+        logger.error("Failed to start bulk load: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start bulk load.",
+        ) from e
+
+
+@router.post("/finish", response_model=BulkLoadStatusResponse, status_code=status.HTTP_202_ACCEPTED)
+async def finish_bulk_load():
+    """Rebuild the suspended indexes in the background; poll ``GET /bulk-load`` for progress."""
+    try:
+        await bulk_loader.finish()
+        return await _status()
+    except Exception as e:
+        logger.error("Failed to finish bulk load: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to finish bulk load.",
+        ) from e
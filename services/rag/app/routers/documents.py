@@ -1,18 +1,22 @@
 """Document management endpoints for Tale RAG service."""
 
+import asyncio
 import datetime as dt
 import json
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
 from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile, status
-from fastapi.background import BackgroundTasks
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from tale_shared.db import acquire_with_retry
 
 from ..config import settings
 from ..models import (
+    BatchUploadItem,
+    BatchUploadResponse,
     DocumentAddResponse,
     DocumentCompareRequest,
     DocumentCompareResponse,
@@ -22,17 +26,27 @@ from ..models import (
     DocumentStatusRequest,
     DocumentStatusResponse,
 )
-from ..secret_scanner import scan_file_for_secrets
+from ..secret_scanner import scan_upload_for_secrets
+from ..services.admission import AdmissionRejected, admission, extraction_weight
 from ..services.database import SCHEMA, get_pool
+from ..services.indexing_service import DocumentInput
+from ..services.ingestion_queue import IngestionJob, IngestionLane, ingestion_queue
+from ..services.progress_events import RESYNC, TERMINAL_STATUSES, progress_events
 from ..services.rag_service import rag_service
 from ..utils import cleanup_memory
+from ..utils.upload_spool import UploadSpool
 
 router = APIRouter(prefix="/api/v1", tags=["Documents"])
 
 _FILE_UPLOAD = File(..., description="File to upload")
+_BATCH_FILES = File(..., description="Files to upload")
 _BASE_FILE = File(..., description="Base document file")
 _COMPARISON_FILE = File(..., description="Comparison document file")
+_LANE_QUERY = Query("interactive", description="Ingestion queue lane: 'interactive' or 'bulk' (backfills)")
+_BATCH_LANE_QUERY = Query("bulk", description="Ingestion queue lane: 'interactive' or 'bulk' (backfills)")
 _MAX_CHANGES_FORM = Form(default=500, ge=1, le=2000, description="Maximum number of change items")
+_EVENT_FILE_IDS_QUERY = Query(..., alias="file_id", description="File IDs to follow (repeat the parameter, max 200)")
+_MAX_EVENT_FILE_IDS = 200
 
 SUPPORTED_EXTENSIONS = {
     # Documents
@@ -142,6 +156,25 @@ async def _insert_processing_row(
         )
 
 
+async def _insert_processing_rows(rows: list[tuple[str, str]]) -> None:
+    """Insert processing status rows for many ``(file_id, filename)`` pairs in one statement."""
+    pool = await get_pool()
+    async with acquire_with_retry(pool) as conn:
+        await conn.execute(
+            f"""
+            INSERT INTO {SCHEMA}.documents (file_id, filename, status)
+            SELECT u.file_id, u.filename, 'processing'
+            FROM unnest($1::text[], $2::text[]) AS u(file_id, filename)
+            ON CONFLICT (file_id, COALESCE(team_id, ''))
+            DO UPDATE SET status = 'processing', error = NULL, chunks_count = 0,
+                         progress_phase = NULL, progress_detail = NULL,
+                         updated_at = NOW()
+            """,
+            [file_id for file_id, _ in rows],
+            [filename for _, filename in rows],
+        )
+
+
 async def _record_failure(
     file_id: str,
     filename: str,
@@ -177,7 +210,8 @@ async def _mark_completed(
             SET status = 'completed',
                 error = NULL,
                 chunks_count = (
-                    SELECT COUNT(*) FROM {SCHEMA}.chunks c WHERE c.document_id = d.id
+                    SELECT COUNT(*) FROM {SCHEMA}.chunks c
+                    WHERE c.document_id = COALESCE(d.chunk_owner_id, d.id)
                 ),
                 updated_at = NOW()
             WHERE d.file_id = $1
@@ -194,44 +228,77 @@ def _sanitize_error(exc: Exception, max_length: int = 500) -> str:
     return msg
 
 
-async def _background_ingest(
-    content: bytes,
-    file_id: str,
-    filename: str,
-    source_created_at: dt.datetime | None = None,
-    source_modified_at: dt.datetime | None = None,
-) -> None:
-    """Run document ingestion in the background, recording status in documents table."""
+async def run_ingestion_job(job: IngestionJob) -> None:
+    """Ingest one queued upload; raises so the queue can retry the job."""
     try:
         result = await rag_service.add_document(
-            content=content,
-            file_id=file_id,
-            filename=filename,
-            source_created_at=source_created_at,
-            source_modified_at=source_modified_at,
+            content=job.content,
+            file_id=job.file_id,
+            filename=job.filename,
+            source_created_at=job.source_created_at,
+            source_modified_at=job.source_modified_at,
+            content_hash=job.content_hash,
         )
         if result.get("skipped"):
-            await _mark_completed(file_id)
+            await _mark_completed(job.file_id)
         logger.info(
-            "Background ingestion completed",
+            "Queued ingestion completed",
             extra={
-                "file_id": file_id,
-                "filename": filename,
+                "file_id": job.file_id,
+                "filename": job.filename,
+                "attempt": job.attempts,
                 "chunks_created": result.get("chunks_created", 0),
                 "skipped": result.get("skipped", False),
             },
         )
-    except Exception as exc:
-        logger.opt(exception=True).error(
-            "Background ingestion failed for {}",
-            file_id,
+    finally:
+        cleanup_memory(context=f"after ingestion of {job.file_id}")
+
+
+async def run_ingestion_batch(jobs: list[IngestionJob]) -> list[Exception | None]:
+    """Ingest several small queued uploads, sharing their embedding requests."""
+    try:
+        results = await rag_service.add_documents(
+            [
+                DocumentInput(
+                    job.file_id,
+                    job.content,
+                    job.filename,
+                    job.source_created_at,
+                    job.source_modified_at,
+                    job.content_hash,
+                )
+                for job in jobs
+            ]
+        )
+        outcomes: list[Exception | None] = []
+        for job, result in zip(jobs, results, strict=True):
+            if isinstance(result, Exception):
+                outcomes.append(result)
+                continue
+            try:
+                if result.get("skipped"):
+                    await _mark_completed(job.file_id)
+            except Exception as exc:
+                outcomes.append(exc)
+            else:
+                outcomes.append(None)
+        logger.info(
+            "Queued batch ingestion completed",
+            extra={
+                "jobs": len(jobs),
+                "failed": sum(outcome is not None for outcome in outcomes),
+                "chunks_created": sum(r.get("chunks_created", 0) for r in results if isinstance(r, dict)),
+            },
         )
-        try:
-            await _record_failure(file_id, filename, _sanitize_error(exc))
-        except Exception as record_exc:
-            logger.critical("Could not record failure for {}: {}", file_id, record_exc)
+        return outcomes
     finally:
-        cleanup_memory(context=f"after background ingestion for {file_id}")
+        cleanup_memory(context=f"after batch ingestion of {len(jobs)} files")
+
+
+async def record_ingestion_failure(job: IngestionJob, exc: Exception) -> None:
+    """Mark a queued upload failed once the queue gives up on it."""
+    await _record_failure(job.file_id, job.filename, _sanitize_error(exc))
 
 
 def _validate_file_extension(filename: str) -> str:
@@ -259,25 +326,71 @@ def _validate_file_extension(filename: str) -> str:
     return file_ext
 
 
-async def _read_upload_with_size_check(file: UploadFile, max_size_mb: int) -> bytes:
-    """Read uploaded file with streaming size check."""
+def _too_many_requests(exc: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+async def _read_upload_with_size_check(file: UploadFile, max_size_mb: int) -> UploadSpool:
+    """Stream an upload into a spool (on disk above the threshold) with a size check.
+
+    The caller owns the returned spool and must close it.
+    """
     max_size_bytes = max_size_mb * 1024 * 1024
-    chunks: list[bytes] = []
-    total_size = 0
-    while chunk := await file.read(64 * 1024):
-        total_size += len(chunk)
-        if total_size > max_size_bytes:
-            logger.warning(
-                "Upload rejected (413): size over limit | filename={} max_mb={}",
-                file.filename,
-                max_size_mb,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size exceeds maximum allowed size of {max_size_mb}MB",
-            )
-        chunks.append(chunk)
-    return b"".join(chunks)
+    spool = UploadSpool(settings.upload_spool_threshold_mb * 1024 * 1024, dir=settings.upload_spool_dir)
+    try:
+        while chunk := await file.read(64 * 1024):
+            if spool.size + len(chunk) > max_size_bytes:
+                logger.warning(
+                    "Upload rejected (413): size over limit | filename={} max_mb={}",
+                    file.filename,
+                    max_size_mb,
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File size exceeds maximum allowed size of {max_size_mb}MB",
+                )
+            await spool.awrite(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+async def _read_validated_upload(file: UploadFile, file_id: str | None) -> tuple[str, UploadSpool]:
+    """Check an upload's name, extension, size and secrets.
+
+    Returns ``(filename, spool)`` or raises HTTPException. The caller owns
+    the spool and must close it.
+    """
+    if not file.filename:
+        logger.warning(
+            "Upload rejected (400): missing filename | file_id={} content_type={}",
+            file_id,
+            file.content_type,
+        )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required")
+
+    _validate_file_extension(file.filename)
+
+    spool = await _read_upload_with_size_check(file, settings.max_document_size_mb)
+
+    rejected, reason = await scan_upload_for_secrets(spool.source(), file.filename, spool.content_hash)
+    if rejected:
+        spool.close()
+        logger.warning(
+            "Upload rejected by secret scanner",
+            extra={"filename": file.filename, "reason": reason},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"File rejected: {reason}",
+        )
+
+    return file.filename, spool
 
 
 def _parse_metadata(metadata_str: str | None) -> dict[str, Any]:
@@ -311,6 +424,34 @@ def _parse_metadata(metadata_str: str | None) -> dict[str, Any]:
     return parsed_value
 
 
+def _parse_batch_metadata(metadata_str: str | None, file_count: int) -> list[dict[str, Any]]:
+    """Parse the optional JSON array of per-file metadata objects (one per file, or null)."""
+    if not metadata_str:
+        return [{} for _ in range(file_count)]
+
+    try:
+        parsed_value = json.loads(metadata_str)
+    except json.JSONDecodeError as exc:
+        logger.warning("Batch upload rejected (400): invalid metadata JSON | error={}", exc)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid metadata format. Must be valid JSON string.",
+        ) from None
+
+    if (
+        not isinstance(parsed_value, list)
+        or len(parsed_value) != file_count
+        or not all(item is None or isinstance(item, dict) for item in parsed_value)
+    ):
+        logger.warning("Batch upload rejected (400): metadata is not an array of {} objects", file_count)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid metadata format. Must be a JSON array with one object (or null) per file.",
+        )
+
+    return [item or {} for item in parsed_value]
+
+
 def _ms_timestamp_to_datetime(value: Any) -> dt.datetime | None:
     """Convert a Unix millisecond timestamp to a timezone-aware datetime."""
     if value is None:
@@ -324,96 +465,91 @@ def _ms_timestamp_to_datetime(value: Any) -> dt.datetime | None:
 
 @router.post("/documents/upload", response_model=DocumentAddResponse)
 async def upload_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = _FILE_UPLOAD,
     metadata: str | None = Form(None, description="Optional metadata as JSON string"),
     file_id: str | None = Form(None, description="Optional custom file ID"),
     sync: bool = Query(False, description="If true, wait for ingestion to complete before responding"),
+    lane: IngestionLane = _LANE_QUERY,
 ):
     """Upload a file to the knowledge base.
 
-    By default, heavy ingestion work is delegated to a background task.
-    Set `sync=true` to wait for ingestion to complete before responding.
+    By default, the file is written to the durable ingestion queue and
+    processed by a queue worker (on any replica). Bulk backfills should use
+    `lane=bulk` so they never delay interactive uploads.
+    Set `sync=true` to wait for ingestion to complete before responding;
+    sync uploads get 429 with `Retry-After` when too many extractions are
+    already waiting.
     """
     try:
-        if not file.filename:
-            logger.warning(
-                "Upload rejected (400): missing filename | file_id={} content_type={}",
-                file_id,
-                file.content_type,
-            )
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required")
-
-        _validate_file_extension(file.filename)
-
-        file_bytes = await _read_upload_with_size_check(file, settings.max_document_size_mb)
-
-        rejected, reason = scan_file_for_secrets(file_bytes)
-        if rejected:
-            logger.warning(
-                "Upload rejected by secret scanner",
-                extra={"filename": file.filename, "reason": reason},
-            )
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=f"File rejected: {reason}",
-            )
-
-        parsed_metadata = _parse_metadata(metadata)
-        source_created_at = _ms_timestamp_to_datetime(parsed_metadata.get("source_created_at"))
-        source_modified_at = _ms_timestamp_to_datetime(parsed_metadata.get("source_modified_at"))
-
-        doc_id = file_id or f"file-{uuid4().hex}"
-
-        await _insert_processing_row(doc_id, file.filename)
-
-        if sync:
-            try:
-                result = await rag_service.add_document(
-                    content=file_bytes,
+        filename, spool = await _read_validated_upload(file, file_id)
+        with spool:
+            parsed_metadata = _parse_metadata(metadata)
+            source_created_at = _ms_timestamp_to_datetime(parsed_metadata.get("source_created_at"))
+            source_modified_at = _ms_timestamp_to_datetime(parsed_metadata.get("source_modified_at"))
+
+            doc_id = file_id or f"file-{uuid4().hex}"
+
+            if sync:
+                # Queued uploads wait in the durable queue instead. The
+                # reservation covers the whole ingestion, so concurrent sync
+                # uploads cannot overrun the budget, and a 429 is raised
+                # before the status row is touched.
+                weight = await extraction_weight(spool.source(), filename)
+                async with admission.admit(*weight, reject_when_full=True):
+                    await _insert_processing_row(doc_id, filename)
+                    try:
+                        result = await rag_service.add_document(
+                            content=spool.source(),
+                            file_id=doc_id,
+                            filename=filename,
+                            source_created_at=source_created_at,
+                            source_modified_at=source_modified_at,
+                            content_hash=spool.content_hash,
+                            admitted=True,
+                        )
+                    except Exception as sync_exc:
+                        await _record_failure(doc_id, filename, _sanitize_error(sync_exc))
+                        raise
+
+                    if result.get("skipped"):
+                        await _mark_completed(doc_id)
+
+                skipped = result.get("skipped", False)
+                skip_reason = result.get("skip_reason")
+                return DocumentAddResponse(
+                    success=True,
                     file_id=doc_id,
-                    filename=file.filename,
-                    source_created_at=source_created_at,
-                    source_modified_at=source_modified_at,
+                    chunks_created=result.get("chunks_created", 0),
+                    message=f"File '{filename}' ingested synchronously",
+                    queued=False,
+                    skipped=skipped,
+                    skip_reason=skip_reason,
                 )
-            except Exception as sync_exc:
-                await _record_failure(doc_id, file.filename, _sanitize_error(sync_exc))
-                raise
 
-            if result.get("skipped"):
-                await _mark_completed(doc_id)
+            await _insert_processing_row(doc_id, filename)
+
+            await ingestion_queue.enqueue(
+                file_id=doc_id,
+                filename=filename,
+                content=spool.source(),
+                lane=lane,
+                source_created_at=source_created_at,
+                source_modified_at=source_modified_at,
+                content_hash=spool.content_hash,
+            )
 
-            skipped = result.get("skipped", False)
-            skip_reason = result.get("skip_reason")
             return DocumentAddResponse(
                 success=True,
                 file_id=doc_id,
-                chunks_created=result.get("chunks_created", 0),
-                message=f"File '{file.filename}' ingested synchronously",
-                queued=False,
-                skipped=skipped,
-                skip_reason=skip_reason,
+                chunks_created=0,
+                message=f"File '{filename}' upload queued for ingestion",
+                queued=True,
             )
 
-        background_tasks.add_task(
-            _background_ingest,
-            file_bytes,
-            doc_id,
-            file.filename,
-            source_created_at,
-            source_modified_at,
-        )
-
-        return DocumentAddResponse(
-            success=True,
-            file_id=doc_id,
-            chunks_created=0,
-            message=f"File '{file.filename}' upload queued for ingestion",
-            queued=True,
-        )
-
     except HTTPException:
         raise
+    except AdmissionRejected as e:
+        raise _too_many_requests(e) from e
     except Exception as e:
         logger.error("Failed to upload file: {}", e)
         raise HTTPException(
@@ -422,6 +558,94 @@ async def upload_document(
         ) from e
 
 
+@router.post("/documents/upload/batch", response_model=BatchUploadResponse)
+async def upload_documents_batch(
+    files: list[UploadFile] = _BATCH_FILES,
+    metadata: str | None = Form(
+        None,
+        description="Optional JSON array, one object (or null) per file in upload order, "
+        "with file_id, source_created_at and source_modified_at",
+    ),
+    lane: IngestionLane = _BATCH_LANE_QUERY,
+):
+    """Upload many files to the knowledge base in one request.
+
+    Files are validated one by one; a rejected file is reported in the
+    results without failing the others. Status rows and queue jobs for the
+    accepted files are each written with a single statement, and queue
+    workers embed the chunks of small files together in full-size batches.
+    Defaults to `lane=bulk`; track progress with `/documents/statuses`.
+    """
+    if len(files) > settings.max_batch_upload_files:
+        logger.warning("Batch upload rejected (400): {} files over limit", len(files))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.max_batch_upload_files} files per batch upload",
+        )
+
+    per_file_metadata = _parse_batch_metadata(metadata, len(files))
+
+    results: list[BatchUploadItem] = []
+    accepted: list[DocumentInput] = []
+    # Spooled files stay open until the queue has copied them
+    spools: list[UploadSpool] = []
+    seen_ids: set[str] = set()
+    try:
+        for file, file_metadata in zip(files, per_file_metadata, strict=True):
+            requested_id = file_metadata.get("file_id")
+            doc_id = str(requested_id) if requested_id else f"file-{uuid4().hex}"
+            if doc_id in seen_ids:
+                results.append(
+                    BatchUploadItem(
+                        filename=file.filename, file_id=doc_id, status="rejected", error="Duplicate file_id in batch"
+                    )
+                )
+                continue
+            try:
+                filename, spool = await _read_validated_upload(file, doc_id)
+            except HTTPException as exc:
+                results.append(
+                    BatchUploadItem(filename=file.filename, file_id=doc_id, status="rejected", error=str(exc.detail))
+                )
+                continue
+
+            seen_ids.add(doc_id)
+            spools.append(spool)
+            accepted.append(
+                DocumentInput(
+                    file_id=doc_id,
+                    content=spool.source(),
+                    filename=filename,
+                    source_created_at=_ms_timestamp_to_datetime(file_metadata.get("source_created_at")),
+                    source_modified_at=_ms_timestamp_to_datetime(file_metadata.get("source_modified_at")),
+                    content_hash=spool.content_hash,
+                )
+            )
+            results.append(BatchUploadItem(filename=filename, file_id=doc_id, status="queued"))
+
+        if accepted:
+            try:
+                await _insert_processing_rows([(d.file_id, d.filename) for d in accepted])
+                await ingestion_queue.enqueue_many(accepted, lane=lane)
+            except Exception as e:
+                logger.error("Failed to queue batch upload of {} files: {}", len(accepted), e)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to upload files. Please try again.",
+                ) from e
+    finally:
+        for spool in spools:
+            spool.close()
+
+    logger.info("Batch upload queued {} of {} files (lane={})", len(accepted), len(files), lane)
+    return BatchUploadResponse(
+        success=bool(accepted),
+        queued=len(accepted),
+        rejected=len(results) - len(accepted),
+        results=results,
+    )
+
+
 @router.delete("/documents/{file_id}", response_model=DocumentDeleteResponse)
 async def delete_document(file_id: str):
     """Delete a document from the knowledge base by ID."""
@@ -537,6 +761,7 @@ async def compare_files(
     """Compare two uploaded files using deterministic paragraph-level diffing.
 
     Extracts text directly from file bytes — no database indexing or embedding required.
+    Returns 429 with `Retry-After` when too many extractions are already waiting.
     """
     if not base_file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Base file must have a filename")
@@ -546,28 +771,31 @@ async def compare_files(
     _validate_file_extension(base_file.filename)
     _validate_file_extension(comparison_file.filename)
 
-    base_bytes = await _read_upload_with_size_check(base_file, settings.max_document_size_mb)
-    comparison_bytes = await _read_upload_with_size_check(comparison_file, settings.max_document_size_mb)
-
-    try:
-        result = await rag_service.compare_files(
-            base_bytes,
-            base_file.filename,
-            comparison_bytes,
-            comparison_file.filename,
-            max_changes=max_changes,
-        )
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e),
-        ) from e
-    except Exception as e:
-        logger.error("Failed to compare uploaded files: {}", e)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to compare uploaded files.",
-        ) from e
+    base_spool = await _read_upload_with_size_check(base_file, settings.max_document_size_mb)
+    with base_spool:
+        comparison_spool = await _read_upload_with_size_check(comparison_file, settings.max_document_size_mb)
+        with comparison_spool:
+            try:
+                result = await rag_service.compare_files(
+                    base_spool.source(),
+                    base_file.filename,
+                    comparison_spool.source(),
+                    comparison_file.filename,
+                    max_changes=max_changes,
+                )
+            except AdmissionRejected as e:
+                raise _too_many_requests(e) from e
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=str(e),
+                ) from e
+            except Exception as e:
+                logger.error("Failed to compare uploaded files: {}", e)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to compare uploaded files.",
+                ) from e
 
     return DocumentCompareResponse(**result)
 
@@ -601,3 +829,71 @@ async def get_document_statuses(request: DocumentStatusRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get document statuses.",
         ) from e
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _status_event(file_id: str, info: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "file_id": file_id,
+        "status": info["status"],
+        "progress_phase": info.get("progress_phase"),
+        "progress_detail": info.get("progress_detail"),
+        "error": info.get("error"),
+    }
+
+
+async def _current_statuses(file_ids: set[str]) -> list[dict[str, Any]]:
+    statuses = await rag_service.get_document_statuses(sorted(file_ids))
+    return [_status_event(fid, info) for fid, info in statuses.items() if info]
+
+
+async def _document_events(file_ids: list[str]) -> AsyncIterator[str]:
+    """Current statuses, then every change, until each document completes or fails."""
+    pending = set(file_ids)
+    # Subscribe before reading the snapshot so no change in between is missed
+    with progress_events.subscribe(file_ids) as queue:
+        updates = await _current_statuses(pending)
+        while True:
+            for update in updates:
+                if update.get("file_id") in pending:
+                    yield _sse("status", update)
+                    if update["status"] in TERMINAL_STATUSES:
+                        pending.discard(update["file_id"])
+            if not pending:
+                return
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.progress_events_heartbeat_seconds)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                updates = []
+                continue
+            updates = await _current_statuses(pending) if event is RESYNC else [event]
+
+
+@router.get("/documents/events")
+async def stream_document_events(file_ids: list[str] = _EVENT_FILE_IDS_QUERY):
+    """Stream status and progress changes of documents as server-sent events.
+
+    Sends the current status of each document first, then a ``status``
+    event (``file_id``, ``status``, ``progress_phase``, ``progress_detail``,
+    ``error``) on every change, and ends once every document has completed
+    or failed. Replaces polling ``/documents/statuses``.
+    """
+    if len(file_ids) > _MAX_EVENT_FILE_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {_MAX_EVENT_FILE_IDS} file IDs per stream.",
+        )
+    if not progress_events.listening:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Progress events unavailable, poll /documents/statuses.",
+        )
+    return StreamingResponse(
+        _document_events(file_ids),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -105,6 +105,7 @@ async def get_config():
         openai_embedding_model=llm_config.get("embedding_model", ""),
         chunk_size=settings.chunk_size,
         chunk_overlap=settings.chunk_overlap,
+        chunk_sizing=settings.chunk_sizing,
         top_k=settings.top_k,
         similarity_threshold=settings.similarity_threshold,
     )
@@ -11,14 +11,29 @@ On top of that we apply a small post-filter for bareword placeholders
 the library still flags (``REDACTED``, ``your-api-key-here``, ``null``,
 etc.) — these sneak through because the KeywordDetector treats any value
 after ``password:`` / ``secret:`` as a candidate.
+
+Uploads are scanned in memory (no temp file) by
+:func:`scan_upload_for_secrets`, which runs the plugins in a small process
+pool so scans neither block the event loop nor serialize on the GIL, and
+caches verdicts by content hash. Binary formats (PDF, Office, images) are
+not scanned: the plugins match text lines, and these files are compressed
+or encoded, so they could never match.
 """
 
+import asyncio
+import io
+import multiprocessing
+import os
 import re
-import tempfile
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
-from detect_secrets import SecretsCollection
+from detect_secrets.core.scan import _process_line_based_plugins
 from detect_secrets.settings import transient_settings
+from detect_secrets.transformers import get_transformed_file
 from loguru import logger
 
 # Enabled plugins. Keep the list explicit so bumping detect-secrets does
@@ -112,46 +127,145 @@ def _is_noise(secret_value: str | None) -> bool:
     return bool(_MEMBER_ACCESS_RE.match(stripped))
 
 
-def scan_file_for_secrets(file_bytes: bytes) -> tuple[bool, str | None]:
-    """Scan file content for credential patterns.
+# Extensions the scanner skips (see the module docstring)
+_BINARY_EXTENSIONS: frozenset[str] = frozenset(
+    {".pdf", ".docx", ".pptx", ".xlsx", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".tiff", ".tif"}
+)
 
-    Returns ``(rejected, reason)``. When rejected is True the upload must
-    not be indexed; ``reason`` contains the detect-secrets detector label
-    (e.g. ``"AWS Access Key"``, ``"Secret Keyword"``).
+# Name the scanned text is given: picks the same transformers and
+# filename filters as the `.txt` temp files scanned before.
+_SCAN_NAME = "upload.txt"
 
-    Detector errors (malformed bytes, I/O failures) fail open — log and
-    allow the upload rather than block it.
-    """
+_executor: ProcessPoolExecutor | None = None
+_slots: asyncio.Semaphore | None = None
+_max_workers = 2
+_verdicts: OrderedDict[str, tuple[bool, str | None]] = OrderedDict()
+_cache_size = 4096
+
+
+def configure_secret_scanning(max_workers: int, cache_size: int) -> None:
+    """Set the pool size (applies when the pool is next created) and the verdict cache size."""
+    global _max_workers, _cache_size
+    if max_workers < 1:
+        raise ValueError("Secret scan pool needs at least one worker")
+    _max_workers = max_workers
+    _cache_size = cache_size
+    while len(_verdicts) > _cache_size:
+        _verdicts.popitem(last=False)
+
+
+def shutdown_secret_scan_pool() -> None:
+    """Stop the worker processes (no-op if the pool was never used)."""
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _slots = None
+
+
+def _get_executor() -> tuple[ProcessPoolExecutor, asyncio.Semaphore]:
+    global _executor, _slots
+    if _executor is None or _slots is None:
+        _executor = ProcessPoolExecutor(max_workers=_max_workers, mp_context=multiprocessing.get_context("spawn"))
+        _slots = asyncio.Semaphore(_max_workers)
+    return _executor, _slots
+
+
+def _line_sets(text: str) -> Iterator[list[str]]:
+    """Lines to scan, as ``detect_secrets.core.scan.scan_file`` reads them from a file."""
+    file = io.StringIO(text)
+    file.name = _SCAN_NAME
+    yield get_transformed_file(file) or text.splitlines(keepends=True)
+    # Only reached when the plain lines had no secret
+    eager = get_transformed_file(file, use_eager_transformers=True)
+    if eager:
+        yield eager
+
+
+def _find_secrets(content: bytes | os.PathLike[str]) -> list[tuple[str, str]]:
+    """``(type, value)`` of every candidate secret in the content; empty for binary content."""
+    data = Path(content).read_bytes() if isinstance(content, os.PathLike) else content
     try:
-        # detect-secrets scans a file path, so write to a temp file.
-        # `/tmp` is tmpfs in the Docker image, so this is an in-memory
-        # round-trip with no real disk I/O.
-        with tempfile.NamedTemporaryFile(mode="wb", suffix=".txt", delete=False) as tf:
-            tf.write(file_bytes)
-            tmp_path = Path(tf.name)
-
-        try:
-            collection = SecretsCollection()
-            with transient_settings({"plugins_used": _PLUGINS}):
-                collection.scan_file(str(tmp_path))
-        finally:
-            tmp_path.unlink(missing_ok=True)
-    except Exception:
-        logger.exception("Secret scan failed; allowing file")
-        return False, None
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return []
+    with transient_settings({"plugins_used": _PLUGINS}):
+        for lines in _line_sets(text):
+            # Pinned detect-secrets 1.5.0: the line loop of `scan_file`,
+            # which itself only accepts a path on disk.
+            found = [
+                (secret.type, secret.secret_value or "")
+                for secret in _process_line_based_plugins(list(enumerate(lines, start=1)), _SCAN_NAME)
+            ]
+            if found:
+                return found
+    return []
+
 
-    for _filename, secret in collection:
-        value = secret.secret_value or ""
+def _verdict(found: list[tuple[str, str]]) -> tuple[bool, str | None]:
+    for secret_type, value in found:
         if _is_noise(value):
             logger.info(
                 "Secret scanner: filtered placeholder match",
-                extra={"type": secret.type, "value_len": len(value)},
+                extra={"type": secret_type, "value_len": len(value)},
             )
             continue
         logger.warning(
             "File rejected by secret scanner",
-            extra={"type": secret.type, "value_len": len(value)},
+            extra={"type": secret_type, "value_len": len(value)},
         )
-        return True, f"Potential secret detected: {secret.type}"
-
+        return True, f"Potential secret detected: {secret_type}"
     return False, None
+
+
+def scan_file_for_secrets(content: bytes | os.PathLike[str]) -> tuple[bool, str | None]:
+    """Scan file content (bytes, or the path of a spooled upload) for credential patterns.
+
+    Returns ``(rejected, reason)``. When rejected is True the upload must
+    not be indexed; ``reason`` contains the detect-secrets detector label
+    (e.g. ``"AWS Access Key"``, ``"Secret Keyword"``).
+
+    Detector errors (malformed bytes, I/O failures) fail open — log and
+    allow the upload rather than block it. Runs in the calling thread;
+    request handlers use :func:`scan_upload_for_secrets`.
+    """
+    try:
+        found = _find_secrets(content)
+    except Exception:
+        logger.exception("Secret scan failed; allowing file")
+        return False, None
+    return _verdict(found)
+
+
+async def scan_upload_for_secrets(
+    content: bytes | os.PathLike[str],
+    filename: str,
+    content_hash: str,
+) -> tuple[bool, str | None]:
+    """:func:`scan_file_for_secrets` for an upload, off the event loop and cached by content hash."""
+    if Path(filename).suffix.lower() in _BINARY_EXTENSIONS:
+        return False, None
+
+    cached = _verdicts.get(content_hash)
+    if cached is not None:
+        _verdicts.move_to_end(content_hash)
+        return cached
+
+    executor, slots = _get_executor()
+    try:
+        async with slots:
+            found = await asyncio.get_running_loop().run_in_executor(executor, _find_secrets, content)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); start a fresh pool next time
+        logger.warning("Secret scan process pool broke; allowing file")
+        shutdown_secret_scan_pool()
+        return False, None
+    except Exception:
+        logger.exception("Secret scan failed; allowing file")
+        return False, None
+
+    verdict = _verdict(found)
+    _verdicts[content_hash] = verdict
+    while len(_verdicts) > _cache_size:
+        _verdicts.popitem(last=False)
+    return verdict
@@ -0,0 +1,164 @@
+"""Byte- and page-weighted admission control for document extraction.
+
+Extraction cost grows with the file, not with the number of requests: a
+300-page scanned PDF renders, OCRs and describes every page while a small
+text file is done in milliseconds. Counting concurrent extractions would
+let a few large uploads exhaust memory, so each extraction reserves its
+file size and page count against ``admission_max_mb`` and
+``admission_max_pages`` before it starts. Work that does not fit waits in
+FIFO order; a single file larger than the whole budget runs once nothing
+else is admitted.
+
+Queue workers always wait — their jobs are already durable. Requests that
+extract while the client waits (``sync=true`` uploads, file comparisons)
+are rejected with :class:`AdmissionRejected` once ``admission_max_queued``
+extractions are already waiting; the API answers 429 with ``Retry-After``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+from loguru import logger
+from tale_knowledge.extraction import FileSource
+
+from ..config import settings
+
+
+class AdmissionRejected(Exception):
+    """Raised instead of queueing when too many extractions are already waiting."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Too many documents are waiting for extraction; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _pdf_page_count(source: FileSource) -> int:
+    from tale_knowledge.extraction.pdf import open_pdf
+
+    doc = open_pdf(source)
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+async def extraction_weight(source: FileSource, filename: str) -> tuple[int, int]:
+    """Bytes and pages an extraction of ``source`` reserves.
+
+    Only PDFs are opened to count their pages (MuPDF reads the page tree,
+    not the pages); every other format, or a PDF that cannot be opened,
+    counts as one page.
+    """
+    nbytes = os.stat(source).st_size if isinstance(source, os.PathLike) else len(source)
+    pages = 1
+    if filename.lower().endswith(".pdf"):
+        try:
+            pages = max(await asyncio.to_thread(_pdf_page_count, source), 1)
+        except Exception as e:
+            logger.debug("Could not count the pages of {}: {}", filename, e)
+    return nbytes, pages
+
+
+class AdmissionController:
+    """FIFO admission of extractions against a byte and a page budget."""
+
+    def __init__(self, max_bytes: int, max_pages: int, max_queued: int, retry_after_seconds: int) -> None:
+        self._max_bytes = max_bytes
+        self._max_pages = max_pages
+        self._max_queued = max_queued
+        self._retry_after = retry_after_seconds
+        self._bytes = 0
+        self._pages = 0
+        self._active = 0
+        self._waiters: deque[tuple[int, int, asyncio.Future[None]]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def raise_if_saturated(self) -> None:
+        """Raise :class:`AdmissionRejected` if the wait queue is full."""
+        if len(self._waiters) >= self._max_queued:
+            raise AdmissionRejected(self._retry_after)
+
+    @contextlib.asynccontextmanager
+    async def admit(self, nbytes: int, pages: int = 1, *, reject_when_full: bool = False) -> AsyncIterator[None]:
+        """Hold a reservation of ``nbytes`` and ``pages`` for the duration of the block.
+
+        Waits for earlier reservations to be released. With
+        ``reject_when_full`` raises :class:`AdmissionRejected` instead of
+        waiting when the wait queue is full.
+        """
+        # A file larger than the budget takes all of it (and runs alone)
+        nbytes = min(nbytes, self._max_bytes)
+        pages = min(max(pages, 1), self._max_pages)
+        if not self._waiters and self._fits(nbytes, pages):
+            self._reserve(nbytes, pages)
+        else:
+            if reject_when_full:
+                self.raise_if_saturated()
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            entry = (nbytes, pages, waiter)
+            self._waiters.append(entry)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Admitted just before the cancellation arrived
+                    self._release(nbytes, pages)
+                else:
+                    with contextlib.suppress(ValueError):
+                        self._waiters.remove(entry)
+                    self._wake()
+                raise
+        try:
+            yield
+        finally:
+            self._release(nbytes, pages)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "active": self._active,
+            "queued": len(self._waiters),
+            "reserved_bytes": self._bytes,
+            "reserved_pages": self._pages,
+            "max_bytes": self._max_bytes,
+            "max_pages": self._max_pages,
+        }
+
+    def _fits(self, nbytes: int, pages: int) -> bool:
+        return self._active == 0 or (self._bytes + nbytes <= self._max_bytes and self._pages + pages <= self._max_pages)
+
+    def _reserve(self, nbytes: int, pages: int) -> None:
+        self._bytes += nbytes
+        self._pages += pages
+        self._active += 1
+
+    def _release(self, nbytes: int, pages: int) -> None:
+        self._bytes -= nbytes
+        self._pages -= pages
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Strict FIFO: a large waiter at the head is not overtaken by small ones
+        while self._waiters and self._fits(*self._waiters[0][:2]):
+            nbytes, pages, waiter = self._waiters.popleft()
+            if waiter.done():
+                continue  # cancelled while waiting
+            self._reserve(nbytes, pages)
+            waiter.set_result(None)
+
+
+admission = AdmissionController(
+    max_bytes=settings.admission_max_mb * 1024 * 1024,
+    max_pages=settings.admission_max_pages,
+    max_queued=settings.admission_max_queued,
+    retry_after_seconds=settings.admission_retry_after_seconds,
+)
@@ -0,0 +1,101 @@
+"""Bulk-load mode for ``private_knowledge.chunks``.
+
+For a first-time import of a large corpus, ``start`` drops the HNSW and
+BM25 indexes so ingestion writes plain rows, and ``finish`` builds each
+index once from the loaded table in a background task, with
+``bulk_load_maintenance_work_mem`` and ``bulk_load_parallel_workers``.
+Search keeps working in between, but without the indexes it is slow and
+vector-only. The suspended indexes are recorded in the database, so the
+mode survives restarts and a rebuild interrupted by one is resumed by
+calling ``finish`` again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any
+
+import asyncpg
+from loguru import logger
+from tale_shared.db import (
+    acquire_with_retry,
+    build_progress,
+    rebuild_indexes,
+    suspend_indexes,
+    suspended_indexes,
+)
+
+from ..config import settings
+from .database import SCHEMA, get_pool, list_vector_indexes
+
+_CHUNKS = f"{SCHEMA}.chunks"
+_BM25_INDEX = f"{SCHEMA}.idx_pk_chunks_bm25"
+
+
+class BulkLoader:
+    """Suspends the chunk indexes and rebuilds them in a background task."""
+
+    def __init__(self) -> None:
+        self._rebuild: asyncio.Task[list[str]] | None = None
+
+    @property
+    def rebuilding(self) -> bool:
+        return self._rebuild is not None and not self._rebuild.done()
+
+    async def start(self) -> list[str]:
+        """Enter bulk-load mode; returns every index now suspended."""
+        pool = await get_pool()
+        async with acquire_with_retry(pool) as conn:
+            dropped = await suspend_indexes(conn, SCHEMA, [*await list_vector_indexes(conn), _BM25_INDEX])
+            suspended = await suspended_indexes(conn, SCHEMA)
+        logger.info("Bulk load started: dropped {}", dropped or "no indexes")
+        return suspended
+
+    async def finish(self) -> bool:
+        """Start rebuilding the suspended indexes; False if already rebuilding here."""
+        if self.rebuilding:
+            return False
+        self._rebuild = asyncio.create_task(self._run_rebuild(await get_pool()))
+        return True
+
+    async def status(self) -> dict[str, Any]:
+        pool = await get_pool()
+        async with acquire_with_retry(pool) as conn:
+            suspended = await suspended_indexes(conn, SCHEMA)
+            builds = await build_progress(conn, _CHUNKS)
+            rows = await conn.fetchval("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass($1)", _CHUNKS)
+        return {
+            "active": bool(suspended),
+            "suspended_indexes": suspended,
+            "rebuilding": self.rebuilding,
+            "builds": builds,
+            "approximate_chunks": max(rows or 0, 0),
+        }
+
+    async def stop(self) -> None:
+        """Cancel a running rebuild (its index is rebuilt by the next ``finish``)."""
+        if self._rebuild is not None:
+            self._rebuild.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._rebuild
+            self._rebuild = None
+
+    async def _run_rebuild(self, pool: asyncpg.Pool) -> list[str]:
+        try:
+            built = await rebuild_indexes(
+                pool,
+                SCHEMA,
+                _CHUNKS,
+                maintenance_work_mem=settings.bulk_load_maintenance_work_mem,
+                parallel_workers=settings.bulk_load_parallel_workers,
+                timeout=settings.bulk_load_rebuild_timeout_seconds,
+            )
+        except Exception:
+            logger.exception("Bulk load index rebuild failed; call finish again to resume")
+            raise
+        logger.info("Bulk load finished: built {}", built or "no indexes")
+        return built
+
+
+bulk_loader = BulkLoader()
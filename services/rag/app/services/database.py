@@ -9,7 +9,8 @@ import asyncio
 
 import asyncpg
 from loguru import logger
-from tale_shared.db import acquire_with_retry
+from tale_knowledge.retrieval import PrefixIndex, prefix_index_for
+from tale_shared.db import acquire_with_retry, register_vector_codecs, suspended_indexes
 
 from ..config import settings
 
@@ -17,6 +18,13 @@ _pool: asyncpg.Pool | None = None
 _pool_lock = asyncio.Lock()
 
 SCHEMA = "private_knowledge"
+_HNSW_INDEX_BASE = "idx_pk_chunks_embedding"
+_SERVER_SETTINGS = {
+    "search_path": f"{SCHEMA},public",
+    "tcp_keepalives_idle": "60",
+    "tcp_keepalives_interval": "10",
+    "tcp_keepalives_count": "3",
+}
 
 
 async def init_pool() -> asyncpg.Pool:
@@ -39,12 +47,9 @@ async def init_pool() -> asyncpg.Pool:
             max_size=settings.database_pool_max,
             command_timeout=30,
             max_inactive_connection_lifetime=120.0,
-            server_settings={
-                "search_path": f"{SCHEMA},public",
-                "tcp_keepalives_idle": "60",
-                "tcp_keepalives_interval": "10",
-                "tcp_keepalives_count": "3",
-            },
+            server_settings=_SERVER_SETTINGS,
+            # Embeddings travel in pgvector's binary format, not text literals
+            init=register_vector_codecs,
         )
         logger.info("Created connection pool for {} schema", SCHEMA)
         return _pool
@@ -56,6 +61,18 @@ async def get_pool() -> asyncpg.Pool:
     return _pool
 
 
+async def connect_dedicated() -> asyncpg.Connection:
+    """Open a connection outside the pool, for sessions held open indefinitely (LISTEN).
+
+    The caller closes it.
+    """
+    return await asyncpg.connect(
+        settings.get_database_url(),
+        command_timeout=30,
+        server_settings=_SERVER_SETTINGS,
+    )
+
+
 async def close_pool() -> None:
     global _pool
     if _pool is not None:
@@ -103,11 +120,65 @@ async def pin_embedding_dimensions(pool: asyncpg.Pool, dimensions: int) -> None:
             logger.info("Embedding column already pinned to {}", expected_type)
 
         try:
-            await conn.execute(f"SELECT {SCHEMA}.create_chunks_hnsw_index()")
-            logger.info("HNSW index ensured")
+            await ensure_vector_index(conn)
         except asyncpg.exceptions.ProgramLimitExceededError:
             logger.warning(
                 "Cannot create HNSW index: {} dimensions exceeds pgvector limit (2000). "
                 "Vector search will use sequential scan. Consider reducing dimensions.",
                 dimensions,
             )
+
+
+def vector_prefix_index() -> PrefixIndex | None:
+    """Prefix index selected by ``vector_index_mode``, or None for full vectors."""
+    if settings.vector_index_mode == "full":
+        return None
+    return prefix_index_for(
+        settings.vector_index_mode, settings.vector_index_dimensions, settings.get_embedding_dimensions()
+    )
+
+
+def vector_index_name() -> str:
+    """Qualified name of the HNSW index the current settings search through."""
+    prefix = vector_prefix_index()
+    name = prefix.index_name(_HNSW_INDEX_BASE) if prefix else f"{_HNSW_INDEX_BASE}_hnsw"
+    return f"{SCHEMA}.{name}"
+
+
+async def list_vector_indexes(conn: asyncpg.Connection) -> list[str]:
+    """Qualified names of the HNSW indexes currently on chunks.embedding."""
+    rows = await conn.fetch(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = $1 AND tablename = 'chunks' AND indexname LIKE $2",
+        SCHEMA,
+        f"{_HNSW_INDEX_BASE}%hnsw",
+    )
+    return [f"{SCHEMA}.{row['indexname']}" for row in rows]
+
+
+async def ensure_vector_index(conn: asyncpg.Connection) -> None:
+    """Converge chunks to exactly one HNSW index for the configured mode.
+
+    Full mode uses the migration-defined ``create_chunks_hnsw_index()``;
+    prefix modes build an expression index over the truncated prefix. Any
+    index left over from a previous mode or width is dropped so only one
+    graph is kept in memory.
+
+    Does nothing while a bulk load has the indexes suspended.
+    """
+    if await suspended_indexes(conn, SCHEMA):
+        logger.info("Bulk load in progress, vector index build deferred to its finish")
+        return
+
+    wanted = vector_index_name()
+    for index in await list_vector_indexes(conn):
+        if index != wanted:
+            logger.info("Dropping stale vector index {}", index)
+            await conn.execute(f"DROP INDEX IF EXISTS {index}")
+
+    prefix = vector_prefix_index()
+    if prefix is None:
+        await conn.execute(f"SELECT {SCHEMA}.create_chunks_hnsw_index()")
+    else:
+        name = wanted.split(".", 1)[1]
+        await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {SCHEMA}.chunks {prefix.index_method()}")
+    logger.info("HNSW index ensured: {}", wanted)
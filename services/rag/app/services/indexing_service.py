@@ -2,47 +2,58 @@
 
 Handles: extract text -> chunk -> embed -> store in private_knowledge schema.
 Content hash dedup: skip if document content hasn't changed.
+
+Chunks are stored once per content: a document whose content was already
+indexed under another document shares that document's chunks through
+``documents.chunk_owner_id`` instead of copying them (see
+:func:`clone_from_existing` and :func:`hand_over_chunks`).
 """
 
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
-import re
 import time
 import uuid
+from collections.abc import Sequence
+from contextlib import aclosing, nullcontext
 from dataclasses import dataclass, replace
-from io import BytesIO
 from typing import Any
 
 import asyncpg
+import numpy as np
 from loguru import logger
-from tale_knowledge.chunking import ContentChunk, chunk_content
+from tale_knowledge.chunking import ChunkDiff, ChunkSizing, ContentChunk, chunk_content_async, plan_chunk_diff
+from tale_knowledge.chunking.offload import OFFLOAD_THRESHOLD
 from tale_knowledge.embedding import EmbeddingService
-from tale_knowledge.extraction import extract_text
+from tale_knowledge.extraction import FileSource, PageCheckpointStore, extract_document
 from tale_knowledge.vision import VisionClient
-from tale_shared.db import acquire_with_retry
-from tale_shared.utils.hashing import compute_content_hash
+from tale_shared.db import acquire_with_retry, copy_insert
+from tale_shared.utils.hashing import compute_content_hash, compute_file_hash
+
+from .admission import AdmissionController, extraction_weight
+from .database import vector_index_name
+from .page_checkpoints import PostgresPageCheckpointStore
 
 SCHEMA = "private_knowledge"
-_HNSW_INDEX = f"{SCHEMA}.idx_pk_chunks_embedding_hnsw"
 _HNSW_CORRUPTION_MARKER = "should be empty but is not"
 
-_PDF_DATE_RE = re.compile(
-    r"^(?:D:)?"
-    r"(\d{4})"
-    r"(\d{2})?"
-    r"(\d{2})?"
-    r"(\d{2})?"
-    r"(\d{2})?"
-    r"(\d{2})?"
-    r"([Z+\-])?"
-    r"(\d{2})?'?"
-    r"(\d{2})?'?"
+# Chunk runs at least this long are written with binary COPY
+_COPY_MIN_ROWS = 100
+# Rounds of (embed what the diff needs, apply it) before giving up on a
+# re-upload whose stored chunks keep changing under us
+_STORE_ROUNDS = 3
+_CHUNK_COLUMNS = (
+    "document_id",
+    "chunk_index",
+    "chunk_content",
+    "content_hash",
+    "embedding",
+    "core_content",
+    "prefix_overlap",
+    "suffix_overlap",
 )
 
-_MIN_YEAR = 1970
-_MAX_YEAR = 2100
-
 
 @dataclass(frozen=True, slots=True)
 class PreparedDocument:
@@ -50,107 +61,22 @@ class PreparedDocument:
 
     content_hash: str
     chunks: list[ContentChunk]
-    embeddings: list[list[float]]
+    # (len(chunks), dimensions) float32; None when embedding is deferred to
+    # the streaming store path.
+    embeddings: np.ndarray | None
     vision_used: bool
     source_created_at: dt.datetime | None = None
     source_modified_at: dt.datetime | None = None
 
 
-def _parse_pdf_date(date_str: str | None) -> dt.datetime | None:
-    """Parse PDF date format ``D:YYYYMMDDHHmmSSOHH'mm'`` to a datetime.
-
-    Returns ``None`` for missing, malformed, or out-of-range dates.
-    """
-    if not date_str or not isinstance(date_str, str):
-        return None
-
-    match = _PDF_DATE_RE.match(date_str.strip())
-    if not match:
-        return None
+def _chunk_hash(chunk: ContentChunk) -> str:
+    return compute_content_hash(chunk.content.encode("utf-8"))
 
-    try:
-        year = int(match.group(1))
-        if year < _MIN_YEAR or year > _MAX_YEAR:
-            return None
 
-        month = int(match.group(2) or "01")
-        day = int(match.group(3) or "01")
-        hour = int(match.group(4) or "00")
-        minute = int(match.group(5) or "00")
-        second = int(match.group(6) or "00")
-
-        tz_sign = match.group(7)
-        tz_hours = int(match.group(8) or "0")
-        tz_minutes = int(match.group(9) or "0")
-
-        if tz_sign == "-":
-            tz_offset = dt.timezone(dt.timedelta(hours=-tz_hours, minutes=-tz_minutes))
-        elif tz_sign == "+":
-            tz_offset = dt.timezone(dt.timedelta(hours=tz_hours, minutes=tz_minutes))
-        else:
-            tz_offset = dt.UTC
-
-        return dt.datetime(year, month, day, hour, minute, second, tzinfo=tz_offset)
-    except (ValueError, OverflowError):
-        return None
-
-
-def _ensure_aware(d: dt.datetime | None) -> dt.datetime | None:
-    """Ensure a datetime is timezone-aware (assume UTC if naive)."""
-    if d is None:
-        return None
-    if not isinstance(d, dt.datetime):
-        return None
-    if d.tzinfo is None:
-        return d.replace(tzinfo=dt.UTC)
-    return d
-
-
-def _extract_file_dates(
-    content_bytes: bytes,
-    filename: str,
-) -> tuple[dt.datetime | None, dt.datetime | None]:
-    """Extract created/modified dates from PDF, DOCX, or PPTX file bytes.
-
-    Returns (created, modified). Both may be None on failure or unsupported format.
-    """
-    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-
-    try:
-        if ext == "pdf":
-            import fitz
-
-            doc = fitz.open(stream=content_bytes, filetype="pdf")
-            metadata = doc.metadata or {}
-            doc.close()
-            return (
-                _parse_pdf_date(metadata.get("creationDate")),
-                _parse_pdf_date(metadata.get("modDate")),
-            )
-
-        if ext == "docx":
-            from docx import Document
-
-            doc = Document(BytesIO(content_bytes))
-            props = doc.core_properties
-            return (
-                _ensure_aware(props.created),
-                _ensure_aware(props.modified),
-            )
-
-        if ext == "pptx":
-            from pptx import Presentation
-
-            prs = Presentation(BytesIO(content_bytes))
-            props = prs.core_properties
-            return (
-                _ensure_aware(props.created),
-                _ensure_aware(props.modified),
-            )
-    except Exception:
-        logger.warning("Could not extract dates from {}", filename)
-
-    return (None, None)
+def _source_hash(source: FileSource) -> str:
+    if isinstance(source, bytes):
+        return compute_content_hash(source)
+    return compute_file_hash(source)
 
 
 async def _update_progress(
@@ -201,27 +127,48 @@ def _make_extraction_progress_callback(
 
 
 async def prepare_document(
-    content_bytes: bytes,
+    content_bytes: FileSource,
     filename: str,
     *,
+    content_hash: str | None = None,
     embedding_service: EmbeddingService,
     vision_client: VisionClient | None = None,
     chunk_size: int = 2048,
     chunk_overlap: int = 200,
+    chunk_sizing: ChunkSizing = "chars",
+    chunk_offload_threshold: int = OFFLOAD_THRESHOLD,
     on_progress: Any = None,
+    embed: bool = True,
+    page_checkpoints: PageCheckpointStore | None = None,
 ) -> PreparedDocument | None:
     """Extract, chunk, and embed a document (expensive work done once).
 
+    With ``chunk_sizing="tokens"`` chunk size and overlap are counted in
+    tokens of the embedding model. Text of at least
+    ``chunk_offload_threshold`` characters is chunked in a worker process
+    so the event loop keeps serving searches.
+
+    With ``embed=False`` the embeddings are left as None so the caller can
+    stream them straight into storage (see ``store_prepared_document``).
+
+    ``content_bytes`` may be the path of a spooled upload; pass
+    ``content_hash`` when the caller already hashed it. With
+    ``page_checkpoints``, PDF pages are saved as they are extracted and a
+    retry skips the pages already saved.
+
     Returns None if no usable text/chunks could be produced.
     """
-    content_hash = compute_content_hash(content_bytes)
+    if content_hash is None:
+        content_hash = _source_hash(content_bytes)
 
     try:
-        extracted_text, vision_used = await extract_text(
+        extracted = await extract_document(
             content_bytes,
             filename,
             vision_client=vision_client,
             on_progress=on_progress,
+            checkpoints=page_checkpoints,
+            content_hash=content_hash,
         )
     except UnicodeDecodeError:
         raise ValueError(
@@ -229,31 +176,33 @@ async def prepare_document(
             "PDF, DOCX, PPTX, XLSX, TXT, MD, CSV, PNG, JPG, GIF, WebP"
         ) from None
 
-    source_created_at, source_modified_at = _extract_file_dates(content_bytes, filename)
-
+    extracted_text = extracted.text
     if not extracted_text or not extracted_text.strip():
         logger.warning("No text extracted from {}", filename)
         return None
 
-    chunks = chunk_content(
+    chunks = await chunk_content_async(
         extracted_text,
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
+        sizing=chunk_sizing,
+        tokenizer_model=embedding_service.model if chunk_sizing == "tokens" else None,
+        offload_threshold=chunk_offload_threshold,
     )
 
     if not chunks:
         logger.warning("No chunks produced from {}", filename)
         return None
 
-    embeddings = await embedding_service.embed_texts([c.content for c in chunks])
+    embeddings = await embedding_service.embed_texts_array([c.content for c in chunks]) if embed else None
 
     return PreparedDocument(
         content_hash=content_hash,
         chunks=chunks,
         embeddings=embeddings,
-        vision_used=vision_used,
-        source_created_at=source_created_at,
-        source_modified_at=source_modified_at,
+        vision_used=extracted.vision_used,
+        source_created_at=extracted.metadata.created_at,
+        source_modified_at=extracted.metadata.modified_at,
     )
 
 
@@ -263,11 +212,13 @@ async def find_existing_by_hash(
 ) -> uuid.UUID | None:
     """Find a completed document with the given content hash (any scope).
 
-    Returns the internal UUID (documents.id) if found, else None.
+    Returns the internal UUID (documents.id) of the document that stores
+    the chunks for this content if found, else None.
     """
     async with acquire_with_retry(pool) as conn:
         row = await conn.fetchrow(
-            f"SELECT id FROM {SCHEMA}.documents WHERE content_hash = $1 AND status = 'completed' LIMIT 1",
+            f"""SELECT COALESCE(chunk_owner_id, id) AS id FROM {SCHEMA}.documents
+                WHERE content_hash = $1 AND status = 'completed' LIMIT 1""",
             content_hash,
         )
     return row["id"] if row else None
@@ -283,8 +234,10 @@ async def clone_from_existing(
     source_created_at: dt.datetime | None = None,
     source_modified_at: dt.datetime | None = None,
 ) -> dict[str, Any] | None:
-    """Clone chunks from an existing document into a new scope.
+    """Index a document by sharing the chunks of one with the same content.
 
+    Only the document row is written — it references the source's chunks,
+    so a duplicate upload costs the same whatever the document's size.
     Skips if the target scope already has the same content hash.
     Falls back to None if the source document no longer exists.
     """
@@ -318,7 +271,7 @@ async def clone_from_existing(
             if result is None:
                 return None
             logger.info(
-                "Cloned document {}: {} chunks (from source {})",
+                "Cloned document {}: shares {} chunks of source {}",
                 file_id,
                 result["chunks_created"],
                 source_doc_id,
@@ -341,17 +294,22 @@ async def _do_clone(
     source_created_at: dt.datetime | None = None,
     source_modified_at: dt.datetime | None = None,
 ) -> dict[str, Any] | None:
-    """Clone chunks from source document in a single transaction.
+    """Point a document at the source's chunks in a single transaction.
 
     Uses ON CONFLICT to atomically handle concurrent writes for the same
-    file_id.  Returns None if the source document has no chunks (e.g.
-    deleted concurrently).
+    file_id.  The source row is share-locked so it cannot hand its chunks
+    over or drop them until the reference is committed.  Returns None if
+    the source no longer stores chunks for ``content_hash`` (e.g. deleted
+    or re-indexed concurrently).
     """
     async with acquire_with_retry(pool) as conn, conn.transaction():
         source = await conn.fetchrow(
             f"""SELECT chunks_count, source_created_at, source_modified_at
-                FROM {SCHEMA}.documents WHERE id = $1 AND status = 'completed'""",
+                FROM {SCHEMA}.documents
+                WHERE id = $1 AND content_hash = $2 AND chunk_owner_id IS NULL
+                FOR SHARE""",
             source_doc_id,
+            content_hash,
         )
         if not source:
             return None
@@ -360,8 +318,8 @@ async def _do_clone(
             f"""
             INSERT INTO {SCHEMA}.documents
                 (file_id, filename, content_hash, status, chunks_count,
-                 source_created_at, source_modified_at)
-            VALUES ($1, $2, $3, 'completed', $4, $5, $6)
+                 source_created_at, source_modified_at, chunk_owner_id)
+            VALUES ($1, $2, $3, 'completed', $4, $5, $6, $7)
             ON CONFLICT (file_id, COALESCE(team_id, ''))
             DO UPDATE SET
                 filename = EXCLUDED.filename,
@@ -370,6 +328,7 @@ async def _do_clone(
                 chunks_count = EXCLUDED.chunks_count,
                 source_created_at = EXCLUDED.source_created_at,
                 source_modified_at = EXCLUDED.source_modified_at,
+                chunk_owner_id = EXCLUDED.chunk_owner_id,
                 error = NULL,
                 progress_phase = NULL,
                 progress_detail = NULL,
@@ -382,58 +341,89 @@ async def _do_clone(
             source["chunks_count"],
             source_created_at or source["source_created_at"],
             source_modified_at or source["source_modified_at"],
+            source_doc_id,
         )
-        doc_uuid = doc_row["id"]
 
-        # On UPDATE (not a fresh insert), remove old chunks first
+        # On UPDATE (not a fresh insert), the old content's chunks go to the
+        # documents still sharing them, or are removed
         if not doc_row["is_insert"]:
+            await hand_over_chunks(conn, doc_row["id"])
             await conn.execute(
                 f"DELETE FROM {SCHEMA}.chunks WHERE document_id = $1",
-                doc_uuid,
+                doc_row["id"],
             )
 
-        chunks_created = await conn.fetchval(
-            f"""
-            WITH inserted AS (
-                INSERT INTO {SCHEMA}.chunks
-                    (document_id, chunk_index, chunk_content, content_hash, embedding,
-                     core_content, prefix_overlap, suffix_overlap)
-                SELECT $1, chunk_index, chunk_content, content_hash, embedding,
-                       core_content, prefix_overlap, suffix_overlap
-                FROM {SCHEMA}.chunks
-                WHERE document_id = $2
-                RETURNING 1
-            )
-            SELECT count(*) FROM inserted
-            """,
-            doc_uuid,
-            source_doc_id,
-        )
-
     return {
         "success": True,
         "file_id": file_id,
-        "chunks_created": chunks_created,
+        "chunks_created": source["chunks_count"],
         "skipped": False,
         "skip_reason": None,
     }
 
 
+async def hand_over_chunks(
+    conn: asyncpg.Connection,
+    doc_uuid: uuid.UUID,
+    *,
+    exclude: Sequence[uuid.UUID] = (),
+) -> bool:
+    """Move a document's chunks to one of the documents sharing them.
+
+    Call inside a transaction before the document's chunks are changed or
+    deleted. The oldest sharer (not in ``exclude``, e.g. documents being
+    deleted together with this one) becomes the new owner and the other
+    sharers are re-pointed at it. Returns False when nothing shares the
+    chunks, leaving them in place.
+    """
+    heir = await conn.fetchval(
+        f"""SELECT id FROM {SCHEMA}.documents
+            WHERE chunk_owner_id = $1 AND id <> ALL($2::uuid[])
+            ORDER BY created_at, id
+            LIMIT 1
+            FOR UPDATE""",
+        doc_uuid,
+        list(exclude),
+    )
+    if heir is None:
+        return False
+    await conn.execute(
+        f"""UPDATE {SCHEMA}.documents
+            SET chunk_owner_id = CASE WHEN id = $2 THEN NULL ELSE $2 END
+            WHERE chunk_owner_id = $1""",
+        doc_uuid,
+        heir,
+    )
+    await conn.execute(f"UPDATE {SCHEMA}.chunks SET document_id = $2 WHERE document_id = $1", doc_uuid, heir)
+    logger.info("Handed shared chunks of document {} over to {}", doc_uuid, heir)
+    return True
+
+
 async def _reindex_chunks_hnsw(pool: asyncpg.Pool) -> None:
     """Rebuild the HNSW vector index to recover from page corruption."""
-    logger.warning("HNSW index corruption detected — rebuilding {}", _HNSW_INDEX)
+    index = vector_index_name()
+    logger.warning("HNSW index corruption detected — rebuilding {}", index)
     async with acquire_with_retry(pool) as conn:
-        await conn.execute(f"REINDEX INDEX {_HNSW_INDEX}", timeout=300)
+        await conn.execute(f"REINDEX INDEX {index}", timeout=300)
     logger.info("HNSW index rebuild completed")
 
 
+class _StaleChunkDiff(Exception):
+    """The stored chunks changed since the diff was planned; these positions need embedding."""
+
+    def __init__(self, positions: list[int]) -> None:
+        super().__init__(f"{len(positions)} chunks need embedding")
+        self.positions = positions
+
+
 async def _do_store(
     pool: asyncpg.Pool,
     file_id: str,
     filename: str,
     prepared: PreparedDocument,
+    embedding_service: EmbeddingService | None = None,
 ) -> dict[str, Any]:
-    """Upsert document and replace chunks in a single transaction.
+    """Upsert document and sync its chunks.
 
     Uses ON CONFLICT to atomically handle concurrent writes for the same
     file_id.  A WHERE clause on content_hash skips the update (and chunk
@@ -442,89 +432,401 @@ async def _do_store(
 
     When the WHERE filters out the update, RETURNING yields no rows —
     we treat that as "content unchanged, skip".
+
+    On re-upload the new chunks are diffed against the stored ones by
+    ``content_hash`` (see :func:`plan_chunk_diff`): unchanged chunks keep
+    their row and embedding, only new or changed chunks are embedded and
+    inserted, and chunks that disappeared are deleted. If other documents
+    share the stored chunks, those are handed over to them instead and
+    every chunk is inserted anew.
+
+    With precomputed embeddings everything happens in one transaction.
+    When ``prepared.embeddings`` is None, chunks are embedded here and no
+    transaction is held open across provider calls:
+
+    - A document search already serves chunks for (a re-upload) is diffed
+      first, the chunks the diff needs are embedded, and the diff is
+      re-planned and applied in one transaction, so search keeps seeing
+      the previous chunk set until the new one is complete. If the stored
+      chunks changed in between, the missing positions are embedded and
+      the write is retried, up to ``_STORE_ROUNDS`` times.
+    - A new document streams its chunks with
+      ``embedding_service.embed_stream``: the upsert commits first with
+      the document ``processing`` and its ``content_hash`` cleared, each
+      embedded batch is inserted in its own short transaction as it
+      arrives, and a last statement flips the document to ``completed``.
+      A write that dies midway leaves the hash cleared, so the retry is
+      not skipped as unchanged and reuses the chunks already inserted.
+      Each step checks that ``updated_at`` is still the value the upsert
+      wrote, so a newer upload of the same file supersedes this one
+      instead of interleaving.
+    """
+    if prepared.embeddings is not None:
+        diff = await _store_chunks(pool, file_id, filename, prepared, dict(enumerate(prepared.embeddings)))
+    elif embedding_service is None:
+        raise ValueError("embedding_service is required when embeddings are not precomputed")
+    else:
+        async with acquire_with_retry(pool) as conn:
+            served = await _served_chunk_diff(conn, file_id, prepared)
+        to_embed = None if served is None else served.inserts
+        vectors: dict[int, Any] = {}
+        for _ in range(_STORE_ROUNDS):
+            try:
+                if to_embed is None:
+                    diff = await _stream_new_document(pool, file_id, filename, prepared, embedding_service)
+                    break
+                if to_embed:
+                    batch = await embedding_service.embed_texts_array([prepared.chunks[i].content for i in to_embed])
+                    vectors.update(zip(to_embed, batch, strict=True))
+                diff = await _store_chunks(pool, file_id, filename, prepared, vectors)
+                break
+            except _StaleChunkDiff as exc:
+                to_embed = exc.positions
+        else:
+            raise RuntimeError(f"Stored chunks of {file_id} kept changing while it was re-indexed")
+
+    # No diff → content_hash matched, nothing to do
+    if diff is None:
+        return {
+            "success": True,
+            "file_id": file_id,
+            "chunks_created": 0,
+            "skipped": True,
+            "skip_reason": "content_unchanged",
+        }
+
+    if diff.reused:
+        logger.info(
+            "Document {}: reused {} chunks, embedded {}, deleted {}",
+            file_id,
+            diff.reused,
+            len(diff.inserts),
+            len(diff.deletes),
+        )
+
+    return {
+        "success": True,
+        "file_id": file_id,
+        "chunks_created": len(prepared.chunks),
+        "chunks_embedded": len(diff.inserts),
+        "chunks_reused": diff.reused,
+        "skipped": False,
+        "skip_reason": None,
+    }
+
+
+async def _upsert_document(
+    conn: asyncpg.Connection,
+    file_id: str,
+    filename: str,
+    prepared: PreparedDocument,
+    *,
+    streaming: bool,
+) -> asyncpg.Record | None:
+    """Write the document row; None when its content is unchanged."""
+    return await conn.fetchrow(
+        f"""
+            INSERT INTO {SCHEMA}.documents
+                (file_id, filename, content_hash, status, chunks_count,
+                 source_created_at, source_modified_at, ocr_applied)
+            VALUES ($1, $2, $8, $9, $4, $5, $6, $7)
+            ON CONFLICT (file_id, COALESCE(team_id, ''))
+            DO UPDATE SET
+                filename = EXCLUDED.filename,
+                content_hash = EXCLUDED.content_hash,
+                status = EXCLUDED.status,
+                chunks_count = EXCLUDED.chunks_count,
+                source_created_at = EXCLUDED.source_created_at,
+                source_modified_at = EXCLUDED.source_modified_at,
+                ocr_applied = EXCLUDED.ocr_applied,
+                chunk_owner_id = NULL,
+                error = NULL,
+                progress_phase = NULL,
+                progress_detail = NULL,
+                updated_at = NOW()
+            WHERE {SCHEMA}.documents.content_hash IS DISTINCT FROM $3
+            RETURNING id, (xmax = 0) AS is_insert, updated_at
+            """,
+        file_id,
+        filename,
+        prepared.content_hash,
+        0 if streaming else len(prepared.chunks),
+        prepared.source_created_at,
+        prepared.source_modified_at,
+        prepared.vision_used,
+        None if streaming else prepared.content_hash,
+        "processing" if streaming else "completed",
+    )
+
+
+async def _stored_chunk_diff(
+    conn: asyncpg.Connection,
+    doc_uuid: uuid.UUID,
+    prepared: PreparedDocument,
+) -> ChunkDiff | None:
+    """Diff ``prepared`` against the document's own stored chunks; None if it has none."""
+    existing = await conn.fetch(
+        f"""
+            SELECT id, chunk_index,
+                   CASE WHEN embedding IS NOT NULL THEN content_hash END AS content_hash
+            FROM {SCHEMA}.chunks
+            WHERE document_id = $1
+            """,
+        doc_uuid,
+    )
+    if not existing:
+        return None
+    return plan_chunk_diff(
+        [(row["id"], row["chunk_index"], row["content_hash"]) for row in existing],
+        [_chunk_hash(chunk) for chunk in prepared.chunks],
+    )
+
+
+async def _served_chunk_diff(
+    conn: asyncpg.Connection,
+    file_id: str,
+    prepared: PreparedDocument,
+    *,
+    lock: bool = False,
+) -> ChunkDiff | None:
+    """Diff ``prepared`` against the chunks search serves for ``file_id``.
+
+    None when search serves none yet (new document, or one whose earlier
+    attempts stored nothing), so its chunks can be streamed in.
+    """
+    doc = await conn.fetchrow(
+        f"""
+            SELECT id, chunk_owner_id IS NOT NULL AS shares_chunks
+            FROM {SCHEMA}.documents
+            WHERE file_id = $1
+            {"FOR UPDATE" if lock else ""}
+            """,
+        file_id,
+    )
+    if doc is None:
+        return None
+    if doc["shares_chunks"]:
+        return ChunkDiff.insert_all(len(prepared.chunks))
+    return await _stored_chunk_diff(conn, doc["id"], prepared)
+
+
+async def _store_chunks(
+    pool: asyncpg.Pool,
+    file_id: str,
+    filename: str,
+    prepared: PreparedDocument,
+    vectors: dict[int, Any],
+) -> ChunkDiff | None:
+    """Write the document and its chunk diff in one transaction.
+
+    ``vectors`` maps chunk positions to embeddings. Raises
+    :class:`_StaleChunkDiff` (rolling everything back) when the diff
+    planned under lock needs a position ``vectors`` lacks.
     """
     async with acquire_with_retry(pool) as conn, conn.transaction():
-        doc_row = await conn.fetchrow(
+        doc_row = await _upsert_document(conn, file_id, filename, prepared, streaming=False)
+        if doc_row is None:
+            return None
+        doc_uuid = doc_row["id"]
+
+        # On UPDATE (not a fresh insert), diff against the stored chunks so
+        # only new or changed chunks are embedded and written.
+        diff = None
+        if not doc_row["is_insert"] and not await hand_over_chunks(conn, doc_uuid):
+            diff = await _stored_chunk_diff(conn, doc_uuid, prepared)
+        if diff is None:
+            diff = ChunkDiff.insert_all(len(prepared.chunks))
+        missing = [position for position in diff.inserts if position not in vectors]
+        if missing:
+            raise _StaleChunkDiff(missing)
+
+        await _apply_chunk_diff(conn, doc_uuid, diff, prepared.chunks)
+        if diff.inserts:
+            await _insert_chunks(
+                conn,
+                doc_uuid,
+                [prepared.chunks[position] for position in diff.inserts],
+                [vectors[position] for position in diff.inserts],
+            )
+    return diff
+
+
+async def _stream_new_document(
+    pool: asyncpg.Pool,
+    file_id: str,
+    filename: str,
+    prepared: PreparedDocument,
+    embedding_service: EmbeddingService,
+) -> ChunkDiff | None:
+    """Stream a document search serves no chunks for yet, batch by batch.
+
+    Raises :class:`_StaleChunkDiff` if a concurrent write stored chunks for
+    it since the caller checked.
+    """
+    async with acquire_with_retry(pool) as conn, conn.transaction():
+        served = await _served_chunk_diff(conn, file_id, prepared, lock=True)
+        if served is not None:
+            raise _StaleChunkDiff(served.inserts)
+        doc_row = await _upsert_document(conn, file_id, filename, prepared, streaming=True)
+        if doc_row is None:
+            return None
+
+    doc_uuid = doc_row["id"]
+    written_at = doc_row["updated_at"]
+    stream = embedding_service.embed_stream([c.content for c in prepared.chunks])
+    async with aclosing(stream) as batches:
+        async for offset, vectors in batches:
+            batch = prepared.chunks[offset : offset + len(vectors)]
+            await _insert_chunk_batch(pool, doc_uuid, written_at, batch, vectors)
+    await _complete_store(pool, doc_uuid, written_at, prepared)
+    return ChunkDiff.insert_all(len(prepared.chunks))
+
+
+async def _insert_chunk_batch(
+    pool: asyncpg.Pool,
+    doc_uuid: uuid.UUID,
+    written_at: dt.datetime,
+    chunks: list[ContentChunk],
+    embeddings: Any,
+) -> None:
+    """Insert one embedded batch in its own transaction, unless the write was superseded."""
+    async with acquire_with_retry(pool) as conn, conn.transaction():
+        current = await conn.execute(
+            f"SELECT 1 FROM {SCHEMA}.documents WHERE id = $1 AND updated_at = $2 FOR SHARE",
+            doc_uuid,
+            written_at,
+        )
+        if current == "SELECT 0":
+            raise RuntimeError(f"Document {doc_uuid} was re-indexed concurrently")
+        await _insert_chunks(conn, doc_uuid, chunks, embeddings)
+
+
+async def _complete_store(
+    pool: asyncpg.Pool,
+    doc_uuid: uuid.UUID,
+    written_at: dt.datetime,
+    prepared: PreparedDocument,
+) -> None:
+    """Mark a streamed write completed and record its content hash."""
+    async with acquire_with_retry(pool) as conn:
+        result = await conn.execute(
             f"""
-                INSERT INTO {SCHEMA}.documents
-                    (file_id, filename, content_hash, status, chunks_count,
-                     source_created_at, source_modified_at, ocr_applied)
-                VALUES ($1, $2, $3, 'completed', $4, $5, $6, $7)
-                ON CONFLICT (file_id, COALESCE(team_id, ''))
-                DO UPDATE SET
-                    filename = EXCLUDED.filename,
-                    content_hash = EXCLUDED.content_hash,
-                    status = 'completed',
-                    chunks_count = EXCLUDED.chunks_count,
-                    source_created_at = EXCLUDED.source_created_at,
-                    source_modified_at = EXCLUDED.source_modified_at,
-                    ocr_applied = EXCLUDED.ocr_applied,
-                    error = NULL,
+                UPDATE {SCHEMA}.documents
+                SET status = 'completed',
+                    content_hash = $3,
+                    chunks_count = $4,
                     progress_phase = NULL,
                     progress_detail = NULL,
                     updated_at = NOW()
-                WHERE {SCHEMA}.documents.content_hash IS DISTINCT FROM EXCLUDED.content_hash
-                RETURNING id, (xmax = 0) AS is_insert
+                WHERE id = $1 AND updated_at = $2
                 """,
-            file_id,
-            filename,
+            doc_uuid,
+            written_at,
             prepared.content_hash,
             len(prepared.chunks),
-            prepared.source_created_at,
-            prepared.source_modified_at,
-            prepared.vision_used,
         )
+    if result == "UPDATE 0":
+        raise RuntimeError(f"Document {doc_uuid} was re-indexed concurrently")
 
-        # No row returned → content_hash matched, nothing to do
-        if doc_row is None:
-            return {
-                "success": True,
-                "file_id": file_id,
-                "chunks_created": 0,
-                "skipped": True,
-                "skip_reason": "content_unchanged",
-            }
 
-        doc_uuid = doc_row["id"]
+async def _apply_chunk_diff(
+    conn: asyncpg.Connection,
+    doc_uuid: uuid.UUID,
+    diff: ChunkDiff,
+    chunks: list[ContentChunk],
+) -> None:
+    """Delete dropped rows and renumber reused ones (the caller inserts new ones).
 
-        # On UPDATE (not a fresh insert), remove old chunks first
-        if not doc_row["is_insert"]:
-            await conn.execute(
-                f"DELETE FROM {SCHEMA}.chunks WHERE document_id = $1",
-                doc_uuid,
-            )
+    ``(document_id, chunk_index)`` is unique and checked row by row, so
+    moved rows are first parked at negative positions and then flipped to
+    their final ones — a reorder never collides mid-statement. Rows whose
+    position and spans are unchanged are not touched at all.
+    """
+    if diff.deletes:
+        await conn.execute(f"DELETE FROM {SCHEMA}.chunks WHERE id = ANY($1::bigint[])", diff.deletes)
+    if not diff.updates:
+        return
+    await conn.execute(
+        f"""
+            UPDATE {SCHEMA}.chunks c
+            SET chunk_index = -1 - v.chunk_index,
+                core_content = v.core_content,
+                prefix_overlap = v.prefix_overlap,
+                suffix_overlap = v.suffix_overlap
+            FROM unnest($1::bigint[], $2::int[], $3::text[], $4::text[], $5::text[])
+                AS v(id, chunk_index, core_content, prefix_overlap, suffix_overlap)
+            WHERE c.id = v.id
+              AND (c.chunk_index, c.core_content, c.prefix_overlap, c.suffix_overlap)
+                  IS DISTINCT FROM (v.chunk_index, v.core_content, v.prefix_overlap, v.suffix_overlap)
+            """,
+        [row_id for row_id, _ in diff.updates],
+        [chunks[position].index for _, position in diff.updates],
+        [chunks[position].core_content for _, position in diff.updates],
+        [chunks[position].prefix_overlap for _, position in diff.updates],
+        [chunks[position].suffix_overlap for _, position in diff.updates],
+    )
+    await conn.execute(
+        f"UPDATE {SCHEMA}.chunks SET chunk_index = -1 - chunk_index WHERE document_id = $1 AND chunk_index < 0",
+        doc_uuid,
+    )
 
-        chunk_rows = [
+
+async def _insert_chunks(
+    conn: asyncpg.Connection,
+    doc_uuid: uuid.UUID,
+    chunks: list[ContentChunk],
+    embeddings: Any,
+) -> None:
+    """Insert a run of chunks and their embeddings.
+
+    Runs of at least ``_COPY_MIN_ROWS`` go through binary COPY (the float32
+    rows go straight to the ``vector`` codec, no text round-trip); smaller
+    ones use one executemany call.
+    """
+    if len(chunks) >= _COPY_MIN_ROWS:
+        await copy_insert(
+            conn,
+            f"{SCHEMA}.chunks",
+            _CHUNK_COLUMNS,
             (
-                doc_uuid,
-                chunk.index,
-                chunk.content,
-                compute_content_hash(chunk.content.encode("utf-8")),
-                str(embedding),
-                chunk.core_content,
-                chunk.prefix_overlap,
-                chunk.suffix_overlap,
-            )
-            for chunk, embedding in zip(prepared.chunks, prepared.embeddings, strict=True)
-        ]
-        await conn.executemany(
-            f"""
-                INSERT INTO {SCHEMA}.chunks
-                    (document_id, chunk_index, chunk_content,
-                     content_hash, embedding,
-                     core_content, prefix_overlap, suffix_overlap)
-                VALUES ($1, $2, $3, $4, $5::vector, $6, $7, $8)
-                """,
-            chunk_rows,
+                (
+                    doc_uuid,
+                    chunk.index,
+                    chunk.content,
+                    _chunk_hash(chunk),
+                    embedding,
+                    chunk.core_content,
+                    chunk.prefix_overlap,
+                    chunk.suffix_overlap,
+                )
+                for chunk, embedding in zip(chunks, embeddings, strict=True)
+            ),
         )
+        return
 
-    return {
-        "success": True,
-        "file_id": file_id,
-        "chunks_created": len(prepared.chunks),
-        "skipped": False,
-        "skip_reason": None,
-    }
+    chunk_rows = [
+        (
+            doc_uuid,
+            chunk.index,
+            chunk.content,
+            _chunk_hash(chunk),
+            embedding,
+            chunk.core_content,
+            chunk.prefix_overlap,
+            chunk.suffix_overlap,
+        )
+        for chunk, embedding in zip(chunks, embeddings, strict=True)
+    ]
+    await conn.executemany(
+        f"""
+            INSERT INTO {SCHEMA}.chunks
+                (document_id, chunk_index, chunk_content,
+                 content_hash, embedding,
+                 core_content, prefix_overlap, suffix_overlap)
+            VALUES ($1, $2, $3, $4, $5::vector, $6, $7, $8)
+            """,
+        chunk_rows,
+    )
 
 
 async def store_prepared_document(
@@ -532,16 +834,21 @@ async def store_prepared_document(
     file_id: str,
     filename: str,
     prepared: PreparedDocument,
+    *,
+    embedding_service: EmbeddingService | None = None,
 ) -> dict[str, Any]:
     """Store a pre-processed document.
 
     Content-hash dedup is handled atomically inside _do_store's UPSERT
     (WHERE content_hash IS DISTINCT FROM).  HNSW index self-healing is
     retained via the retry loop.
+
+    If ``prepared`` was built with ``embed=False``, ``embedding_service``
+    is used to embed and insert the chunks batch by batch.
     """
     for attempt in range(2):
         try:
-            result = await _do_store(pool, file_id, filename, prepared)
+            result = await _do_store(pool, file_id, filename, prepared, embedding_service)
             if result["skipped"]:
                 logger.info("Document {} content unchanged, skipping", file_id)
             else:
@@ -558,34 +865,57 @@ async def store_prepared_document(
             raise
 
 
-async def index_document(
+@dataclass(frozen=True, slots=True)
+class DocumentInput:
+    """One upload to index with :func:`index_documents`."""
+
+    file_id: str
+    # In-memory bytes or the path of a spooled upload
+    content: FileSource
+    filename: str
+    source_created_at: dt.datetime | None = None
+    source_modified_at: dt.datetime | None = None
+    # SHA-256 of content when already computed (e.g. while the upload streamed in)
+    content_hash: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _StagedDocument:
+    """Extracted and chunked document waiting for embedding and storage."""
+
+    file_id: str
+    filename: str
+    prepared: PreparedDocument
+    # Embed batch by batch inside the store (large or incremental documents)
+    embed_in_store: bool
+
+
+async def _stage_document(
     pool: asyncpg.Pool,
-    file_id: str,
-    content_bytes: bytes,
-    filename: str,
+    document: DocumentInput,
     *,
     embedding_service: EmbeddingService,
-    vision_client: VisionClient | None = None,
-    chunk_size: int = 2048,
-    chunk_overlap: int = 200,
-    source_created_at: dt.datetime | None = None,
-    source_modified_at: dt.datetime | None = None,
-) -> dict[str, Any]:
-    """Index a document: extract, chunk, embed, and store.
-
-    Attempts content-hash dedup first: if another document already has the same
-    content, clone its chunks instead of re-extracting/embedding.
-    """
-    content_hash = compute_content_hash(content_bytes)
-
-    # Fast path: same file_id with unchanged content AND chunks already stored —
-    # skip immediately instead of re-extracting/embedding.
+    vision_client: VisionClient | None,
+    chunk_size: int,
+    chunk_overlap: int,
+    chunk_sizing: ChunkSizing,
+    chunk_offload_threshold: int,
+    stream_min_chunks: int,
+    page_checkpoints: PostgresPageCheckpointStore | None = None,
+    admission: AdmissionController | None = None,
+) -> dict[str, Any] | _StagedDocument:
+    """Run everything before embedding; returns the final result if nothing is left to embed."""
+    file_id = document.file_id
+    content_hash = document.content_hash or _source_hash(document.content)
+
+    # Fast path: same file_id with unchanged content AND chunks already stored
+    # (its own or shared) — skip immediately instead of re-extracting/embedding.
     async with acquire_with_retry(pool) as conn:
         own_row = await conn.fetchrow(
             f"""SELECT d.content_hash,
                        (SELECT COUNT(*)
                         FROM {SCHEMA}.chunks c
-                        WHERE c.document_id = d.id) AS chunk_count
+                        WHERE c.document_id = COALESCE(d.chunk_owner_id, d.id)) AS chunk_count
                 FROM {SCHEMA}.documents d
                 WHERE d.file_id = $1""",
             file_id,
@@ -621,31 +951,38 @@ async def index_document(
             pool,
             source_id,
             file_id,
-            filename,
+            document.filename,
             content_hash,
-            source_created_at=source_created_at,
-            source_modified_at=source_modified_at,
+            source_created_at=document.source_created_at,
+            source_modified_at=document.source_modified_at,
         )
         if result is not None:
             return result
         logger.warning("Clone source {} vanished, falling back to full processing", source_id)
 
-    import asyncio as _aio
-
-    loop = _aio.get_running_loop()
+    loop = asyncio.get_running_loop()
     extraction_cb = _make_extraction_progress_callback(pool, file_id, loop)
 
     await _update_progress(pool, file_id, "extracting", "")
 
-    prepared = await prepare_document(
-        content_bytes,
-        filename,
-        embedding_service=embedding_service,
-        vision_client=vision_client,
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        on_progress=extraction_cb,
-    )
+    reservation = nullcontext()
+    if admission is not None:
+        reservation = admission.admit(*await extraction_weight(document.content, document.filename))
+    async with reservation:
+        prepared = await prepare_document(
+            document.content,
+            document.filename,
+            content_hash=content_hash,
+            embedding_service=embedding_service,
+            vision_client=vision_client,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            chunk_sizing=chunk_sizing,
+            chunk_offload_threshold=chunk_offload_threshold,
+            on_progress=extraction_cb,
+            embed=False,
+            page_checkpoints=page_checkpoints,
+        )
 
     if prepared is None:
         return {
@@ -656,6 +993,13 @@ async def index_document(
             "skip_reason": "no_text_extracted",
         }
 
+    if document.source_created_at is not None or document.source_modified_at is not None:
+        prepared = replace(
+            prepared,
+            source_created_at=document.source_created_at or prepared.source_created_at,
+            source_modified_at=document.source_modified_at or prepared.source_modified_at,
+        )
+
     await _update_progress(
         pool,
         file_id,
@@ -663,18 +1007,163 @@ async def index_document(
         f"{len(prepared.chunks)} chunks",
     )
 
-    if source_created_at is not None or source_modified_at is not None:
-        prepared = replace(
-            prepared,
-            source_created_at=source_created_at or prepared.source_created_at,
-            source_modified_at=source_modified_at or prepared.source_modified_at,
-        )
+    streaming = len(prepared.chunks) >= stream_min_chunks
+    # Existing chunks are diffed in _do_store; embed there so unchanged ones are skipped.
+    incremental = own_row is not None and own_row["chunk_count"] > 0
+    return _StagedDocument(file_id, document.filename, prepared, embed_in_store=streaming or incremental)
 
-    await _update_progress(pool, file_id, "storing", "")
 
-    return await store_prepared_document(
+async def _store_staged(
+    pool: asyncpg.Pool,
+    staged: _StagedDocument,
+    embedding_service: EmbeddingService,
+    page_checkpoints: PostgresPageCheckpointStore | None = None,
+) -> dict[str, Any]:
+    await _update_progress(pool, staged.file_id, "storing", "")
+
+    result = await store_prepared_document(
         pool,
-        file_id,
-        filename,
-        prepared,
+        staged.file_id,
+        staged.filename,
+        staged.prepared,
+        embedding_service=embedding_service if staged.embed_in_store else None,
     )
+    if page_checkpoints is not None and staged.filename.lower().endswith(".pdf"):
+        try:
+            await page_checkpoints.discard(staged.prepared.content_hash)
+        except Exception as e:
+            logger.warning("Could not delete page checkpoints of {}: {}", staged.file_id, e)
+    return result
+
+
+async def index_document(
+    pool: asyncpg.Pool,
+    file_id: str,
+    content_bytes: FileSource,
+    filename: str,
+    *,
+    embedding_service: EmbeddingService,
+    vision_client: VisionClient | None = None,
+    chunk_size: int = 2048,
+    chunk_overlap: int = 200,
+    chunk_sizing: ChunkSizing = "chars",
+    chunk_offload_threshold: int = OFFLOAD_THRESHOLD,
+    source_created_at: dt.datetime | None = None,
+    source_modified_at: dt.datetime | None = None,
+    stream_min_chunks: int = 256,
+    content_hash: str | None = None,
+    page_checkpoints: PostgresPageCheckpointStore | None = None,
+    admission: AdmissionController | None = None,
+) -> dict[str, Any]:
+    """Index a document: extract, chunk, embed, and store.
+
+    Attempts content-hash dedup first: if another document already has the same
+    content, clone its chunks instead of re-extracting/embedding.
+
+    Documents with at least ``stream_min_chunks`` chunks are embedded and
+    inserted batch by batch, bounding peak memory for very large files.
+    Re-uploads of a document that already has chunks defer embedding to the
+    store, which embeds only the chunks that changed. With
+    ``page_checkpoints``, a retried PDF resumes extraction at the first
+    page the failed attempt had not finished. With ``admission``,
+    extraction waits until the file's size and page count fit its budget.
+    """
+    staged = await _stage_document(
+        pool,
+        DocumentInput(file_id, content_bytes, filename, source_created_at, source_modified_at, content_hash),
+        embedding_service=embedding_service,
+        vision_client=vision_client,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        chunk_sizing=chunk_sizing,
+        chunk_offload_threshold=chunk_offload_threshold,
+        stream_min_chunks=stream_min_chunks,
+        page_checkpoints=page_checkpoints,
+        admission=admission,
+    )
+    if not isinstance(staged, _StagedDocument):
+        return staged
+
+    if not staged.embed_in_store:
+        chunks = staged.prepared.chunks
+        embeddings = await embedding_service.embed_texts_array([c.content for c in chunks])
+        staged = replace(staged, prepared=replace(staged.prepared, embeddings=embeddings))
+
+    return await _store_staged(pool, staged, embedding_service, page_checkpoints)
+
+
+async def index_documents(
+    pool: asyncpg.Pool,
+    documents: Sequence[DocumentInput],
+    *,
+    embedding_service: EmbeddingService,
+    vision_client: VisionClient | None = None,
+    chunk_size: int = 2048,
+    chunk_overlap: int = 200,
+    chunk_sizing: ChunkSizing = "chars",
+    chunk_offload_threshold: int = OFFLOAD_THRESHOLD,
+    stream_min_chunks: int = 256,
+    page_checkpoints: PostgresPageCheckpointStore | None = None,
+    admission: AdmissionController | None = None,
+) -> list[dict[str, Any] | Exception]:
+    """Index several documents as :func:`index_document` would, sharing embedding requests.
+
+    Documents are extracted and chunked concurrently; the chunks of every
+    document that is embedded up front are then sent in one
+    ``embed_texts_array`` call, so many small documents fill full-size
+    provider batches instead of each sending a small one. Each document is
+    stored in its own transaction.
+
+    Returns one entry per input, in order: the ``index_document`` result,
+    or the exception that document failed with.
+    """
+    stage_kwargs: dict[str, Any] = {
+        "embedding_service": embedding_service,
+        "vision_client": vision_client,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "chunk_sizing": chunk_sizing,
+        "chunk_offload_threshold": chunk_offload_threshold,
+        "stream_min_chunks": stream_min_chunks,
+        "page_checkpoints": page_checkpoints,
+        "admission": admission,
+    }
+    outcomes: list[Any] = await asyncio.gather(
+        *(_stage_document(pool, document, **stage_kwargs) for document in documents),
+        return_exceptions=True,
+    )
+    _reraise_cancellation(outcomes)
+
+    shared = [i for i, o in enumerate(outcomes) if isinstance(o, _StagedDocument) and not o.embed_in_store]
+    if shared:
+        texts = [chunk.content for i in shared for chunk in outcomes[i].prepared.chunks]
+        try:
+            matrix = await embedding_service.embed_texts_array(texts)
+        except Exception as exc:
+            logger.warning("Shared embedding of {} chunks failed for {} documents: {}", len(texts), len(shared), exc)
+            for i in shared:
+                outcomes[i] = exc
+        else:
+            offset = 0
+            for i in shared:
+                staged = outcomes[i]
+                end = offset + len(staged.prepared.chunks)
+                outcomes[i] = replace(staged, prepared=replace(staged.prepared, embeddings=matrix[offset:end]))
+                offset = end
+            logger.info("Embedded {} chunks for {} documents in shared batches", len(texts), len(shared))
+
+    pending = [i for i, o in enumerate(outcomes) if isinstance(o, _StagedDocument)]
+    stored = await asyncio.gather(
+        *(_store_staged(pool, outcomes[i], embedding_service, page_checkpoints) for i in pending),
+        return_exceptions=True,
+    )
+    _reraise_cancellation(stored)
+    for i, result in zip(pending, stored, strict=True):
+        outcomes[i] = result
+    return outcomes
+
+
+def _reraise_cancellation(outcomes: list[Any]) -> None:
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+            raise outcome
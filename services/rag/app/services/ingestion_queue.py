@@ -0,0 +1,605 @@
+"""Durable ingestion queue backed by the ``ingestion_jobs`` table.
+
+Uploads are written to Postgres (file bytes included) and consumed by
+worker loops that claim one job at a time with ``FOR UPDATE SKIP LOCKED``,
+so any number of loops across any number of replicas share one queue.
+
+A claimed job is hidden until ``visible_at``; the worker extends it while
+the job runs. If the worker dies, the job becomes visible again once the
+visibility timeout lapses and another worker retries it. Failed jobs are
+retried with exponential backoff until ``max_attempts``; ``ValueError``
+(undecodable input) and timeouts fail immediately. Finished jobs are deleted.
+
+Jobs run in two lanes. ``interactive`` (single-file uploads) always goes
+first, and ``ingestion_interactive_workers`` loops take nothing else, so a
+long ``bulk`` backfill can never occupy every worker. Only the oldest job
+per ``file_id`` is claimable; enqueueing a file drops its older jobs that
+are not running, so re-uploads are processed in order and only once.
+
+A bulk-lane worker that claims a small job also claims up to
+``ingestion_batch_size - 1`` more small bulk jobs and hands them to the
+batch handler together, so their chunks share full-size embedding
+requests. Each job in a batch still succeeds, retries or fails on its own.
+
+Claiming returns job metadata only. Right before the handler runs, the
+worker streams each job's file out of the row in ``_CONTENT_PIECE`` slices
+into a temp file in ``upload_spool_dir`` and hands over its path, so a
+large upload is never held in memory whole.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import os
+import socket
+import struct
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Literal
+
+import asyncpg
+from loguru import logger
+from tale_knowledge.extraction import FileSource
+from tale_shared.db import acquire_with_retry
+
+from ..config import settings
+from .database import SCHEMA, get_pool
+from .indexing_service import DocumentInput
+
+IngestionLane = Literal["interactive", "bulk"]
+ALL_LANES: tuple[IngestionLane, ...] = ("interactive", "bulk")
+INTERACTIVE_LANES: tuple[IngestionLane, ...] = ("interactive",)
+
+_JOB_COLUMNS = """j.id, j.file_id, j.filename, j.lane, octet_length(j.content) AS content_size,
+                  j.source_created_at, j.source_modified_at, j.attempts, j.max_attempts, j.content_hash"""
+
+
+@dataclass(frozen=True, slots=True)
+class IngestionJob:
+    """One claimed upload."""
+
+    id: int
+    file_id: str
+    filename: str
+    lane: IngestionLane
+    content_size: int
+    source_created_at: dt.datetime | None
+    source_modified_at: dt.datetime | None
+    attempts: int
+    max_attempts: int
+    # SHA-256 of the file computed at upload time, if the upload passed one
+    content_hash: str | None = None
+    # Path of the spooled file while the handler runs; empty until then
+    content: FileSource = b""
+
+    @classmethod
+    def from_record(cls, row: Any) -> IngestionJob:
+        return cls(
+            id=row["id"],
+            file_id=row["file_id"],
+            filename=row["filename"],
+            lane=row["lane"],
+            content_size=row["content_size"],
+            source_created_at=row["source_created_at"],
+            source_modified_at=row["source_modified_at"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            content_hash=row["content_hash"],
+        )
+
+
+JobHandler = Callable[[IngestionJob], Awaitable[None]]
+FailureHandler = Callable[[IngestionJob, Exception], Awaitable[None]]
+# Returns one outcome per job, in order: None on success, else the exception
+BatchHandler = Callable[[list[IngestionJob]], Awaitable[list[Exception | None]]]
+
+
+def retry_delay(attempts: int, backoff: float) -> float:
+    """Seconds to wait before attempt ``attempts + 1`` (exponential, capped at 1h)."""
+    return min(backoff * 2 ** max(attempts - 1, 0), 3600.0)
+
+
+async def enqueue_job(
+    pool: asyncpg.Pool,
+    *,
+    file_id: str,
+    filename: str,
+    content: FileSource,
+    lane: IngestionLane = "interactive",
+    source_created_at: dt.datetime | None = None,
+    source_modified_at: dt.datetime | None = None,
+    max_attempts: int = 3,
+    content_hash: str | None = None,
+) -> int:
+    """Queue an upload, superseding older not-yet-running jobs for the file.
+
+    ``content`` may be the path of a spooled upload; it is then streamed
+    into the job row instead of being read into memory. ``content_hash``
+    is the file's SHA-256 when the upload already computed it; the worker
+    reuses it instead of hashing the file again.
+    """
+    if not isinstance(content, bytes):
+        document = DocumentInput(file_id, content, filename, source_created_at, source_modified_at, content_hash)
+        (job_id,) = await enqueue_jobs(pool, [document], lane=lane, max_attempts=max_attempts)
+        return job_id
+    async with acquire_with_retry(pool) as conn, conn.transaction():
+        await conn.execute(
+            f"DELETE FROM {SCHEMA}.ingestion_jobs WHERE file_id = $1 AND locked_by IS NULL",
+            file_id,
+        )
+        return await conn.fetchval(
+            f"""
+            INSERT INTO {SCHEMA}.ingestion_jobs
+                (file_id, filename, lane, content, source_created_at, source_modified_at, max_attempts, content_hash)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            RETURNING id
+            """,
+            file_id,
+            filename,
+            lane,
+            content,
+            source_created_at,
+            source_modified_at,
+            max_attempts,
+            content_hash,
+        )
+
+
+async def enqueue_jobs(
+    pool: asyncpg.Pool,
+    documents: Sequence[DocumentInput],
+    *,
+    lane: IngestionLane = "bulk",
+    max_attempts: int = 3,
+) -> list[int]:
+    """Queue many uploads with one statement; returns the job ids in input order.
+
+    Spooled uploads (paths) are first streamed into a staging table with a
+    binary COPY, so no file is ever held in memory whole.
+    """
+    spooled = [(n, d.content) for n, d in enumerate(documents, start=1) if not isinstance(d.content, bytes)]
+    async with acquire_with_retry(pool) as conn, conn.transaction():
+        file_ids = [d.file_id for d in documents]
+        await conn.execute(
+            f"DELETE FROM {SCHEMA}.ingestion_jobs WHERE file_id = ANY($1::text[]) AND locked_by IS NULL",
+            file_ids,
+        )
+        content, join = "u.content", ""
+        if spooled:
+            await _copy_spooled_contents(conn, spooled)
+            content, join = "COALESCE(u.content, s.content)", f" LEFT JOIN {_SPOOL_STAGING} s ON s.n = u.n"
+        rows = await conn.fetch(
+            f"""
+            INSERT INTO {SCHEMA}.ingestion_jobs
+                (file_id, filename, lane, content, source_created_at, source_modified_at, max_attempts, content_hash)
+            SELECT u.file_id, u.filename, $3, {content}, u.source_created_at, u.source_modified_at, $7, u.content_hash
+            FROM unnest($1::text[], $2::text[], $4::bytea[], $5::timestamptz[], $6::timestamptz[], $8::text[])
+                WITH ORDINALITY
+                AS u(file_id, filename, content, source_created_at, source_modified_at, content_hash, n){join}
+            ORDER BY u.n
+            RETURNING id
+            """,
+            file_ids,
+            [d.filename for d in documents],
+            lane,
+            [d.content if isinstance(d.content, bytes) else None for d in documents],
+            [d.source_created_at for d in documents],
+            [d.source_modified_at for d in documents],
+            max_attempts,
+            [d.content_hash for d in documents],
+        )
+    return sorted(row["id"] for row in rows)
+
+
+_SPOOL_STAGING = "_ingestion_job_content"
+# Binary COPY framing: signature, flags and header-extension length
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+_CONTENT_PIECE = 1024 * 1024
+
+
+async def _copy_spooled_contents(conn: asyncpg.Connection, spooled: list[tuple[int, FileSource]]) -> None:
+    """COPY ``(n, file content)`` rows into the staging table, reading each file in pieces."""
+    await conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {_SPOOL_STAGING} (n bigint, content bytea) ON COMMIT DROP")
+
+    async def rows() -> AsyncIterator[bytes]:
+        yield _COPY_HEADER
+        for n, path in spooled:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                yield struct.pack(">hiqi", 2, 8, n, size)
+                while piece := await asyncio.to_thread(f.read, _CONTENT_PIECE):
+                    yield piece
+        yield _COPY_TRAILER
+
+    await conn.copy_to_table(_SPOOL_STAGING, source=rows(), columns=["n", "content"], format="binary")
+
+
+@contextlib.asynccontextmanager
+async def spooled_job_content(pool: asyncpg.Pool, job: IngestionJob) -> AsyncIterator[Path]:
+    """Stream a claimed job's file into a temp file, one slice per query.
+
+    Yields the path; the file is deleted when the block exits.
+    """
+    with tempfile.NamedTemporaryFile(prefix="tale-job-", dir=settings.upload_spool_dir) as f:
+        async with acquire_with_retry(pool) as conn:
+            for offset in range(0, job.content_size, _CONTENT_PIECE):
+                piece = await conn.fetchval(
+                    f"SELECT substring(content from $2 for $3) FROM {SCHEMA}.ingestion_jobs WHERE id = $1",
+                    job.id,
+                    offset + 1,
+                    _CONTENT_PIECE,
+                )
+                if piece is None:
+                    raise RuntimeError(f"Ingestion job {job.id} disappeared while its content was read")
+                await asyncio.to_thread(f.write, piece)
+        await asyncio.to_thread(f.flush)
+        yield Path(f.name)
+
+
+_CLAIM_SQL = f"""
+    WITH next AS (
+        SELECT j.id
+        FROM {SCHEMA}.ingestion_jobs j
+        WHERE j.lane = ANY($1::text[])
+          AND j.visible_at <= NOW()
+          AND NOT EXISTS (
+              SELECT 1 FROM {SCHEMA}.ingestion_jobs older
+              WHERE older.file_id = j.file_id AND older.id < j.id
+          ){{filter}}
+        ORDER BY j.lane = 'bulk', j.id
+        LIMIT {{limit}}
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE {SCHEMA}.ingestion_jobs j
+    SET attempts = j.attempts + 1,
+        locked_by = $2,
+        visible_at = NOW() + make_interval(secs => $3)
+    FROM next
+    WHERE j.id = next.id
+    RETURNING {_JOB_COLUMNS}
+"""
+
+
+async def claim_job(
+    pool: asyncpg.Pool,
+    lanes: tuple[IngestionLane, ...],
+    worker_id: str,
+    visibility_timeout: float,
+) -> IngestionJob | None:
+    """Claim the next visible job (interactive before bulk), or None."""
+    async with acquire_with_retry(pool) as conn:
+        row = await conn.fetchrow(
+            _CLAIM_SQL.format(filter="", limit="1"),
+            list(lanes),
+            worker_id,
+            float(visibility_timeout),
+        )
+    return IngestionJob.from_record(row) if row is not None else None
+
+
+async def claim_jobs(
+    pool: asyncpg.Pool,
+    lanes: tuple[IngestionLane, ...],
+    worker_id: str,
+    visibility_timeout: float,
+    *,
+    limit: int,
+    max_bytes: int,
+) -> list[IngestionJob]:
+    """Claim up to ``limit`` visible jobs whose content is at most ``max_bytes``."""
+    async with acquire_with_retry(pool) as conn:
+        rows = await conn.fetch(
+            _CLAIM_SQL.format(filter="\n          AND octet_length(j.content) <= $5", limit="$4"),
+            list(lanes),
+            worker_id,
+            float(visibility_timeout),
+            limit,
+            max_bytes,
+        )
+    return sorted((IngestionJob.from_record(row) for row in rows), key=lambda job: job.id)
+
+
+async def extend_job(pool: asyncpg.Pool, job_id: int, worker_id: str, visibility_timeout: float) -> bool:
+    """Push a running job's visibility deadline out; False if it was reclaimed."""
+    async with acquire_with_retry(pool) as conn:
+        result = await conn.execute(
+            f"""
+            UPDATE {SCHEMA}.ingestion_jobs
+            SET visible_at = NOW() + make_interval(secs => $3)
+            WHERE id = $1 AND locked_by = $2
+            """,
+            job_id,
+            worker_id,
+            float(visibility_timeout),
+        )
+    return result != "UPDATE 0"
+
+
+async def complete_job(pool: asyncpg.Pool, job_id: int, worker_id: str) -> None:
+    async with acquire_with_retry(pool) as conn:
+        await conn.execute(
+            f"DELETE FROM {SCHEMA}.ingestion_jobs WHERE id = $1 AND locked_by = $2",
+            job_id,
+            worker_id,
+        )
+
+
+async def retry_job(pool: asyncpg.Pool, job_id: int, worker_id: str, error: str, delay: float) -> None:
+    async with acquire_with_retry(pool) as conn:
+        await conn.execute(
+            f"""
+            UPDATE {SCHEMA}.ingestion_jobs
+            SET locked_by = NULL,
+                last_error = $3,
+                visible_at = NOW() + make_interval(secs => $4)
+            WHERE id = $1 AND locked_by = $2
+            """,
+            job_id,
+            worker_id,
+            error,
+            float(delay),
+        )
+
+
+async def release_job(pool: asyncpg.Pool, job_id: int, worker_id: str) -> None:
+    """Hand an interrupted job back without spending an attempt (e.g. on shutdown)."""
+    async with acquire_with_retry(pool) as conn:
+        await conn.execute(
+            f"""
+            UPDATE {SCHEMA}.ingestion_jobs
+            SET locked_by = NULL, attempts = GREATEST(attempts - 1, 0), visible_at = NOW()
+            WHERE id = $1 AND locked_by = $2
+            """,
+            job_id,
+            worker_id,
+        )
+
+
+class IngestionQueue:
+    """Enqueue uploads and run this replica's worker loops."""
+
+    def __init__(self) -> None:
+        self._pool: asyncpg.Pool | None = None
+        self._handler: JobHandler | None = None
+        self._on_failure: FailureHandler | None = None
+        self._batch_handler: BatchHandler | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._wake = asyncio.Event()
+        self._in_flight = 0
+        self._completed = 0
+        self._retried = 0
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def enqueue(
+        self,
+        *,
+        file_id: str,
+        filename: str,
+        content: FileSource,
+        lane: IngestionLane = "interactive",
+        source_created_at: dt.datetime | None = None,
+        source_modified_at: dt.datetime | None = None,
+        content_hash: str | None = None,
+    ) -> int:
+        """Persist an upload for ingestion and wake this replica's workers."""
+        job_id = await enqueue_job(
+            self._pool or await get_pool(),
+            file_id=file_id,
+            filename=filename,
+            content=content,
+            lane=lane,
+            source_created_at=source_created_at,
+            source_modified_at=source_modified_at,
+            max_attempts=settings.ingestion_max_attempts,
+            content_hash=content_hash,
+        )
+        self._wake.set()
+        return job_id
+
+    async def enqueue_many(
+        self,
+        documents: Sequence[DocumentInput],
+        *,
+        lane: IngestionLane = "bulk",
+    ) -> list[int]:
+        """Persist many uploads in one statement and wake this replica's workers."""
+        job_ids = await enqueue_jobs(
+            self._pool or await get_pool(),
+            documents,
+            lane=lane,
+            max_attempts=settings.ingestion_max_attempts,
+        )
+        self._wake.set()
+        return job_ids
+
+    def start(
+        self,
+        pool: asyncpg.Pool,
+        handler: JobHandler,
+        on_failure: FailureHandler,
+        batch_handler: BatchHandler | None = None,
+    ) -> None:
+        """Start ``ingestion_workers`` + ``ingestion_interactive_workers`` loops.
+
+        ``handler`` raises to fail an attempt; ``on_failure`` runs once a job
+        will not be retried. Without a ``batch_handler`` every job runs alone.
+        """
+        if self._tasks:
+            return
+        self._pool = pool
+        self._handler = handler
+        self._on_failure = on_failure
+        self._batch_handler = batch_handler
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        loops = [ALL_LANES] * settings.ingestion_workers + [INTERACTIVE_LANES] * settings.ingestion_interactive_workers
+        for n, lanes in enumerate(loops):
+            task = asyncio.create_task(self._run(f"{prefix}:{n}", lanes), name=f"ingestion-worker-{n}")
+            self._tasks.append(task)
+        logger.info(
+            "Started {} ingestion workers ({} interactive-only)",
+            len(loops),
+            settings.ingestion_interactive_workers,
+        )
+
+    async def stop(self) -> None:
+        """Cancel the worker loops; running jobs are released back to the queue."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def get_stats(self) -> dict[str, float]:
+        return {
+            "workers": float(len(self._tasks)),
+            "in_flight": float(self._in_flight),
+            "completed": float(self._completed),
+            "retried": float(self._retried),
+            "failed": float(self._failed),
+        }
+
+    async def _run(self, worker_id: str, lanes: tuple[IngestionLane, ...]) -> None:
+        assert self._pool is not None
+        while True:
+            try:
+                job = await claim_job(self._pool, lanes, worker_id, settings.ingestion_visibility_timeout_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Ingestion worker {} could not claim a job", worker_id)
+                job = None
+
+            if job is not None:
+                await self._process_batch(worker_id, [job, *await self._claim_batch(worker_id, job)])
+                continue
+
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), settings.ingestion_poll_interval_seconds)
+            self._wake.clear()
+
+    async def _claim_batch(self, worker_id: str, first: IngestionJob) -> list[IngestionJob]:
+        """Claim more small bulk jobs to run alongside ``first`` (which must be one)."""
+        assert self._pool is not None
+        limit = settings.ingestion_batch_size - 1
+        max_bytes = settings.ingestion_batch_max_file_bytes
+        if self._batch_handler is None or first.lane != "bulk" or limit < 1 or first.content_size > max_bytes:
+            return []
+        try:
+            return await claim_jobs(
+                self._pool,
+                ("bulk",),
+                worker_id,
+                settings.ingestion_visibility_timeout_seconds,
+                limit=limit,
+                max_bytes=max_bytes,
+            )
+        except Exception:
+            logger.exception("Ingestion worker {} could not claim a batch", worker_id)
+            return []
+
+    async def _process_batch(self, worker_id: str, jobs: list[IngestionJob]) -> None:
+        assert self._pool is not None and self._handler is not None and self._on_failure is not None
+        runnable: list[IngestionJob] = []
+        for job in jobs:
+            if job.attempts > job.max_attempts:
+                # Every earlier attempt lost its worker mid-job (crash, OOM kill).
+                await self._fail(worker_id, job, RuntimeError(f"Ingestion abandoned after {job.max_attempts} attempts"))
+            else:
+                runnable.append(job)
+        if not runnable:
+            return
+
+        self._in_flight += len(runnable)
+        heartbeats = [asyncio.create_task(self._heartbeat(worker_id, job.id)) for job in runnable]
+        deadline = asyncio.timeout(settings.ingestion_timeout_seconds)
+        try:
+            try:
+                async with deadline:
+                    outcomes = await self._handle(runnable)
+            except asyncio.CancelledError:
+                for job in runnable:
+                    with contextlib.suppress(Exception):
+                        await release_job(self._pool, job.id, worker_id)
+                raise
+            except Exception as exc:
+                outcomes = [exc] * len(runnable)
+            for job, outcome in zip(runnable, outcomes, strict=True):
+                await self._conclude(worker_id, job, outcome, deadline.expired())
+        finally:
+            for heartbeat in heartbeats:
+                heartbeat.cancel()
+            self._in_flight -= len(runnable)
+
+    async def _handle(self, jobs: list[IngestionJob]) -> list[Exception | None]:
+        assert self._pool is not None and self._handler is not None
+        async with contextlib.AsyncExitStack() as stack:
+            jobs = [
+                replace(job, content=await stack.enter_async_context(spooled_job_content(self._pool, job)))
+                for job in jobs
+            ]
+            if len(jobs) > 1 and self._batch_handler is not None:
+                return await self._batch_handler(jobs)
+            await self._handler(jobs[0])
+            return [None]
+
+    async def _conclude(self, worker_id: str, job: IngestionJob, exc: Exception | None, expired: bool) -> None:
+        assert self._pool is not None
+        if exc is None:
+            self._completed += 1
+            await self._settle(complete_job(self._pool, job.id, worker_id))
+        elif isinstance(exc, ValueError) or expired or job.attempts >= job.max_attempts:
+            logger.opt(exception=exc).error("Ingestion failed for {} (attempt {})", job.file_id, job.attempts)
+            await self._fail(worker_id, job, exc)
+        else:
+            delay = retry_delay(job.attempts, settings.ingestion_retry_backoff_seconds)
+            logger.warning(
+                "Ingestion attempt {} for {} failed, retrying in {:.0f}s: {}",
+                job.attempts,
+                job.file_id,
+                delay,
+                exc,
+            )
+            self._retried += 1
+            await self._settle(retry_job(self._pool, job.id, worker_id, str(exc)[:500], delay))
+
+    async def _fail(self, worker_id: str, job: IngestionJob, exc: Exception) -> None:
+        assert self._pool is not None and self._on_failure is not None
+        self._failed += 1
+        try:
+            await self._on_failure(job, exc)
+        except Exception as record_exc:
+            logger.critical("Could not record failure for {}: {}", job.file_id, record_exc)
+        await self._settle(complete_job(self._pool, job.id, worker_id))
+
+    async def _settle(self, update: Awaitable[None]) -> None:
+        # A lost update is recovered by the visibility timeout; keep the loop alive.
+        try:
+            await update
+        except Exception:
+            logger.exception("Could not update ingestion job state")
+
+    async def _heartbeat(self, worker_id: str, job_id: int) -> None:
+        assert self._pool is not None
+        timeout = settings.ingestion_visibility_timeout_seconds
+        while True:
+            await asyncio.sleep(timeout / 3)
+            try:
+                if not await extend_job(self._pool, job_id, worker_id, timeout):
+                    logger.warning("Ingestion job {} was reclaimed by another worker", job_id)
+                    return
+            except Exception:
+                logger.opt(exception=True).warning("Could not extend ingestion job {}", job_id)
+
+
+# Module-level singleton
+ingestion_queue = IngestionQueue()
@@ -0,0 +1,72 @@
+"""Postgres-backed store for PDF page checkpoints.
+
+Saves each extracted PDF page in ``private_knowledge.pdf_page_checkpoints``
+keyed by (content_hash, extractor_version, page_index), so a queue job
+retried after a vision timeout or a pod eviction — on any replica —
+resumes extraction at the first missing page. A document's checkpoints are
+deleted once it is stored; those of documents that never finish are pruned
+after ``pdf_page_checkpoint_retention_hours``.
+"""
+
+from __future__ import annotations
+
+import asyncpg
+from tale_knowledge.extraction import PageResult
+from tale_shared.db import acquire_with_retry
+
+from ..config import settings
+from .database import SCHEMA
+
+
+class PostgresPageCheckpointStore:
+    def __init__(self, pool: asyncpg.Pool, retention_hours: int) -> None:
+        self._pool = pool
+        self._retention_hours = retention_hours
+
+    async def load_pages(self, content_hash: str, extractor_version: str) -> dict[int, PageResult]:
+        async with acquire_with_retry(self._pool) as conn:
+            rows = await conn.fetch(
+                f"""SELECT page_index, content, vision_used, is_scanned
+                    FROM {SCHEMA}.pdf_page_checkpoints
+                    WHERE content_hash = $1 AND extractor_version = $2""",
+                content_hash,
+                extractor_version,
+            )
+        return {row["page_index"]: PageResult(row["content"], row["vision_used"], row["is_scanned"]) for row in rows}
+
+    async def save_page(self, content_hash: str, extractor_version: str, page_index: int, page: PageResult) -> None:
+        async with acquire_with_retry(self._pool) as conn:
+            await conn.execute(
+                f"""INSERT INTO {SCHEMA}.pdf_page_checkpoints
+                        (content_hash, extractor_version, page_index, content, vision_used, is_scanned)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    ON CONFLICT (content_hash, extractor_version, page_index) DO UPDATE
+                    SET content = EXCLUDED.content,
+                        vision_used = EXCLUDED.vision_used,
+                        is_scanned = EXCLUDED.is_scanned,
+                        created_at = NOW()""",
+                content_hash,
+                extractor_version,
+                page_index,
+                page.content,
+                page.vision_used,
+                page.is_scanned,
+            )
+
+    async def discard(self, content_hash: str) -> None:
+        """Delete a stored document's checkpoints, and any past the retention."""
+        async with acquire_with_retry(self._pool) as conn:
+            await conn.execute(
+                f"""DELETE FROM {SCHEMA}.pdf_page_checkpoints
+                    WHERE content_hash = $1
+                       OR created_at < NOW() - make_interval(hours => $2)""",
+                content_hash,
+                self._retention_hours,
+            )
+
+
+def build_page_checkpoint_store(pool: asyncpg.Pool) -> PostgresPageCheckpointStore | None:
+    """Build the checkpoint store from settings, or None when disabled."""
+    if not settings.pdf_page_checkpoints_enabled:
+        return None
+    return PostgresPageCheckpointStore(pool, settings.pdf_page_checkpoint_retention_hours)
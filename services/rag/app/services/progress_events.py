@@ -0,0 +1,162 @@
+"""Pushed document status and progress events.
+
+A trigger on ``documents`` sends a NOTIFY on ``CHANNEL`` whenever a
+document's status, progress or error changes (see the
+``create_document_progress_notify_trigger`` migration). Each replica keeps
+one dedicated connection (outside the pool, so it never takes a slot from
+queries) listening on it and hands the events to in-process
+subscribers — the ``GET /documents/events`` stream — so clients are pushed
+updates instead of polling ``/documents/statuses``. NOTIFY reaches every
+listener on the database, so a client sees progress made by any replica.
+
+Notifications sent while the listening connection is down are lost; after
+reconnecting every subscriber gets a ``RESYNC`` marker and re-reads the
+statuses it follows.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from typing import Any
+
+import asyncpg
+from loguru import logger
+
+from .database import SCHEMA, connect_dedicated
+
+CHANNEL = f"{SCHEMA}_document_progress"
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+# Queued for a subscriber in place of an event after missed notifications
+RESYNC: dict[str, Any] = {"resync": True}
+
+_QUEUE_SIZE = 256
+_PING_INTERVAL = 60.0
+_MAX_RECONNECT_DELAY = 30.0
+_CLOSE_TIMEOUT = 5.0
+
+
+class ProgressEvents:
+    """LISTENs for document progress notifications and fans them out by file_id."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = defaultdict(set)
+        self._task: asyncio.Task[None] | None = None
+        self._listening = False
+
+    @property
+    def listening(self) -> bool:
+        return self._listening
+
+    def start(self, connect: Callable[[], Awaitable[asyncpg.Connection]] = connect_dedicated) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(connect))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    @contextlib.contextmanager
+    def subscribe(self, file_ids: Iterable[str]) -> Iterator[asyncio.Queue[dict[str, Any]]]:
+        """Queue receiving the events of ``file_ids`` until the block exits."""
+        file_ids = set(file_ids)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=_QUEUE_SIZE)
+        for file_id in file_ids:
+            self._subscribers[file_id].add(queue)
+        try:
+            yield queue
+        finally:
+            for file_id in file_ids:
+                subscribers = self._subscribers.get(file_id)
+                if subscribers is not None:
+                    subscribers.discard(queue)
+                    if not subscribers:
+                        del self._subscribers[file_id]
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Hand one event to the subscribers of its file_id."""
+        for queue in self._subscribers.get(event.get("file_id"), ()):
+            _put_latest(queue, event)
+
+    def _on_notify(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed progress notification: {}", payload[:200])
+            return
+        self.publish(event)
+
+    def _resync(self) -> None:
+        for queue in {queue for queues in self._subscribers.values() for queue in queues}:
+            _put_latest(queue, RESYNC)
+
+    async def _run(self, connect: Callable[[], Awaitable[asyncpg.Connection]]) -> None:
+        delay = 1.0
+        reconnecting = False
+        while True:
+            try:
+                conn = await connect()
+                try:
+                    await self._listen(conn, resync=reconnecting)
+                finally:
+                    with contextlib.suppress(Exception):
+                        await conn.close(timeout=_CLOSE_TIMEOUT)
+                logger.warning("Progress event listener lost its connection")
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Progress event listener failed, retrying in {:.0f}s: {}", delay, e)
+            reconnecting = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _MAX_RECONNECT_DELAY)
+
+    async def _listen(self, conn: asyncpg.Connection, *, resync: bool) -> None:
+        """Deliver notifications until ``conn`` is closed or stops answering."""
+        lost = asyncio.Event()
+
+        def on_terminated(_conn: Any) -> None:
+            lost.set()
+
+        conn.add_termination_listener(on_terminated)
+        try:
+            await conn.add_listener(CHANNEL, self._on_notify)
+            self._listening = True
+            if resync:
+                logger.info("Progress event listener reconnected")
+                self._resync()
+            await _wait_until_lost(conn, lost)
+        finally:
+            self._listening = False
+            conn.remove_termination_listener(on_terminated)
+            if not conn.is_closed():
+                with contextlib.suppress(Exception):
+                    await conn.remove_listener(CHANNEL, self._on_notify)
+
+
+async def _wait_until_lost(conn: asyncpg.Connection, lost: asyncio.Event) -> None:
+    """Return once the connection is closed or stops answering pings."""
+    while not lost.is_set():
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(lost.wait(), timeout=_PING_INTERVAL)
+            return
+        await conn.execute("SELECT 1", timeout=_PING_INTERVAL)
+
+
+def _put_latest(queue: asyncio.Queue[dict[str, Any]], event: dict[str, Any]) -> None:
+    """Enqueue without blocking; a full queue drops its oldest event."""
+    if queue.full():
+        queue.get_nowait()
+        if event is not RESYNC:
+            # Events were skipped: the subscriber has to re-read the statuses
+            event = RESYNC
+    queue.put_nowait(event)
+
+
+progress_events = ProgressEvents()
@@ -15,18 +15,29 @@ import asyncpg
 import httpx
 from loguru import logger
 from openai import AsyncOpenAI
-from tale_knowledge.embedding import EmbeddingService
+from tale_knowledge.chunking import configure_chunk_pool, shutdown_chunk_pool
+from tale_knowledge.embedding import (
+    EmbeddingService,
+    QueryEmbeddingCache,
+    TieredEmbeddingCache,
+    create_embedding_service,
+    is_local_base_url,
+)
+from tale_knowledge.extraction import FileSource
 from tale_knowledge.vision import VisionClient
 from tale_shared.db import acquire_with_retry
 
 from ..config import settings
+from .admission import admission, extraction_weight
 from .database import (
     SCHEMA,
     close_pool,
     init_pool,
     pin_embedding_dimensions,
 )
-from .indexing_service import index_document
+from .embedding_cache import build_embedding_cache
+from .indexing_service import DocumentInput, hand_over_chunks, index_document, index_documents
+from .page_checkpoints import PostgresPageCheckpointStore, build_page_checkpoint_store
 from .search_service import RagSearchService
 
 RAG_TOP_K = 30
@@ -66,6 +77,9 @@ class RagService:
         self._init_lock = asyncio.Lock()
         self._pool: asyncpg.Pool | None = None
         self._embedding_service: EmbeddingService | None = None
+        self._embedding_cache: TieredEmbeddingCache | None = None
+        self._page_checkpoints: PostgresPageCheckpointStore | None = None
+        self._query_embedding_cache: QueryEmbeddingCache | None = None
         self._vision_client: VisionClient | None = None
         self._openai_client: AsyncOpenAI | None = None
         self._search_service: RagSearchService | None = None
@@ -89,16 +103,35 @@ class RagService:
         # Database pool
         self._pool = await init_pool()
 
+        # Worker processes for chunking large documents (started on first use)
+        configure_chunk_pool(settings.chunk_pool_workers)
+
         # Embedding service
         llm_config = settings.get_llm_config()
         embedding_model = llm_config["embedding_model"]
         dimensions = settings.get_embedding_dimensions()
 
-        self._embedding_service = EmbeddingService(
+        # Built once and shared by every EmbeddingService instance, so cached
+        # vectors and hit counters survive provider config reloads.
+        self._embedding_cache = build_embedding_cache(self._pool)
+        self._page_checkpoints = build_page_checkpoint_store(self._pool)
+        if settings.query_embedding_cache_size > 0:
+            self._query_embedding_cache = QueryEmbeddingCache(
+                settings.query_embedding_cache_size,
+                settings.query_embedding_cache_ttl_seconds,
+            )
+
+        self._embedding_service = create_embedding_service(
             api_key=llm_config["embedding_api_key"],
             base_url=llm_config["embedding_base_url"],
             model=embedding_model,
             dimensions=dimensions,
+            cache=self._embedding_cache,
+            max_tokens_per_request=settings.embedding_max_tokens_per_request,
+            query_batch_window=settings.embedding_query_batch_window_ms / 1000,
+            query_batch_size=settings.embedding_query_batch_size,
+            query_cache=self._query_embedding_cache,
+            encoding_format="base64",
         )
         self._llm_config = llm_config
 
@@ -146,6 +179,24 @@ class RagService:
     def embedding_service(self) -> EmbeddingService | None:
         return self._embedding_service
 
+    def get_embedding_limiter_stats(self) -> dict[str, float]:
+        """Adaptive embedding concurrency: current limit, in-flight, throttle events."""
+        if self._embedding_service is None:
+            return {}
+        return self._embedding_service.limiter.get_stats()
+
+    def get_embedding_cache_stats(self) -> dict[str, int]:
+        """Embedding cache hit/miss counters (empty when the cache is disabled)."""
+        if self._embedding_cache is None:
+            return {}
+        return self._embedding_cache.get_stats()
+
+    def get_query_embedding_cache_stats(self) -> dict[str, float]:
+        """Query embedding LRU hits, misses and hit rate (empty when disabled)."""
+        if self._query_embedding_cache is None:
+            return {}
+        return self._query_embedding_cache.get_stats()
+
     def _maybe_refresh_clients(self) -> None:
         """Check provider config freshness; rebuild clients if changed.
 
@@ -162,7 +213,9 @@ class RagService:
         # Check chat/embedding config
         new_llm_config = settings.get_llm_config()
         if new_llm_config != self._llm_config:
-            if not new_llm_config.get("api_key") or not new_llm_config.get("embedding_api_key"):
+            if not new_llm_config.get("api_key") or not (
+                new_llm_config.get("embedding_api_key") or is_local_base_url(new_llm_config.get("embedding_base_url"))
+            ):
                 logger.warning("Skipping LLM config reload: empty API key")
             else:
                 new_dims = settings.get_embedding_dimensions()
@@ -174,11 +227,17 @@ class RagService:
                     )
                 else:
                     # Prepare new clients before swapping any state
-                    new_emb = EmbeddingService(
+                    new_emb = create_embedding_service(
                         api_key=new_llm_config["embedding_api_key"],
                         base_url=new_llm_config["embedding_base_url"],
                         model=new_llm_config["embedding_model"],
                         dimensions=new_dims,
+                        cache=self._embedding_cache,
+                        max_tokens_per_request=settings.embedding_max_tokens_per_request,
+                        query_batch_window=settings.embedding_query_batch_window_ms / 1000,
+                        query_batch_size=settings.embedding_query_batch_size,
+                        query_cache=self._query_embedding_cache,
+                        encoding_format="base64",
                     )
                     new_oai = AsyncOpenAI(
                         api_key=new_llm_config["api_key"],
@@ -194,6 +253,9 @@ class RagService:
                     if self._pool:
                         self._search_service = RagSearchService(self._pool, new_emb)
                     self._llm_config = new_llm_config
+                    # Vectors from the previous provider must not answer new queries.
+                    if self._query_embedding_cache is not None:
+                        self._query_embedding_cache.clear()
                     logger.info("RAG LLM clients refreshed: model={}", new_llm_config.get("embedding_model"))
 
                     # Close old clients (fire-and-forget with grace period)
@@ -235,14 +297,20 @@ class RagService:
 
     async def add_document(
         self,
-        content: bytes,
+        content: FileSource,
         file_id: str,
         filename: str,
         *,
         source_created_at: dt.datetime | None = None,
         source_modified_at: dt.datetime | None = None,
+        content_hash: str | None = None,
+        admitted: bool = False,
     ) -> dict[str, Any]:
-        """Add a document to the knowledge base."""
+        """Add a document (bytes or a spooled upload's path) to the knowledge base.
+
+        Extraction reserves its share of the admission budget unless the
+        caller already holds a reservation for it (``admitted``).
+        """
         if not self.initialized:
             await self.initialize()
         self._maybe_refresh_clients()
@@ -261,8 +329,42 @@ class RagService:
             vision_client=self._vision_client,
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap,
+            chunk_sizing=settings.chunk_sizing,
+            chunk_offload_threshold=settings.chunk_offload_threshold_chars,
             source_created_at=source_created_at,
             source_modified_at=source_modified_at,
+            stream_min_chunks=settings.embedding_stream_min_chunks,
+            content_hash=content_hash,
+            page_checkpoints=self._page_checkpoints,
+            admission=None if admitted else admission,
+        )
+
+    async def add_documents(self, documents: list[DocumentInput]) -> list[dict[str, Any] | Exception]:
+        """Add several documents, sharing embedding requests between them.
+
+        Returns one result (or the exception it failed with) per document.
+        """
+        if not self.initialized:
+            await self.initialize()
+        self._maybe_refresh_clients()
+
+        if self._pool is None:
+            raise RuntimeError("RagService not initialized: database pool is None")
+        if self._embedding_service is None:
+            raise RuntimeError("RagService not initialized: embedding service is None")
+
+        return await index_documents(
+            self._pool,
+            documents,
+            embedding_service=self._embedding_service,
+            vision_client=self._vision_client,
+            chunk_size=settings.chunk_size,
+            chunk_overlap=settings.chunk_overlap,
+            chunk_sizing=settings.chunk_sizing,
+            chunk_offload_threshold=settings.chunk_offload_threshold_chars,
+            stream_min_chunks=settings.embedding_stream_min_chunks,
+            page_checkpoints=self._page_checkpoints,
+            admission=admission,
         )
 
     async def search(
@@ -440,7 +542,8 @@ class RagService:
 
         async with acquire_with_retry(self._pool) as conn:
             doc = await conn.fetchrow(
-                f"SELECT id, file_id, filename, chunks_count, source_created_at, source_modified_at"
+                f"SELECT COALESCE(chunk_owner_id, id) AS chunks_document_id, file_id, filename, chunks_count,"
+                f" source_created_at, source_modified_at"
                 f" FROM {SCHEMA}.documents WHERE {where} LIMIT 1",
                 *params,
             )
@@ -448,7 +551,7 @@ class RagService:
             if doc is None:
                 return None
 
-            doc_uuid = doc["id"]
+            doc_uuid = doc["chunks_document_id"]
             total_chunks = doc["chunks_count"]
 
             # Convert 1-indexed API params to 0-indexed chunk_index
@@ -599,6 +702,16 @@ class RagService:
         ids_to_delete = [row["id"] for row in rows]
 
         async with acquire_with_retry(self._pool) as conn, conn.transaction():
+            # Locked first so no upload can start sharing their chunks
+            # between the hand-over and the delete
+            locked = await conn.fetch(
+                f"SELECT id FROM {SCHEMA}.documents WHERE id = ANY($1) ORDER BY id FOR UPDATE",
+                ids_to_delete,
+            )
+            ids_to_delete = [row["id"] for row in locked]
+            # Chunks other documents still share move to one of them
+            for doc_uuid in ids_to_delete:
+                await hand_over_chunks(conn, doc_uuid, exclude=ids_to_delete)
             await conn.execute(
                 f"DELETE FROM {SCHEMA}.chunks WHERE document_id = ANY($1)",
                 ids_to_delete,
@@ -663,9 +776,9 @@ class RagService:
 
     async def compare_files(
         self,
-        base_bytes: bytes,
+        base_bytes: FileSource,
         base_filename: str,
-        comparison_bytes: bytes,
+        comparison_bytes: FileSource,
         comparison_filename: str,
         *,
         max_changes: int = 500,
@@ -673,7 +786,9 @@ class RagService:
         """Compare two uploaded files using deterministic paragraph-level diffing.
 
         Extracts text directly from file bytes — no database storage or embedding.
-        Text extraction runs in parallel for both files via asyncio.gather.
+        Text extraction runs in parallel for both files via asyncio.gather,
+        under one admission reservation for both; raises AdmissionRejected
+        when too many extractions are already waiting.
         """
         self._maybe_refresh_clients()
 
@@ -681,12 +796,17 @@ class RagService:
 
         from .diff_service import compute_diff
 
-        t0 = time.time()
-
-        (base_text, _), (comp_text, _) = await asyncio.gather(
-            extract_text(base_bytes, base_filename, vision_client=self._vision_client),
-            extract_text(comparison_bytes, comparison_filename, vision_client=self._vision_client),
+        (base_size, base_pages), (comp_size, comp_pages) = await asyncio.gather(
+            extraction_weight(base_bytes, base_filename),
+            extraction_weight(comparison_bytes, comparison_filename),
         )
+        async with admission.admit(base_size + comp_size, base_pages + comp_pages, reject_when_full=True):
+            t0 = time.time()
+
+            (base_text, _), (comp_text, _) = await asyncio.gather(
+                extract_text(base_bytes, base_filename, vision_client=self._vision_client),
+                extract_text(comparison_bytes, comparison_filename, vision_client=self._vision_client),
+            )
 
         extraction_ms = (time.time() - t0) * 1000
         logger.info("Parallel text extraction completed in {:.1f}ms", extraction_ms)
@@ -713,8 +833,9 @@ class RagService:
         return result
 
     async def shutdown(self) -> None:
-        """Clean shutdown — close pool."""
+        """Clean shutdown — close pool and chunking workers."""
         await close_pool()
+        shutdown_chunk_pool()
         self.initialized = False
 
 
@@ -2,6 +2,8 @@
 
 BM25 full-text (pg_search) + pgvector similarity with RRF fusion.
 Scoping via file_ids. Optional semantic caching and cross-encoder re-ranking.
+Hits on chunks shared by several documents (``documents.chunk_owner_id``)
+are reported once per document.
 """
 
 from __future__ import annotations
@@ -9,16 +11,18 @@ from __future__ import annotations
 import asyncio
 import json
 import time
+from collections import defaultdict
 from typing import Any, ClassVar
 
 import asyncpg
 from loguru import logger
 from tale_knowledge.embedding import EmbeddingService, EmbeddingUsage
-from tale_knowledge.retrieval import merge_rrf
+from tale_knowledge.retrieval import candidate_limit, merge_rrf
 from tale_knowledge.retrieval.reranker import Reranker
 from tale_shared.db import acquire_with_retry
 
 from ..config import settings
+from .database import vector_prefix_index
 from .semantic_cache import SemanticCache
 
 SCHEMA = "private_knowledge"
@@ -118,7 +122,7 @@ class RagSearchService:
             if not fts_results and not vector_results:
                 return []
 
-            merged = merge_rrf([fts_results, vector_results], top_k)
+            merged = await self._fan_out_shared(merge_rrf([fts_results, vector_results], top_k), file_ids, top_k)
 
             if settings.recency_boost_enabled:
                 _apply_recency_boost(
@@ -193,6 +197,7 @@ class RagSearchService:
                 if query_embedding is None:
                     query_embedding = await self._embedding.embed_query(query)
                 vector_results = await self._vector_search(query_embedding, file_ids, top_k)
+                vector_results = await self._fan_out_shared(vector_results, file_ids, top_k)
                 return [
                     {
                         "content": item.get("core_content") or item.get("chunk_content") or "",
@@ -212,9 +217,62 @@ class RagSearchService:
             return "", []
 
         idx = param_offset + 1
-        clause = f" AND c.document_id IN (SELECT id FROM {SCHEMA}.documents WHERE file_id = ANY(${idx}))"
+        clause = (
+            f" AND c.document_id IN"
+            f" (SELECT COALESCE(chunk_owner_id, id) FROM {SCHEMA}.documents WHERE file_id = ANY(${idx}))"
+        )
         return clause, [file_ids]
 
+    async def _fan_out_shared(
+        self,
+        items: list[dict[str, Any]],
+        file_ids: list[str] | None,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Report each hit on shared chunks for every document sharing them.
+
+        Search rows carry the owner document of their chunk; the documents
+        referencing it get a copy of the hit with their own metadata (and
+        the same score), and with ``file_ids`` only in-scope documents are
+        kept. Only rows flagged ``shared`` cost a lookup.
+        """
+        owners = list({item["document_id"] for item in items if item.get("shared")})
+        if not owners:
+            return items
+        scope = set(file_ids) if file_ids else None
+
+        async with acquire_with_retry(self._pool) as conn:
+            rows = await conn.fetch(
+                f"""SELECT id, chunk_owner_id, file_id, filename,
+                           source_created_at, source_modified_at, created_at
+                    FROM {SCHEMA}.documents
+                    WHERE chunk_owner_id = ANY($1::uuid[]) AND status = 'completed'
+                    ORDER BY created_at, id""",
+                owners,
+            )
+        sharers: dict[Any, list[asyncpg.Record]] = defaultdict(list)
+        for row in rows:
+            if scope is None or row["file_id"] in scope:
+                sharers[row["chunk_owner_id"]].append(row)
+
+        expanded: list[dict[str, Any]] = []
+        for item in items:
+            if not item.get("shared") or scope is None or item.get("file_id") in scope:
+                expanded.append(item)
+            for row in sharers.get(item.get("document_id"), ()):
+                expanded.append(
+                    {
+                        **item,
+                        "document_id": row["id"],
+                        "file_id": row["file_id"],
+                        "filename": row["filename"],
+                        "source_created_at": row["source_created_at"],
+                        "source_modified_at": row["source_modified_at"],
+                        "created_at": row["created_at"],
+                    }
+                )
+        return expanded[:limit]
+
     async def _rebuild_bm25_index(self) -> None:
         """Rebuild the BM25 index after corruption. Runs as a background task."""
         try:
@@ -237,6 +295,7 @@ class RagSearchService:
             SELECT c.id, c.chunk_content, c.core_content, c.chunk_index, c.document_id,
                    d.file_id, d.filename,
                    d.source_created_at, d.source_modified_at, d.created_at,
+                   EXISTS (SELECT 1 FROM {SCHEMA}.documents s WHERE s.chunk_owner_id = c.document_id) AS shared,
                    paradedb.score(c.id) AS score
             FROM {SCHEMA}.chunks c
             LEFT JOIN {SCHEMA}.documents d ON c.document_id = d.id
@@ -264,24 +323,56 @@ class RagSearchService:
         file_ids: list[str] | None,
         limit: int,
     ) -> list[dict[str, Any]]:
-        vec_str = json.dumps(embedding)
         tenant_clause, tenant_params = self._build_scope_clause(file_ids, 1)
+        prefix = vector_prefix_index()
+
+        if prefix is None:
+            sql = f"""
+                SELECT c.id, c.chunk_content, c.core_content, c.chunk_index, c.document_id,
+                       d.file_id, d.filename,
+                       d.source_created_at, d.source_modified_at, d.created_at,
+                       EXISTS (SELECT 1 FROM {SCHEMA}.documents s WHERE s.chunk_owner_id = c.document_id) AS shared,
+                       1 - (c.embedding <=> $1::vector) AS score
+                FROM {SCHEMA}.chunks c
+                LEFT JOIN {SCHEMA}.documents d ON c.document_id = d.id
+                WHERE c.embedding IS NOT NULL
+                {tenant_clause}
+                ORDER BY c.embedding <=> $1::vector
+                LIMIT ${2 + len(tenant_params)}
+            """
+            params = [embedding, *tenant_params, limit]
 
+            async with acquire_with_retry(self._pool) as conn:
+                rows = await conn.fetch(sql, *params)
+                return [dict(r) for r in rows]
+
+        # Two-stage: HNSW over the truncated prefix picks candidates, the
+        # full-precision column rescores them.
+        candidates = candidate_limit(limit, settings.vector_rescore_factor)
         sql = f"""
             SELECT c.id, c.chunk_content, c.core_content, c.chunk_index, c.document_id,
                    d.file_id, d.filename,
                    d.source_created_at, d.source_modified_at, d.created_at,
+                   EXISTS (SELECT 1 FROM {SCHEMA}.documents s WHERE s.chunk_owner_id = c.document_id) AS shared,
                    1 - (c.embedding <=> $1::vector) AS score
-            FROM {SCHEMA}.chunks c
+            FROM (
+                SELECT c.id
+                FROM {SCHEMA}.chunks c
+                WHERE c.embedding IS NOT NULL
+                {tenant_clause}
+                ORDER BY {prefix.distance("c.embedding", "$1::vector")}
+                LIMIT ${2 + len(tenant_params)}
+            ) candidates
+            JOIN {SCHEMA}.chunks c ON c.id = candidates.id
             LEFT JOIN {SCHEMA}.documents d ON c.document_id = d.id
-            WHERE c.embedding IS NOT NULL
-            {tenant_clause}
             ORDER BY c.embedding <=> $1::vector
-            LIMIT ${2 + len(tenant_params)}
+            LIMIT ${3 + len(tenant_params)}
         """
-        params = [vec_str, *tenant_params, limit]
+        params = [embedding, *tenant_params, candidates, limit]
 
-        async with acquire_with_retry(self._pool) as conn:
+        async with acquire_with_retry(self._pool) as conn, conn.transaction():
+            # The HNSW scan returns at most ef_search rows.
+            await conn.execute(f"SET LOCAL hnsw.ef_search = {max(candidates, 40)}")
             rows = await conn.fetch(sql, *params)
             return [dict(r) for r in rows]
 
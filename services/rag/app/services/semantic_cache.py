@@ -87,7 +87,6 @@ class SemanticCache:
         Returns:
             CacheEntry if a sufficiently similar cached query exists, else None.
         """
-        vec_str = json.dumps(query_embedding)
         now = datetime.now(UTC)
 
         try:
@@ -102,7 +101,7 @@ class SemanticCache:
                     ORDER BY query_embedding <=> $1::vector
                     LIMIT 1
                     """,
-                    vec_str,
+                    query_embedding,
                     now,
                     threshold,
                 )
@@ -159,7 +158,6 @@ class SemanticCache:
             ttl_hours: Time-to-live in hours.
             file_ids: File IDs referenced by the response (for invalidation).
         """
-        vec_str = json.dumps(embedding)
         now = datetime.now(UTC)
         expires_at = now + timedelta(hours=ttl_hours)
         meta_json = json.dumps(metadata) if metadata else "{}"
@@ -173,7 +171,7 @@ class SemanticCache:
                     VALUES ($1, $2::vector, $3, $4::jsonb, $5, $6)
                     """,
                     query,
-                    vec_str,
+                    embedding,
                     response,
                     meta_json,
                     expires_at,
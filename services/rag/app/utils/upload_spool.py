@@ -0,0 +1,87 @@
+"""Bounded-memory buffering of uploaded files.
+
+Uploads are kept in memory up to a threshold and spooled to a temporary
+file beyond it, like ``tempfile.SpooledTemporaryFile`` — except that the
+rolled-over file is a ``NamedTemporaryFile``, so the secret scanner, the
+extractors and the ingestion queue can read it by path instead of the
+upload being materialized as one ``bytes`` object. The SHA-256 content
+hash is computed while the upload is written, so nothing re-reads the
+file just to hash it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from types import TracebackType
+from typing import IO
+
+from tale_knowledge.extraction import FileSource
+
+
+class UploadSpool:
+    """One upload, in memory up to ``max_memory`` bytes and on disk beyond."""
+
+    def __init__(self, max_memory: int, *, dir: str | None = None) -> None:
+        self._max_memory = max_memory
+        self._dir = dir
+        self._buffer = BytesIO()
+        self._file: IO[bytes] | None = None
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+
+    @property
+    def content_hash(self) -> str:
+        """Hex SHA-256 of everything written (same as ``compute_content_hash``)."""
+        return self._sha256.hexdigest()
+
+    @property
+    def on_disk(self) -> bool:
+        return self._file is not None
+
+    def write(self, data: bytes) -> None:
+        self._sha256.update(data)
+        self.size += len(data)
+        if self._file is None and self.size > self._max_memory:
+            self._file = tempfile.NamedTemporaryFile(prefix="tale-upload-", dir=self._dir)  # noqa: SIM115
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = BytesIO()
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buffer.write(data)
+
+    async def awrite(self, data: bytes) -> None:
+        """``write`` with the file I/O off the event loop once the spool is on disk."""
+        if self._file is None and self.size + len(data) <= self._max_memory:
+            self.write(data)
+        else:
+            await asyncio.to_thread(self.write, data)
+
+    def source(self) -> FileSource:
+        """The upload as bytes while in memory, else the path of the spool file."""
+        if self._file is None:
+            return self._buffer.getvalue()
+        self._file.flush()
+        return Path(self._file.name)
+
+    def close(self) -> None:
+        """Discard the upload (the spool file is deleted)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buffer = BytesIO()
+
+    def __enter__(self) -> UploadSpool:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
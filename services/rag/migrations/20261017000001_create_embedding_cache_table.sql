@@ -0,0 +1,18 @@
+-- migrate:up
+-- Content-addressed embedding cache. Rows are keyed by the embedding model,
+-- the requested dimensions and sha256 of the embedded text, so unchanged
+-- chunks of re-uploaded documents are never sent to the provider again.
+-- Vectors are stored as REAL[]: the table is only read by primary key and
+-- needs no vector index.
+
+CREATE TABLE IF NOT EXISTS private_knowledge.embedding_cache (
+    model       TEXT NOT NULL,
+    dimensions  INTEGER NOT NULL,
+    text_hash   TEXT NOT NULL,
+    embedding   REAL[] NOT NULL,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (model, dimensions, text_hash)
+);
+
+-- migrate:down
+DROP TABLE IF EXISTS private_knowledge.embedding_cache;
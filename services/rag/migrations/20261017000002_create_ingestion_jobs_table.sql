@@ -0,0 +1,31 @@
+-- migrate:up
+-- Durable ingestion queue. Uploads are written here (file bytes included, so
+-- any replica can process them) and consumed by worker loops with
+-- FOR UPDATE SKIP LOCKED. A claimed job is hidden until visible_at; workers
+-- extend it while they run, so a job whose worker died reappears once the
+-- visibility timeout lapses. Finished jobs are deleted.
+
+CREATE TABLE IF NOT EXISTS private_knowledge.ingestion_jobs (
+    id                  BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    file_id             TEXT NOT NULL,
+    filename            TEXT NOT NULL,
+    lane                TEXT NOT NULL DEFAULT 'interactive'
+                        CHECK (lane IN ('interactive', 'bulk')),
+    content             BYTEA NOT NULL,
+    source_created_at   TIMESTAMPTZ,
+    source_modified_at  TIMESTAMPTZ,
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    max_attempts        INTEGER NOT NULL DEFAULT 3,
+    visible_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_by           TEXT,
+    last_error          TEXT,
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_pk_ingestion_jobs_lane_visible
+    ON private_knowledge.ingestion_jobs (lane, visible_at, id);
+CREATE INDEX IF NOT EXISTS idx_pk_ingestion_jobs_file_id
+    ON private_knowledge.ingestion_jobs (file_id, id);
+
+-- migrate:down
+DROP TABLE IF EXISTS private_knowledge.ingestion_jobs;
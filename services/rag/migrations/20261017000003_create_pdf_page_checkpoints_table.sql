@@ -0,0 +1,24 @@
+-- migrate:up
+-- Per-page PDF extraction results, saved while a large PDF is extracted so a
+-- retried ingestion job resumes from the first missing page instead of
+-- repeating every OCR and vision call. Rows are keyed by the file's content
+-- hash, the extractor version (bumped when page output changes) and the
+-- zero-based page index. They are deleted once the document is stored;
+-- checkpoints of documents that never finish are pruned by age.
+
+CREATE TABLE IF NOT EXISTS private_knowledge.pdf_page_checkpoints (
+    content_hash        TEXT NOT NULL,
+    extractor_version   TEXT NOT NULL,
+    page_index          INTEGER NOT NULL,
+    content             TEXT NOT NULL,
+    vision_used         BOOLEAN NOT NULL,
+    is_scanned          BOOLEAN NOT NULL,
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (content_hash, extractor_version, page_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pk_pdf_page_checkpoints_created_at
+    ON private_knowledge.pdf_page_checkpoints (created_at);
+
+-- migrate:down
+DROP TABLE IF EXISTS private_knowledge.pdf_page_checkpoints;
@@ -0,0 +1,14 @@
+-- migrate:up
+-- Indexes suspended for a bulk load. Starting a bulk load records each
+-- search index's definition here and drops it; finishing it rebuilds every
+-- index once and deletes its row in the same transaction. While rows exist,
+-- the service does not recreate these indexes on its own.
+
+CREATE TABLE IF NOT EXISTS private_knowledge.bulk_load_indexes (
+    index_name      TEXT PRIMARY KEY,
+    definition      TEXT NOT NULL,
+    suspended_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- migrate:down
+DROP TABLE IF EXISTS private_knowledge.bulk_load_indexes;
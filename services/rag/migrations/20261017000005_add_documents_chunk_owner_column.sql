@@ -0,0 +1,46 @@
+-- migrate:up
+-- Content-addressed chunk storage. A document whose content was already
+-- indexed under another document no longer gets a copy of its chunks and
+-- embeddings: chunk_owner_id points at the document that stores them, and
+-- search maps hits on those chunks back to every document sharing them.
+-- Owners always have chunk_owner_id NULL (no chains). Before an owner's
+-- chunks change or go away they are handed over to one of its sharers.
+
+ALTER TABLE private_knowledge.documents
+    ADD COLUMN IF NOT EXISTS chunk_owner_id UUID
+        REFERENCES private_knowledge.documents(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_pk_docs_chunk_owner
+    ON private_knowledge.documents(chunk_owner_id)
+    WHERE chunk_owner_id IS NOT NULL;
+
+-- Collapse the per-document copies made by earlier duplicate uploads: the
+-- oldest completed document with chunks keeps them for each content hash.
+WITH owners AS (
+    SELECT DISTINCT ON (content_hash) content_hash, id
+    FROM private_knowledge.documents
+    WHERE status = 'completed' AND content_hash IS NOT NULL AND chunks_count > 0
+    ORDER BY content_hash, created_at, id
+)
+UPDATE private_knowledge.documents d
+SET chunk_owner_id = owners.id
+FROM owners
+WHERE d.content_hash = owners.content_hash
+  AND d.id <> owners.id
+  AND d.status = 'completed';
+
+DELETE FROM private_knowledge.chunks c
+USING private_knowledge.documents d
+WHERE c.document_id = d.id AND d.chunk_owner_id IS NOT NULL;
+
+-- migrate:down
+INSERT INTO private_knowledge.chunks
+    (document_id, chunk_index, chunk_content, content_hash, embedding,
+     core_content, prefix_overlap, suffix_overlap)
+SELECT d.id, c.chunk_index, c.chunk_content, c.content_hash, c.embedding,
+       c.core_content, c.prefix_overlap, c.suffix_overlap
+FROM private_knowledge.documents d
+JOIN private_knowledge.chunks c ON c.document_id = d.chunk_owner_id;
+
+DROP INDEX IF EXISTS private_knowledge.idx_pk_docs_chunk_owner;
+ALTER TABLE private_knowledge.documents DROP COLUMN IF EXISTS chunk_owner_id;
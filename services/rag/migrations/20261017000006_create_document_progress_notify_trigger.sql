@@ -0,0 +1,37 @@
+-- migrate:up
+-- Push document status and progress changes to listeners (the RAG
+-- service's /documents/events stream) with NOTIFY, so clients no longer
+-- poll /documents/statuses. Notifications are sent on commit and reach the
+-- listeners of every replica.
+
+CREATE OR REPLACE FUNCTION private_knowledge.notify_document_progress()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND (OLD.status, OLD.progress_phase, OLD.progress_detail, OLD.error)
+           IS NOT DISTINCT FROM (NEW.status, NEW.progress_phase, NEW.progress_detail, NEW.error) THEN
+        RETURN NULL;
+    END IF;
+    PERFORM pg_notify(
+        'private_knowledge_document_progress',
+        json_build_object(
+            'file_id', NEW.file_id,
+            'status', NEW.status,
+            'progress_phase', NEW.progress_phase,
+            'progress_detail', NEW.progress_detail,
+            'error', left(NEW.error, 1000)
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_pk_documents_progress ON private_knowledge.documents;
+CREATE TRIGGER trg_pk_documents_progress
+    AFTER INSERT OR UPDATE OF status, progress_phase, progress_detail, error
+    ON private_knowledge.documents
+    FOR EACH ROW EXECUTE FUNCTION private_knowledge.notify_document_progress();
+
+-- migrate:down
+DROP TRIGGER IF EXISTS trg_pk_documents_progress ON private_knowledge.documents;
+DROP FUNCTION IF EXISTS private_knowledge.notify_document_progress();
@@ -0,0 +1,11 @@
+-- migrate:up
+-- Workers read queued files in slices with substring(content from .. for ..)
+-- instead of fetching the whole bytea. Uncompressed out-of-line storage
+-- lets Postgres fetch just the TOAST chunks of each slice rather than
+-- decompressing the whole value per slice. Applies to rows written from
+-- now on; queued jobs are short-lived.
+
+ALTER TABLE private_knowledge.ingestion_jobs ALTER COLUMN content SET STORAGE EXTERNAL;
+
+-- migrate:down
+ALTER TABLE private_knowledge.ingestion_jobs ALTER COLUMN content SET STORAGE EXTENDED;
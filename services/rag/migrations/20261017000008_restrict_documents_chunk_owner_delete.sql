@@ -0,0 +1,16 @@
+-- migrate:up
+-- Deleting a document that still owns chunks shared by others must hand
+-- them over first. ON DELETE SET NULL silently left the sharers pointing at
+-- nothing (and showing no content) when that step was missed; RESTRICT
+-- makes such a delete fail instead.
+
+ALTER TABLE private_knowledge.documents
+    DROP CONSTRAINT IF EXISTS documents_chunk_owner_id_fkey,
+    ADD CONSTRAINT documents_chunk_owner_id_fkey
+        FOREIGN KEY (chunk_owner_id) REFERENCES private_knowledge.documents(id) ON DELETE RESTRICT;
+
+-- migrate:down
+ALTER TABLE private_knowledge.documents
+    DROP CONSTRAINT IF EXISTS documents_chunk_owner_id_fkey,
+    ADD CONSTRAINT documents_chunk_owner_id_fkey
+        FOREIGN KEY (chunk_owner_id) REFERENCES private_knowledge.documents(id) ON DELETE SET NULL;
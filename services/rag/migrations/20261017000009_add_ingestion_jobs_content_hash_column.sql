@@ -0,0 +1,9 @@
+-- migrate:up
+-- SHA-256 of the queued file, computed while the upload streamed in, so
+-- the worker does not read the whole file back just to hash it again.
+-- NULL for jobs queued without one; the worker then hashes the file.
+
+ALTER TABLE private_knowledge.ingestion_jobs ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- migrate:down
+ALTER TABLE private_knowledge.ingestion_jobs DROP COLUMN IF EXISTS content_hash;
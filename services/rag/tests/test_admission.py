@@ -0,0 +1,153 @@
+"""Tests for byte- and page-weighted extraction admission."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from app.services.admission import AdmissionController, AdmissionRejected, extraction_weight
+
+pytestmark = pytest.mark.asyncio
+
+
+def _controller(*, max_bytes: int = 100, max_pages: int = 10, max_queued: int = 2) -> AdmissionController:
+    return AdmissionController(max_bytes, max_pages, max_queued, retry_after_seconds=7)
+
+
+async def _hold(controller: AdmissionController, nbytes: int, pages: int, release: asyncio.Event, log: list[str]):
+    async with controller.admit(nbytes, pages):
+        log.append(f"in {nbytes}")
+        await release.wait()
+
+
+class TestAdmissionController:
+    async def test_work_within_budget_runs_concurrently(self):
+        controller = _controller()
+        async with controller.admit(40, 4), controller.admit(60, 6):
+            assert controller.get_stats()["active"] == 2
+            assert controller.get_stats()["reserved_bytes"] == 100
+        assert controller.get_stats()["reserved_bytes"] == 0
+
+    async def test_work_over_budget_waits_for_release(self):
+        controller = _controller()
+        release = asyncio.Event()
+        log: list[str] = []
+        first = asyncio.create_task(_hold(controller, 80, 1, release, log))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_hold(controller, 30, 1, asyncio.Event(), log))
+        await asyncio.sleep(0)
+        assert log == ["in 80"]
+        assert controller.queued == 1
+
+        release.set()
+        await first
+        await asyncio.sleep(0)
+        assert log == ["in 80", "in 30"]
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+
+    async def test_pages_are_budgeted_like_bytes(self):
+        controller = _controller()
+        async with controller.admit(1, 8):
+            waiter = asyncio.create_task(controller.admit(1, 5).__aenter__())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+            waiter.cancel()
+        assert controller.get_stats() == {
+            "active": 0,
+            "queued": 0,
+            "reserved_bytes": 0,
+            "reserved_pages": 0,
+            "max_bytes": 100,
+            "max_pages": 10,
+        }
+
+    async def test_oversized_document_runs_alone(self):
+        controller = _controller()
+        async with controller.admit(10_000, 500):
+            assert controller.get_stats()["reserved_bytes"] == 100
+
+    async def test_waiters_are_admitted_in_order(self):
+        controller = _controller(max_queued=5)
+        release = asyncio.Event()
+        log: list[str] = []
+        holder = asyncio.create_task(_hold(controller, 90, 1, release, log))
+        await asyncio.sleep(0)
+        # The large waiter at the head is not overtaken by the small one
+        large = asyncio.create_task(_hold(controller, 50, 1, asyncio.Event(), log))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(_hold(controller, 5, 1, asyncio.Event(), log))
+        await asyncio.sleep(0)
+        assert log == ["in 90"]
+
+        release.set()
+        await holder
+        await asyncio.sleep(0)
+        assert log == ["in 90", "in 50", "in 5"]
+        large.cancel()
+        small.cancel()
+        await asyncio.gather(large, small, return_exceptions=True)
+
+    async def test_rejects_when_queue_full(self):
+        controller = _controller(max_queued=1)
+        async with controller.admit(100, 1):
+            waiter = asyncio.create_task(controller.admit(10, 1).__aenter__())
+            await asyncio.sleep(0)
+
+            with pytest.raises(AdmissionRejected) as exc_info:
+                async with controller.admit(10, 1, reject_when_full=True):
+                    pass
+            assert exc_info.value.retry_after == 7
+            with pytest.raises(AdmissionRejected):
+                controller.raise_if_saturated()
+            waiter.cancel()
+            await asyncio.sleep(0)
+        controller.raise_if_saturated()
+
+    async def test_cancelled_waiter_frees_its_place(self):
+        controller = _controller()
+        release = asyncio.Event()
+        log: list[str] = []
+        holder = asyncio.create_task(_hold(controller, 100, 1, release, log))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(_hold(controller, 50, 1, asyncio.Event(), log))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert controller.queued == 0
+
+        release.set()
+        await holder
+        assert controller.get_stats()["active"] == 0
+        assert controller.get_stats()["reserved_bytes"] == 0
+
+
+class TestExtractionWeight:
+    @pytest.fixture(autouse=True)
+    def _unload_pdf_extractor(self):
+        # Other tests stub fitz before tale_knowledge.extraction.pdf is imported
+        with patch.dict(sys.modules):
+            yield
+
+    async def test_bytes_count_one_page(self):
+        assert await extraction_weight(b"hello", "notes.txt") == (5, 1)
+
+    async def test_spooled_path_is_measured_on_disk(self, tmp_path):
+        path = tmp_path / "upload"
+        path.write_bytes(b"x" * 1234)
+        assert await extraction_weight(path, "notes.md") == (1234, 1)
+
+    async def test_pdf_pages_are_counted(self):
+        fitz = pytest.importorskip("fitz")
+        doc = fitz.open()
+        for _ in range(3):
+            doc.new_page()
+        data = doc.tobytes()
+        doc.close()
+        assert await extraction_weight(data, "report.PDF") == (len(data), 3)
+
+    async def test_unreadable_pdf_counts_one_page(self):
+        assert await extraction_weight(b"not a pdf", "broken.pdf") == (9, 1)
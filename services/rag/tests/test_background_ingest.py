@@ -2,7 +2,11 @@
 
 Covers:
 - get_document_statuses: status priority with DISTINCT ON, error fields, edge cases
-- _background_ingest: happy path, skipped content re-upload, failure recording
+- run_ingestion_job / record_ingestion_failure: happy path, skipped content
+  re-upload, failures propagated to the queue, failure recording
+- run_ingestion_batch: per-job outcomes from the shared pipeline
+- upload_documents_batch: per-file validation, one processing-row insert,
+  one bulk enqueue
 - _mark_completed: restores status on skipped re-uploads
 - _sanitize_error: truncation of long error messages
 
@@ -16,6 +20,7 @@ from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from tale_shared.utils.hashing import compute_content_hash
 
 pytestmark = pytest.mark.asyncio
 
@@ -178,12 +183,31 @@ class TestSanitizeError:
         assert result == "a" * 500
 
 
+def _job(**overrides: Any):
+    from app.services.ingestion_queue import IngestionJob
+
+    fields: dict[str, Any] = {
+        "id": 1,
+        "file_id": "doc-1",
+        "filename": "test.txt",
+        "lane": "interactive",
+        "content_size": 7,
+        "content": b"content",
+        "source_created_at": None,
+        "source_modified_at": None,
+        "attempts": 1,
+        "max_attempts": 3,
+    }
+    fields.update(overrides)
+    return IngestionJob(**fields)
+
+
 @_requires_multipart
-class TestBackgroundIngest:
-    """Tests for the _background_ingest async function."""
+class TestRunIngestionJob:
+    """Tests for the ingestion queue job handler."""
 
     async def test_successful_ingestion(self):
-        from app.routers.documents import _background_ingest
+        from app.routers.documents import run_ingestion_job
 
         add_result: dict[str, Any] = {
             "success": True,
@@ -197,16 +221,14 @@ class TestBackgroundIngest:
             patch("app.routers.documents.cleanup_memory"),
         ):
             mock_rag.add_document = AsyncMock(return_value=add_result)
-            await _background_ingest(
-                b"content",
-                "doc-1",
-                "test.txt",
-            )
+            await run_ingestion_job(_job(content_hash="upload-hash"))
 
         mock_rag.add_document.assert_awaited_once()
+        # The hash computed while the upload streamed in is reused
+        assert mock_rag.add_document.await_args.kwargs["content_hash"] == "upload-hash"
 
     async def test_skipped_content_marks_completed(self):
-        from app.routers.documents import _background_ingest
+        from app.routers.documents import run_ingestion_job
 
         add_result: dict[str, Any] = {
             "success": True,
@@ -222,16 +244,12 @@ class TestBackgroundIngest:
             patch("app.routers.documents.cleanup_memory"),
         ):
             mock_rag.add_document = AsyncMock(return_value=add_result)
-            await _background_ingest(
-                b"content",
-                "doc-1",
-                "test.txt",
-            )
+            await run_ingestion_job(_job())
 
         mock_mark.assert_awaited_once_with("doc-1")
 
     async def test_non_skipped_does_not_call_mark_completed(self):
-        from app.routers.documents import _background_ingest
+        from app.routers.documents import run_ingestion_job
 
         add_result: dict[str, Any] = {
             "success": True,
@@ -246,56 +264,38 @@ class TestBackgroundIngest:
             patch("app.routers.documents.cleanup_memory"),
         ):
             mock_rag.add_document = AsyncMock(return_value=add_result)
-            await _background_ingest(
-                b"content",
-                "doc-1",
-                "test.txt",
-            )
+            await run_ingestion_job(_job())
 
         mock_mark.assert_not_awaited()
 
-    async def test_ingestion_failure_records_sanitized_error(self):
-        from app.routers.documents import _background_ingest
+    async def test_ingestion_failure_propagates_for_retry(self):
+        from app.routers.documents import run_ingestion_job
 
         with (
             patch("app.routers.documents._record_failure", new_callable=AsyncMock) as mock_fail,
             patch("app.routers.documents.rag_service") as mock_rag,
             patch("app.routers.documents.cleanup_memory"),
         ):
-            mock_rag.add_document = AsyncMock(side_effect=RuntimeError("x" * 1000))
-            await _background_ingest(
-                b"content",
-                "doc-1",
-                "test.txt",
-            )
+            mock_rag.add_document = AsyncMock(side_effect=RuntimeError("boom"))
+            with pytest.raises(RuntimeError, match="boom"):
+                await run_ingestion_job(_job())
 
-        mock_fail.assert_awaited_once()
-        error_arg = mock_fail.call_args[0][2]
-        assert len(error_arg) <= 503  # 500 + "..."
+        mock_fail.assert_not_awaited()
 
-    async def test_record_failure_error_does_not_propagate(self):
-        from app.routers.documents import _background_ingest
+    async def test_record_ingestion_failure_sanitizes_error(self):
+        from app.routers.documents import record_ingestion_failure
 
-        with (
-            patch(
-                "app.routers.documents._record_failure",
-                new_callable=AsyncMock,
-                side_effect=RuntimeError("db down"),
-            ),
-            patch("app.routers.documents.rag_service") as mock_rag,
-            patch("app.routers.documents.cleanup_memory"),
-        ):
-            mock_rag.add_document = AsyncMock(side_effect=ValueError("ingestion failed"))
-            await _background_ingest(
-                b"content",
-                "doc-1",
-                "test.txt",
-            )
+        with patch("app.routers.documents._record_failure", new_callable=AsyncMock) as mock_fail:
+            await record_ingestion_failure(_job(), RuntimeError("x" * 1000))
+
+        mock_fail.assert_awaited_once()
+        assert mock_fail.call_args[0][:2] == ("doc-1", "test.txt")
+        assert len(mock_fail.call_args[0][2]) <= 503  # 500 + "..."
 
     async def test_forwards_source_timestamps_to_add_document(self):
         import datetime as dt
 
-        from app.routers.documents import _background_ingest
+        from app.routers.documents import run_ingestion_job
 
         created = dt.datetime(2025, 6, 15, 10, 30, 0, tzinfo=dt.UTC)
         modified = dt.datetime(2025, 7, 20, 14, 45, 0, tzinfo=dt.UTC)
@@ -312,13 +312,7 @@ class TestBackgroundIngest:
             patch("app.routers.documents.cleanup_memory"),
         ):
             mock_rag.add_document = AsyncMock(return_value=add_result)
-            await _background_ingest(
-                b"content",
-                "doc-1",
-                "test.txt",
-                source_created_at=created,
-                source_modified_at=modified,
-            )
+            await run_ingestion_job(_job(source_created_at=created, source_modified_at=modified))
 
         mock_rag.add_document.assert_awaited_once_with(
             content=b"content",
@@ -326,21 +320,205 @@ class TestBackgroundIngest:
             filename="test.txt",
             source_created_at=created,
             source_modified_at=modified,
+            content_hash=None,
         )
 
     async def test_cleanup_memory_always_called(self):
-        from app.routers.documents import _background_ingest
+        from app.routers.documents import run_ingestion_job
 
         with (
-            patch("app.routers.documents._record_failure", new_callable=AsyncMock),
             patch("app.routers.documents.rag_service") as mock_rag,
             patch("app.routers.documents.cleanup_memory") as mock_cleanup,
         ):
             mock_rag.add_document = AsyncMock(side_effect=RuntimeError("boom"))
-            await _background_ingest(
-                b"content",
-                "doc-1",
-                "test.txt",
-            )
+            with pytest.raises(RuntimeError):
+                await run_ingestion_job(_job())
 
         mock_cleanup.assert_called_once()
+
+
+@_requires_multipart
+class TestRunIngestionBatch:
+    """Tests for the batch ingestion queue handler."""
+
+    async def test_returns_outcome_per_job(self):
+        from app.routers.documents import run_ingestion_batch
+
+        jobs = [_job(id=1), _job(id=2, file_id="doc-2"), _job(id=3, file_id="doc-3")]
+        failure = RuntimeError("store failed")
+        results = [
+            {"success": True, "file_id": "doc-1", "chunks_created": 2, "skipped": False},
+            failure,
+            {"success": True, "file_id": "doc-3", "chunks_created": 0, "skipped": True},
+        ]
+
+        with (
+            patch("app.routers.documents._mark_completed", new_callable=AsyncMock) as mock_mark,
+            patch("app.routers.documents.rag_service") as mock_rag,
+            patch("app.routers.documents.cleanup_memory") as mock_cleanup,
+        ):
+            mock_rag.add_documents = AsyncMock(return_value=results)
+            outcomes = await run_ingestion_batch(jobs)
+
+        assert outcomes == [None, failure, None]
+        documents = mock_rag.add_documents.await_args.args[0]
+        assert [(d.file_id, d.content, d.filename) for d in documents] == [
+            ("doc-1", b"content", "test.txt"),
+            ("doc-2", b"content", "test.txt"),
+            ("doc-3", b"content", "test.txt"),
+        ]
+        mock_mark.assert_awaited_once_with("doc-3")
+        mock_cleanup.assert_called_once()
+
+
+def _upload(filename: str | None, content: bytes):
+    from io import BytesIO
+
+    from fastapi import UploadFile
+
+    return UploadFile(file=BytesIO(content), filename=filename)
+
+
+@_requires_multipart
+class TestSyncUpload:
+    """Sync uploads hold an admission reservation for their whole ingestion."""
+
+    async def test_ingests_inside_admission_reservation(self):
+        from app.routers.documents import upload_document
+        from app.services.admission import AdmissionController
+
+        controller = AdmissionController(100, 10, 0, retry_after_seconds=7)
+        active: list[int] = []
+
+        async def add_document(**kwargs):
+            active.append(controller.get_stats()["active"])
+            return {"success": True, "chunks_created": 1}
+
+        with (
+            patch("app.routers.documents.admission", controller),
+            patch("app.routers.documents._insert_processing_row", new_callable=AsyncMock),
+            patch("app.routers.documents.rag_service") as mock_rag,
+        ):
+            mock_rag.add_document = AsyncMock(side_effect=add_document)
+            response = await upload_document(
+                file=_upload("a.txt", b"content"), metadata=None, file_id="doc-1", sync=True, lane="interactive"
+            )
+
+        assert response.queued is False
+        assert active == [1]
+        # The router's reservation covers extraction; no second one is taken
+        assert mock_rag.add_document.await_args.kwargs["admitted"] is True
+        assert controller.get_stats()["active"] == 0
+
+    async def test_saturated_budget_rejects_before_status_row(self):
+        from fastapi import HTTPException
+
+        from app.routers.documents import upload_document
+        from app.services.admission import AdmissionController
+
+        controller = AdmissionController(100, 10, 0, retry_after_seconds=7)
+
+        with (
+            patch("app.routers.documents.admission", controller),
+            patch("app.routers.documents._insert_processing_row", new_callable=AsyncMock) as mock_row,
+            patch("app.routers.documents.rag_service") as mock_rag,
+        ):
+            async with controller.admit(100, 10):
+                with pytest.raises(HTTPException) as exc_info:
+                    await upload_document(
+                        file=_upload("a.txt", b"content"), metadata=None, file_id="doc-1", sync=True, lane="interactive"
+                    )
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"Retry-After": "7"}
+        mock_row.assert_not_awaited()
+        mock_rag.add_document.assert_not_called()
+
+
+@_requires_multipart
+class TestUploadDocumentsBatch:
+    """Tests for the multi-file upload endpoint."""
+
+    async def test_queues_valid_files_and_reports_rejections(self):
+        from app.routers.documents import upload_documents_batch
+
+        files = [
+            _upload("a.txt", b"first"),
+            _upload("virus.exe", b"nope"),
+            _upload("b.md", b"second"),
+            _upload("c.txt", b"dup"),
+        ]
+        metadata = '[{"file_id": "doc-a", "source_modified_at": 1750000000000}, null, null, {"file_id": "doc-a"}]'
+
+        with (
+            patch("app.routers.documents._insert_processing_rows", new_callable=AsyncMock) as mock_rows,
+            patch("app.routers.documents.ingestion_queue") as mock_queue,
+        ):
+            mock_queue.enqueue_many = AsyncMock(return_value=[1, 2])
+            response = await upload_documents_batch(files=files, metadata=metadata, lane="bulk")
+
+        assert (response.success, response.queued, response.rejected) == (True, 2, 2)
+        assert [r.status for r in response.results] == ["queued", "rejected", "queued", "rejected"]
+        assert "Unsupported file type" in response.results[1].error
+        assert response.results[3].error == "Duplicate file_id in batch"
+
+        rows = mock_rows.await_args.args[0]
+        assert rows[0] == ("doc-a", "a.txt")
+        assert rows[1][1] == "b.md" and rows[1][0].startswith("file-")
+        documents = mock_queue.enqueue_many.await_args.args[0]
+        assert [d.content for d in documents] == [b"first", b"second"]
+        assert documents[0].source_modified_at is not None
+        assert [d.content_hash for d in documents] == [compute_content_hash(b"first"), compute_content_hash(b"second")]
+        assert mock_queue.enqueue_many.await_args.kwargs == {"lane": "bulk"}
+
+    async def test_large_files_queued_from_disk_and_cleaned_up(self):
+        from pathlib import Path
+
+        from app.config import settings
+        from app.routers.documents import upload_documents_batch
+
+        seen: list[tuple[Path, bytes]] = []
+
+        async def enqueue_many(documents, *, lane):
+            seen.extend((d.content, d.content.read_bytes()) for d in documents)
+            return [1]
+
+        with (
+            patch.object(settings, "upload_spool_threshold_mb", 0),
+            patch("app.routers.documents._insert_processing_rows", new_callable=AsyncMock),
+            patch("app.routers.documents.ingestion_queue") as mock_queue,
+        ):
+            mock_queue.enqueue_many = enqueue_many
+            response = await upload_documents_batch(files=[_upload("a.txt", b"spooled")], metadata=None, lane="bulk")
+
+        assert response.queued == 1
+        [(path, content)] = seen
+        assert isinstance(path, Path) and content == b"spooled"
+        assert not path.exists()
+
+    async def test_nothing_queued_when_all_rejected(self):
+        from app.routers.documents import upload_documents_batch
+
+        with (
+            patch("app.routers.documents._insert_processing_rows", new_callable=AsyncMock) as mock_rows,
+            patch("app.routers.documents.ingestion_queue") as mock_queue,
+        ):
+            response = await upload_documents_batch(files=[_upload(None, b"x")], metadata=None, lane="bulk")
+
+        assert (response.success, response.queued, response.rejected) == (False, 0, 1)
+        mock_rows.assert_not_awaited()
+        mock_queue.enqueue_many.assert_not_called()
+
+    async def test_too_many_files_rejected(self):
+        from fastapi import HTTPException
+
+        from app.routers.documents import upload_documents_batch
+
+        with patch("app.routers.documents.settings") as mock_settings:
+            mock_settings.max_batch_upload_files = 1
+            with pytest.raises(HTTPException) as exc_info:
+                await upload_documents_batch(
+                    files=[_upload("a.txt", b"a"), _upload("b.txt", b"b")], metadata=None, lane="bulk"
+                )
+
+        assert exc_info.value.status_code == 400
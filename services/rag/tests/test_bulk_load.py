@@ -0,0 +1,111 @@
+"""Tests for bulk-load mode (suspended search indexes, one-off rebuild)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def _async_ctx(mock_conn):
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=mock_conn)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return ctx
+
+
+def _patch_pool(mock_conn):
+    return (
+        patch("app.services.bulk_load.get_pool", AsyncMock(return_value=MagicMock())),
+        patch("app.services.bulk_load.acquire_with_retry", return_value=_async_ctx(mock_conn)),
+    )
+
+
+class TestBulkLoader:
+    async def test_start_suspends_vector_and_bm25_indexes(self):
+        from app.services.bulk_load import BulkLoader
+
+        pool_patch, acquire_patch = _patch_pool(AsyncMock())
+        with (
+            pool_patch,
+            acquire_patch,
+            patch(
+                "app.services.bulk_load.list_vector_indexes",
+                AsyncMock(return_value=["private_knowledge.idx_pk_chunks_embedding_hnsw"]),
+            ),
+            patch("app.services.bulk_load.suspend_indexes", AsyncMock(return_value=[])) as suspend,
+            patch(
+                "app.services.bulk_load.suspended_indexes",
+                AsyncMock(return_value=["private_knowledge.idx_pk_chunks_bm25"]),
+            ),
+        ):
+            suspended = await BulkLoader().start()
+
+        assert suspend.await_args.args[2] == [
+            "private_knowledge.idx_pk_chunks_embedding_hnsw",
+            "private_knowledge.idx_pk_chunks_bm25",
+        ]
+        assert suspended == ["private_knowledge.idx_pk_chunks_bm25"]
+
+    async def test_finish_rebuilds_once_with_tuned_settings(self):
+        from app.config import settings
+        from app.services.bulk_load import BulkLoader
+
+        release = asyncio.Event()
+
+        async def rebuild(*args, **kwargs):
+            await release.wait()
+            return ["private_knowledge.idx_pk_chunks_bm25"]
+
+        loader = BulkLoader()
+        with (
+            patch("app.services.bulk_load.get_pool", AsyncMock(return_value=MagicMock())),
+            patch("app.services.bulk_load.rebuild_indexes", AsyncMock(side_effect=rebuild)) as rebuild_mock,
+        ):
+            assert await loader.finish() is True
+            await asyncio.sleep(0)
+            assert loader.rebuilding
+            assert await loader.finish() is False
+
+            release.set()
+            await loader._rebuild
+
+        assert not loader.rebuilding
+        rebuild_mock.assert_awaited_once()
+        kwargs = rebuild_mock.await_args.kwargs
+        assert kwargs["maintenance_work_mem"] == settings.bulk_load_maintenance_work_mem
+        assert kwargs["parallel_workers"] == settings.bulk_load_parallel_workers
+
+    async def test_stop_cancels_running_rebuild(self):
+        from app.services.bulk_load import BulkLoader
+
+        async def rebuild(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        loader = BulkLoader()
+        with (
+            patch("app.services.bulk_load.get_pool", AsyncMock(return_value=MagicMock())),
+            patch("app.services.bulk_load.rebuild_indexes", AsyncMock(side_effect=rebuild)),
+        ):
+            await loader.finish()
+            await asyncio.sleep(0)
+            await loader.stop()
+
+        assert not loader.rebuilding
+
+
+class TestEnsureVectorIndexDuringBulkLoad:
+    async def test_skips_while_indexes_are_suspended(self):
+        from app.services.database import ensure_vector_index
+
+        mock_conn = AsyncMock()
+        with patch(
+            "app.services.database.suspended_indexes",
+            AsyncMock(return_value=["private_knowledge.idx_pk_chunks_bm25"]),
+        ):
+            await ensure_vector_index(mock_conn)
+
+        mock_conn.execute.assert_not_awaited()
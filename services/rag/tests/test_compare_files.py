@@ -249,3 +249,22 @@ class TestCompareFilesEndpoint:
 
         assert response.status_code == 422
         assert "No text could be extracted" in response.json()["message"]
+
+    async def test_saturated_admission_returns_429_with_retry_after(self):
+        from app.services.admission import AdmissionRejected
+
+        with patch("app.routers.documents.rag_service") as mock_svc:
+            mock_svc.compare_files = AsyncMock(side_effect=AdmissionRejected(retry_after=30))
+
+            transport = ASGITransport(app=self._get_app())
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post(
+                    "/api/v1/documents/compare-files",
+                    files={
+                        "base_file": ("base.txt", b"Hello", "text/plain"),
+                        "comparison_file": ("comp.txt", b"World", "text/plain"),
+                    },
+                )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "30"
@@ -50,7 +50,7 @@ def _async_ctx(mock_conn):
 
 
 DOC_ROW = {
-    "id": "uuid-abc",
+    "chunks_document_id": "uuid-abc",
     "file_id": "doc-1",
     "filename": "report.pdf",
     "chunks_count": 5,
@@ -3,6 +3,7 @@
 Covers:
 - _validate_file_extension: supported, unsupported, no extension
 - _parse_metadata: valid JSON, invalid JSON, non-dict JSON, None
+- _parse_batch_metadata: one object (or null) per file
 - SUPPORTED_EXTENSIONS: excludes legacy Office formats (.doc, .ppt, .xls)
 - Settings.get_embedding_dimensions(): via provider files
 - Settings.get_llm_config(): via provider files
@@ -17,6 +18,7 @@ from fastapi import HTTPException
 from app.config import Settings
 from app.routers.documents import (
     SUPPORTED_EXTENSIONS,
+    _parse_batch_metadata,
     _parse_metadata,
     _validate_file_extension,
 )
@@ -146,6 +148,26 @@ class TestParseMetadata:
         assert "JSON object" in exc_info.value.detail
 
 
+class TestParseBatchMetadata:
+    """Parse the optional per-file metadata array of a batch upload."""
+
+    def test_none_returns_empty_dict_per_file(self):
+        assert _parse_batch_metadata(None, 2) == [{}, {}]
+
+    def test_null_entries_become_empty_dicts(self):
+        assert _parse_batch_metadata('[{"file_id": "a"}, null]', 2) == [{"file_id": "a"}, {}]
+
+    def test_length_mismatch_raises_400(self):
+        with pytest.raises(HTTPException) as exc_info:
+            _parse_batch_metadata('[{"file_id": "a"}]', 2)
+        assert exc_info.value.status_code == 400
+
+    def test_object_raises_400(self):
+        with pytest.raises(HTTPException) as exc_info:
+            _parse_batch_metadata('{"file_id": "a"}', 1)
+        assert exc_info.value.status_code == 400
+
+
 class TestSupportedExtensions:
     """SUPPORTED_EXTENSIONS must not include legacy Office formats."""
 
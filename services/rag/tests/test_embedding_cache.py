@@ -0,0 +1,77 @@
+"""Tests for the Postgres-backed embedding cache tier."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def _async_ctx(mock_conn):
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=mock_conn)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return ctx
+
+
+def _patch_acquire(mock_conn):
+    return patch(
+        "app.services.embedding_cache.acquire_with_retry",
+        return_value=_async_ctx(mock_conn),
+    )
+
+
+class TestPostgresEmbeddingCache:
+    async def test_get_many_returns_found_rows(self):
+        from app.services.embedding_cache import PostgresEmbeddingCache
+
+        mock_conn = AsyncMock()
+        mock_conn.fetch = AsyncMock(return_value=[{"text_hash": "h1", "embedding": [0.5, 0.25]}])
+
+        with _patch_acquire(mock_conn):
+            found = await PostgresEmbeddingCache(MagicMock()).get_many("model", 2, ["h1", "h2"])
+
+        assert found == {"h1": [0.5, 0.25]}
+        args = mock_conn.fetch.call_args.args
+        assert "embedding_cache" in args[0]
+        assert args[1:] == ("model", 2, ["h1", "h2"])
+
+    async def test_get_many_empty_skips_db(self):
+        from app.services.embedding_cache import PostgresEmbeddingCache
+
+        mock_conn = AsyncMock()
+        with _patch_acquire(mock_conn):
+            assert await PostgresEmbeddingCache(MagicMock()).get_many("model", 2, []) == {}
+        mock_conn.fetch.assert_not_called()
+
+    async def test_set_many_inserts_ignoring_conflicts(self):
+        from app.services.embedding_cache import PostgresEmbeddingCache
+
+        mock_conn = AsyncMock()
+        with _patch_acquire(mock_conn):
+            await PostgresEmbeddingCache(MagicMock()).set_many("model", 2, {"h1": [0.5, 0.25]})
+
+        sql, rows = mock_conn.executemany.call_args.args
+        assert "ON CONFLICT (model, dimensions, text_hash) DO NOTHING" in sql
+        assert rows == [("model", 2, "h1", [0.5, 0.25])]
+
+
+class TestBuildEmbeddingCache:
+    def test_disabled_returns_none(self):
+        from app.services.embedding_cache import build_embedding_cache
+
+        with patch("app.services.embedding_cache.settings") as mock_settings:
+            mock_settings.embedding_cache_enabled = False
+            assert build_embedding_cache(MagicMock()) is None
+
+    def test_enabled_builds_memory_then_postgres(self):
+        from app.services.embedding_cache import build_embedding_cache
+
+        with patch("app.services.embedding_cache.settings") as mock_settings:
+            mock_settings.embedding_cache_enabled = True
+            mock_settings.embedding_cache_memory_size = 10
+            cache = build_embedding_cache(MagicMock())
+
+        assert [tier.name for tier in cache.tiers] == ["memory", "postgres"]
@@ -1,11 +1,8 @@
 """Tests for document date extraction helpers.
 
 Covers:
-- _parse_pdf_date: PDF date format parsing to datetime
-- _ensure_aware: naive/aware datetime handling
-- _extract_file_dates: dispatching by file extension
 - _ms_timestamp_to_datetime: Unix ms timestamp conversion
-- PreparedDocument date fields in index_document pipeline
+- PreparedDocument date fields from the extraction metadata
 - Clone path date override
 - Response models include date fields
 """
@@ -13,179 +10,16 @@ Covers:
 from __future__ import annotations
 
 import datetime as dt
-import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from tale_knowledge.extraction import DocumentMetadata, ExtractionResult
 
 from app.models import DocumentContentResponse, DocumentStatusInfo, SearchResult
-from app.services.indexing_service import (
-    _ensure_aware,
-    _extract_file_dates,
-    _parse_pdf_date,
-)
 
 pytestmark = pytest.mark.asyncio
 
 
-class TestParsePdfDate:
-    """PDF date format ``D:YYYYMMDDHHmmSSOHH'mm'`` parsing."""
-
-    def test_full_date_with_timezone(self):
-        result = _parse_pdf_date("D:20230615143052+02'00'")
-        assert result is not None
-        assert result.year == 2023
-        assert result.month == 6
-        assert result.day == 15
-        assert result.hour == 14
-        assert result.minute == 30
-        assert result.second == 52
-        assert result.tzinfo is not None
-
-    def test_date_without_prefix(self):
-        result = _parse_pdf_date("20230101120000Z")
-        assert result is not None
-        assert result.year == 2023
-        assert result.tzinfo == dt.UTC
-
-    def test_date_only_year(self):
-        result = _parse_pdf_date("D:2023")
-        assert result is not None
-        assert result.year == 2023
-        assert result.month == 1
-        assert result.day == 1
-
-    def test_negative_timezone(self):
-        result = _parse_pdf_date("D:20230615143052-05'00'")
-        assert result is not None
-        expected_offset = dt.timezone(dt.timedelta(hours=-5))
-        assert result.utcoffset() == expected_offset.utcoffset(None)
-
-    def test_none_input(self):
-        assert _parse_pdf_date(None) is None
-
-    def test_empty_string(self):
-        assert _parse_pdf_date("") is None
-
-    def test_non_string_input(self):
-        assert _parse_pdf_date(12345) is None  # type: ignore[arg-type]
-
-    def test_malformed_string(self):
-        assert _parse_pdf_date("not-a-date") is None
-
-    def test_year_below_min(self):
-        assert _parse_pdf_date("D:1900") is None
-
-    def test_year_above_max(self):
-        assert _parse_pdf_date("D:2200") is None
-
-    def test_whitespace_stripped(self):
-        result = _parse_pdf_date("  D:20230101  ")
-        assert result is not None
-        assert result.year == 2023
-
-
-class TestEnsureAware:
-    """Timezone-aware datetime conversion."""
-
-    def test_none_returns_none(self):
-        assert _ensure_aware(None) is None
-
-    def test_naive_gets_utc(self):
-        naive = dt.datetime(2023, 1, 1, 12, 0, 0)
-        result = _ensure_aware(naive)
-        assert result is not None
-        assert result.tzinfo == dt.UTC
-
-    def test_aware_preserved(self):
-        tz = dt.timezone(dt.timedelta(hours=5))
-        aware = dt.datetime(2023, 1, 1, 12, 0, 0, tzinfo=tz)
-        result = _ensure_aware(aware)
-        assert result is not None
-        assert result.tzinfo == tz
-
-    def test_non_datetime_returns_none(self):
-        assert _ensure_aware("not a datetime") is None  # type: ignore[arg-type]
-
-
-class TestExtractFileDates:
-    """File date extraction by extension."""
-
-    def test_unsupported_extension_returns_none_pair(self):
-        created, modified = _extract_file_dates(b"data", "file.txt")
-        assert created is None
-        assert modified is None
-
-    def test_no_extension_returns_none_pair(self):
-        created, modified = _extract_file_dates(b"data", "noext")
-        assert created is None
-        assert modified is None
-
-    def test_pdf_extraction_calls_fitz(self):
-        mock_doc = MagicMock()
-        mock_doc.metadata = {
-            "creationDate": "D:20230615143052Z",
-            "modDate": "D:20240101000000Z",
-        }
-
-        mock_fitz = MagicMock()
-        mock_fitz.open.return_value = mock_doc
-
-        with patch.dict(sys.modules, {"fitz": mock_fitz}):
-            created, modified = _extract_file_dates(b"pdf-bytes", "report.pdf")
-
-        assert created is not None
-        assert created.year == 2023
-        assert modified is not None
-        assert modified.year == 2024
-        mock_doc.close.assert_called_once()
-
-    def test_pdf_extraction_handles_exception(self):
-        mock_fitz = MagicMock()
-        mock_fitz.open.side_effect = RuntimeError("corrupt")
-
-        with patch.dict(sys.modules, {"fitz": mock_fitz}):
-            created, modified = _extract_file_dates(b"bad-pdf", "broken.pdf")
-
-        assert created is None
-        assert modified is None
-
-    def test_docx_extraction(self):
-        mock_props = MagicMock()
-        mock_props.created = dt.datetime(2023, 6, 15, 14, 30, 52)
-        mock_props.modified = dt.datetime(2024, 1, 1, 0, 0, 0, tzinfo=dt.UTC)
-
-        mock_doc_instance = MagicMock()
-        mock_doc_instance.core_properties = mock_props
-
-        mock_docx = MagicMock()
-        mock_docx.Document.return_value = mock_doc_instance
-
-        with patch.dict(sys.modules, {"docx": mock_docx}):
-            created, modified = _extract_file_dates(b"docx-bytes", "report.docx")
-
-        assert created is not None
-        assert created.tzinfo == dt.UTC
-        assert modified is not None
-
-    def test_pptx_extraction(self):
-        mock_props = MagicMock()
-        mock_props.created = dt.datetime(2023, 3, 10, 9, 0, 0)
-        mock_props.modified = None
-
-        mock_prs_instance = MagicMock()
-        mock_prs_instance.core_properties = mock_props
-
-        mock_pptx = MagicMock()
-        mock_pptx.Presentation.return_value = mock_prs_instance
-
-        with patch.dict(sys.modules, {"pptx": mock_pptx}):
-            created, modified = _extract_file_dates(b"pptx-bytes", "slides.pptx")
-
-        assert created is not None
-        assert modified is None
-
-
 class TestMsTimestampToDatetime:
     """Unix millisecond timestamp conversion in the router."""
 
@@ -236,23 +70,21 @@ class TestIndexDocumentDatesThreaded:
         from app.services.indexing_service import prepare_document
 
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
+        mock_embed.embed_texts_array = AsyncMock(return_value=[[0.1, 0.2]])
 
         created = dt.datetime(2023, 6, 15, tzinfo=dt.UTC)
         modified = dt.datetime(2024, 1, 1, tzinfo=dt.UTC)
 
         with (
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
-                return_value=("Some text", False),
+                return_value=ExtractionResult(
+                    "Some text", False, DocumentMetadata(created_at=created, modified_at=modified)
+                ),
             ),
             patch(
-                "app.services.indexing_service._extract_file_dates",
-                return_value=(created, modified),
-            ),
-            patch(
-                "app.services.indexing_service.chunk_content",
+                "app.services.indexing_service.chunk_content_async",
                 return_value=[MagicMock(content="chunk", index=0)],
             ),
         ):
@@ -270,7 +102,7 @@ class TestIndexDocumentDatesThreaded:
         from app.services.indexing_service import index_document
 
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=[[0.1, 0.2]])
+        mock_embed.embed_texts_array = AsyncMock(return_value=[[0.1, 0.2]])
 
         file_created = dt.datetime(2023, 1, 1, tzinfo=dt.UTC)
         caller_created = dt.datetime(2022, 6, 1, tzinfo=dt.UTC)
@@ -294,16 +126,12 @@ class TestIndexDocumentDatesThreaded:
             patch("app.services.indexing_service.acquire_with_retry", return_value=ctx),
             patch("app.services.indexing_service.compute_content_hash", return_value="hash123"),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
-                return_value=("Text", False),
-            ),
-            patch(
-                "app.services.indexing_service._extract_file_dates",
-                return_value=(file_created, None),
+                return_value=ExtractionResult("Text", False, DocumentMetadata(created_at=file_created)),
             ),
             patch(
-                "app.services.indexing_service.chunk_content",
+                "app.services.indexing_service.chunk_content_async",
                 return_value=[MagicMock(content="chunk", index=0)],
             ),
         ):
@@ -6,16 +6,21 @@ Covers:
 - Empty content handling (no text extracted, no chunks produced)
 - UnicodeDecodeError wrapping
 - Transaction semantics (document + chunks inserted together)
+- Multi-document indexing with shared embedding calls
 """
 
 from __future__ import annotations
 
+import datetime as dt
 from dataclasses import dataclass
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import asyncpg.exceptions
+import numpy as np
 import pytest
+from tale_knowledge.chunking.offload import OFFLOAD_THRESHOLD
+from tale_knowledge.extraction import ExtractionResult
 
 pytestmark = pytest.mark.asyncio
 
@@ -56,9 +61,10 @@ def _mock_pool(
     mock_conn.fetchrow = AsyncMock(
         side_effect=[
             None,  # early-dedup check (no existing row with same content)
-            {"id": inserted_doc_id, "is_insert": existing_row is None},
+            {"id": inserted_doc_id, "is_insert": existing_row is None, "updated_at": WRITTEN_AT},
         ]
     )
+    mock_conn.fetchval = AsyncMock(return_value=None)  # no other document shares the chunks
     mock_conn.execute = AsyncMock()
 
     mock_tx = AsyncMock()
@@ -70,6 +76,29 @@ def _mock_pool(
     return pool, mock_conn
 
 
+def _stale_rows(count: int = 3) -> list[dict[str, Any]]:
+    """Stored chunk rows whose hashes match none of the new chunks."""
+    return [{"id": 100 + i, "chunk_index": i, "content_hash": f"old-{i}"} for i in range(count)]
+
+
+def _stream_embeddings(mock_embed) -> None:
+    """Make ``embed_stream`` yield SAMPLE_EMBEDDINGS rows for whatever it is asked."""
+
+    async def embed_stream(texts):
+        yield 0, SAMPLE_EMBEDDINGS[: len(texts)]
+
+    mock_embed.embed_stream = MagicMock(side_effect=embed_stream)
+
+
+def _array_embeddings(mock_embed) -> None:
+    """Make ``embed_texts_array`` return SAMPLE_EMBEDDINGS rows for whatever it is asked."""
+    mock_embed.embed_texts_array = AsyncMock(side_effect=lambda texts: SAMPLE_EMBEDDINGS[: len(texts)])
+
+
+# Lookup of a stored document whose own chunks search serves
+SERVED_DOC = {"id": "doc-uuid", "shares_chunks": False}
+
+
 def _patch_acquire(mock_conn):
     """Return a patch for acquire_with_retry that yields mock_conn."""
     return patch(
@@ -90,16 +119,21 @@ SAMPLE_FILENAME = "test.txt"
 SAMPLE_DOC_ID = "doc-123"
 SAMPLE_HASH = "abcdef1234567890"
 DIFFERENT_HASH = "ffffffffffffffff"
+# updated_at returned by the document upsert
+WRITTEN_AT = dt.datetime(2026, 10, 17, tzinfo=dt.UTC)
 
 SAMPLE_CHUNKS = [
     ContentChunk(content="chunk zero content", index=0),
     ContentChunk(content="chunk one content", index=1),
 ]
 
-SAMPLE_EMBEDDINGS = [
-    [0.1, 0.2, 0.3],
-    [0.4, 0.5, 0.6],
-]
+SAMPLE_EMBEDDINGS = np.array(
+    [
+        [0.1, 0.2, 0.3],
+        [0.4, 0.5, 0.6],
+    ],
+    dtype=np.float32,
+)
 
 
 class TestSuccessfulIndexing:
@@ -110,17 +144,17 @@ class TestSuccessfulIndexing:
 
         pool, mock_conn = _mock_pool(existing_row=None)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
 
         with (
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
-                return_value=("Extracted document text here.", False),
+                return_value=ExtractionResult("Extracted document text here.", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             result = await index_document(
                 pool,
@@ -141,15 +175,17 @@ class TestSuccessfulIndexing:
 
         pool, mock_conn = _mock_pool(existing_row=None)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
 
         with (
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=("Some text", False)
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("Some text", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             await index_document(
                 pool,
@@ -159,22 +195,24 @@ class TestSuccessfulIndexing:
                 embedding_service=mock_embed,
             )
 
-        mock_embed.embed_texts.assert_awaited_once_with(["chunk zero content", "chunk one content"])
+        mock_embed.embed_texts_array.assert_awaited_once_with(["chunk zero content", "chunk one content"])
 
     async def test_chunk_insert_called_per_chunk(self):
         from app.services.indexing_service import index_document
 
         pool, mock_conn = _mock_pool(existing_row=None)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
 
         with (
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=("Some text", False)
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("Some text", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             await index_document(
                 pool,
@@ -188,22 +226,26 @@ class TestSuccessfulIndexing:
         mock_conn.executemany.assert_awaited_once()
         chunk_rows = mock_conn.executemany.call_args[0][1]
         assert len(chunk_rows) == 2
+        # float32 rows are sent as shortest-repr pgvector literals
+        assert chunk_rows[0][4].tolist() == pytest.approx([0.1, 0.2, 0.3])
 
     async def test_passes_vision_client_to_extract(self):
         from app.services.indexing_service import index_document
 
         pool, mock_conn = _mock_pool(existing_row=None)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
         mock_vision = MagicMock()
 
         with (
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=("vision text", True)
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("vision text", True),
             ) as mock_extract,
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             await index_document(
                 pool,
@@ -224,13 +266,17 @@ class TestSuccessfulIndexing:
 
         pool, mock_conn = _mock_pool(existing_row=None)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
 
         with (
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
-            patch("app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=("text", False)),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS) as mock_chunk,
+            patch(
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("text", False),
+            ),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS) as mock_chunk,
         ):
             await index_document(
                 pool,
@@ -242,7 +288,328 @@ class TestSuccessfulIndexing:
                 chunk_overlap=25,
             )
 
-        mock_chunk.assert_called_once_with("text", chunk_size=256, chunk_overlap=25)
+        mock_chunk.assert_called_once_with(
+            "text",
+            chunk_size=256,
+            chunk_overlap=25,
+            sizing="chars",
+            tokenizer_model=None,
+            offload_threshold=OFFLOAD_THRESHOLD,
+        )
+
+    async def test_token_sizing_uses_embedding_model_tokenizer(self):
+        from app.services.indexing_service import index_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        mock_embed = AsyncMock()
+        mock_embed.model = "text-embedding-3-small"
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+
+        with (
+            _patch_acquire(mock_conn),
+            patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
+            patch(
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("text", False),
+            ),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS) as mock_chunk,
+        ):
+            await index_document(
+                pool,
+                SAMPLE_DOC_ID,
+                SAMPLE_CONTENT,
+                SAMPLE_FILENAME,
+                embedding_service=mock_embed,
+                chunk_size=512,
+                chunk_overlap=64,
+                chunk_sizing="tokens",
+            )
+
+        mock_chunk.assert_called_once_with(
+            "text",
+            chunk_size=512,
+            chunk_overlap=64,
+            sizing="tokens",
+            tokenizer_model="text-embedding-3-small",
+            offload_threshold=OFFLOAD_THRESHOLD,
+        )
+
+
+class TestPageCheckpoints:
+    """PDF page checkpoints are handed to extraction and dropped once stored."""
+
+    async def _index_pdf(self, checkpoints):
+        from app.services.indexing_service import index_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        mock_embed = AsyncMock()
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+
+        with (
+            _patch_acquire(mock_conn),
+            patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
+            patch(
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("pdf text", False),
+            ) as mock_extract,
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
+        ):
+            result = await index_document(
+                pool,
+                SAMPLE_DOC_ID,
+                SAMPLE_CONTENT,
+                "report.pdf",
+                embedding_service=mock_embed,
+                page_checkpoints=checkpoints,
+            )
+        return result, mock_extract
+
+    async def test_checkpoints_passed_to_extraction_and_discarded(self):
+        checkpoints = AsyncMock()
+
+        result, mock_extract = await self._index_pdf(checkpoints)
+
+        assert result["chunks_created"] == 2
+        assert mock_extract.call_args.kwargs["checkpoints"] is checkpoints
+        assert mock_extract.call_args.kwargs["content_hash"] == SAMPLE_HASH
+        checkpoints.discard.assert_awaited_once_with(SAMPLE_HASH)
+
+    async def test_discard_failure_does_not_fail_ingestion(self):
+        checkpoints = AsyncMock()
+        checkpoints.discard = AsyncMock(side_effect=ConnectionError("db down"))
+
+        result, _ = await self._index_pdf(checkpoints)
+
+        assert result["success"] is True
+
+
+class TestStreamingStore:
+    """Large documents are embedded and inserted batch by batch."""
+
+    async def test_inserts_each_batch_as_it_arrives(self):
+        from app.services.indexing_service import index_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        # Early dedup, then the unlocked and locked served-chunk lookups find no document
+        mock_conn.fetchrow.side_effect = [
+            None,
+            None,
+            None,
+            {"id": "doc-uuid", "is_insert": True, "updated_at": WRITTEN_AT},
+        ]
+        mock_embed = AsyncMock()
+
+        async def embed_stream(texts):
+            # Completion order need not match input order.
+            yield 1, SAMPLE_EMBEDDINGS[1:]
+            yield 0, SAMPLE_EMBEDDINGS[:1]
+
+        mock_embed.embed_stream = MagicMock(side_effect=embed_stream)
+
+        with (
+            _patch_acquire(mock_conn),
+            patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
+            patch(
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("Some text", False),
+            ),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
+        ):
+            result = await index_document(
+                pool,
+                SAMPLE_DOC_ID,
+                SAMPLE_CONTENT,
+                SAMPLE_FILENAME,
+                embedding_service=mock_embed,
+                stream_min_chunks=2,
+            )
+
+        assert result["chunks_created"] == 2
+        mock_embed.embed_texts_array.assert_not_called()
+        mock_embed.embed_stream.assert_called_once_with(["chunk zero content", "chunk one content"])
+        batches = [c.args[1] for c in mock_conn.executemany.await_args_list]
+        assert [[row[1] for row in rows] for rows in batches] == [[1], [0]]
+        assert batches[0][0][4].tolist() == pytest.approx([0.4, 0.5, 0.6])
+
+    async def test_no_transaction_open_while_embedding(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        mock_conn.fetchrow = AsyncMock(
+            side_effect=[None, None, {"id": "doc-uuid", "is_insert": True, "updated_at": WRITTEN_AT}]
+        )
+        open_transactions = 0
+
+        async def _enter(*_args):
+            nonlocal open_transactions
+            open_transactions += 1
+
+        async def _exit(*_args):
+            nonlocal open_transactions
+            open_transactions -= 1
+            return False
+
+        mock_conn.transaction.return_value.__aenter__ = AsyncMock(side_effect=_enter)
+        mock_conn.transaction.return_value.__aexit__ = AsyncMock(side_effect=_exit)
+        mock_embed = MagicMock()
+
+        async def embed_stream(texts):
+            for offset in range(len(texts)):
+                assert open_transactions == 0
+                yield offset, SAMPLE_EMBEDDINGS[offset : offset + 1]
+
+        mock_embed.embed_stream = MagicMock(side_effect=embed_stream)
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH,
+            chunks=SAMPLE_CHUNKS,
+            embeddings=None,
+            vision_used=False,
+        )
+
+        with _patch_acquire(mock_conn):
+            result = await store_prepared_document(
+                pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed
+            )
+
+        assert result["chunks_created"] == 2
+        # Locked lookup and upsert, then one transaction per batch
+        assert mock_conn.transaction.call_count == 3
+        assert "FOR UPDATE" in mock_conn.fetchrow.await_args_list[1].args[0]
+        upsert_args = mock_conn.fetchrow.await_args.args
+        assert upsert_args[8:] == (None, "processing")
+        guards = [c.args for c in mock_conn.execute.await_args_list if "FOR SHARE" in c.args[0]]
+        assert guards == [(guards[0][0], "doc-uuid", WRITTEN_AT)] * 2
+        sql, *args = mock_conn.execute.await_args.args
+        assert "status = 'completed'" in sql
+        assert args == ["doc-uuid", WRITTEN_AT, SAMPLE_HASH, 2]
+
+    async def test_superseded_write_stops(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        mock_conn.fetchrow = AsyncMock(
+            side_effect=[None, None, {"id": "doc-uuid", "is_insert": True, "updated_at": WRITTEN_AT}]
+        )
+        mock_conn.execute = AsyncMock(return_value="SELECT 0")
+        mock_embed = MagicMock()
+        _stream_embeddings(mock_embed)
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH,
+            chunks=SAMPLE_CHUNKS,
+            embeddings=None,
+            vision_used=False,
+        )
+
+        with _patch_acquire(mock_conn), pytest.raises(RuntimeError, match="re-indexed concurrently"):
+            await store_prepared_document(pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed)
+
+        mock_conn.executemany.assert_not_called()
+
+    async def test_document_stored_concurrently_is_not_streamed(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        # Nothing stored when planned; another upload stored chunks before the lock
+        mock_conn.fetchrow = AsyncMock(
+            side_effect=[
+                None,
+                SERVED_DOC,
+                {"id": "doc-uuid", "is_insert": False, "updated_at": WRITTEN_AT},
+            ]
+        )
+        mock_conn.fetch = AsyncMock(return_value=_stale_rows())
+        mock_embed = MagicMock()
+        _stream_embeddings(mock_embed)
+        _array_embeddings(mock_embed)
+        prepared = PreparedDocument(content_hash=SAMPLE_HASH, chunks=SAMPLE_CHUNKS, embeddings=None, vision_used=False)
+
+        with _patch_acquire(mock_conn):
+            result = await store_prepared_document(
+                pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed
+            )
+
+        assert result["chunks_embedded"] == 2
+        mock_embed.embed_stream.assert_not_called()
+        assert mock_conn.fetchrow.await_args.args[8:] == (SAMPLE_HASH, "completed")
+
+    async def test_unchanged_content_skips_embedding(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        mock_conn.fetchrow = AsyncMock(return_value=None)
+        mock_embed = MagicMock()
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH,
+            chunks=SAMPLE_CHUNKS,
+            embeddings=None,
+            vision_used=False,
+        )
+
+        with _patch_acquire(mock_conn):
+            result = await store_prepared_document(
+                pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed
+            )
+
+        assert result["skip_reason"] == "content_unchanged"
+        mock_embed.embed_stream.assert_not_called()
+
+
+class TestCopyInsert:
+    """Large chunk runs are written with binary COPY instead of executemany."""
+
+    async def test_large_run_uses_copy(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        mock_conn.fetchrow = AsyncMock(return_value={"id": "doc-uuid", "is_insert": True, "updated_at": WRITTEN_AT})
+        chunks = [ContentChunk(content=f"chunk {i}", index=i) for i in range(150)]
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH,
+            chunks=chunks,
+            embeddings=np.ones((150, 3), dtype=np.float32),
+            vision_used=False,
+        )
+
+        with (
+            _patch_acquire(mock_conn),
+            patch("app.services.indexing_service.copy_insert", new_callable=AsyncMock) as mock_copy,
+        ):
+            result = await store_prepared_document(pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared)
+
+        assert result["chunks_created"] == 150
+        mock_conn.executemany.assert_not_called()
+        _conn, table, columns, records = mock_copy.await_args.args
+        assert table == "private_knowledge.chunks"
+        assert mock_copy.await_args.kwargs == {}
+        rows = list(records)
+        assert len(rows) == 150
+        embedding = rows[0][columns.index("embedding")]
+        assert embedding.dtype == np.float32
+        assert embedding.tolist() == [1.0, 1.0, 1.0]
+
+    async def test_small_run_uses_executemany(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row=None)
+        mock_conn.fetchrow = AsyncMock(return_value={"id": "doc-uuid", "is_insert": True, "updated_at": WRITTEN_AT})
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH,
+            chunks=SAMPLE_CHUNKS,
+            embeddings=SAMPLE_EMBEDDINGS,
+            vision_used=False,
+        )
+
+        with (
+            _patch_acquire(mock_conn),
+            patch("app.services.indexing_service.copy_insert", new_callable=AsyncMock) as mock_copy,
+        ):
+            await store_prepared_document(pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared)
+
+        mock_copy.assert_not_awaited()
+        mock_conn.executemany.assert_awaited_once()
 
 
 class TestContentHashDedup:
@@ -257,7 +624,7 @@ class TestContentHashDedup:
             return_value={"content_hash": SAMPLE_HASH, "chunk_count": 5},
         )
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
 
         with (
             _patch_acquire(mock_conn),
@@ -281,15 +648,18 @@ class TestContentHashDedup:
         existing = {"id": "existing-uuid", "content_hash": DIFFERENT_HASH}
         pool, mock_conn = _mock_pool(existing_row=existing)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        _array_embeddings(mock_embed)
+        mock_conn.fetch = AsyncMock(return_value=_stale_rows())
 
         # The connection is used multiple times:
         # 1. fetchrow for early-dedup check -> returns row with different hash
-        # 2. fetchrow for UPSERT RETURNING id, is_insert
+        # 2. fetchrow for the stored document whose chunks are diffed
+        # 3. fetchrow for UPSERT RETURNING id, is_insert
         mock_conn.fetchrow = AsyncMock(
             side_effect=[
                 {"content_hash": DIFFERENT_HASH, "chunk_count": 3},
-                {"id": "new-uuid", "is_insert": False},
+                SERVED_DOC,
+                {"id": "new-uuid", "is_insert": False, "updated_at": WRITTEN_AT},
             ]
         )
 
@@ -297,11 +667,11 @@ class TestContentHashDedup:
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
-                return_value=("Updated text", False),
+                return_value=ExtractionResult("Updated text", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             result = await index_document(
                 pool,
@@ -328,12 +698,14 @@ class TestExplicitChunkDeletion:
         existing = {"id": "existing-uuid", "content_hash": DIFFERENT_HASH}
         pool, mock_conn = _mock_pool(existing_row=existing)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        _array_embeddings(mock_embed)
+        mock_conn.fetch = AsyncMock(return_value=_stale_rows())
 
         mock_conn.fetchrow = AsyncMock(
             side_effect=[
                 {"content_hash": DIFFERENT_HASH, "chunk_count": 3},
-                {"id": "new-uuid", "is_insert": False},
+                SERVED_DOC,
+                {"id": "new-uuid", "is_insert": False, "updated_at": WRITTEN_AT},
             ]
         )
 
@@ -351,11 +723,11 @@ class TestExplicitChunkDeletion:
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
-                return_value=("Updated text", False),
+                return_value=ExtractionResult("Updated text", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             await index_document(
                 pool,
@@ -374,12 +746,14 @@ class TestExplicitChunkDeletion:
         existing = {"id": "existing-uuid", "content_hash": DIFFERENT_HASH}
         pool, mock_conn = _mock_pool(existing_row=existing)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        _array_embeddings(mock_embed)
+        mock_conn.fetch = AsyncMock(return_value=_stale_rows())
 
         mock_conn.fetchrow = AsyncMock(
             side_effect=[
                 {"content_hash": DIFFERENT_HASH, "chunk_count": 3},
-                {"id": "new-uuid", "is_insert": False},
+                SERVED_DOC,
+                {"id": "new-uuid", "is_insert": False, "updated_at": WRITTEN_AT},
             ]
         )
 
@@ -387,11 +761,11 @@ class TestExplicitChunkDeletion:
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
-                return_value=("Updated text", False),
+                return_value=ExtractionResult("Updated text", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             await index_document(
                 pool,
@@ -417,7 +791,11 @@ class TestEmptyContentHandling:
         with (
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
-            patch("app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=("", False)),
+            patch(
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("", False),
+            ),
         ):
             result = await index_document(
                 pool,
@@ -441,7 +819,9 @@ class TestEmptyContentHandling:
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=("   \n\t  ", False)
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("   \n\t  ", False),
             ),
         ):
             result = await index_document(
@@ -465,9 +845,11 @@ class TestEmptyContentHandling:
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=("Some text", False)
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult("Some text", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=[]),
+            patch("app.services.indexing_service.chunk_content_async", return_value=[]),
         ):
             result = await index_document(
                 pool,
@@ -489,7 +871,11 @@ class TestEmptyContentHandling:
         with (
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
-            patch("app.services.indexing_service.extract_text", new_callable=AsyncMock, return_value=(None, False)),
+            patch(
+                "app.services.indexing_service.extract_document",
+                new_callable=AsyncMock,
+                return_value=ExtractionResult(None, False),
+            ),
         ):
             result = await index_document(
                 pool,
@@ -516,7 +902,7 @@ class TestExtractionErrors:
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
                 side_effect=UnicodeDecodeError("utf-8", b"", 0, 1, "bad"),
             ),
@@ -540,7 +926,7 @@ class TestExtractionErrors:
             _patch_acquire(mock_conn),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
                 side_effect=UnicodeDecodeError("utf-8", b"", 0, 1, "bad"),
             ),
@@ -565,8 +951,8 @@ class TestHnswIndexSelfHealing:
         # fetchrow: UPSERT (attempt 1) → id, UPSERT (attempt 2) → id
         mock_conn.fetchrow = AsyncMock(
             side_effect=[
-                {"id": "uuid-1", "is_insert": True},
-                {"id": "uuid-2", "is_insert": True},
+                {"id": "uuid-1", "is_insert": True, "updated_at": WRITTEN_AT},
+                {"id": "uuid-2", "is_insert": True, "updated_at": WRITTEN_AT},
             ]
         )
 
@@ -617,8 +1003,8 @@ class TestHnswIndexSelfHealing:
         # fetchrow: UPSERT (attempt 1) → id, UPSERT (attempt 2) → id
         mock_conn.fetchrow = AsyncMock(
             side_effect=[
-                {"id": "uuid-1", "is_insert": True},
-                {"id": "uuid-2", "is_insert": True},
+                {"id": "uuid-1", "is_insert": True, "updated_at": WRITTEN_AT},
+                {"id": "uuid-2", "is_insert": True, "updated_at": WRITTEN_AT},
             ]
         )
 
@@ -651,7 +1037,9 @@ class TestHnswIndexSelfHealing:
 
         pool, mock_conn = _mock_pool(existing_row=None)
         # store_prepared_document calls _do_store directly (UPSERT)
-        mock_conn.fetchrow = AsyncMock(return_value={"id": "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee", "is_insert": True})
+        mock_conn.fetchrow = AsyncMock(
+            return_value={"id": "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee", "is_insert": True, "updated_at": WRITTEN_AT}
+        )
 
         prepared = PreparedDocument(
             content_hash=SAMPLE_HASH,
@@ -727,7 +1115,7 @@ class TestCrossHashClone:
         assert result["skipped"] is True
         assert result["skip_reason"] == "content_unchanged"
 
-    async def test_clone_copies_chunks_from_source(self):
+    async def test_clone_shares_chunks_of_source(self):
         from app.services.indexing_service import clone_from_existing
 
         pool, mock_conn = _mock_pool()
@@ -753,6 +1141,32 @@ class TestCrossHashClone:
         assert result["success"] is True
         assert result["chunks_created"] == 5
         assert result["skipped"] is False
+        # The new document references the source's chunks instead of copying them
+        assert mock_conn.fetchrow.call_args_list[2].args[7] == 42
+        assert not any("INSERT INTO" in str(c) and "chunks" in str(c) for c in mock_conn.execute.call_args_list)
+
+    async def test_clone_over_other_content_hands_over_old_chunks(self):
+        from app.services.indexing_service import clone_from_existing
+
+        pool, mock_conn = _mock_pool()
+        mock_conn.fetchrow = AsyncMock(
+            side_effect=[
+                {"id": "target-uuid", "content_hash": "old-hash"},
+                {"chunks_count": 5, "source_created_at": None, "source_modified_at": None},
+                {"id": "target-uuid", "is_insert": False},
+            ]
+        )
+
+        with (
+            _patch_acquire(mock_conn),
+            patch("app.services.indexing_service.hand_over_chunks", new_callable=AsyncMock) as mock_hand_over,
+        ):
+            result = await clone_from_existing(pool, 42, SAMPLE_DOC_ID, SAMPLE_FILENAME, SAMPLE_HASH)
+
+        assert result["skipped"] is False
+        mock_hand_over.assert_awaited_once_with(mock_conn, "target-uuid")
+        delete_calls = [c for c in mock_conn.execute.call_args_list if "DELETE FROM" in c.args[0]]
+        assert delete_calls[0].args[1] == "target-uuid"
 
     async def test_clone_returns_none_when_source_vanished(self):
         from app.services.indexing_service import clone_from_existing
@@ -798,7 +1212,7 @@ class TestCrossHashClone:
                 },
             ) as mock_clone,
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
-            patch("app.services.indexing_service.extract_text", new_callable=AsyncMock) as mock_extract,
+            patch("app.services.indexing_service.extract_document", new_callable=AsyncMock) as mock_extract,
         ):
             result = await index_document(
                 pool,
@@ -818,7 +1232,7 @@ class TestCrossHashClone:
 
         pool, mock_conn = _mock_pool(existing_row=None)
         mock_embed = AsyncMock()
-        mock_embed.embed_texts = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
+        mock_embed.embed_texts_array = AsyncMock(return_value=SAMPLE_EMBEDDINGS)
 
         with (
             _patch_acquire(mock_conn),
@@ -834,11 +1248,11 @@ class TestCrossHashClone:
             ),
             patch("app.services.indexing_service.compute_content_hash", return_value=SAMPLE_HASH),
             patch(
-                "app.services.indexing_service.extract_text",
+                "app.services.indexing_service.extract_document",
                 new_callable=AsyncMock,
-                return_value=("Extracted text", False),
+                return_value=ExtractionResult("Extracted text", False),
             ),
-            patch("app.services.indexing_service.chunk_content", return_value=SAMPLE_CHUNKS),
+            patch("app.services.indexing_service.chunk_content_async", return_value=SAMPLE_CHUNKS),
         ):
             result = await index_document(
                 pool,
@@ -851,3 +1265,290 @@ class TestCrossHashClone:
         assert result["success"] is True
         assert result["chunks_created"] == 2
         assert result["skipped"] is False
+
+
+class TestHandOverChunks:
+    """Shared chunks move to a sharing document before their owner changes."""
+
+    async def test_no_sharers_leaves_chunks(self):
+        from app.services.indexing_service import hand_over_chunks
+
+        _, mock_conn = _mock_pool()
+
+        assert await hand_over_chunks(mock_conn, "owner-uuid") is False
+        mock_conn.execute.assert_not_awaited()
+
+    async def test_oldest_sharer_becomes_owner(self):
+        from app.services.indexing_service import hand_over_chunks
+
+        _, mock_conn = _mock_pool()
+        mock_conn.fetchval = AsyncMock(return_value="heir-uuid")
+
+        assert await hand_over_chunks(mock_conn, "owner-uuid", exclude=["owner-uuid"]) is True
+
+        assert mock_conn.fetchval.await_args.args[1:] == ("owner-uuid", ["owner-uuid"])
+        repoint, move = mock_conn.execute.await_args_list
+        assert "chunk_owner_id" in repoint.args[0]
+        assert repoint.args[1:] == ("owner-uuid", "heir-uuid")
+        assert "UPDATE private_knowledge.chunks" in move.args[0]
+        assert move.args[1:] == ("owner-uuid", "heir-uuid")
+
+    async def test_store_inserts_all_chunks_after_hand_over(self):
+        from app.services.indexing_service import PreparedDocument, _do_store
+
+        _, mock_conn = _mock_pool(existing_row={"content_hash": "old"})
+        mock_conn.fetchrow = AsyncMock(return_value={"id": "owner-uuid", "is_insert": False, "updated_at": WRITTEN_AT})
+        mock_conn.fetchval = AsyncMock(return_value="heir-uuid")
+        mock_conn.fetch = AsyncMock(return_value=_stale_rows())
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH, chunks=SAMPLE_CHUNKS, embeddings=SAMPLE_EMBEDDINGS, vision_used=False
+        )
+
+        with _patch_acquire(mock_conn):
+            result = await _do_store(MagicMock(), SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared)
+
+        assert result["chunks_embedded"] == len(SAMPLE_CHUNKS)
+        assert result["chunks_reused"] == 0
+        # The handed-over rows belong to the heir now: nothing to diff against
+        mock_conn.fetch.assert_not_awaited()
+
+
+def _row(row_id: int, index: int, content: str) -> dict[str, Any]:
+    from app.services.indexing_service import _chunk_hash
+
+    return {
+        "id": row_id,
+        "chunk_index": index,
+        "content_hash": _chunk_hash(ContentChunk(content=content, index=index)),
+    }
+
+
+class TestIncrementalStore:
+    """Re-uploads embed and insert only new or changed chunks."""
+
+    async def test_only_changed_chunk_embedded(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row={"id": "existing"})
+        mock_conn.fetchrow = AsyncMock(
+            side_effect=[SERVED_DOC, {"id": "doc-uuid", "is_insert": False, "updated_at": WRITTEN_AT}]
+        )
+        mock_conn.fetch = AsyncMock(return_value=[_row(7, 0, "chunk zero content"), _row(8, 1, "old text")])
+        mock_embed = MagicMock()
+        _array_embeddings(mock_embed)
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH,
+            chunks=SAMPLE_CHUNKS,
+            embeddings=None,
+            vision_used=False,
+        )
+
+        with _patch_acquire(mock_conn):
+            result = await store_prepared_document(
+                pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed
+            )
+
+        assert result["chunks_created"] == 2
+        assert result["chunks_embedded"] == 1
+        assert result["chunks_reused"] == 1
+        mock_embed.embed_texts_array.assert_awaited_once_with(["chunk one content"])
+        inserted = mock_conn.executemany.await_args.args[1]
+        assert [row[1] for row in inserted] == [1]
+        delete_call = next(c for c in mock_conn.execute.await_args_list if "DELETE" in c.args[0])
+        assert delete_call.args[1] == [8]
+
+    async def test_reused_rows_renumbered_via_negative_positions(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row={"id": "existing"})
+        mock_conn.fetchrow = AsyncMock(
+            side_effect=[SERVED_DOC, {"id": "doc-uuid", "is_insert": False, "updated_at": WRITTEN_AT}]
+        )
+        mock_conn.fetch = AsyncMock(return_value=[_row(7, 0, "chunk one content"), _row(8, 1, "chunk zero content")])
+        mock_embed = MagicMock()
+        _array_embeddings(mock_embed)
+        prepared = PreparedDocument(
+            content_hash=SAMPLE_HASH,
+            chunks=SAMPLE_CHUNKS,
+            embeddings=None,
+            vision_used=False,
+        )
+
+        with _patch_acquire(mock_conn):
+            result = await store_prepared_document(
+                pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed
+            )
+
+        assert result["chunks_embedded"] == 0
+        mock_embed.embed_texts_array.assert_not_called()
+        mock_conn.executemany.assert_not_called()
+        park, flip = [
+            c.args for c in mock_conn.execute.await_args_list if "UPDATE private_knowledge.chunks" in c.args[0]
+        ]
+        assert "-1 - v.chunk_index" in park[0]
+        assert park[1:3] == ([8, 7], [0, 1])
+        assert "chunk_index < 0" in flip[0]
+
+    async def test_reupload_swaps_chunks_in_one_transaction(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row={"id": "existing"})
+        mock_conn.fetchrow = AsyncMock(
+            side_effect=[SERVED_DOC, {"id": "doc-uuid", "is_insert": False, "updated_at": WRITTEN_AT}]
+        )
+        mock_conn.fetch = AsyncMock(return_value=[_row(7, 0, "chunk zero content"), _row(8, 1, "old text")])
+        open_transactions = 0
+
+        async def _enter(*_args):
+            nonlocal open_transactions
+            open_transactions += 1
+
+        async def _exit(*_args):
+            nonlocal open_transactions
+            open_transactions -= 1
+            return False
+
+        mock_conn.transaction.return_value.__aenter__ = AsyncMock(side_effect=_enter)
+        mock_conn.transaction.return_value.__aexit__ = AsyncMock(side_effect=_exit)
+        mock_embed = MagicMock()
+
+        async def embed_texts_array(texts):
+            assert open_transactions == 0
+            return SAMPLE_EMBEDDINGS[: len(texts)]
+
+        mock_embed.embed_texts_array = AsyncMock(side_effect=embed_texts_array)
+        prepared = PreparedDocument(content_hash=SAMPLE_HASH, chunks=SAMPLE_CHUNKS, embeddings=None, vision_used=False)
+
+        with _patch_acquire(mock_conn):
+            await store_prepared_document(pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed)
+
+        # Search keeps the previous chunk set until the new one commits with the document
+        mock_conn.transaction.assert_called_once()
+        mock_embed.embed_stream.assert_not_called()
+        assert mock_conn.fetchrow.await_args.args[8:] == (SAMPLE_HASH, "completed")
+
+    async def test_chunks_changed_before_lock_embeds_missing_positions(self):
+        from app.services.indexing_service import PreparedDocument, store_prepared_document
+
+        pool, mock_conn = _mock_pool(existing_row={"id": "existing"})
+        upserted = {"id": "doc-uuid", "is_insert": False, "updated_at": WRITTEN_AT}
+        mock_conn.fetchrow = AsyncMock(side_effect=[SERVED_DOC, upserted, upserted])
+        # Planned against rows reusing chunk 0; by the time the write locks, they are gone
+        planned = [_row(7, 0, "chunk zero content"), _row(8, 1, "old text")]
+        mock_conn.fetch = AsyncMock(side_effect=[planned, _stale_rows(), _stale_rows()])
+        mock_embed = MagicMock()
+        _array_embeddings(mock_embed)
+        prepared = PreparedDocument(content_hash=SAMPLE_HASH, chunks=SAMPLE_CHUNKS, embeddings=None, vision_used=False)
+
+        with _patch_acquire(mock_conn):
+            result = await store_prepared_document(
+                pool, SAMPLE_DOC_ID, SAMPLE_FILENAME, prepared, embedding_service=mock_embed
+            )
+
+        assert result["chunks_embedded"] == 2
+        assert [c.args[0] for c in mock_embed.embed_texts_array.await_args_list] == [
+            ["chunk one content"],
+            ["chunk zero content"],
+        ]
+        inserted = mock_conn.executemany.await_args.args[1]
+        assert [row[1] for row in inserted] == [0, 1]
+
+
+class TestIndexDocuments:
+    """Several documents indexed together share one embedding call."""
+
+    @staticmethod
+    def _staged(file_id: str, chunks: list[ContentChunk], *, embed_in_store: bool = False):
+        from app.services.indexing_service import PreparedDocument, _StagedDocument
+
+        prepared = PreparedDocument(content_hash=file_id, chunks=chunks, embeddings=None, vision_used=False)
+        return _StagedDocument(file_id, f"{file_id}.txt", prepared, embed_in_store=embed_in_store)
+
+    async def test_small_documents_embedded_in_one_call(self):
+        from app.services.indexing_service import DocumentInput, index_documents
+
+        chunks_a = [ContentChunk(content="a0", index=0)]
+        chunks_b = [ContentChunk(content="b0", index=0), ContentChunk(content="b1", index=1)]
+        staged = {
+            "a": self._staged("a", chunks_a),
+            "b": self._staged("b", chunks_b),
+            "big": self._staged("big", chunks_b, embed_in_store=True),
+        }
+        skipped = {"success": True, "file_id": "same", "chunks_created": 0, "skipped": True}
+        stored: dict[str, Any] = {}
+
+        async def _stage(_pool, document, **_kw):
+            return staged.get(document.file_id, skipped)
+
+        async def _store(_pool, staged_doc, _embedding_service, _page_checkpoints=None):
+            stored[staged_doc.file_id] = staged_doc.prepared.embeddings
+            return {"file_id": staged_doc.file_id, "skipped": False}
+
+        mock_embed = AsyncMock()
+        mock_embed.embed_texts_array = AsyncMock(return_value=np.arange(9, dtype=np.float32).reshape(3, 3))
+
+        with (
+            patch("app.services.indexing_service._stage_document", side_effect=_stage),
+            patch("app.services.indexing_service._store_staged", side_effect=_store),
+        ):
+            results = await index_documents(
+                MagicMock(),
+                [DocumentInput(file_id, b"x", f"{file_id}.txt") for file_id in ("a", "same", "b", "big")],
+                embedding_service=mock_embed,
+            )
+
+        mock_embed.embed_texts_array.assert_awaited_once_with(["a0", "b0", "b1"])
+        assert [r["file_id"] for r in results] == ["a", "same", "b", "big"]
+        assert stored["a"].tolist() == [[0, 1, 2]]
+        assert stored["b"].tolist() == [[3, 4, 5], [6, 7, 8]]
+        assert stored["big"] is None
+
+    async def test_failures_are_isolated_per_document(self):
+        from app.services.indexing_service import DocumentInput, index_documents
+
+        async def _stage(_pool, document, **_kw):
+            if document.file_id == "bad":
+                raise ValueError("Could not decode file 'bad.bin'")
+            return self._staged(document.file_id, [ContentChunk(content="ok", index=0)])
+
+        mock_embed = AsyncMock()
+        mock_embed.embed_texts_array = AsyncMock(return_value=np.zeros((1, 3), dtype=np.float32))
+
+        with (
+            patch("app.services.indexing_service._stage_document", side_effect=_stage),
+            patch(
+                "app.services.indexing_service._store_staged",
+                new_callable=AsyncMock,
+                return_value={"file_id": "good", "skipped": False},
+            ),
+        ):
+            results = await index_documents(
+                MagicMock(),
+                [DocumentInput("bad", b"x", "bad.bin"), DocumentInput("good", b"x", "good.txt")],
+                embedding_service=mock_embed,
+            )
+
+        assert isinstance(results[0], ValueError)
+        assert results[1] == {"file_id": "good", "skipped": False}
+
+    async def test_embedding_failure_fails_every_shared_document(self):
+        from app.services.indexing_service import DocumentInput, index_documents
+
+        async def _stage(_pool, document, **_kw):
+            return self._staged(document.file_id, [ContentChunk(content=document.file_id, index=0)])
+
+        mock_embed = AsyncMock()
+        mock_embed.embed_texts_array = AsyncMock(side_effect=RuntimeError("provider down"))
+
+        with (
+            patch("app.services.indexing_service._stage_document", side_effect=_stage),
+            patch("app.services.indexing_service._store_staged", new_callable=AsyncMock) as store,
+        ):
+            results = await index_documents(
+                MagicMock(),
+                [DocumentInput("a", b"x", "a.txt"), DocumentInput("b", b"x", "b.txt")],
+                embedding_service=mock_embed,
+            )
+
+        assert [str(r) for r in results] == ["provider down", "provider down"]
+        store.assert_not_awaited()
@@ -0,0 +1,420 @@
+"""Tests for the durable ingestion queue (claiming, retries, lanes, release)."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.indexing_service import DocumentInput
+from app.services.ingestion_queue import (
+    ALL_LANES,
+    INTERACTIVE_LANES,
+    IngestionJob,
+    IngestionQueue,
+    claim_job,
+    claim_jobs,
+    enqueue_job,
+    enqueue_jobs,
+    retry_delay,
+    spooled_job_content,
+)
+
+
+def _job(**overrides: Any) -> IngestionJob:
+    fields: dict[str, Any] = {
+        "id": 7,
+        "file_id": "doc-1",
+        "filename": "test.txt",
+        "lane": "interactive",
+        "content_size": 7,
+        "source_created_at": None,
+        "source_modified_at": None,
+        "attempts": 1,
+        "max_attempts": 3,
+    }
+    fields.update(overrides)
+    return IngestionJob(**fields)
+
+
+def _patch_acquire(conn):
+    @asynccontextmanager
+    async def _acq(_pool, **_kw):
+        yield conn
+
+    return patch("app.services.ingestion_queue.acquire_with_retry", _acq)
+
+
+@pytest.fixture
+def _no_spooling():
+    """Run handlers on the claimed job as-is instead of streaming its content."""
+
+    @asynccontextmanager
+    async def _spool(_pool, job):
+        yield job.content
+
+    with patch("app.services.ingestion_queue.spooled_job_content", _spool):
+        yield
+
+
+def _queue(handler=None, on_failure=None, batch_handler=None) -> IngestionQueue:
+    queue = IngestionQueue()
+    queue._pool = MagicMock()
+    queue._handler = handler or AsyncMock()
+    queue._on_failure = on_failure or AsyncMock()
+    queue._batch_handler = batch_handler
+    return queue
+
+
+class TestRetryDelay:
+    def test_exponential_and_capped(self):
+        assert retry_delay(1, 30) == 30
+        assert retry_delay(3, 30) == 120
+        assert retry_delay(20, 30) == 3600
+
+
+@pytest.mark.asyncio
+class TestQueueSql:
+    async def test_enqueue_supersedes_pending_jobs(self):
+        conn = AsyncMock()
+        conn.fetchval = AsyncMock(return_value=11)
+        conn.transaction = MagicMock(return_value=AsyncMock())
+
+        with _patch_acquire(conn):
+            job_id = await enqueue_job(MagicMock(), file_id="doc-1", filename="a.pdf", content=b"x", lane="bulk")
+
+        assert job_id == 11
+        delete_sql = conn.execute.await_args.args[0]
+        assert "DELETE" in delete_sql and "locked_by IS NULL" in delete_sql
+        assert conn.fetchval.await_args.args[3] == "bulk"
+
+    async def test_claim_skips_locked_and_prefers_interactive(self):
+        conn = AsyncMock()
+        conn.fetchrow = AsyncMock(return_value=None)
+
+        with _patch_acquire(conn):
+            job = await claim_job(MagicMock(), INTERACTIVE_LANES, "w:0", 300)
+
+        assert job is None
+        sql, lanes, worker_id, timeout = conn.fetchrow.await_args.args
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "ORDER BY j.lane = 'bulk', j.id" in sql
+        assert "older.id < j.id" in sql
+        assert (lanes, worker_id, timeout) == (["interactive"], "w:0", 300.0)
+
+    async def test_enqueue_many_in_one_statement(self):
+        conn = AsyncMock()
+        conn.fetch = AsyncMock(return_value=[{"id": 5}, {"id": 4}])
+        conn.transaction = MagicMock(return_value=AsyncMock())
+        documents = [
+            DocumentInput("doc-1", b"a", "a.txt", content_hash="hash-a"),
+            DocumentInput("doc-2", b"b", "b.txt"),
+        ]
+
+        with _patch_acquire(conn):
+            job_ids = await enqueue_jobs(MagicMock(), documents)
+
+        assert job_ids == [4, 5]
+        assert conn.execute.await_args.args[1] == ["doc-1", "doc-2"]
+        sql, file_ids, filenames, lane, contents, *_ = conn.fetch.await_args.args
+        assert "unnest" in sql
+        assert (file_ids, filenames, lane, contents) == (["doc-1", "doc-2"], ["a.txt", "b.txt"], "bulk", [b"a", b"b"])
+        assert conn.fetch.await_args.args[-1] == ["hash-a", None]
+
+    async def test_enqueue_spooled_file_streams_through_copy(self, tmp_path):
+        spooled = tmp_path / "upload"
+        spooled.write_bytes(b"spooled content")
+        copied: list[bytes] = []
+
+        async def copy_to_table(table, *, source, columns, format):
+            assert (columns, format) == (["n", "content"], "binary")
+            copied.extend([piece async for piece in source])
+
+        conn = AsyncMock()
+        conn.copy_to_table = copy_to_table
+        conn.fetch = AsyncMock(return_value=[{"id": 9}])
+        conn.transaction = MagicMock(return_value=AsyncMock())
+
+        with _patch_acquire(conn):
+            job_id = await enqueue_job(
+                MagicMock(), file_id="doc-1", filename="a.pdf", content=spooled, content_hash="spool-hash"
+            )
+
+        assert job_id == 9
+        stream = b"".join(copied)
+        assert stream.startswith(b"PGCOPY\n\xff\r\n\x00") and stream.endswith(b"\xff\xff")
+        assert b"spooled content" in stream
+        sql, *_, contents, _created, _modified, _attempts, hashes = conn.fetch.await_args.args
+        assert "COALESCE(u.content, s.content)" in sql
+        assert contents == [None]
+        assert hashes == ["spool-hash"]
+
+    async def test_claim_jobs_limits_count_and_size(self):
+        conn = AsyncMock()
+        conn.fetch = AsyncMock(return_value=[])
+
+        with _patch_acquire(conn):
+            jobs = await claim_jobs(MagicMock(), ("bulk",), "w:0", 300, limit=15, max_bytes=1024)
+
+        assert jobs == []
+        sql, *args = conn.fetch.await_args.args
+        assert "octet_length(j.content) <= $5" in sql and "LIMIT $4" in sql
+        assert args == [["bulk"], "w:0", 300.0, 15, 1024]
+
+    async def test_claim_returns_job(self):
+        row = {
+            "id": 3,
+            "file_id": "doc-1",
+            "filename": "a.pdf",
+            "lane": "bulk",
+            "content_size": 3,
+            "source_created_at": None,
+            "source_modified_at": None,
+            "attempts": 1,
+            "max_attempts": 3,
+            "content_hash": "abc",
+        }
+        conn = AsyncMock()
+        conn.fetchrow = AsyncMock(return_value=row)
+
+        with _patch_acquire(conn):
+            job = await claim_job(MagicMock(), ALL_LANES, "w:0", 300)
+
+        assert job == _job(id=3, filename="a.pdf", lane="bulk", content_size=3, content_hash="abc")
+        assert "j.content," not in conn.fetchrow.await_args.args[0]
+
+
+@pytest.mark.asyncio
+class TestSpooledJobContent:
+    async def test_content_streamed_to_temp_file_in_slices(self, tmp_path):
+        conn = AsyncMock()
+        conn.fetchval = AsyncMock(side_effect=[b"abcd", b"efgh", b"ij"])
+
+        with (
+            _patch_acquire(conn),
+            patch("app.services.ingestion_queue._CONTENT_PIECE", 4),
+            patch("app.services.ingestion_queue.settings") as mock_settings,
+        ):
+            mock_settings.upload_spool_dir = str(tmp_path)
+            async with spooled_job_content(MagicMock(), _job(content_size=10)) as path:
+                assert isinstance(path, Path) and path.parent == tmp_path
+                assert path.read_bytes() == b"abcdefghij"
+
+        assert [c.args[1:] for c in conn.fetchval.await_args_list] == [(7, 1, 4), (7, 5, 4), (7, 9, 4)]
+        assert "substring(content from $2 for $3)" in conn.fetchval.await_args.args[0]
+        assert not path.exists()
+
+    async def test_missing_job_raises(self, tmp_path):
+        conn = AsyncMock()
+        conn.fetchval = AsyncMock(return_value=None)
+
+        with _patch_acquire(conn), patch("app.services.ingestion_queue.settings") as mock_settings:
+            mock_settings.upload_spool_dir = str(tmp_path)
+            with pytest.raises(RuntimeError, match="disappeared"):
+                async with spooled_job_content(MagicMock(), _job()):
+                    pass
+
+        assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_no_spooling")
+class TestProcess:
+    async def test_success_completes_job(self):
+        queue = _queue()
+
+        with patch("app.services.ingestion_queue.complete_job", new_callable=AsyncMock) as complete:
+            await queue._process_batch("w:0", [_job()])
+
+        complete.assert_awaited_once_with(queue._pool, 7, "w:0")
+        assert queue.get_stats()["completed"] == 1
+        assert queue.get_stats()["in_flight"] == 0
+
+    async def test_transient_failure_retried_with_backoff(self):
+        queue = _queue(handler=AsyncMock(side_effect=RuntimeError("provider down")))
+
+        with (
+            patch("app.services.ingestion_queue.retry_job", new_callable=AsyncMock) as retry,
+            patch("app.services.ingestion_queue.settings") as mock_settings,
+        ):
+            mock_settings.ingestion_timeout_seconds = 60
+            mock_settings.ingestion_visibility_timeout_seconds = 300
+            mock_settings.ingestion_retry_backoff_seconds = 10
+            await queue._process_batch("w:0", [_job(attempts=2)])
+
+        retry.assert_awaited_once_with(queue._pool, 7, "w:0", "provider down", 20)
+        queue._on_failure.assert_not_awaited()
+
+    async def test_value_error_fails_without_retry(self):
+        queue = _queue(handler=AsyncMock(side_effect=ValueError("undecodable")))
+
+        with (
+            patch("app.services.ingestion_queue.retry_job", new_callable=AsyncMock) as retry,
+            patch("app.services.ingestion_queue.complete_job", new_callable=AsyncMock) as complete,
+        ):
+            await queue._process_batch("w:0", [_job()])
+
+        retry.assert_not_awaited()
+        queue._on_failure.assert_awaited_once()
+        complete.assert_awaited_once()
+
+    async def test_last_attempt_fails(self):
+        queue = _queue(handler=AsyncMock(side_effect=RuntimeError("boom")))
+
+        with (
+            patch("app.services.ingestion_queue.retry_job", new_callable=AsyncMock) as retry,
+            patch("app.services.ingestion_queue.complete_job", new_callable=AsyncMock),
+        ):
+            await queue._process_batch("w:0", [_job(attempts=3)])
+
+        retry.assert_not_awaited()
+        _, exc = queue._on_failure.await_args.args
+        assert str(exc) == "boom"
+        assert queue.get_stats()["failed"] == 1
+
+    async def test_abandoned_job_fails_without_running(self):
+        queue = _queue()
+
+        with patch("app.services.ingestion_queue.complete_job", new_callable=AsyncMock) as complete:
+            await queue._process_batch("w:0", [_job(attempts=4)])
+
+        queue._handler.assert_not_awaited()
+        assert "abandoned" in str(queue._on_failure.await_args.args[1])
+        complete.assert_awaited_once()
+
+    async def test_failure_recording_error_does_not_propagate(self):
+        queue = _queue(
+            handler=AsyncMock(side_effect=ValueError("bad file")),
+            on_failure=AsyncMock(side_effect=RuntimeError("db down")),
+        )
+
+        with patch("app.services.ingestion_queue.complete_job", new_callable=AsyncMock) as complete:
+            await queue._process_batch("w:0", [_job()])
+
+        complete.assert_awaited_once()
+
+    async def test_cancelled_job_released(self):
+        started = asyncio.Event()
+
+        async def _slow(_job):
+            started.set()
+            await asyncio.sleep(60)
+
+        queue = _queue(handler=_slow)
+
+        with patch("app.services.ingestion_queue.release_job", new_callable=AsyncMock) as release:
+            task = asyncio.create_task(queue._process_batch("w:0", [_job()]))
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        release.assert_awaited_once_with(queue._pool, 7, "w:0")
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_no_spooling")
+class TestBatches:
+    async def test_batch_outcomes_settled_per_job(self):
+        batch_handler = AsyncMock(return_value=[None, RuntimeError("provider down"), ValueError("bad file")])
+        queue = _queue(batch_handler=batch_handler)
+        jobs = [_job(id=1, lane="bulk"), _job(id=2, file_id="doc-2", lane="bulk"), _job(id=3, file_id="doc-3")]
+
+        with (
+            patch("app.services.ingestion_queue.complete_job", new_callable=AsyncMock) as complete,
+            patch("app.services.ingestion_queue.retry_job", new_callable=AsyncMock) as retry,
+        ):
+            await queue._process_batch("w:0", jobs)
+
+        batch_handler.assert_awaited_once_with(jobs)
+        queue._handler.assert_not_awaited()
+        assert [c.args[1] for c in complete.await_args_list] == [1, 3]
+        assert retry.await_args.args[1] == 2
+        assert queue._on_failure.await_args.args[0].id == 3
+        assert queue.get_stats()["in_flight"] == 0
+
+    async def test_batch_handler_error_fails_attempt_for_all(self):
+        queue = _queue(batch_handler=AsyncMock(side_effect=RuntimeError("db down")))
+
+        with patch("app.services.ingestion_queue.retry_job", new_callable=AsyncMock) as retry:
+            await queue._process_batch("w:0", [_job(id=1), _job(id=2, file_id="doc-2")])
+
+        assert [c.args[1] for c in retry.await_args_list] == [1, 2]
+
+    async def test_only_small_bulk_jobs_are_batched(self):
+        queue = _queue(batch_handler=AsyncMock())
+
+        with (
+            patch("app.services.ingestion_queue.claim_jobs", new_callable=AsyncMock, return_value=[]) as claim,
+            patch("app.services.ingestion_queue.settings") as mock_settings,
+        ):
+            mock_settings.ingestion_batch_size = 16
+            mock_settings.ingestion_batch_max_file_bytes = 4
+            mock_settings.ingestion_visibility_timeout_seconds = 300
+            await queue._claim_batch("w:0", _job(lane="interactive"))
+            await queue._claim_batch("w:0", _job(lane="bulk", content_size=9))
+            claim.assert_not_awaited()
+
+            await queue._claim_batch("w:0", _job(lane="bulk", content_size=4))
+
+        assert claim.await_args.kwargs == {"limit": 15, "max_bytes": 4}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_no_spooling")
+class TestWorkers:
+    async def test_enqueue_wakes_idle_worker(self):
+        handled = asyncio.Event()
+
+        async def _handler(_job):
+            handled.set()
+
+        queue = IngestionQueue()
+        jobs = [None, _job()]
+
+        async def _claim(*_args):
+            return jobs.pop(0) if jobs else None
+
+        with (
+            patch("app.services.ingestion_queue.claim_job", side_effect=_claim),
+            patch("app.services.ingestion_queue.complete_job", new_callable=AsyncMock),
+            patch("app.services.ingestion_queue.enqueue_job", new_callable=AsyncMock, return_value=7),
+            patch("app.services.ingestion_queue.settings") as mock_settings,
+        ):
+            mock_settings.ingestion_workers = 1
+            mock_settings.ingestion_interactive_workers = 0
+            mock_settings.ingestion_poll_interval_seconds = 60
+            mock_settings.ingestion_visibility_timeout_seconds = 300
+            mock_settings.ingestion_timeout_seconds = 60
+            queue.start(MagicMock(), _handler, AsyncMock())
+            await asyncio.sleep(0)
+            await queue.enqueue(file_id="doc-1", filename="test.txt", content=b"content")
+            await asyncio.wait_for(handled.wait(), 1)
+            await queue.stop()
+
+        assert not queue.running
+
+    async def test_interactive_only_loops(self):
+        queue = IngestionQueue()
+        lanes_seen: list[tuple[str, ...]] = []
+
+        async def _claim(_pool, lanes, *_args):
+            lanes_seen.append(lanes)
+            return None
+
+        with (
+            patch("app.services.ingestion_queue.claim_job", side_effect=_claim),
+            patch("app.services.ingestion_queue.settings") as mock_settings,
+        ):
+            mock_settings.ingestion_workers = 1
+            mock_settings.ingestion_interactive_workers = 1
+            mock_settings.ingestion_poll_interval_seconds = 60
+            queue.start(MagicMock(), AsyncMock(), AsyncMock())
+            await asyncio.sleep(0)
+            await queue.stop()
+
+        assert sorted(lanes_seen) == sorted([ALL_LANES, INTERACTIVE_LANES])
@@ -0,0 +1,71 @@
+"""Tests for the Postgres-backed PDF page checkpoint store."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from tale_knowledge.extraction import PageResult
+
+pytestmark = pytest.mark.asyncio
+
+
+def _async_ctx(mock_conn):
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=mock_conn)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return ctx
+
+
+def _patch_acquire(mock_conn):
+    return patch(
+        "app.services.page_checkpoints.acquire_with_retry",
+        return_value=_async_ctx(mock_conn),
+    )
+
+
+class TestPostgresPageCheckpointStore:
+    async def test_load_pages_by_hash_and_version(self):
+        from app.services.page_checkpoints import PostgresPageCheckpointStore
+
+        mock_conn = AsyncMock()
+        mock_conn.fetch = AsyncMock(
+            return_value=[{"page_index": 4, "content": "page five", "vision_used": True, "is_scanned": True}]
+        )
+
+        with _patch_acquire(mock_conn):
+            pages = await PostgresPageCheckpointStore(MagicMock(), 72).load_pages("h1", "1:vision")
+
+        assert pages == {4: PageResult("page five", True, True)}
+        assert mock_conn.fetch.call_args.args[1:] == ("h1", "1:vision")
+
+    async def test_save_page_upserts(self):
+        from app.services.page_checkpoints import PostgresPageCheckpointStore
+
+        mock_conn = AsyncMock()
+        with _patch_acquire(mock_conn):
+            await PostgresPageCheckpointStore(MagicMock(), 72).save_page(
+                "h1", "1:text", 0, PageResult("page one", False, False)
+            )
+
+        sql, *args = mock_conn.execute.call_args.args
+        assert "ON CONFLICT (content_hash, extractor_version, page_index) DO UPDATE" in sql
+        assert args == ["h1", "1:text", 0, "page one", False, False]
+
+    async def test_discard_also_prunes_expired(self):
+        from app.services.page_checkpoints import PostgresPageCheckpointStore
+
+        mock_conn = AsyncMock()
+        with _patch_acquire(mock_conn):
+            await PostgresPageCheckpointStore(MagicMock(), 24).discard("h1")
+
+        sql, *args = mock_conn.execute.call_args.args
+        assert "content_hash = $1" in sql and "make_interval(hours => $2)" in sql
+        assert args == ["h1", 24]
+
+    async def test_disabled_by_setting(self):
+        from app.services.page_checkpoints import build_page_checkpoint_store
+
+        with patch("app.services.page_checkpoints.settings") as mock_settings:
+            mock_settings.pdf_page_checkpoints_enabled = False
+            assert build_page_checkpoint_store(MagicMock()) is None
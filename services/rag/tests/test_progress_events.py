@@ -0,0 +1,166 @@
+"""Tests for pushed document progress events.
+
+Covers:
+- ProgressEvents: routing notifications by file_id, unsubscribing,
+  overflow, reconnect resync and the dedicated listening connection
+- GET /documents/events: snapshot first, pushed changes, end on terminal
+  status, 503 without a listener
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def _payload(file_id: str, status: str, phase: str | None = None, detail: str | None = None) -> str:
+    return json.dumps(
+        {"file_id": file_id, "status": status, "progress_phase": phase, "progress_detail": detail, "error": None}
+    )
+
+
+def _lost_conn() -> AsyncMock:
+    """A connection that reports itself terminated as soon as it is watched."""
+    conn = AsyncMock()
+    conn.add_termination_listener = lambda callback: callback(conn)
+    conn.remove_termination_listener = lambda callback: None
+    conn.is_closed = lambda: True
+    return conn
+
+
+class TestProgressEvents:
+    async def test_notifications_reach_subscribers_of_their_file(self):
+        from app.services.progress_events import CHANNEL, ProgressEvents
+
+        events = ProgressEvents()
+        with events.subscribe(["a"]) as queue_a, events.subscribe(["b"]) as queue_b:
+            events._on_notify(None, 1, CHANNEL, _payload("a", "processing", "extracting", "3/10"))
+
+            assert queue_a.get_nowait()["progress_detail"] == "3/10"
+            assert queue_b.empty()
+
+    async def test_unsubscribed_on_exit(self):
+        from app.services.progress_events import ProgressEvents
+
+        events = ProgressEvents()
+        with events.subscribe(["a", "b"]):
+            pass
+
+        assert not events._subscribers
+
+    async def test_malformed_payload_ignored(self):
+        from app.services.progress_events import CHANNEL, ProgressEvents
+
+        events = ProgressEvents()
+        with events.subscribe(["a"]) as queue:
+            events._on_notify(None, 1, CHANNEL, "not json")
+
+            assert queue.empty()
+
+    async def test_overflow_replaces_events_with_resync(self):
+        from app.services.progress_events import _QUEUE_SIZE, RESYNC, ProgressEvents
+
+        events = ProgressEvents()
+        with events.subscribe(["a"]) as queue:
+            for i in range(_QUEUE_SIZE + 1):
+                events.publish({"file_id": "a", "status": "processing", "progress_detail": str(i)})
+
+            assert queue.qsize() == _QUEUE_SIZE
+            items = [queue.get_nowait() for _ in range(_QUEUE_SIZE)]
+        assert items[-1] is RESYNC
+
+    async def test_reconnect_resyncs_every_subscriber(self):
+        from app.services.progress_events import RESYNC, ProgressEvents
+
+        events = ProgressEvents()
+
+        with events.subscribe(["a", "b"]) as queue:
+            await events._listen(_lost_conn(), resync=True)
+
+            assert queue.get_nowait() is RESYNC
+            assert queue.empty()
+        assert not events.listening
+
+    async def test_lost_connection_closed_and_replaced(self):
+        from app.services.progress_events import CHANNEL, ProgressEvents
+
+        events = ProgressEvents()
+        conns = [_lost_conn(), _lost_conn()]
+        connect = AsyncMock(side_effect=conns)
+
+        with (
+            patch("app.services.progress_events.asyncio.sleep", AsyncMock(side_effect=[None, asyncio.CancelledError])),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await events._run(connect)
+
+        assert connect.await_count == 2
+        for conn in conns:
+            conn.add_listener.assert_awaited_once_with(CHANNEL, events._on_notify)
+            conn.close.assert_awaited_once()
+
+
+def _parse_sse(body: str) -> list[dict[str, Any]]:
+    return [
+        json.loads(block.split("data: ", 1)[1]) for block in body.split("\n\n") if block.startswith("event: status")
+    ]
+
+
+class TestDocumentEventsEndpoint:
+    @pytest.fixture
+    def client(self):
+        from fastapi import FastAPI
+        from httpx import ASGITransport, AsyncClient
+
+        from app.routers.documents import router
+
+        app = FastAPI()
+        app.include_router(router)
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+    async def test_streams_snapshot_then_changes_until_done(self, client):
+        from app.services.progress_events import ProgressEvents
+
+        events = ProgressEvents()
+        events._listening = True
+
+        async def statuses(file_ids):
+            # Changes published after subscribing are delivered after the snapshot
+            events.publish(json.loads(_payload("a", "processing", "embedding", "40 chunks")))
+            events.publish(json.loads(_payload("a", "completed")))
+            return {
+                "a": {"status": "processing", "progress_phase": "extracting", "progress_detail": "1/2", "error": None},
+                "b": {"status": "failed", "progress_phase": None, "progress_detail": None, "error": "boom"},
+            }
+
+        with (
+            patch("app.routers.documents.progress_events", events),
+            patch("app.routers.documents.rag_service.get_document_statuses", AsyncMock(side_effect=statuses)),
+        ):
+            async with client:
+                response = await client.get("/api/v1/documents/events", params=[("file_id", "a"), ("file_id", "b")])
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert [(e["file_id"], e["status"], e["progress_phase"]) for e in _parse_sse(response.text)] == [
+            ("a", "processing", "extracting"),
+            ("b", "failed", None),
+            ("a", "processing", "embedding"),
+            ("a", "completed", None),
+        ]
+        assert not events._subscribers
+
+    async def test_503_without_listener(self, client):
+        from app.services.progress_events import ProgressEvents
+
+        with patch("app.routers.documents.progress_events", ProgressEvents()):
+            async with client:
+                response = await client.get("/api/v1/documents/events", params={"file_id": "a"})
+
+        assert response.status_code == 503
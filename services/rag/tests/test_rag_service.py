@@ -12,7 +12,7 @@ from __future__ import annotations
 
 import time
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
@@ -488,6 +488,44 @@ class TestDeleteDocument:
 
         mock_conn.transaction.assert_called_once()
 
+    async def test_hands_over_shared_chunks_before_deleting(self):
+        service = _make_service()
+        mock_conn = _mock_conn(fetch_return=[{"id": "uuid-1"}, {"id": "uuid-2"}])
+
+        with (
+            patch("app.services.rag_service.acquire_with_retry", return_value=_async_ctx(mock_conn)),
+            patch("app.services.rag_service.hand_over_chunks", new_callable=AsyncMock) as mock_hand_over,
+        ):
+            await service.delete_document("doc-1")
+
+        assert mock_hand_over.await_args_list == [
+            call(mock_conn, "uuid-1", exclude=["uuid-1", "uuid-2"]),
+            call(mock_conn, "uuid-2", exclude=["uuid-1", "uuid-2"]),
+        ]
+
+    async def test_locks_documents_before_hand_over(self):
+        service = _make_service()
+        mock_conn = _mock_conn()
+        calls: list[str] = []
+
+        async def _fetch(sql, *_args):
+            calls.append(sql)
+            return [{"id": "uuid-1"}]
+
+        async def _hand_over(*_args, **_kwargs):
+            calls.append("hand_over")
+
+        mock_conn.fetch = AsyncMock(side_effect=_fetch)
+
+        with (
+            patch("app.services.rag_service.acquire_with_retry", return_value=_async_ctx(mock_conn)),
+            patch("app.services.rag_service.hand_over_chunks", side_effect=_hand_over),
+        ):
+            await service.delete_document("doc-1")
+
+        assert "FOR UPDATE" in calls[1]
+        assert calls[2] == "hand_over"
+
     async def test_processing_time_is_reported(self):
         service = _make_service()
         mock_conn = _mock_conn(fetch_return=[])
@@ -497,3 +535,38 @@ class TestDeleteDocument:
 
         assert "processing_time_ms" in result
         assert result["processing_time_ms"] >= 0
+
+
+class TestConfigRefresh:
+    async def test_embedding_swap_clears_query_embedding_cache(self):
+        from tale_knowledge.embedding import QueryEmbeddingCache
+
+        service = _make_service()
+        service._last_config_check = 0.0
+        service._embedding_service = MagicMock(dimensions=3)
+        service._openai_client = MagicMock()
+        service._query_embedding_cache = QueryEmbeddingCache()
+        service._query_embedding_cache.set("old-model", 3, "hello", [0.1, 0.2, 0.3])
+        new_config = {
+            "api_key": "k",
+            "base_url": "http://llm",
+            "embedding_model": "new-model",
+            "embedding_api_key": "k",
+            "embedding_base_url": "http://emb",
+        }
+
+        with (
+            patch("app.services.rag_service.settings") as mock_settings,
+            patch("app.services.rag_service.create_embedding_service") as mock_create,
+            patch("app.services.rag_service.AsyncOpenAI"),
+            patch("app.services.rag_service.RagSearchService"),
+            patch("app.services.rag_service._safe_close", new_callable=AsyncMock),
+        ):
+            mock_settings.get_llm_config.return_value = new_config
+            mock_settings.get_embedding_dimensions.return_value = 3
+            mock_settings.get_vision_config.side_effect = ValueError("no vision model")
+            service._maybe_refresh_clients()
+
+        assert service._embedding_service is mock_create.return_value
+        assert mock_create.call_args.kwargs["query_cache"] is service._query_embedding_cache
+        assert len(service._query_embedding_cache) == 0
@@ -7,10 +7,13 @@ Covers:
 - UndefinedTableError / UndefinedColumnError handling
 - Empty results from both search channels
 - Recency boost scoring
+- Full-precision vs truncated-prefix vector search SQL
+- Hits on shared chunks reported for every sharing document
 """
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -18,6 +21,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import asyncpg
 import pytest
 from tale_knowledge.embedding import EmbeddingQueryResult, EmbeddingUsage
+from tale_knowledge.retrieval import PrefixIndex
 
 pytestmark = pytest.mark.asyncio
 
@@ -237,6 +241,84 @@ class TestScopeFiltering:
         assert vec_args[0][1] == ["doc-1", "doc-2"]
 
 
+class TestSharedChunks:
+    """Chunks stored once under an owner document are reported for each sharer."""
+
+    @staticmethod
+    def _sharer(doc_id: str, owner_id: str, file_id: str) -> dict[str, Any]:
+        return {
+            "id": doc_id,
+            "chunk_owner_id": owner_id,
+            "file_id": file_id,
+            "filename": f"{file_id}.pdf",
+            "source_created_at": None,
+            "source_modified_at": None,
+            "created_at": None,
+        }
+
+    def _service_with_sharers(self, sharers: list[dict[str, Any]]):
+        service, *_ = _build_service()
+        conn = AsyncMock()
+        conn.fetch = AsyncMock(return_value=sharers)
+        ctx = AsyncMock()
+        ctx.__aenter__ = AsyncMock(return_value=conn)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        return service, conn, patch("app.services.search_service.acquire_with_retry", return_value=ctx)
+
+    async def test_unshared_hits_need_no_lookup(self):
+        service, conn, acquire = self._service_with_sharers([])
+        items = [{**_make_row(1, "A", "doc-1"), "document_id": "owner", "shared": False}]
+
+        with acquire:
+            result = await service._fan_out_shared(items, None, 10)
+
+        assert result == items
+        conn.fetch.assert_not_awaited()
+
+    async def test_shared_hit_repeated_per_sharer(self):
+        service, conn, acquire = self._service_with_sharers([self._sharer("copy", "owner", "doc-2")])
+        items = [
+            {**_make_row(1, "A", "doc-1"), "document_id": "owner", "shared": True},
+            {**_make_row(2, "B", "doc-3"), "document_id": "other", "shared": False},
+        ]
+
+        with acquire:
+            result = await service._fan_out_shared(items, None, 10)
+
+        assert [(r["id"], r["file_id"]) for r in result] == [(1, "doc-1"), (1, "doc-2"), (2, "doc-3")]
+        assert result[1]["filename"] == "doc-2.pdf"
+        assert conn.fetch.await_args.args[1] == ["owner"]
+
+    async def test_scope_drops_out_of_scope_owner(self):
+        service, _, acquire = self._service_with_sharers(
+            [self._sharer("copy", "owner", "doc-2"), self._sharer("copy-2", "owner", "doc-4")]
+        )
+        items = [{**_make_row(1, "A", "doc-1"), "document_id": "owner", "shared": True}]
+
+        with acquire:
+            result = await service._fan_out_shared(items, ["doc-2"], 10)
+
+        assert [r["file_id"] for r in result] == ["doc-2"]
+
+    async def test_result_count_capped_at_limit(self):
+        service, _, acquire = self._service_with_sharers(
+            [self._sharer(f"copy-{i}", "owner", f"doc-{i}") for i in range(5)]
+        )
+        items = [{**_make_row(1, "A", "doc-owner"), "document_id": "owner", "shared": True}]
+
+        with acquire:
+            result = await service._fan_out_shared(items, None, 3)
+
+        assert len(result) == 3
+
+    def test_scope_clause_includes_shared_chunks(self):
+        from app.services.search_service import RagSearchService
+
+        clause, _ = RagSearchService(MagicMock(), MagicMock())._build_scope_clause(["doc-a"], 1)
+
+        assert "COALESCE(chunk_owner_id, id)" in clause
+
+
 class TestGracefulFallback:
     """Error handling: BM25 not ready, missing tables/columns."""
 
@@ -607,3 +689,50 @@ class TestRecencyBoostIntegration:
                 mock_boost.assert_not_called()
 
         assert len(results) == 2
+
+
+class TestVectorSearchIndexModes:
+    """_vector_search SQL for full-precision vs truncated-prefix indexes."""
+
+    @staticmethod
+    def _conn_ctx(conn):
+        @asynccontextmanager
+        async def _acq(_pool, **_kw):
+            yield conn
+
+        return _acq
+
+    async def test_full_mode_single_stage(self):
+        service, *_, vector_conn = _build_service()
+        vector_conn.fetch = AsyncMock(return_value=[_make_row(1, "A", "doc-1", 0.9)])
+
+        with (
+            patch("app.services.search_service.acquire_with_retry", self._conn_ctx(vector_conn)),
+            patch("app.services.search_service.vector_prefix_index", return_value=None),
+        ):
+            rows = await service._vector_search([0.1, 0.2], None, 15)
+
+        sql, *params = vector_conn.fetch.call_args.args
+        assert "subvector" not in sql
+        assert params[-1] == 15
+        assert rows[0]["id"] == 1
+
+    async def test_halfvec_mode_rescores_prefix_candidates(self):
+        service, *_, vector_conn = _build_service()
+        vector_conn.fetch = AsyncMock(return_value=[_make_row(1, "A", "doc-1", 0.9)])
+        vector_conn.transaction = MagicMock(return_value=AsyncMock())
+
+        with (
+            patch("app.services.search_service.acquire_with_retry", self._conn_ctx(vector_conn)),
+            patch("app.services.search_service.vector_prefix_index", return_value=PrefixIndex("halfvec", 512)),
+            patch("app.services.search_service.settings") as mock_settings,
+        ):
+            mock_settings.vector_rescore_factor = 4
+            await service._vector_search([0.1, 0.2], ["doc-1"], 15)
+
+        vector_conn.execute.assert_awaited_once_with("SET LOCAL hnsw.ef_search = 60")
+        sql, *params = vector_conn.fetch.call_args.args
+        assert "ORDER BY (l2_normalize(subvector(c.embedding, 1, 512))::halfvec(512)) <#>" in sql
+        assert "ORDER BY c.embedding <=> $1::vector" in sql
+        assert "1 - (c.embedding <=> $1::vector) AS score" in sql
+        assert params[1:] == [["doc-1"], 60, 15]
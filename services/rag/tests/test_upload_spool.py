@@ -0,0 +1,49 @@
+"""Tests for the bounded-memory upload spool."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from tale_shared.utils.hashing import compute_content_hash
+
+from app.utils.upload_spool import UploadSpool
+
+
+class TestUploadSpool:
+    def test_small_upload_stays_in_memory(self):
+        with UploadSpool(16) as spool:
+            spool.write(b"hello ")
+            spool.write(b"world")
+
+            assert not spool.on_disk
+            assert spool.source() == b"hello world"
+            assert spool.size == 11
+            assert spool.content_hash == compute_content_hash(b"hello world")
+
+    def test_large_upload_rolls_over_to_disk(self, tmp_path):
+        spool = UploadSpool(8, dir=str(tmp_path))
+        spool.write(b"0123456")
+        spool.write(b"789abc")
+
+        source = spool.source()
+        assert spool.on_disk
+        assert isinstance(source, Path) and source.parent == tmp_path
+        assert source.read_bytes() == b"0123456789abc"
+        assert spool.content_hash == compute_content_hash(b"0123456789abc")
+
+        spool.close()
+        assert not source.exists()
+
+    @pytest.mark.asyncio
+    async def test_awrite_moves_disk_writes_off_the_loop(self, tmp_path):
+        spool = UploadSpool(8, dir=str(tmp_path))
+        with patch("app.utils.upload_spool.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            await spool.awrite(b"0123")
+            to_thread.assert_not_called()
+            await spool.awrite(b"456789")
+            await spool.awrite(b"abc")
+
+        assert to_thread.call_count == 2
+        assert spool.source().read_bytes() == b"0123456789abc"
+        spool.close()